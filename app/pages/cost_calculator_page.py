@@ -252,7 +252,35 @@ def render():
         st.subheader("📉 낙폭 (Drawdown)")
         fig_dd = Visualizer.plot_drawdown(data['daily_capital'])
         st.plotly_chart(fig_dd, use_container_width=True)
-        
+
+        # 성과 지표 신뢰구간 (Monte Carlo 부트스트랩)
+        uncertainty = data.get('uncertainty')
+        if uncertainty and (uncertainty['daily'] is not None or uncertainty['trades'] is not None):
+            st.markdown("---")
+            st.subheader("🎲 성과 지표 신뢰구간 (Monte Carlo)")
+            st.caption(
+                f"거래 / 일별 수익률을 {uncertainty['n_sims']:,}회 재표본추출한 90% 신뢰구간입니다. "
+                "단일 백테스트 경로의 지표는 확정값이 아닙니다."
+            )
+            if uncertainty['prob_loss'] is not None:
+                st.metric("손실 확률", f"{uncertainty['prob_loss'] * 100:.1f}%")
+
+            labels = {'final_return': '최종 수익률', 'mdd': 'MDD', 'sharpe_ratio': 'Sharpe Ratio'}
+            for key, title in (('daily', '일별 수익률 블록 부트스트랩'), ('trades', '거래 부트스트랩')):
+                table = uncertainty[key]
+                if table is None:
+                    continue
+                if key == 'daily':
+                    title += f" (블록 {uncertainty['block_size']}일)"
+                st.markdown(f"#### {title}")
+                st.dataframe(
+                    table.rename(index=labels, columns={
+                        'observed': '실제', 'mean': '평균', 'median': '중앙값',
+                        'lower': '하한 (5%)', 'upper': '상한 (95%)'
+                    }).round(4),
+                    use_container_width=True
+                )
+
         # 거래 내역
         if not data['trades'].empty:
             st.markdown("---")
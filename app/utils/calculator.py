@@ -24,6 +24,7 @@ else:
 sys.path.insert(0, str(ROOT / "scripts" / "subprojects" / "arbitrage"))
 
 from backtest_engine_optimized import OptimizedArbitrageBacktest
+from monte_carlo import MonteCarloBootstrap
 
 
 class CostCalculator:
@@ -54,11 +55,17 @@ class CostCalculator:
         entry_z: float = 2.5,
         exit_z: float = 0.5,
         stop_loss: float = -0.03,
-        max_holding_days: int = 30
+        max_holding_days: int = 30,
+        n_sims: int = 2_000,
+        seed: Optional[int] = 42
     ) -> Dict:
         """
         차익거래 비용 계산
         
+        Args:
+            n_sims: Monte Carlo 시뮬레이션 횟수 (화면 호출마다 실행되므로 기본값은 작게)
+            seed: 난수 시드 (같은 조건 재계산은 캐시된 신뢰구간 재사용)
+        
         Returns:
             {
                 "success": bool,
@@ -71,7 +78,8 @@ class CostCalculator:
                     "sharpe_ratio": float,
                     "annualized_return": float,
                     "trades": pd.DataFrame,
-                    "daily_capital": pd.DataFrame
+                    "daily_capital": pd.DataFrame,
+                    "uncertainty": Dict (Monte Carlo 부트스트랩 신뢰구간)
                 },
                 "error": str (if success=False)
             }
@@ -132,13 +140,19 @@ class CostCalculator:
             # 성과 분석
             metrics = backtest.analyze_performance(trades_df, daily_capital_df, benchmark_return)
             
+            # 성과 지표 불확실성 (거래 / 일별 수익률 부트스트랩)
+            uncertainty = MonteCarloBootstrap(n_sims=n_sims, seed=seed).run(
+                trades_df, daily_capital_df, metrics
+            )
+            
             return {
                 "success": True,
                 "data": {
                     **metrics,
                     "trades": trades_df,
                     "daily_capital": daily_capital_df,
-                    "benchmark_return": benchmark_return
+                    "benchmark_return": benchmark_return,
+                    "uncertainty": uncertainty
                 }
             }
             
@@ -271,13 +271,38 @@ class RiskPredictor:
                 df, include_dynamic=self.include_dynamic
             )
             
+        except Exception as e:
+            import traceback
+            logging.error(f"예측 실패: {str(e)}\n{traceback.format_exc()}")
+            return {
+                'success': False,
+                'error': f"예측 중 오류 발생: {str(e)}"
+            }
+        
+        return self.predict_from_features(df, target_date, generated_features)
+    
+    def predict_from_features(self, df: pd.DataFrame, target_date: str,
+                              generated_features: Optional[List[str]] = None) -> Dict:
+        """특성 생성이 끝난 데이터로 리스크 예측 (데이터 로드 / 특성 생성을 호출자와 공유)
+        
+        Args:
+            df: FeatureEngineer.create_features 결과 (동적 변수가 더 있어도 모델 특성만 사용, 수정하지 않음)
+            target_date: 예측할 날짜 (YYYY-MM-DD)
+            generated_features: create_features가 반환한 특성 목록 (모델 특성 목록이 없을 때 사용)
+        
+        Returns:
+            predict_risk()와 동일한 형식
+        """
+        try:
+            target_dt = datetime.strptime(target_date, "%Y-%m-%d")
+            
             # 타겟 날짜 행 찾기
             target_df = df[df['date'].dt.date == target_dt.date()]
             
             if target_df.empty:
                 if len(df) > 0:
-                    df['date_diff'] = (df['date'].dt.date - target_dt.date()).abs()
-                    closest_row = df.loc[df['date_diff'].idxmin()]
+                    date_diff = (df['date'].dt.date - target_dt.date()).abs()
+                    closest_row = df.loc[date_diff.idxmin()]
                     closest_date = closest_row['date'].date()
                     days_diff = abs((closest_date - target_dt.date()).days)
                     
@@ -295,7 +320,7 @@ class RiskPredictor:
             row = target_df.iloc[0]
             
             # 사용할 특성 결정
-            features_to_use = self.features if self.features else generated_features
+            features_to_use = self.features if self.features else (generated_features or [])
             
             # 특성 추출
             X_values = []
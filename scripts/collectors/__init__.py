@@ -9,6 +9,7 @@ BSC 거래 수집을 위한 하이브리드 시스템 모듈
 from .bsc_api_collector import (
     get_bsc_addresses_from_supabase,
     fetch_transactions_via_api,
+    fetch_transaction_history,
     collect_all_bsc_transactions,
     classify_transaction_size,
     is_high_value_transaction,
@@ -29,6 +30,7 @@ __all__ = [
     # API Collector
     'get_bsc_addresses_from_supabase',
     'fetch_transactions_via_api',
+    'fetch_transaction_history',
     'collect_all_bsc_transactions',
     'classify_transaction_size',
     'is_high_value_transaction',
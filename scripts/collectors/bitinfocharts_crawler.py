@@ -5,14 +5,19 @@ BTC, LTC, DOGE, XRP 등의 Rich List에서 지갑 라벨(거래소 등)을 수
 """
 
 import os
+import sys
 import time
 import random
-import requests
 from bs4 import BeautifulSoup
 from supabase import create_client
 from dotenv import load_dotenv
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# 공용 HTTP 클라이언트 (keep-alive 연결 재사용 + 호스트별 호출 한도 + 재시도)
+from src import http_client
+
 # 환경 변수 로드
 load_dotenv(Path.cwd() / 'config' / '.env')
 
@@ -45,7 +50,7 @@ def crawl_bitinfocharts(coin_symbol):
     print(f"   URL: {url}")
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = http_client.get(url, headers=HEADERS, timeout=15)
         if response.status_code != 200:
             print(f"❌ 요청 실패: {response.status_code}")
             return
@@ -13,7 +13,7 @@ import sys
 import time
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from supabase import create_client
 import requests
@@ -28,6 +28,8 @@ load_dotenv(PROJECT_ROOT / 'config' / '.env')
 # API 설정
 BSCSCAN_API_URL = 'https://api.bscscan.com/api'
 RATE_LIMIT_DELAY = 0.25  # 초
+# txlist 요청 1회 최대 건수 (page × offset ≤ 10,000)
+TXLIST_PAGE_SIZE = 10000
 
 
 def get_supabase_client():
@@ -124,14 +126,59 @@ def is_high_value_transaction(tx: Dict) -> bool:
     return False
 
 
-def fetch_transactions_via_api(
-    address: str, 
+def _parse_bscscan_tx(tx: Dict) -> Dict:
+    """BSCScan txlist 항목 → whale_transactions 스키마"""
+    # 값 변환
+    value = int(tx.get('value', 0)) / 1e18  # Wei -> BNB
+    gas_used = int(tx.get('gasUsed', 0))
+    gas_price = int(tx.get('gasPrice', 0))
+    gas_fee = (gas_used * gas_price) / 1e18  # Wei -> BNB
+    
+    # 타임스탬프 변환
+    block_timestamp = datetime.fromtimestamp(
+        int(tx.get('timeStamp', 0)), 
+        tz=timezone.utc
+    )
+    
+    # whale_transactions 스키마에 맞게 매핑
+    return {
+        'tx_hash': tx.get('hash'),
+        'block_number': int(tx.get('blockNumber', 0)),
+        'block_timestamp': block_timestamp,
+        'from_address': tx.get('from', '').lower(),
+        'to_address': tx.get('to', '').lower() if tx.get('to') else None,
+        'coin_symbol': 'BNB',
+        'chain': 'bsc',
+        'amount': value,
+        'amount_usd': None,  # 가격 조회는 별도 처리
+        'gas_used': gas_used,
+        'gas_price': gas_price,
+        'gas_fee_eth': gas_fee,
+        'gas_fee_usd': None,
+        'transaction_status': 'FAILED' if tx.get('isError') == '1' else 'SUCCESS',
+        'is_whale': True,
+        'whale_category': classify_transaction_size(value, 'BNB'),
+        'contract_address': None,
+        'token_name': None,
+        'input_data': tx.get('input', ''),
+        'is_contract_to_contract': False,
+        'has_method_id': len(tx.get('input', '0x')) > 2,
+        'from_label': None,
+        'to_label': None,
+    }
+
+
+def fetch_transaction_history(
+    address: str,
     api_key: str,
     start_block: int = 0,
     end_block: int = 99999999
-) -> List[Dict]:
+) -> Tuple[List[Dict], Optional[int]]:
     """
-    BSCScan API를 사용하여 특정 주소의 거래 기록 수집
+    BSCScan API로 start_block 이후 거래를 오래된 순 페이지로 모두 수집
+    
+    txlist는 요청 1회(page × offset)에 최대 10,000건이라, 가득 찬 페이지는 마지막 블록부터 다시 요청
+    (같은 블록 거래는 tx_hash로 중복 제거) → 마지막 블록 직전까지는 빠짐없이 수집된 구간
     
     Parameters:
     -----------
@@ -146,94 +193,116 @@ def fetch_transactions_via_api(
     
     Returns:
     --------
-    List[Dict] : 거래 기록 리스트 (whale_transactions 스키마 형식)
+    Tuple[List[Dict], Optional[int]] : (거래 기록 리스트, 빠짐없이 수집한 마지막 블록)
+        - 끝까지 수집하면 마지막 거래 블록, 중간에 실패하면 실패 전 페이지까지 완결된 블록
+        - 완결된 블록이 없으면 None (워터마크 유지)
     """
     if not api_key:
         print("⚠️ ETHERSCAN_API_KEY가 설정되지 않았습니다.")
-        return []
-    
-    params = {
-        'module': 'account',
-        'action': 'txlist',
-        'address': address,
-        'startblock': start_block,
-        'endblock': end_block,
-        'sort': 'desc',
-        'apikey': api_key
-    }
-    
-    try:
-        response = requests.get(BSCSCAN_API_URL, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        return [], None
+    
+    transactions: List[Dict] = []
+    seen = set()
+    covered_block = None
+    current_block = start_block
+    
+    while True:
+        params = {
+            'module': 'account',
+            'action': 'txlist',
+            'address': address,
+            'startblock': current_block,
+            'endblock': end_block,
+            'page': 1,
+            'offset': TXLIST_PAGE_SIZE,
+            'sort': 'asc',
+            'apikey': api_key
+        }
+        
+        try:
+            response = requests.get(BSCSCAN_API_URL, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"❌ API 호출 실패: {e}")
+            return transactions, covered_block
+        except Exception as e:
+            print(f"❌ 예상치 못한 오류: {e}")
+            return transactions, covered_block
         
         if data.get('status') != '1' or not data.get('result'):
             if data.get('message') == 'No transactions found':
-                return []
+                # 이전 페이지까지 받은 거래가 끝
+                if transactions:
+                    covered_block = max(tx['block_number'] for tx in transactions)
+                return transactions, covered_block
             print(f"⚠️ API 오류: {data.get('message', 'Unknown error')}")
-            return []
+            return transactions, covered_block
         
-        transactions = []
-        for tx in data['result']:
+        result = data['result']
+        for tx in result:
+            if tx.get('hash') in seen:
+                continue
             try:
-                # 값 변환
-                value = int(tx.get('value', 0)) / 1e18  # Wei -> BNB
-                gas_used = int(tx.get('gasUsed', 0))
-                gas_price = int(tx.get('gasPrice', 0))
-                gas_fee = (gas_used * gas_price) / 1e18  # Wei -> BNB
-                
-                # 타임스탬프 변환
-                block_timestamp = datetime.fromtimestamp(
-                    int(tx.get('timeStamp', 0)), 
-                    tz=timezone.utc
-                )
-                
-                # whale_transactions 스키마에 맞게 매핑
-                transaction = {
-                    'tx_hash': tx.get('hash'),
-                    'block_number': int(tx.get('blockNumber', 0)),
-                    'block_timestamp': block_timestamp,
-                    'from_address': tx.get('from', '').lower(),
-                    'to_address': tx.get('to', '').lower() if tx.get('to') else None,
-                    'coin_symbol': 'BNB',
-                    'chain': 'bsc',
-                    'amount': value,
-                    'amount_usd': None,  # 가격 조회는 별도 처리
-                    'gas_used': gas_used,
-                    'gas_price': gas_price,
-                    'gas_fee_eth': gas_fee,
-                    'gas_fee_usd': None,
-                    'transaction_status': 'FAILED' if tx.get('isError') == '1' else 'SUCCESS',
-                    'is_whale': True,
-                    'whale_category': classify_transaction_size(value, 'BNB'),
-                    'contract_address': None,
-                    'token_name': None,
-                    'input_data': tx.get('input', ''),
-                    'is_contract_to_contract': False,
-                    'has_method_id': len(tx.get('input', '0x')) > 2,
-                    'from_label': None,
-                    'to_label': None,
-                }
-                
-                transactions.append(transaction)
-            
+                transactions.append(_parse_bscscan_tx(tx))
+                seen.add(tx.get('hash'))
             except Exception as e:
                 print(f"⚠️ 거래 파싱 실패: {e}")
                 continue
         
-        return transactions
+        if len(result) < TXLIST_PAGE_SIZE:
+            if transactions:
+                covered_block = max(tx['block_number'] for tx in transactions)
+            return transactions, covered_block
+        
+        last_block = int(result[-1].get('blockNumber', 0))
+        if last_block <= current_block:
+            # 블록 하나에 10,000건 이상: 더 나눠 받을 수 없으므로 해당 블록은 받은 만큼으로 완결 처리
+            print(f"⚠️ 블록 {last_block} 거래가 페이지 한도 이상: 일부만 수집")
+            covered_block = last_block
+            current_block = last_block + 1
+        else:
+            # 마지막 블록은 다음 페이지에 이어질 수 있으므로 그 직전까지만 완결
+            covered_block = last_block - 1
+            current_block = last_block
+        
+        print(f"  … {len(transactions)}건, 블록 {current_block}부터 이어서 조회")
+        time.sleep(RATE_LIMIT_DELAY)
+
+
+def fetch_transactions_via_api(
+    address: str, 
+    api_key: str,
+    start_block: int = 0,
+    end_block: int = 99999999
+) -> List[Dict]:
+    """
+    BSCScan API를 사용하여 특정 주소의 거래 기록 수집 (fetch_transaction_history의 거래 목록)
     
-    except requests.exceptions.RequestException as e:
-        print(f"❌ API 호출 실패: {e}")
-        return []
-    except Exception as e:
-        print(f"❌ 예상치 못한 오류: {e}")
-        return []
+    Parameters:
+    -----------
+    address : str
+        지갑 주소
+    api_key : str
+        BSCScan API 키
+    start_block : int
+        시작 블록 (기본값: 0)
+    end_block : int
+        종료 블록 (기본값: 99999999)
+    
+    Returns:
+    --------
+    List[Dict] : 거래 기록 리스트 (whale_transactions 스키마 형식)
+    """
+    transactions, _ = fetch_transaction_history(address, api_key, start_block, end_block)
+    return transactions
 
 
 def collect_all_bsc_transactions(
     addresses: Optional[List[str]] = None,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    start_blocks: Optional[Dict[str, int]] = None,
+    covered_blocks: Optional[Dict[str, int]] = None
 ) -> List[Dict]:
     """
     모든 BSC 주소의 거래 기록 수집
@@ -244,6 +313,10 @@ def collect_all_bsc_transactions(
         주소 리스트 (None일 경우 Supabase에서 조회)
     api_key : Optional[str]
         BSCScan API 키 (None일 경우 환경 변수에서 로드)
+    start_blocks : Optional[Dict[str, int]]
+        주소(소문자)별 시작 블록 (워터마크 다음 블록, 없으면 0)
+    covered_blocks : Optional[Dict[str, int]]
+        주어지면 주소(소문자)별 빠짐없이 수집한 마지막 블록을 채움 (워터마크 전진 상한)
     
     Returns:
     --------
@@ -276,7 +349,10 @@ def collect_all_bsc_transactions(
     for i, address in enumerate(addresses, 1):
         print(f"\n[{i}/{len(addresses)}] 주소 처리 중: {address[:10]}...")
         
-        transactions = fetch_transactions_via_api(address, api_key)
+        start_block = (start_blocks or {}).get(address.lower(), 0)
+        transactions, covered_block = fetch_transaction_history(address, api_key, start_block=start_block)
+        if covered_blocks is not None and covered_block is not None:
+            covered_blocks[address.lower()] = covered_block
         
         if transactions:
             all_transactions.extend(transactions)
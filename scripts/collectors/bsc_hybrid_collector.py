@@ -11,7 +11,6 @@ BSC 거래 수집을 위한 하이브리드 시스템
 
 import os
 import sys
-import json
 import time
 import argparse
 from pathlib import Path
@@ -32,70 +31,71 @@ from scripts.collectors.bsc_api_collector import (
 )
 
 from scripts.collectors.bsc_web_scraper import (
+    MAX_WORKERS,
+    TxDetailCache,
     scrape_multiple_transactions
 )
 
+from src.collectors.ingestion_state import SupabaseIngestionState
+
 # 설정
-CHECKPOINT_FILE = PROJECT_ROOT / "checkpoints" / "bsc_hybrid_checkpoint.json"
+# ingestion_state 키: ('bscscan', 주소(소문자), 'whale_transactions')
+STATE_SOURCE = 'bscscan'
+STATE_STREAM = 'whale_transactions'
 DEFAULT_MIN_BNB = 100  # BNB 기준
 DEFAULT_MIN_USD = 50000  # USD 기준
 WEB_SCRAPING_DELAY = 2  # 초
 
 
-def load_checkpoint() -> Dict:
+def get_start_blocks(state: SupabaseIngestionState, addresses: List[str]) -> Dict[str, int]:
     """
-    체크포인트 파일 로드
+    주소별 시작 블록 (워터마크 다음 블록)
     
     Returns:
     --------
-    Dict : 체크포인트 데이터
+    Dict[str, int] : 주소(소문자) -> 시작 블록 (워터마크가 없는 주소는 제외 → 0부터)
     """
-    if not CHECKPOINT_FILE.exists():
-        return {
-            'last_run': None,
-            'processed_addresses': [],
-            'high_value_txs_scraped': [],
-            'total_collected': 0,
-            'total_scraped': 0
-        }
-    
-    try:
-        with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"⚠️ 체크포인트 로드 실패: {e}")
-        return {
-            'last_run': None,
-            'processed_addresses': [],
-            'high_value_txs_scraped': [],
-            'total_collected': 0,
-            'total_scraped': 0
-        }
+    start_blocks = {}
+    for address in addresses:
+        last_block = state.last_block(STATE_SOURCE, address.lower(), STATE_STREAM)
+        if last_block is not None:
+            start_blocks[address.lower()] = last_block + 1
+    return start_blocks
 
 
-def save_checkpoint(checkpoint: Dict):
+def advance_watermarks(
+    state: SupabaseIngestionState,
+    addresses: List[str],
+    transactions: List[Dict],
+    covered_blocks: Optional[Dict[str, int]] = None
+):
     """
-    체크포인트 저장
+    저장이 끝난 거래 기준으로 주소별 워터마크 전진
     
     Parameters:
     -----------
-    checkpoint : Dict
-        저장할 체크포인트 데이터
+    addresses : List[str]
+        이번 실행에서 조회한 주소
+    transactions : List[Dict]
+        whale_transactions에 저장된 거래
+    covered_blocks : Optional[Dict[str, int]]
+        주소(소문자)별 빠짐없이 수집한 마지막 블록 (주어지면 그 블록까지만 전진, 없는 주소는 전진하지 않음)
     """
-    try:
-        # 디렉토리 생성
-        CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 현재 시간 업데이트
-        checkpoint['last_run'] = datetime.now().isoformat()
-        
-        with open(CHECKPOINT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ 체크포인트 저장: {CHECKPOINT_FILE}")
-    
-    except Exception as e:
-        print(f"⚠️ 체크포인트 저장 실패: {e}")
+    latest: Dict[str, Dict] = {}
+    targets = {address.lower() for address in addresses}
+    for tx in transactions:
+        for address in (tx.get('from_address'), tx.get('to_address')):
+            if address not in targets:
+                continue
+            if covered_blocks is not None and tx['block_number'] > covered_blocks.get(address, -1):
+                continue
+            mark = latest.setdefault(address, {'last_block': 0, 'last_timestamp': tx['block_timestamp']})
+            mark['last_block'] = max(mark['last_block'], tx['block_number'])
+            mark['last_timestamp'] = max(mark['last_timestamp'], tx['block_timestamp'])
+    
+    for address, mark in latest.items():
+        state.advance(STATE_SOURCE, address, STATE_STREAM, **mark)
+    print(f"✅ 워터마크 전진: {len(latest)}개 주소")
 
 
 def save_backup_csv(transactions: List[Dict], filename: str):
@@ -186,7 +186,8 @@ def run_hybrid_collection(
     min_bnb: float = DEFAULT_MIN_BNB,
     min_usd: float = DEFAULT_MIN_USD,
     save_to_db: bool = True,
-    web_scraping_delay: float = WEB_SCRAPING_DELAY
+    web_scraping_delay: float = WEB_SCRAPING_DELAY,
+    web_scraping_workers: int = MAX_WORKERS
 ) -> Dict:
     """
     하이브리드 수집 실행
@@ -205,6 +206,8 @@ def run_hybrid_collection(
         데이터베이스 저장 여부
     web_scraping_delay : float
         웹 스크래핑 요청 간 대기 시간
+    web_scraping_workers : int
+        웹 스크래핑 동시 요청 수
     
     Returns:
     --------
@@ -222,15 +225,22 @@ def run_hybrid_collection(
     print(f"  - 최소 USD: ${min_usd:,}")
     print(f"  - DB 저장: {'활성화' if save_to_db else '비활성화'}")
     
-    # 체크포인트 로드
-    checkpoint = load_checkpoint()
+    # 주소별 워터마크 (마지막 저장 블록) 이후만 수집
+    if addresses is None:
+        addresses = get_bsc_addresses_from_supabase()
+    state = SupabaseIngestionState(get_supabase_client())
+    start_blocks = get_start_blocks(state, addresses)
+    print(f"  - 워터마크 보유 주소: {len(start_blocks)}/{len(addresses)}개")
     
     # Step 1: API로 거래 수집
     print(f"\n{'='*80}")
     print(f"Step 1: API를 통한 거래 수집")
     print(f"{'='*80}")
     
-    all_transactions = collect_all_bsc_transactions(addresses)
+    covered_blocks: Dict[str, int] = {}
+    all_transactions = collect_all_bsc_transactions(
+        addresses, start_blocks=start_blocks, covered_blocks=covered_blocks
+    )
     
     if not all_transactions:
         print("⚠️ 수집된 거래가 없습니다.")
@@ -268,36 +278,24 @@ def run_hybrid_collection(
         print(f"Step 3: 웹 스크래핑으로 추가 정보 보완")
         print(f"{'='*80}")
         print(f"대상: {len(high_value_txs)}건")
-        print(f"예상 소요 시간: 약 {len(high_value_txs) * web_scraping_delay / 60:.1f}분")
         
-        # 이미 스크래핑한 거래 제외
-        already_scraped = set(checkpoint.get('high_value_txs_scraped', []))
-        txs_to_scrape = [
-            tx for tx in high_value_txs 
-            if tx.get('tx_hash') not in already_scraped
-        ]
+        # 이전 실행에서 스크래핑한 거래(저장 실패로 워터마크가 유지된 구간)는 tx_hash 캐시에서 재사용
+        enriched_txs = scrape_multiple_transactions(
+            high_value_txs,
+            delay=web_scraping_delay,
+            max_workers=web_scraping_workers,
+            cache=TxDetailCache()
+        )
         
-        if txs_to_scrape:
-            print(f"새로 스크래핑할 거래: {len(txs_to_scrape)}건")
-            
-            enriched_txs = scrape_multiple_transactions(
-                txs_to_scrape,
-                delay=web_scraping_delay
-            )
-            
-            # 원본 거래 리스트 업데이트
-            enriched_tx_map = {tx['tx_hash']: tx for tx in enriched_txs}
-            
-            for i, tx in enumerate(all_transactions):
-                tx_hash = tx.get('tx_hash')
-                if tx_hash in enriched_tx_map:
-                    all_transactions[i] = enriched_tx_map[tx_hash]
-            
-            # 체크포인트 업데이트
-            checkpoint['high_value_txs_scraped'].extend([tx['tx_hash'] for tx in enriched_txs])
-            scraped_count = len(enriched_txs)
-        else:
-            print(f"✓ 모든 고액 거래가 이미 스크래핑되었습니다.")
+        # 원본 거래 리스트 업데이트
+        enriched_tx_map = {tx['tx_hash']: tx for tx in enriched_txs}
+        
+        for i, tx in enumerate(all_transactions):
+            tx_hash = tx.get('tx_hash')
+            if tx_hash in enriched_tx_map:
+                all_transactions[i] = enriched_tx_map[tx_hash]
+        
+        scraped_count = len(enriched_txs)
         
         # 백업 저장 (스크래핑 후)
         backup_filename = f"bsc_transactions_enriched_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -316,15 +314,14 @@ def run_hybrid_collection(
         
         saved_count = save_to_whale_transactions(all_transactions)
         
-        # 체크포인트 업데이트
-        checkpoint['total_collected'] += len(all_transactions)
-        checkpoint['total_scraped'] += scraped_count
+        # 모두 저장된 경우에만 워터마크 전진 (일부 실패 시 다음 실행에서 같은 구간 재수집 / 재스크래핑)
+        if saved_count == len(all_transactions):
+            advance_watermarks(state, addresses, all_transactions, covered_blocks)
+        else:
+            print(f"⚠️ 일부 저장 실패 ({saved_count}/{len(all_transactions)}): 워터마크 유지")
     
     else:
-        print(f"\n⏭️  Step 4: 데이터베이스 저장 건너뛰기")
-    
-    # 체크포인트 저장
-    save_checkpoint(checkpoint)
+        print(f"\n⏭️  Step 4: 데이터베이스 저장 건너뛰기 (워터마크 유지)")
     
     # 결과 요약
     end_time = datetime.now()
@@ -407,6 +404,13 @@ def main():
         help=f'웹 스크래핑 요청 간 대기 시간(초) (기본값: {WEB_SCRAPING_DELAY})'
     )
     
+    parser.add_argument(
+        '--scraping-workers',
+        type=int,
+        default=MAX_WORKERS,
+        help=f'웹 스크래핑 동시 요청 수 (기본값: {MAX_WORKERS})'
+    )
+    
     parser.add_argument(
         '--test',
         action='store_true',
@@ -429,7 +433,8 @@ def main():
             min_bnb=args.min_bnb,
             min_usd=args.min_usd,
             save_to_db=not args.no_save,
-            web_scraping_delay=args.scraping_delay
+            web_scraping_delay=args.scraping_delay,
+            web_scraping_workers=args.scraping_workers
         )
         
         # 성공
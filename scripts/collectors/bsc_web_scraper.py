@@ -4,21 +4,38 @@ BSC Web Scraper Module
 
 BSCscan 웹사이트에서 추가 거래 정보를 스크래핑하는 모듈
 - 특정 tx_hash의 상세 페이지 스크래핑
-- Method, Label, Direction 등 추가 정보 추출
-- Rate limiting 관리
+- Method, Label, Direction 등 추가 정보 추출 (lxml로 한 번 순회)
+- 호스트 호출 한도 안에서 동시 요청, tx_hash별 결과 캐시
 """
 
-import time
 import re
-from typing import Dict, Optional, Tuple
-from bs4 import BeautifulSoup
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+import lxml.html
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.http_client import HttpClient, get_client
+
 # 설정
 BSCSCAN_BASE_URL = "https://bscscan.com"
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # 초
+RETRY_DELAY = 2  # 초 (요청 간 최소 간격, 공용 클라이언트의 bscscan.com 호출 한도)
 REQUEST_TIMEOUT = 30  # 초
+MAX_WORKERS = 4  # 동시 요청 수 (요청 간격은 호스트 호출 한도가 보장)
+CACHE_DB_PATH = Path(__file__).resolve().parents[2] / "data" / "project.db"
+
+FUNCTION_PATTERN = re.compile(r'Function:\s*([^\n]+)')
+USD_PATTERN = re.compile(r'\$([0-9,]+\.[0-9]+)')
+
+DETAIL_FIELDS = ('input_data', 'from_label', 'to_label', 'from_address', 'to_address', 'amount_text', 'amount_usd')
 
 
 def get_headers():
@@ -29,8 +46,6 @@ def get_headers():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
         'Referer': 'https://bscscan.com/',
         'DNT': '1',
@@ -49,169 +64,167 @@ def clean_text(text):
     return ' '.join(text.strip().split())
 
 
-def extract_method(soup: BeautifulSoup) -> Optional[str]:
-    """
-    거래 Method 추출
-    
-    예: Transfer, Swap, Approve 등
-    """
-    try:
-        # Method 정보는 여러 위치에 있을 수 있음
-        # 1. span.u-label 태그
-        method_span = soup.find('span', class_='u-label')
-        if method_span:
-            method = clean_text(method_span.get_text())
-            if method:
-                return method
-        
-        # 2. input data에서 function signature 추출
-        input_data_section = soup.find('div', id='inputdata')
-        if input_data_section:
-            # Function signature 찾기
-            func_match = re.search(r'Function:\s*([^\n]+)', input_data_section.get_text())
-            if func_match:
-                return clean_text(func_match.group(1))
-        
-        return None
-    
-    except Exception as e:
-        print(f"⚠️ Method 추출 실패: {e}")
-        return None
+def _has_class(element, name: str) -> bool:
+    return name in (element.get('class') or '').split()
 
 
-def extract_labels(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
-    """
-    From/To 주소의 라벨 추출
-    
-    Returns:
-    --------
-    Tuple[Optional[str], Optional[str]] : (from_label, to_label)
-    """
-    try:
-        from_label = None
-        to_label = None
-        
-        # From/To 섹션 찾기
-        rows = soup.find_all('div', class_='row')
-        
-        for row in rows:
-            # From 라벨 찾기
-            if 'From:' in row.get_text():
-                label_span = row.find('span', attrs={'data-bs-toggle': 'tooltip'})
-                if label_span:
-                    from_label = clean_text(label_span.get_text())
-                    # 주소가 아닌 라벨인 경우만
-                    if not from_label.startswith('0x'):
-                        pass
-                    else:
-                        from_label = None
-            
-            # To 라벨 찾기
-            if 'To:' in row.get_text():
-                label_span = row.find('span', attrs={'data-bs-toggle': 'tooltip'})
-                if label_span:
-                    to_label = clean_text(label_span.get_text())
-                    # 주소가 아닌 라벨인 경우만
-                    if not to_label.startswith('0x'):
-                        pass
-                    else:
-                        to_label = None
-        
-        return from_label, to_label
-    
-    except Exception as e:
-        print(f"⚠️ Label 추출 실패: {e}")
-        return None, None
+def _row_label(row) -> Optional[str]:
+    """행 안의 tooltip 라벨 (주소 형태는 라벨이 아니므로 None)"""
+    for span in row.iter('span'):
+        if span.get('data-bs-toggle') == 'tooltip':
+            label = clean_text(span.text_content())
+            return None if label.startswith('0x') else label
+    return None
+
 
+def _row_address(row) -> Optional[str]:
+    """행 안의 첫 주소 링크 (소문자)"""
+    for link in row.iter('a'):
+        href = link.get('href') or ''
+        if '/address/0x' in href:
+            return href.split('/address/')[-1].lower()
+    return None
 
-def extract_direction(soup: BeautifulSoup, target_address: str) -> Optional[str]:
+
+def parse_transaction_page(html: Union[str, bytes], target_address: Optional[str] = None) -> Dict:
     """
-    거래 방향 추출 (IN/OUT)
+    거래 상세 페이지를 lxml로 한 번 순회하며 모든 필드 추출
     
-    Parameters:
-    -----------
-    soup : BeautifulSoup
-        파싱된 HTML
-    target_address : str
-        확인할 대상 주소
+    - input_data: 첫 span.u-label (Transfer, Swap 등), 없으면 div#inputdata의 'Function:' 서명
+    - from_label / to_label, from_address / to_address: 'From:' / 'To:' 행의 tooltip 라벨과 주소 링크
+    - amount_text / amount_usd: 'Value:' 행의 span.u-label--value와 '$' 금액
+    - direction: target_address가 To면 IN, From이면 OUT
     
     Returns:
     --------
-    Optional[str] : 'IN', 'OUT', 또는 None
+    Dict : DETAIL_FIELDS + direction (찾지 못한 값은 None)
     """
-    try:
-        target_address = target_address.lower()
-        
-        # From/To 주소 찾기
-        from_address = None
-        to_address = None
+    root = lxml.html.fromstring(html)
+    result = {field: None for field in DETAIL_FIELDS}
+    method = None
+    function_signature = None
+    value_found = False
+    
+    for element in root.iter('span', 'div'):
+        if element.tag == 'span':
+            if method is None and _has_class(element, 'u-label'):
+                method = clean_text(element.text_content()) or None
+            continue
         
-        rows = soup.find_all('div', class_='row')
+        if element.get('id') == 'inputdata' and function_signature is None:
+            func_match = FUNCTION_PATTERN.search(element.text_content())
+            if func_match:
+                function_signature = clean_text(func_match.group(1)) or None
         
-        for row in rows:
-            text = row.get_text()
-            
-            if 'From:' in text:
-                addr_link = row.find('a', href=re.compile(r'/address/0x'))
-                if addr_link:
-                    from_address = addr_link.get('href').split('/address/')[-1].lower()
-            
-            if 'To:' in text:
-                addr_link = row.find('a', href=re.compile(r'/address/0x'))
-                if addr_link:
-                    to_address = addr_link.get('href').split('/address/')[-1].lower()
+        if not _has_class(element, 'row'):
+            continue
         
-        # 방향 판단
-        if to_address and target_address in to_address:
-            return 'IN'
-        elif from_address and target_address in from_address:
-            return 'OUT'
+        # 중첩된 row도 문서 순서대로 확인 (뒤에 나온 행 값이 우선)
+        text = element.text_content()
+        for marker, side in (('From:', 'from'), ('To:', 'to')):
+            if marker in text:
+                result[f'{side}_label'] = _row_label(element) or result[f'{side}_label']
+                result[f'{side}_address'] = _row_address(element) or result[f'{side}_address']
         
-        return None
+        if not value_found and 'Value:' in text:
+            amount = next((span for span in element.iter('span') if _has_class(span, 'u-label--value')), None)
+            if amount is not None:
+                value_found = True
+                result['amount_text'] = clean_text(amount.text_content())
+                usd_match = USD_PATTERN.search(text)
+                result['amount_usd'] = usd_match.group(1).replace(',', '') if usd_match else None
     
-    except Exception as e:
-        print(f"⚠️ Direction 추출 실패: {e}")
+    result['input_data'] = method or function_signature
+    result['direction'] = get_direction(result, target_address)
+    return result
+
+
+def get_direction(details: Dict, target_address: Optional[str]) -> Optional[str]:
+    """거래 방향 (IN/OUT, 판단 불가 시 None)"""
+    if not target_address:
         return None
+    target_address = target_address.lower()
+    if details.get('to_address') and target_address in details['to_address']:
+        return 'IN'
+    if details.get('from_address') and target_address in details['from_address']:
+        return 'OUT'
+    return None
 
 
-def extract_value_and_usd(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+class TxDetailCache:
     """
-    거래 금액과 USD 가치 추출
+    tx_hash별 스크래핑 결과 캐시 (SQLite bscscan_tx_details 테이블)
     
-    Returns:
-    --------
-    Tuple[Optional[str], Optional[str]] : (amount_text, amount_usd)
+    파싱에 성공한 결과만 저장하므로 실패한 거래는 다음 실행에서 다시 스크래핑
     """
-    try:
-        # Value 섹션 찾기
-        rows = soup.find_all('div', class_='row')
-        
-        for row in rows:
-            if 'Value:' in row.get_text():
-                # BNB 금액
-                amount_span = row.find('span', class_='u-label--value')
-                if amount_span:
-                    amount_text = clean_text(amount_span.get_text())
-                    
-                    # USD 가치 (tooltip 또는 별도 표시)
-                    usd_match = re.search(r'\$([0-9,]+\.[0-9]+)', row.get_text())
-                    if usd_match:
-                        amount_usd = usd_match.group(1).replace(',', '')
-                        return amount_text, amount_usd
-                    
-                    return amount_text, None
-        
-        return None, None
     
-    except Exception as e:
-        print(f"⚠️ Value/USD 추출 실패: {e}")
-        return None, None
+    TABLE = 'bscscan_tx_details'
+    
+    def __init__(self, db_path: Union[str, Path] = CACHE_DB_PATH):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        columns = ', '.join(f"{field} TEXT" for field in DETAIL_FIELDS)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} "
+                f"(tx_hash TEXT PRIMARY KEY, {columns}, scraped_at TEXT NOT NULL)"
+            )
+    
+    def get_many(self, tx_hashes: List[str]) -> Dict[str, Dict]:
+        """캐시된 결과 {tx_hash: 상세 정보}"""
+        found = {}
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            for i in range(0, len(tx_hashes), 500):
+                chunk = tx_hashes[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM {self.TABLE} WHERE tx_hash IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    found[row['tx_hash']] = {field: row[field] for field in DETAIL_FIELDS}
+        finally:
+            conn.close()
+        return found
+    
+    def put(self, tx_hash: str, details: Dict) -> bool:
+        """파싱된 필드가 하나라도 있을 때만 저장 (빈 결과 / 차단 페이지는 캐시하지 않음), 저장 여부 반환"""
+        if not any(details.get(field) for field in DETAIL_FIELDS):
+            return False
+        params = [tx_hash] + [details.get(field) for field in DETAIL_FIELDS] + [datetime.now(timezone.utc).isoformat()]
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} VALUES ({', '.join('?' * len(params))})", params
+            )
+        return True
+
+
+def fetch_transaction_details(
+    tx_hash: str,
+    target_address: Optional[str] = None,
+    client: Optional[HttpClient] = None,
+    base_url: str = BSCSCAN_BASE_URL
+) -> Dict:
+    """
+    거래 상세 페이지 요청 + 파싱 (실패 시 예외)
+    
+    Raises:
+    -------
+    requests.exceptions.RequestException : 재시도 후에도 요청 실패
+    """
+    client = client or get_client()
+    response = client.get(
+        f"{base_url}/tx/{tx_hash}", headers=get_headers(), timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES - 1
+    )
+    response.raise_for_status()
+    return parse_transaction_page(response.content, target_address)
 
 
 def scrape_transaction_details(
     tx_hash: str,
     target_address: Optional[str] = None,
-    session: Optional[requests.Session] = None
+    client: Optional[HttpClient] = None,
+    base_url: str = BSCSCAN_BASE_URL
 ) -> Dict:
     """
     특정 거래의 상세 정보를 웹 스크래핑으로 수집
@@ -222,173 +235,145 @@ def scrape_transaction_details(
         거래 해시
     target_address : Optional[str]
         Direction 판단을 위한 대상 주소
-    session : Optional[requests.Session]
-        재사용할 requests 세션
+    client : Optional[HttpClient]
+        HTTP 클라이언트 (None이면 공용 클라이언트, 429 / 5xx는 클라이언트가 지터 백오프 후 재시도)
+    base_url : str
+        BscScan 주소
     
     Returns:
     --------
-    Dict : 추가 정보 딕셔너리
+    Dict : 추가 정보 딕셔너리 (실패 시 모든 값 None)
         {
             'input_data': str,  # Method
             'from_label': str,
             'to_label': str,
+            'from_address': str,
+            'to_address': str,
             'direction': str,  # IN/OUT
             'amount_text': str,
             'amount_usd': str
         }
     """
-    url = f"{BSCSCAN_BASE_URL}/tx/{tx_hash}"
+    try:
+        return fetch_transaction_details(tx_hash, target_address, client=client, base_url=base_url)
     
-    # 세션이 없으면 새로 생성
-    if session is None:
-        session = requests.Session()
-        close_session = True
-    else:
-        close_session = False
-    
-    result = {
-        'input_data': None,
-        'from_label': None,
-        'to_label': None,
-        'direction': None,
-        'amount_text': None,
-        'amount_usd': None
-    }
+    except requests.exceptions.RequestException as e:
+        print(f"❌ 거래 {tx_hash[:10]}... 스크래핑 최종 실패 ({MAX_RETRIES}회 시도): {e}")
     
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = session.get(url, headers=get_headers(), timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            # Rate limiting 체크
-            if response.status_code == 429:
-                wait_time = (attempt + 1) * RETRY_DELAY
-                print(f"⚠️ Rate limit 도달. {wait_time}초 대기...")
-                time.sleep(wait_time)
-                continue
-            
-            # HTML 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 정보 추출
-            result['input_data'] = extract_method(soup)
-            result['from_label'], result['to_label'] = extract_labels(soup)
-            
-            if target_address:
-                result['direction'] = extract_direction(soup, target_address)
-            
-            result['amount_text'], result['amount_usd'] = extract_value_and_usd(soup)
-            
-            # 성공
-            return result
-        
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️ 스크래핑 실패 (시도 {attempt + 1}/{MAX_RETRIES}): {e}")
-            
-            if attempt < MAX_RETRIES - 1:
-                wait_time = (attempt + 1) * RETRY_DELAY
-                time.sleep(wait_time)
-            else:
-                print(f"❌ 거래 {tx_hash[:10]}... 스크래핑 최종 실패")
-        
-        except Exception as e:
-            print(f"❌ 예상치 못한 오류: {e}")
-            break
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류: {e}")
     
-    if close_session:
-        session.close()
+    return dict({field: None for field in DETAIL_FIELDS}, direction=None)
+
+
+def merge_details(tx: Dict, details: Dict) -> Dict:
+    """거래에 스크래핑 정보 병합 (Method, Label, USD 가치)"""
+    enriched_tx = tx.copy()
     
-    return result
+    for field in ('input_data', 'from_label', 'to_label'):
+        if details.get(field):
+            enriched_tx[field] = details[field]
+    
+    if details.get('amount_usd'):
+        try:
+            enriched_tx['amount_usd'] = float(details['amount_usd'])
+        except (TypeError, ValueError):
+            pass
+    
+    return enriched_tx
 
 
 def scrape_multiple_transactions(
     transactions: list,
-    delay: float = RETRY_DELAY
+    delay: float = RETRY_DELAY,
+    max_workers: int = MAX_WORKERS,
+    cache: Optional[TxDetailCache] = None,
+    client: Optional[HttpClient] = None,
+    base_url: str = BSCSCAN_BASE_URL
 ) -> list:
     """
-    여러 거래의 상세 정보를 순차적으로 스크래핑
+    여러 거래의 상세 정보를 동시에 스크래핑
     
     Parameters:
     -----------
     transactions : list
         거래 리스트 (각 항목은 'tx_hash' 필드 필요)
     delay : float
-        요청 간 대기 시간 (초)
+        같은 호스트 요청 간 최소 간격 (초, 클라이언트의 호스트 호출 한도로 등록)
+    max_workers : int
+        동시 요청 수 (응답 대기 시간을 겹치기 위한 상한, 요청 시작 간격은 delay가 보장)
+    cache : Optional[TxDetailCache]
+        tx_hash별 결과 캐시 (캐시에 있는 거래는 요청하지 않음)
+    client : Optional[HttpClient]
+        HTTP 클라이언트 (None이면 공용 클라이언트)
+    base_url : str
+        BscScan 주소
     
     Returns:
     --------
-    list : 추가 정보가 포함된 거래 리스트
+    list : 추가 정보가 포함된 거래 리스트 (입력 순서 유지, 길이는 입력과 같음)
+        실패한 거래 / 중단(Ctrl+C)으로 처리하지 못한 거래는 원본 그대로 포함
     """
-    print(f"\n🌐 웹 스크래핑 시작: {len(transactions)}건")
-    print(f"예상 소요 시간: 약 {len(transactions) * delay / 60:.1f}분")
+    client = client or get_client()
+    
+    # 요청 간격은 클라이언트의 호스트 한도가 보장 (keep-alive 연결 재사용)
+    if delay > 0:
+        client.rate_limits.register(urlparse(base_url).hostname, 1.0 / delay, 1)
+    
+    tx_hashes = [tx['tx_hash'] for tx in transactions if tx.get('tx_hash')]
+    cached = cache.get_many(tx_hashes) if cache else {}
+    pending = [i for i, tx in enumerate(transactions) if tx.get('tx_hash') and tx['tx_hash'] not in cached]
+    
+    print(f"\n🌐 웹 스크래핑 시작: {len(transactions)}건 (캐시 {len(cached)}건, 요청 {len(pending)}건, 동시 {max_workers})")
+    print(f"예상 소요 시간: 약 {len(pending) * delay / 60:.1f}분")
     
-    # 재사용할 세션 생성
-    session = requests.Session()
+    results: Dict[int, Dict] = {}
+    for i, tx in enumerate(transactions):
+        if not tx.get('tx_hash'):
+            print(f"⚠️ [{i + 1}/{len(transactions)}] tx_hash 없음, 건너뜀")
+            results[i] = tx
+        elif tx['tx_hash'] in cached:
+            results[i] = merge_details(tx, cached[tx['tx_hash']])
     
-    enriched_transactions = []
-    success_count = 0
+    success_count = len(cached)
+    failed_count = 0
     
+    def scrape(tx: Dict) -> Dict:
+        target_address = tx.get('from_address') or tx.get('to_address')
+        details = fetch_transaction_details(tx['tx_hash'], target_address, client=client, base_url=base_url)
+        if cache:
+            cache.put(tx['tx_hash'], details)
+        return details
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
     try:
-        for i, tx in enumerate(transactions, 1):
-            tx_hash = tx.get('tx_hash')
-            target_address = tx.get('from_address') or tx.get('to_address')
-            
-            if not tx_hash:
-                print(f"⚠️ [{i}/{len(transactions)}] tx_hash 없음, 건너뜀")
-                enriched_transactions.append(tx)
-                continue
-            
-            print(f"[{i}/{len(transactions)}] {tx_hash[:10]}... 스크래핑 중...")
-            
-            # 스크래핑 실행
-            additional_info = scrape_transaction_details(
-                tx_hash, 
-                target_address=target_address,
-                session=session
-            )
-            
-            # 기존 정보에 추가 정보 병합
-            enriched_tx = tx.copy()
-            
-            # input_data 업데이트 (Method)
-            if additional_info.get('input_data'):
-                enriched_tx['input_data'] = additional_info['input_data']
-            
-            # Label 업데이트
-            if additional_info.get('from_label'):
-                enriched_tx['from_label'] = additional_info['from_label']
-            
-            if additional_info.get('to_label'):
-                enriched_tx['to_label'] = additional_info['to_label']
-            
-            # USD 가치 업데이트
-            if additional_info.get('amount_usd'):
-                try:
-                    enriched_tx['amount_usd'] = float(additional_info['amount_usd'])
-                except:
-                    pass
-            
-            enriched_transactions.append(enriched_tx)
-            success_count += 1
+        futures = {executor.submit(scrape, transactions[i]): i for i in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            tx = transactions[i]
+            try:
+                results[i] = merge_details(tx, future.result())
+                success_count += 1
+            except Exception as e:
+                print(f"❌ 거래 {tx['tx_hash'][:10]}... 스크래핑 실패: {e}")
+                results[i] = tx
+                failed_count += 1
             
             # 진행 상황
-            if i % 10 == 0:
-                print(f"  진행률: {i}/{len(transactions)} ({i/len(transactions)*100:.1f}%)")
-                print(f"  성공: {success_count}건")
-            
-            # Rate limiting
-            time.sleep(delay)
+            if done % 10 == 0:
+                print(f"  진행률: {done}/{len(pending)} ({done / len(pending) * 100:.1f}%)")
+                print(f"  성공: {success_count}건, 실패: {failed_count}건")
     
     except KeyboardInterrupt:
         print("\n⚠️ 사용자에 의해 중단되었습니다.")
-        print(f"처리 완료: {len(enriched_transactions)}/{len(transactions)}건")
+        print(f"처리 완료: {len(results)}/{len(transactions)}건 (나머지 {len(transactions) - len(results)}건은 원본 그대로 반환)")
     
     finally:
-        session.close()
+        executor.shutdown(wait=True, cancel_futures=True)
     
     print(f"\n✅ 웹 스크래핑 완료: {success_count}/{len(transactions)}건 성공")
     
-    return enriched_transactions
+    return [results.get(i, tx) for i, tx in enumerate(transactions)]
 
 
 def main():
@@ -5,14 +5,23 @@ ETHEREUM, BNB(BSC), USDC, XRP, BITCOIN, DOGECOIN, LITECOIN 거래 기록 수집
 """
 
 import os
-import time
+import sys
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
-import requests
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# 공용 HTTP 클라이언트 (keep-alive 연결 재사용 + 호스트별 호출 한도 + 재시도)
+from src import http_client
+from src.http_client import RATE_LIMITS
+
+# 공용 레지스트리에 없는 호스트는 기존 주소 간 간격(0.25초) 유지
+RATE_LIMITS.register('s1.ripple.com', 4.0, 1)
+RATE_LIMITS.register('blockstream.info', 4.0, 1)
+
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
@@ -77,7 +86,7 @@ def fetch_ethereum_transactions(address: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_client.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -135,7 +144,7 @@ def fetch_bsc_transactions(address: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_client.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -192,7 +201,7 @@ def fetch_usdc_transactions(address: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_client.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -245,7 +254,7 @@ def fetch_xrp_transactions(address: str) -> List[Dict]:
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=30)
+        response = http_client.post(url, json=payload, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -294,7 +303,7 @@ def fetch_bitcoin_transactions(address: str) -> List[Dict]:
     url = f"https://blockstream.info/api/address/{address}/txs"
     
     try:
-        response = requests.get(url, timeout=30)
+        response = http_client.get(url, timeout=30)
         response.raise_for_status()
         txs = response.json()
         
@@ -345,7 +354,7 @@ def fetch_dogecoin_transactions(address: str) -> List[Dict]:
         params['token'] = BLOCKCYPHER_TOKEN
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_client.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -393,7 +402,7 @@ def fetch_litecoin_transactions(address: str) -> List[Dict]:
         params['token'] = BLOCKCYPHER_TOKEN
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_client.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -494,12 +503,7 @@ def collect_coin_transactions(coin_symbol: str, chain_type: str, fetch_func) ->
         txs = fetch_func(address)
         all_transactions.extend(txs)
         print(f"    ✅ {len(txs)}건 수집 (2025년 1~10월)")
-        
-        # Rate limit 고려 (Etherscan: 5/sec, BlockCypher: 200/hour)
-        if coin_symbol in ['LITECOIN', 'DOGECOIN']:
-            time.sleep(18)  # BlockCypher: 200/hour = 1req/18sec
-        else:
-            time.sleep(0.25)  # Etherscan: 5/sec
+        # 호출 간격은 공용 클라이언트의 호스트별 한도가 처리 (Etherscan: 5/sec, BlockCypher: 200/hour)
     
     # 저장
     print(f"\n  💾 whale_transactions에 저장 중...")
@@ -536,9 +540,6 @@ def main():
     for coin_symbol, chain_type, fetch_func in COINS_CONFIG:
         result = collect_coin_transactions(coin_symbol, chain_type, fetch_func)
         results.append(result)
-        
-        # 다음 코인 처리 전 대기 (API rate limit 고려)
-        time.sleep(2)
     
     # 최종 결과
     print("\n" + "="*80)
@@ -554,6 +555,7 @@ def main():
         total_transactions += result['transactions']
     
     print(f"\n  {'총계':12} : {total_addresses:3}개 주소, {total_transactions:5}건 거래")
+    print(f"\n🌐 API 요청 지표\n{http_client.REQUEST_METRICS.format_summary()}")
     print(f"\n⏰ 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80)
 
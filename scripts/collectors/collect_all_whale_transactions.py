@@ -23,13 +23,8 @@ sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
 # 멀티체인 수집기 import
-from src.collectors.multi_chain_collector import (
-    fetch_etherscan_transactions,
-    fetch_sochain_transactions,
-    fetch_subscan_transactions,
-    fetch_solscan_transactions,
-    fetch_vtc_transactions
-)
+from src.collectors.ingestion_state import SupabaseIngestionState
+from src.collectors.multi_chain_collector import MultiChainCollector
 
 # API 키 로드
 ETHERSCAN_API_KEY = os.getenv('ETHERSCAN_API_KEY', '')
@@ -114,7 +109,7 @@ def get_all_whale_addresses(supabase) -> Dict[str, Set[str]]:
         return {}
 
 
-def collect_all_transactions(supabase, whale_addresses: Dict[str, Set[str]]) -> List[Dict]:
+def collect_all_transactions(supabase, whale_addresses: Dict[str, Set[str]], collector: MultiChainCollector) -> List[Dict]:
     """
     모든 블록체인에서 거래 기록 수집
     
@@ -124,6 +119,8 @@ def collect_all_transactions(supabase, whale_addresses: Dict[str, Set[str]]) ->
         Supabase 클라이언트
     whale_addresses : Dict[str, Set[str]]
         체인별 고래 지갑 주소 Set
+    collector : MultiChainCollector
+        멀티체인 수집기 (UTXO 체인은 워터마크 이후 거래만 수집)
     
     Returns:
     --------
@@ -135,68 +132,54 @@ def collect_all_transactions(supabase, whale_addresses: Dict[str, Set[str]]) ->
     print("📊 블록체인별 거래 기록 수집 시작")
     print("=" * 70)
     
-    # 1. Etherscan API (ETH, BNB, LINK)
+    # 체인별 수집 대상 (API 키가 없는 제공자는 건너뜀)
+    targets = {}
     if ETHERSCAN_API_KEY:
-        # Ethereum
-        if 'ethereum' in whale_addresses:
-            addresses = list(whale_addresses['ethereum'])
-            print(f"\n[Ethereum] {len(addresses)}개 주소의 거래 기록 수집 중...")
-            eth_txs = fetch_etherscan_transactions(addresses, 'ethereum', ETHERSCAN_API_KEY)
-            all_transactions.extend(eth_txs)
-            print(f"   ✅ {len(eth_txs)}건 수집 완료")
-        
-        # BSC
-        if 'bsc' in whale_addresses:
-            addresses = list(whale_addresses['bsc'])
-            print(f"\n[BSC] {len(addresses)}개 주소의 거래 기록 수집 중...")
-            bsc_txs = fetch_etherscan_transactions(addresses, 'bsc', ETHERSCAN_API_KEY)
-            all_transactions.extend(bsc_txs)
-            print(f"   ✅ {len(bsc_txs)}건 수집 완료")
+        for chain in ['ethereum', 'bsc']:
+            if chain in whale_addresses:
+                targets[chain] = list(whale_addresses[chain])
     else:
         print("\n⚠️ ETHERSCAN_API_KEY가 설정되지 않아 ETH, BNB, LINK 수집을 건너뜁니다.")
     
-    # 2. SoChain API (BTC, LTC, DOGE)
     if SOCHAIN_API_KEY:
-        for coin in ['BTC', 'LTC', 'DOGE']:
-            chain_key = coin.lower()
-            if chain_key in whale_addresses:
-                addresses = list(whale_addresses[chain_key])
-                print(f"\n[{coin}] {len(addresses)}개 주소의 거래 기록 수집 중...")
-                coin_txs = fetch_sochain_transactions(addresses, coin, SOCHAIN_API_KEY)
-                all_transactions.extend(coin_txs)
-                print(f"   ✅ {len(coin_txs)}건 수집 완료")
+        for chain in ['btc', 'ltc', 'doge']:
+            if chain in whale_addresses:
+                targets[chain] = list(whale_addresses[chain])
     else:
         print("\n⚠️ SOCHAIN_API_KEY가 설정되지 않아 BTC, LTC, DOGE 수집을 건너뜁니다.")
     
-    # 3. Subscan API (DOT)
     if SUBSCAN_API_KEY:
         if 'polkadot' in whale_addresses:
-            addresses = list(whale_addresses['polkadot'])
-            print(f"\n[DOT] {len(addresses)}개 주소의 거래 기록 수집 중...")
-            dot_txs = fetch_subscan_transactions(addresses, SUBSCAN_API_KEY)
-            all_transactions.extend(dot_txs)
-            print(f"   ✅ {len(dot_txs)}건 수집 완료")
+            targets['polkadot'] = list(whale_addresses['polkadot'])
     else:
         print("\n⚠️ SUBSCAN_API_KEY가 설정되지 않아 DOT 수집을 건너뜁니다.")
     
-    # 4. Solscan API (SOL)
     if SOLSCAN_API_KEY:
         if 'solana' in whale_addresses:
-            addresses = list(whale_addresses['solana'])
-            print(f"\n[SOL] {len(addresses)}개 주소의 거래 기록 수집 중...")
-            sol_txs = fetch_solscan_transactions(addresses, SOLSCAN_API_KEY)
-            all_transactions.extend(sol_txs)
-            print(f"   ✅ {len(sol_txs)}건 수집 완료")
+            targets['solana'] = list(whale_addresses['solana'])
     else:
         print("\n⚠️ SOLSCAN_API_KEY가 설정되지 않아 SOL 수집을 건너뜁니다.")
     
-    # 5. VTC (공개 API)
+    # VTC (공개 API)
     if 'vtc' in whale_addresses:
-        addresses = list(whale_addresses['vtc'])
-        print(f"\n[VTC] {len(addresses)}개 주소의 거래 기록 수집 중...")
-        vtc_txs = fetch_vtc_transactions(addresses)
-        all_transactions.extend(vtc_txs)
-        print(f"   ✅ {len(vtc_txs)}건 수집 완료")
+        targets['vtc'] = list(whale_addresses['vtc'])
+    
+    for chain, addresses in targets.items():
+        print(f"\n[{chain}] {len(addresses)}개 주소 수집 대기")
+    
+    # 모든 체인 동시 수집 (제공자별 호출 한도 안에서)
+    start = time.time()
+    results = collector.collect(targets)
+    stats = collector.get_stats()
+    
+    for chain, transactions in results.items():
+        all_transactions.extend(transactions)
+        print(f"   ✅ [{chain}] {len(transactions)}건 수집 완료")
+    for provider, provider_stats in stats.items():
+        if provider_stats['requests']:
+            print(f"   - {provider}: 요청 {provider_stats['requests']}회, 재시도 {provider_stats['retries']}회, "
+                  f"429 {provider_stats['throttled']}회, 실패 {provider_stats['errors']}회")
+    print(f"   ⏱️ 수집 시간 {time.time() - start:.1f}초")
     
     print(f"\n✅ 총 {len(all_transactions)}건의 거래 기록 수집 완료")
     
@@ -364,25 +347,32 @@ def main():
             print("❌ 고래 지갑 주소를 찾을 수 없습니다.")
             return
         
-        # 2. 모든 블록체인에서 거래 기록 수집
-        print("\n[2단계] 블록체인별 거래 기록 수집 중...")
-        all_transactions = collect_all_transactions(supabase, whale_addresses)
-        
-        if not all_transactions:
-            print("❌ 수집된 거래 기록이 없습니다.")
-            return
-        
-        # 3. whale_address로 필터링
-        print("\n[3단계] 고래 지갑 주소로 필터링 중...")
-        filtered_transactions = filter_whale_transactions(all_transactions, whale_addresses)
-        
-        if not filtered_transactions:
-            print("❌ 필터링된 거래 기록이 없습니다.")
-            return
-        
-        # 4. whale_transactions에 저장
-        print("\n[4단계] whale_transactions 테이블에 저장 중...")
-        saved_count = save_to_whale_transactions(supabase, filtered_transactions)
+        with MultiChainCollector(state=SupabaseIngestionState(supabase)) as collector:
+            # 2. 모든 블록체인에서 거래 기록 수집
+            print("\n[2단계] 블록체인별 거래 기록 수집 중...")
+            all_transactions = collect_all_transactions(supabase, whale_addresses, collector)
+            
+            if not all_transactions:
+                print("❌ 수집된 거래 기록이 없습니다.")
+                return
+            
+            # 3. whale_address로 필터링
+            print("\n[3단계] 고래 지갑 주소로 필터링 중...")
+            filtered_transactions = filter_whale_transactions(all_transactions, whale_addresses)
+            
+            if not filtered_transactions:
+                print("❌ 필터링된 거래 기록이 없습니다.")
+                return
+            
+            # 4. whale_transactions에 저장
+            print("\n[4단계] whale_transactions 테이블에 저장 중...")
+            saved_count = save_to_whale_transactions(supabase, filtered_transactions)
+            
+            # 모두 저장된 경우에만 UTXO 주소 워터마크 전진 (일부 실패 시 다음 실행에서 같은 구간 재수집)
+            if saved_count == len(filtered_transactions):
+                print(f"✅ 워터마크 전진: {collector.commit_watermarks()}개 주소")
+            else:
+                print(f"⚠️ 일부 저장 실패 ({saved_count}/{len(filtered_transactions)}): 워터마크 유지")
         
         print("\n" + "=" * 70)
         print("✅ 작업 완료")
@@ -7,7 +7,7 @@ whale_address에 있는 고래 지갑 주소의 거래 기록만 whale_transacti
 import os
 import sys
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict, Any
 from dotenv import load_dotenv
@@ -17,6 +17,9 @@ import pandas as pd
 
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.collectors.price_history_writer import upsert_price_history
 
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
@@ -100,13 +103,13 @@ def fetch_binance_klines(symbol: str, interval: str = '1h', limit: int = 500) ->
         klines = []
         for k in data:
             klines.append({
-                'open_time': datetime.fromtimestamp(k[0] / 1000),
+                'open_time': datetime.fromtimestamp(k[0] / 1000, tz=timezone.utc),
                 'open_price': float(k[1]),
                 'high_price': float(k[2]),
                 'low_price': float(k[3]),
                 'close_price': float(k[4]),
                 'volume': float(k[5]),
-                'close_time': datetime.fromtimestamp(k[6] / 1000),
+                'close_time': datetime.fromtimestamp(k[6] / 1000, tz=timezone.utc),
                 'quote_volume': float(k[7]),
                 'trade_count': int(k[8]),
                 'taker_buy_volume': float(k[9]),
@@ -119,54 +122,15 @@ def fetch_binance_klines(symbol: str, interval: str = '1h', limit: int = 500) ->
         return []
 
 def save_to_price_history(supabase, crypto_id: str, klines: List[Dict], symbol: str) -> int:
-    """price_history 테이블에 저장"""
-    records = []
-    
-    for kline in klines:
-        record = {
-            'crypto_id': crypto_id,
-            'timestamp': kline['open_time'].isoformat(),
-            'open_price': str(kline['open_price']),
-            'high_price': str(kline['high_price']),
-            'low_price': str(kline['low_price']),
-            'close_price': str(kline['close_price']),
-            'volume': str(kline['volume']),
-            'quote_volume': str(kline['quote_volume']),
-            'trade_count': kline['trade_count'],
-            'taker_buy_volume': str(kline['taker_buy_volume']),
-            'taker_buy_quote_volume': str(kline['taker_buy_quote_volume']),
-            'data_source': 'binance',
-            'raw_data': {
-                'open_time': kline['open_time'].isoformat(),
-                'close_time': kline['close_time'].isoformat(),
-            }
-        }
-        records.append(record)
-    
-    if not records:
+    """price_history 테이블에 저장 ((crypto_id, timestamp, data_source) 기준 대량 upsert)"""
+    if not klines:
         return 0
-    
-    # 배치로 저장 (중복 체크)
-    saved_count = 0
-    batch_size = 100
-    
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]
-        try:
-            # upsert 사용 (id가 있으면 업데이트, 없으면 추가)
-            response = supabase.table('price_history').upsert(batch).execute()
-            saved_count += len(batch)
-        except Exception as e:
-            print(f"⚠️ price_history 저장 실패 (배치 {i//batch_size + 1}): {e}")
-            # 개별 저장 시도
-            for record in batch:
-                try:
-                    supabase.table('price_history').upsert([record]).execute()
-                    saved_count += 1
-                except:
-                    pass
-    
-    return saved_count
+
+    progress = upsert_price_history(supabase, crypto_id, klines, data_source='binance')
+    if progress['rows_failed']:
+        print(f"⚠️ price_history 저장 실패 {progress['rows_failed']}건 ({symbol})")
+    print(f"   💾 {progress['rows_written']:,}건 저장 ({progress['rows_per_sec']:,.0f}건/초)")
+    return progress['rows_written']
 
 def collect_binance_trades_for_coins(supabase):
     """9개 코인에 대해 바이낸스 거래 기록 수집"""
@@ -17,9 +17,16 @@ import requests
 
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.collectors.ingestion_state import SupabaseIngestionState
 
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
+# ingestion_state 키: ('blockstream', 주소, 'whale_transactions')
+STATE_SOURCE = 'blockstream'
+STATE_STREAM = 'whale_transactions'
+
 # Blockstream API 기본 URL (무료, 제한 없음)
 BLOCKSTREAM_API_BASE = "https://blockstream.info/api"
 
@@ -54,7 +61,7 @@ def get_btc_whale_addresses(supabase) -> List[Dict]:
         print(f"❌ BTC 고래 주소 조회 실패: {e}")
         return []
 
-def fetch_bitcoin_transactions(address: str) -> List[Dict]:
+def fetch_bitcoin_transactions(address: str, min_block: Optional[int] = None) -> List[Dict]:
     """
     Bitcoin 거래 수집 (Blockstream API)
     
@@ -62,6 +69,8 @@ def fetch_bitcoin_transactions(address: str) -> List[Dict]:
     -----------
     address : str
         Bitcoin 주소
+    min_block : Optional[int]
+        이 블록 이하 거래는 이미 저장됨 (최신순이므로 도달하면 조회 중단)
     
     Returns:
     --------
@@ -94,6 +103,9 @@ def fetch_bitcoin_transactions(address: str) -> List[Dict]:
                     if not block_time:
                         continue
                     
+                    if min_block is not None and tx.get('status', {}).get('block_height', 0) <= min_block:
+                        return all_transactions
+                    
                     if block_time < START_TIMESTAMP or block_time > END_TIMESTAMP:
                         # 날짜 범위를 벗어나면 더 이상 조회하지 않음 (최신순이므로)
                         if block_time < START_TIMESTAMP:
@@ -190,8 +202,8 @@ def save_to_whale_transactions(supabase, transactions: List[Dict]) -> int:
     
     return saved_count
 
-def collect_btc_whale_transactions(supabase, addresses=None):
-    """BTC 고래 거래 데이터 수집"""
+def collect_btc_whale_transactions(supabase, addresses=None, state=None):
+    """BTC 고래 거래 데이터 수집 (state가 있으면 주소별 워터마크 이후 거래만 조회, 전부 저장되면 전진)"""
     print("=" * 70)
     print("🐋 BTC 고래 거래 데이터 수집")
     print("=" * 70)
@@ -223,10 +235,13 @@ def collect_btc_whale_transactions(supabase, addresses=None):
         
         # 거래 조회
         try:
-            transactions = fetch_bitcoin_transactions(address)
+            min_block = state.last_block(STATE_SOURCE, address, STATE_STREAM) if state is not None else None
+            if min_block is not None:
+                print(f"    워터마크: 블록 {min_block:,} 이후만 조회")
+            transactions = fetch_bitcoin_transactions(address, min_block=min_block)
             
             if not transactions:
-                print(f"    ⚠️ 거래 기록 없음")
+                print(f"    ⚠️ 새 거래 기록 없음")
                 continue
             
             print(f"    ✅ {len(transactions)}건의 거래 조회 완료")
@@ -237,6 +252,14 @@ def collect_btc_whale_transactions(supabase, addresses=None):
             total_saved += saved
             print(f"    💾 {saved}건 저장 완료")
             
+            # 모두 저장된 경우에만 워터마크 전진 (일부 실패 시 다음 실행에서 같은 구간 재조회)
+            if state is not None and saved == len(transactions):
+                state.advance(
+                    STATE_SOURCE, address, STATE_STREAM,
+                    last_block=max(tx['block_number'] for tx in transactions),
+                    last_timestamp=max(tx['block_timestamp'] for tx in transactions)
+                )
+            
         except Exception as e:
             print(f"    ❌ 오류 발생: {e}")
             continue
@@ -255,93 +278,29 @@ def collect_btc_whale_transactions(supabase, addresses=None):
     
     return total_saved
 
-def load_checkpoint():
-    """체크포인트 로드"""
-    checkpoint_file = PROJECT_ROOT / 'collection_checkpoint.json'
-    if not checkpoint_file.exists():
-        return None
-    
-    try:
-        import json
-        with open(checkpoint_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('btc_whale_transactions')
-    except Exception as e:
-        print(f"⚠️ 체크포인트 로드 실패: {e}")
-        return None
-
-def get_addresses_to_collect(supabase, checkpoint=None):
-    """수집할 주소 목록 반환 (체크포인트 기반)"""
-    addresses = get_btc_whale_addresses(supabase)
-    
-    if not checkpoint:
-        return addresses
-    
-    # 체크포인트에서 완료되지 않은 주소만 반환
-    addresses_to_collect = []
-    for addr_info in addresses:
-        address = addr_info.get('address')
-        if not address:
-            continue
-        
-        addr_checkpoint = checkpoint.get('addresses', {}).get(address, {})
-        status = addr_checkpoint.get('status', 'not_started')
-        
-        # 완료되지 않은 주소만 포함
-        if status in ['not_started', 'in_progress', 'error']:
-            addresses_to_collect.append(addr_info)
-    
-    return addresses_to_collect
-
 def main():
     """메인 함수"""
     import argparse
     
     parser = argparse.ArgumentParser(description='BTC 고래 거래 데이터 수집')
-    parser.add_argument('--resume', action='store_true', help='체크포인트에서 재개')
+    parser.add_argument('--resume', action='store_true', help='워터마크에서 재개 (기본 동작, 이전 실행 스크립트 호환용)')
     args = parser.parse_args()
     
     try:
         supabase = get_supabase_client()
+        state = SupabaseIngestionState(supabase)
         
-        checkpoint = None
-        if args.resume:
-            print("=" * 70)
-            print("🔄 체크포인트에서 재개")
-            print("=" * 70)
-            checkpoint = load_checkpoint()
-            if checkpoint:
-                print("✅ 체크포인트 로드 완료")
-            else:
-                print("⚠️ 체크포인트를 찾을 수 없습니다. 처음부터 시작합니다.")
-        
-        # 체크포인트 기반으로 수집할 주소 결정
-        if checkpoint:
-            addresses = get_addresses_to_collect(supabase, checkpoint)
-            print(f"📋 수집 대상 주소: {len(addresses)}개")
-        else:
-            addresses = get_btc_whale_addresses(supabase)
-        
-        # BTC 고래 거래 데이터 수집
-        total_saved = collect_btc_whale_transactions(supabase, addresses)
+        # BTC 고래 거래 데이터 수집 (주소별 ingestion_state 워터마크 이후만)
+        addresses = get_btc_whale_addresses(supabase)
+        total_saved = collect_btc_whale_transactions(supabase, addresses, state=state)
         
         print("\n" + "=" * 70)
         print("✅ 작업 완료")
         print("=" * 70)
         
-        # 체크포인트 저장
-        print("\n💾 체크포인트 저장 중...")
-        from scripts.save_collection_checkpoint import save_checkpoint
-        save_checkpoint()
-        
     except KeyboardInterrupt:
+        # 저장이 끝난 주소까지만 워터마크가 전진해 있으므로 다시 실행하면 이어서 수집
         print("\n\n⚠️  사용자에 의해 중단되었습니다.")
-        print("💾 체크포인트 저장 중...")
-        try:
-            from scripts.save_collection_checkpoint import save_checkpoint
-            save_checkpoint()
-        except:
-            pass
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
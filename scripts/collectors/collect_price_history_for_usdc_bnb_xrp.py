@@ -6,7 +6,7 @@ USDC, BNB, XRP 3개 코인의 2025년 5월, 6월 K-line 데이터를 수집하
 import os
 import sys
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict
 from dotenv import load_dotenv
@@ -15,6 +15,9 @@ import requests
 
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.collectors.price_history_writer import upsert_price_history
 
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
@@ -105,7 +108,7 @@ def fetch_binance_klines_by_date_range(
             
             # 바이낸스 K-line 형식을 딕셔너리로 변환
             for k in data:
-                kline_time = datetime.fromtimestamp(k[0] / 1000)
+                kline_time = datetime.fromtimestamp(k[0] / 1000, tz=timezone.utc)
                 
                 # 종료 시간을 초과하면 중단
                 if kline_time > end_time:
@@ -118,7 +121,7 @@ def fetch_binance_klines_by_date_range(
                     'low_price': float(k[3]),
                     'close_price': float(k[4]),
                     'volume': float(k[5]),
-                    'close_time': datetime.fromtimestamp(k[6] / 1000),
+                    'close_time': datetime.fromtimestamp(k[6] / 1000, tz=timezone.utc),
                     'quote_volume': float(k[7]),
                     'trade_count': int(k[8]),
                     'taker_buy_volume': float(k[9]),
@@ -146,59 +149,15 @@ def fetch_binance_klines_by_date_range(
     return all_klines
 
 def save_to_price_history(supabase, crypto_id: str, klines: List[Dict], symbol: str) -> int:
-    """price_history 테이블에 저장 (upsert로 중복 자동 처리)"""
-    records = []
-    
-    for kline in klines:
-        record = {
-            'crypto_id': crypto_id,
-            'timestamp': kline['open_time'].isoformat(),
-            'open_price': str(kline['open_price']),
-            'high_price': str(kline['high_price']),
-            'low_price': str(kline['low_price']),
-            'close_price': str(kline['close_price']),
-            'volume': str(kline['volume']),
-            'quote_volume': str(kline['quote_volume']),
-            'trade_count': kline['trade_count'],
-            'taker_buy_volume': str(kline['taker_buy_volume']),
-            'taker_buy_quote_volume': str(kline['taker_buy_quote_volume']),
-            'data_source': 'binance',
-            'raw_data': {
-                'open_time': kline['open_time'].isoformat(),
-                'close_time': kline['close_time'].isoformat(),
-            }
-        }
-        records.append(record)
-    
-    if not records:
+    """price_history 테이블에 저장 ((crypto_id, timestamp, data_source) 기준 대량 upsert)"""
+    if not klines:
         return 0
-    
-    # 배치로 저장 (upsert로 중복 자동 처리)
-    saved_count = 0
-    batch_size = 100
-    
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]
-        try:
-            # upsert 사용 (crypto_id + timestamp 기반으로 중복 자동 처리)
-            response = supabase.table('price_history').upsert(batch).execute()
-            saved_count += len(batch)
-            
-            if (i + batch_size) % 500 == 0:
-                print(f"   ✅ {saved_count}/{len(records)}건 저장 중...")
-                
-        except Exception as e:
-            print(f"⚠️ price_history 저장 실패 (배치 {i//batch_size + 1}): {e}")
-            # 개별 저장 시도
-            for record in batch:
-                try:
-                    supabase.table('price_history').upsert([record]).execute()
-                    saved_count += 1
-                except Exception as inner_e:
-                    print(f"   ⚠️ 개별 저장 실패: {inner_e}")
-                    pass
-    
-    return saved_count
+
+    progress = upsert_price_history(supabase, crypto_id, klines, data_source='binance')
+    if progress['rows_failed']:
+        print(f"⚠️ price_history 저장 실패 {progress['rows_failed']}건 ({symbol})")
+    print(f"   💾 {progress['rows_written']:,}건 저장 ({progress['rows_per_sec']:,.0f}건/초)")
+    return progress['rows_written']
 
 def collect_price_history_for_coins(supabase, start_date: datetime, end_date: datetime):
     """USDC, BNB, XRP 3개 코인에 대해 특정 기간의 가격 데이터 수집"""
@@ -272,9 +231,9 @@ def collect_price_history_for_coins(supabase, start_date: datetime, end_date: da
 def main():
     """메인 함수"""
     # 2025년 5월 1일 00:00:00 UTC
-    start_date = datetime(2025, 5, 1, 0, 0, 0)
+    start_date = datetime(2025, 5, 1, 0, 0, 0, tzinfo=timezone.utc)
     # 2025년 6월 30일 23:59:59 UTC
-    end_date = datetime(2025, 6, 30, 23, 59, 59)
+    end_date = datetime(2025, 6, 30, 23, 59, 59, tzinfo=timezone.utc)
     
     try:
         supabase = get_supabase_client()
@@ -17,6 +17,13 @@ import threading
 
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.collectors.ingestion_state import SupabaseIngestionState
+from src.collectors.price_history_writer import upsert_price_history
+
+# ingestion_state stream 이름 (source = data_source, entity = 코인 심볼)
+STATE_STREAM = 'price_history_1h'
 
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
@@ -164,105 +171,26 @@ def fetch_binance_klines_by_date_range(
     
     return all_klines
 
-def save_to_price_history(supabase, crypto_id: str, klines: List[Dict], symbol: str) -> int:
-    """price_history 테이블에 저장 (중복 확인 후 upsert)"""
-    records = []
-
-    for kline in klines:
-        # UTC 타임존 명시적으로 설정
-        open_time = kline['open_time']
-        if open_time.tzinfo is None:
-            open_time = open_time.replace(tzinfo=timezone.utc)
-
-        record = {
-            'crypto_id': crypto_id,
-            'timestamp': open_time.isoformat(),  # ISO 형식으로 저장 (UTC)
-            'open_price': str(kline['open_price']),
-            'high_price': str(kline['high_price']),
-            'low_price': str(kline['low_price']),
-            'close_price': str(kline['close_price']),
-            'volume': str(kline['volume']),
-            'quote_volume': str(kline['quote_volume']),
-            'trade_count': kline['trade_count'],
-            'taker_buy_volume': str(kline['taker_buy_volume']),
-            'taker_buy_quote_volume': str(kline['taker_buy_quote_volume']),
-            'data_source': 'binance',
-            'raw_data': {
-                'open_time': open_time.isoformat(),
-                'close_time': kline['close_time'].isoformat() if kline['close_time'].tzinfo else kline['close_time'].replace(tzinfo=timezone.utc).isoformat(),
-            }
-        }
-        records.append(record)
+def save_to_price_history(supabase, crypto_id: str, klines: List[Dict], symbol: str, data_source: str = 'binance', state=None) -> int:
+    """
+    price_history 테이블에 저장 ((crypto_id, timestamp, data_source) 기준 대량 upsert)
 
-    if not records:
+    state(ingestion_state)를 주면 모든 행이 저장된 경우에만 마지막 open_time까지 워터마크 전진
+    """
+    if not klines:
         return 0
 
-    # 배치로 저장 (중복 확인 후 upsert)
-    saved_count = 0
-    batch_size = 50  # 배치 크기 축소
-
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]
-
-        # 중복 데이터 확인 및 필터링
-        filtered_batch = []
-        for record in batch:
-            try:
-                # 해당 레코드가 이미 존재하는지 확인
-                existing = supabase.table('price_history')\
-                    .select('id')\
-                    .eq('crypto_id', record['crypto_id'])\
-                    .eq('timestamp', record['timestamp'])\
-                    .eq('data_source', record['data_source'])\
-                    .limit(1)\
-                    .execute()
-
-                if not existing.data:
-                    # 중복이 없으면 추가
-                    filtered_batch.append(record)
-
-            except Exception as e:
-                print(f"      ⚠️ 중복 확인 실패: {e}")
-                # 중복 확인 실패 시 일단 추가
-                filtered_batch.append(record)
-
-        if not filtered_batch:
-            # 모든 데이터가 중복이면 다음 배치로
-            print(f"      ⏭️ 배치 {i//batch_size + 1}의 모든 데이터가 중복됨, 스킵")
-            saved_count += len(batch)  # 카운트는 유지
-            continue
-
-        try:
-            # upsert 사용 (중복 없음이 확인된 데이터만)
-            response = supabase.table('price_history').upsert(filtered_batch).execute()
-            saved_count += len(filtered_batch)
-
-            if (i + batch_size) % 200 == 0:
-                print(f"      💾 {saved_count}/{len(records)}건 저장 중... ({len(filtered_batch)}건 신규)")
-
-        except Exception as e:
-            print(f"⚠️ price_history 저장 실패 (배치 {i//batch_size + 1}): {e}")
-            # 개별 저장 시도 (중복 확인 후)
-            for record in filtered_batch:
-                try:
-                    # 다시 한 번 중복 확인
-                    existing = supabase.table('price_history')\
-                        .select('id')\
-                        .eq('crypto_id', record['crypto_id'])\
-                        .eq('timestamp', record['timestamp'])\
-                        .eq('data_source', record['data_source'])\
-                        .limit(1)\
-                        .execute()
+    def on_batch(progress):
+        progress_info['ingest'] = progress
+        if progress['batches_done'] % 10 == 0:
+            print(f"      💾 {progress['rows_written']:,}/{progress['rows_total']:,}건 저장 중... ({progress['rows_per_sec']:,.0f}건/초)")
 
-                    if not existing.data:
-                        supabase.table('price_history').insert(record).execute()
-                        saved_count += 1
-
-                except Exception as inner_e:
-                    if 'duplicate key' not in str(inner_e):
-                        print(f"      ⚠️ 개별 저장 실패: {inner_e}")
-
-    return saved_count
+    progress = upsert_price_history(supabase, crypto_id, klines, data_source=data_source, progress_callback=on_batch)
+    if progress['rows_failed']:
+        print(f"⚠️ price_history 저장 실패 {progress['rows_failed']}건 ({symbol})")
+    elif state is not None:
+        state.advance(data_source, symbol, STATE_STREAM, last_timestamp=max(kline['open_time'] for kline in klines))
+    return progress['rows_written']
 
 # 전역 변수: 진행률 추적
 progress_info = {
@@ -272,7 +200,8 @@ progress_info = {
     'completed_coins': 0,
     'total_saved': 0,
     'start_time': None,
-    'last_update': None
+    'last_update': None,
+    'ingest': None  # 현재 코인 저장 진행 (BulkUpserter.get_progress)
 }
 
 def print_progress():
@@ -287,6 +216,9 @@ def print_progress():
             print(f"\n⏱️  진행률: {progress_info['completed_coins']}/{progress_info['total_coins']} 코인 완료 ({coin_progress:.1f}%)")
             print(f"   현재 코인: {progress_info['current_coin']} ({progress_info['current_symbol']})")
             print(f"   총 저장: {progress_info['total_saved']:,}건")
+            ingest = progress_info['ingest']
+            if ingest:
+                print(f"   저장 처리량: {ingest['rows_per_sec']:,.0f}건/초 (재시도 {ingest['retries']}회, 실패 {ingest['rows_failed']}건)")
             print(f"   경과 시간: {elapsed_min}분 {elapsed_sec}초")
             print("=" * 70)
 
@@ -297,8 +229,32 @@ def progress_monitor():
         if progress_info['start_time']:
             print_progress()
 
-def collect_price_history_for_coins(supabase, start_date: datetime, end_date: datetime):
-    """모든 코인에 대해 특정 기간의 가격 데이터 수집 (1시간 간격)"""
+def last_closed_hour(now: Optional[datetime] = None) -> datetime:
+    """
+    마감된 마지막 1시간봉의 open_time (UTC)
+    
+    진행 중인 봉까지 저장하면 워터마크가 그 봉을 넘어가 다음 실행에서 다시 갱신되지 않으므로
+    수집 종료 시각은 이 값으로 제한
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+def resume_start(state, crypto_symbol: str, start_date: datetime, data_source: str = 'binance') -> datetime:
+    """
+    워터마크(마지막 저장 open_time) 다음 시각부터 수집, 워터마크가 없으면 start_date
+    
+    data_source는 save_to_price_history가 워터마크를 전진시키는 source와 같아야 함
+    """
+    last = state.last_timestamp(data_source, crypto_symbol, STATE_STREAM) if state is not None else None
+    if not last:
+        return start_date
+    return max(start_date, datetime.fromisoformat(last).astimezone(timezone.utc) + timedelta(hours=1))
+
+def collect_price_history_for_coins(supabase, start_date: datetime, end_date: datetime, state=None, resume: bool = True,
+                                    data_source: str = 'binance'):
+    """모든 코인에 대해 특정 기간의 가격 데이터 수집 (1시간 간격, state가 있으면 코인별 워터마크부터 수집 후 전진)"""
     print("=" * 70)
     print("📊 1시간 단위 가격 데이터 수집")
     print("=" * 70)
@@ -333,12 +289,19 @@ def collect_price_history_for_coins(supabase, start_date: datetime, end_date: da
             results[crypto_symbol] = {'status': 'failed', 'reason': 'crypto_id not found'}
             continue
         
+        coin_start = resume_start(state, crypto_symbol, start_date, data_source) if resume else start_date
+        if coin_start > end_date:
+            print(f"   ⏭️ 이미 최신 ({coin_start.strftime('%Y-%m-%d %H:%M')} UTC)")
+            results[crypto_symbol] = {'status': 'success', 'collected': 0, 'saved': 0}
+            progress_info['completed_coins'] += 1
+            continue
+        
         # 바이낸스에서 K-line 데이터 조회
-        print(f"   📥 바이낸스 API에서 데이터 조회 중...")
+        print(f"   📥 바이낸스 API에서 데이터 조회 중... ({coin_start.strftime('%Y-%m-%d %H:%M')} UTC부터)")
         try:
             klines = fetch_binance_klines_by_date_range(
                 binance_symbol, 
-                start_date, 
+                coin_start, 
                 end_date, 
                 interval='1h'
             )
@@ -358,7 +321,7 @@ def collect_price_history_for_coins(supabase, start_date: datetime, end_date: da
         
         # price_history에 저장
         print(f"   💾 price_history 테이블에 저장 중...")
-        saved = save_to_price_history(supabase, crypto_id, klines, crypto_symbol)
+        saved = save_to_price_history(supabase, crypto_id, klines, crypto_symbol, data_source=data_source, state=state)
         total_saved += saved
         print(f"   ✅ {saved}건을 price_history에 저장 완료")
         
@@ -391,96 +354,37 @@ def collect_price_history_for_coins(supabase, start_date: datetime, end_date: da
     
     return total_saved, results
 
-def load_checkpoint():
-    """체크포인트 로드"""
-    checkpoint_file = PROJECT_ROOT / 'collection_checkpoint.json'
-    if not checkpoint_file.exists():
-        return None
-    
-    try:
-        import json
-        with open(checkpoint_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('price_history')
-    except Exception as e:
-        print(f"⚠️ 체크포인트 로드 실패: {e}")
-        return None
-
-def get_coins_to_collect(supabase, checkpoint=None):
-    """수집할 코인 목록 반환 (체크포인트 기반)"""
-    if not checkpoint:
-        return COINS_TO_COLLECT
-    
-    # 체크포인트에서 완료되지 않은 코인만 반환
-    coins_to_collect = {}
-    for crypto_symbol, binance_symbol in COINS_TO_COLLECT.items():
-        coin_info = checkpoint.get('coins', {}).get(crypto_symbol, {})
-        status = coin_info.get('status', 'not_started')
-        
-        # 완료되지 않은 코인만 포함
-        if status in ['not_started', 'in_progress', 'error']:
-            coins_to_collect[crypto_symbol] = binance_symbol
-    
-    return coins_to_collect
-
 def main():
     """메인 함수"""
     import argparse
     
     parser = argparse.ArgumentParser(description='1시간 단위 가격 데이터 수집')
-    parser.add_argument('--resume', action='store_true', help='체크포인트에서 재개')
+    parser.add_argument('--resume', action='store_true', help='워터마크에서 재개 (기본 동작, 이전 실행 스크립트 호환용)')
+    parser.add_argument('--full', action='store_true', help='워터마크를 무시하고 시작일부터 다시 수집')
     args = parser.parse_args()
     
-    # 2025년 1월 1일 00:00:00 UTC ~ 오늘
+    # 2025년 1월 1일 00:00:00 UTC ~ 마감된 마지막 1시간봉 (코인별로 ingestion_state 워터마크 이후만 수집)
     start_date = datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-    end_date = datetime.now(timezone.utc)
-    
-    checkpoint = None
-    if args.resume:
-        print("=" * 70)
-        print("🔄 체크포인트에서 재개")
-        print("=" * 70)
-        checkpoint = load_checkpoint()
-        if checkpoint:
-            print("✅ 체크포인트 로드 완료")
-            # 체크포인트의 시작 날짜 사용
-            start_date = datetime.fromisoformat(checkpoint['start_date'])
-            end_date = datetime.fromisoformat(checkpoint['end_date'])
-        else:
-            print("⚠️ 체크포인트를 찾을 수 없습니다. 처음부터 시작합니다.")
+    end_date = last_closed_hour()
     
     print(f"\n📅 수집 기간: {start_date.strftime('%Y-%m-%d %H:%M:%S')} UTC ~ {end_date.strftime('%Y-%m-%d %H:%M:%S')} UTC")
     
     try:
         supabase = get_supabase_client()
-        
-        # 체크포인트 기반으로 수집할 코인 결정
-        if checkpoint:
-            original_coins = COINS_TO_COLLECT.copy()
-            COINS_TO_COLLECT.clear()
-            COINS_TO_COLLECT.update(get_coins_to_collect(supabase, checkpoint))
-            print(f"📋 수집 대상 코인: {', '.join(COINS_TO_COLLECT.keys())} ({len(COINS_TO_COLLECT)}개)")
+        state = SupabaseIngestionState(supabase)
         
         # 데이터 수집
-        total_saved, results = collect_price_history_for_coins(supabase, start_date, end_date)
+        total_saved, results = collect_price_history_for_coins(
+            supabase, start_date, end_date, state=state, resume=not args.full
+        )
         
         print("\n" + "=" * 70)
         print("✅ 작업 완료")
         print("=" * 70)
         
-        # 체크포인트 저장
-        print("\n💾 체크포인트 저장 중...")
-        from scripts.save_collection_checkpoint import save_checkpoint
-        save_checkpoint()
-        
     except KeyboardInterrupt:
+        # 저장이 끝난 코인까지만 워터마크가 전진해 있으므로 다시 실행하면 이어서 수집
         print("\n\n⚠️  사용자에 의해 중단되었습니다.")
-        print("💾 체크포인트 저장 중...")
-        try:
-            from scripts.save_collection_checkpoint import save_checkpoint
-            save_checkpoint()
-        except:
-            pass
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
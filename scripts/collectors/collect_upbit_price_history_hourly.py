@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+업비트 KRW 마켓 1시간 단위 가격 데이터 수집 (2025년 1월 1일 ~ 마감된 마지막 1시간봉)
+collect_price_history_hourly.py(바이낸스)의 업비트 대응 수집기
+price_history 테이블에 data_source='upbit'로 저장하여 시간봉 차익거래 백테스트의 업비트 레그로 사용
+ingestion_state의 ('upbit', 코인, price_history_1h) 워터마크 이후만 수집
+"""
+
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from collect_price_history_hourly import (
+    get_supabase_client,
+    get_crypto_id_by_symbol,
+    save_to_price_history,
+    last_closed_hour,
+    resume_start,
+)
+from src.collectors.ingestion_state import SupabaseIngestionState
+from src.http_client import HttpClient, get_client
+
+# 업비트 분봉 API (unit=60 → 1시간봉)
+UPBIT_MINUTE_CANDLES_URL = "https://api.upbit.com/v1/candles/minutes/{unit}"
+
+# 수집 대상 코인 (crypto_symbol -> upbit_market)
+COINS_TO_COLLECT = {
+    'BTC': 'KRW-BTC',
+    'ETH': 'KRW-ETH',
+    'XRP': 'KRW-XRP',
+    'DOGE': 'KRW-DOGE',
+    'LINK': 'KRW-LINK',
+    'SOL': 'KRW-SOL',
+    'DOT': 'KRW-DOT',
+}
+
+
+def fetch_upbit_candles_by_date_range(
+    market: str,
+    start_time: datetime,
+    end_time: datetime,
+    unit: int = 60,
+    client: Optional[HttpClient] = None
+) -> List[Dict]:
+    """
+    업비트에서 특정 기간의 분봉 데이터 조회 (역순 페이지네이션)
+
+    Parameters:
+    -----------
+    market : str
+        업비트 마켓 코드 (예: 'KRW-BTC')
+    start_time : datetime
+        시작 시간 (UTC, 포함)
+    end_time : datetime
+        종료 시간 (UTC, 이 시각에 시작하는 캔들 포함)
+    unit : int
+        분 단위 (기본값: 60 → 1시간봉)
+    client : HttpClient
+        HTTP 클라이언트 (기본값: 공용 클라이언트, 호스트별 호출 한도 / 429·5xx 재시도 적용)
+
+    Returns:
+    --------
+    List[Dict] : 시간 오름차순 K-line 데이터 리스트 (collect_price_history_hourly와 동일한 키)
+    """
+    url = UPBIT_MINUTE_CANDLES_URL.format(unit=unit)
+    all_candles = []
+
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=timezone.utc)
+
+    # 업비트 API는 'to' 이전(미포함) 캔들을 최신순으로 최대 200개 반환 → end_time 캔들까지 받도록 한 칸 뒤에서 시작
+    cursor = end_time + timedelta(minutes=unit)
+    page = 1
+    max_pages = 1000  # 무한 루프 방지
+
+    client = client or get_client()
+
+    while cursor > start_time and page <= max_pages:
+        params = {
+            'market': market,
+            'to': cursor.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'count': 200
+        }
+
+        try:
+            response = client.get(url, params=params, headers={"Accept": "application/json"}, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+
+            if not data:
+                break
+
+            oldest = None
+            for candle in data:
+                open_time = datetime.strptime(
+                    candle['candle_date_time_utc'], '%Y-%m-%dT%H:%M:%S'
+                ).replace(tzinfo=timezone.utc)
+
+                if oldest is None or open_time < oldest:
+                    oldest = open_time
+
+                if open_time < start_time or open_time > end_time:
+                    continue
+
+                all_candles.append({
+                    'open_time': open_time,
+                    'open_price': float(candle['opening_price']),
+                    'high_price': float(candle['high_price']),
+                    'low_price': float(candle['low_price']),
+                    'close_price': float(candle['trade_price']),
+                    'volume': float(candle['candle_acc_trade_volume']),
+                    'close_time': datetime.fromtimestamp(candle['timestamp'] / 1000, tz=timezone.utc),
+                    'quote_volume': float(candle['candle_acc_trade_price']),
+                    # 업비트 캔들 API는 체결 건수 / Taker 매수량을 제공하지 않음
+                    'trade_count': None,
+                    'taker_buy_volume': None,
+                    'taker_buy_quote_volume': None,
+                })
+
+            if len(data) < 200 or oldest is None:
+                # 마지막 페이지
+                break
+
+            cursor = oldest
+            page += 1
+
+            if page % 10 == 0:
+                print(f"      페이지 {page} 처리 중... (현재 {len(all_candles)}건 수집)")
+
+        except Exception as e:
+            print(f"⚠️ 업비트 API 호출 실패 ({market}, 페이지 {page}): {e}")
+            break
+
+    all_candles.sort(key=lambda c: c['open_time'])
+    return all_candles
+
+
+def collect_upbit_price_history_for_coins(supabase, start_date: datetime, end_date: datetime, state=None, resume: bool = True):
+    """모든 코인에 대해 특정 기간의 업비트 1시간봉 수집 (state가 있으면 코인별 워터마크부터 수집 후 전진)"""
+    print("=" * 70)
+    print("📊 업비트 1시간 단위 가격 데이터 수집")
+    print("=" * 70)
+    print(f"\n수집 기간: {start_date.strftime('%Y-%m-%d %H:%M:%S')} ~ {end_date.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"대상 마켓: {', '.join(COINS_TO_COLLECT.values())}")
+    print("=" * 70)
+
+    total_saved = 0
+    results = {}
+
+    for crypto_symbol, market in COINS_TO_COLLECT.items():
+        print(f"\n[{crypto_symbol}] {market} 수집 중...")
+
+        crypto_id = get_crypto_id_by_symbol(supabase, crypto_symbol)
+        if not crypto_id:
+            print(f"   ⚠️ {crypto_symbol}의 crypto_id를 찾을 수 없습니다. cryptocurrencies 테이블에 추가하세요.")
+            results[crypto_symbol] = {'status': 'failed', 'reason': 'crypto_id not found'}
+            continue
+
+        coin_start = resume_start(state, crypto_symbol, start_date, 'upbit') if resume else start_date
+        if coin_start > end_date:
+            print(f"   ⏭️ 이미 최신 ({coin_start.strftime('%Y-%m-%d %H:%M')} UTC)")
+            results[crypto_symbol] = {'status': 'success', 'collected': 0, 'saved': 0}
+            continue
+
+        print(f"   📥 업비트 API에서 데이터 조회 중... ({coin_start.strftime('%Y-%m-%d %H:%M')} UTC부터)")
+        candles = fetch_upbit_candles_by_date_range(market, coin_start, end_date, unit=60)
+
+        if not candles:
+            print(f"   ⚠️ {market} 데이터를 가져올 수 없습니다.")
+            results[crypto_symbol] = {'status': 'failed', 'reason': 'no data', 'count': 0}
+            continue
+
+        print(f"   ✅ {len(candles)}건의 캔들 조회 완료")
+        print(f"   📅 기간: {candles[0]['open_time'].strftime('%Y-%m-%d %H:%M')} ~ {candles[-1]['open_time'].strftime('%Y-%m-%d %H:%M')} (UTC)")
+
+        print(f"   💾 price_history 테이블에 저장 중...")
+        saved = save_to_price_history(supabase, crypto_id, candles, crypto_symbol, data_source='upbit', state=state)
+        total_saved += saved
+        print(f"   ✅ {saved}건을 price_history에 저장 완료")
+
+        results[crypto_symbol] = {
+            'status': 'success',
+            'collected': len(candles),
+            'saved': saved
+        }
+
+    print("\n" + "=" * 70)
+    print("✅ 수집 완료")
+    print("=" * 70)
+    for crypto_symbol, result in results.items():
+        if result['status'] == 'success':
+            print(f"   - {crypto_symbol:6s}: {result['saved']:6d}건 저장 (수집: {result['collected']:6d}건)")
+        else:
+            print(f"   - {crypto_symbol:6s}: 실패 ({result.get('reason', 'unknown')})")
+    print(f"\n총 저장된 데이터: {total_saved:,}건")
+
+    return total_saved, results
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='업비트 1시간 단위 가격 데이터 수집')
+    parser.add_argument('--start-date', type=str, default='2025-01-01', help='시작일 (YYYY-MM-DD, UTC)')
+    parser.add_argument('--end-date', type=str, default=None, help='종료일 (YYYY-MM-DD, UTC). 미지정 시 마감된 마지막 1시간봉')
+    parser.add_argument('--full', action='store_true', help='워터마크를 무시하고 시작일부터 다시 수집')
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    if args.end_date:
+        end_date = datetime.strptime(args.end_date, '%Y-%m-%d').replace(hour=23, tzinfo=timezone.utc)
+    else:
+        end_date = datetime.now(timezone.utc)
+    # 진행 중인 봉이 저장되면 워터마크가 그 봉을 넘어가 다시 갱신되지 않음
+    end_date = min(end_date, last_closed_hour())
+
+    try:
+        supabase = get_supabase_client()
+        state = SupabaseIngestionState(supabase)
+        collect_upbit_price_history_for_coins(supabase, start_date, end_date, state=state, resume=not args.full)
+    except KeyboardInterrupt:
+        # 저장이 끝난 코인까지만 워터마크가 전진해 있으므로 다시 실행하면 이어서 수집
+        print("\n\n⚠️  사용자에 의해 중단되었습니다.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,244 +1,143 @@
 #!/usr/bin/env python3
 """
-병렬 데이터 수집 통합 스크립트
+수집 파이프라인 실행 스크립트
 
-가격 데이터, BTC 고래 거래, BSC 고래 거래를 병렬로 수집
+수집 → 라벨링 → 집계 → 피처 생성 → 동기화 DAG(src/pipeline/collection.py)를 의존 순서대로 실행
+- 서로 의존하지 않는 작업은 워커 풀에서 동시에 실행 (자원별 동시 실행 한도 적용)
+- 실패한 작업은 재시도 후 후속 작업만 중단, 같은 --run-id로 다시 실행하면 실패 지점부터 재개
+- 진행 상황은 logs/pipeline_status.json에 실시간 기록 (scripts/monitor_collection_progress.py로 확인)
 """
 
-import os
 import sys
-import subprocess
 import signal
-import time
+import argparse
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict
 
-PROJECT_ROOT = Path(__file__).parent
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
 
-# 전역 프로세스 리스트
-processes: List[subprocess.Popen] = []
-start_time = None
+from src.collectors.ingestion_state import SQLiteIngestionState
+from src.pipeline import RESOURCE_LIMITS, Scheduler, build_collection_graph, format_progress
+from src.pipeline.scheduler import FAILED, BLOCKED, CANCELLED, STATUS_ICONS
 
-def signal_handler(sig, frame):
-    """Ctrl+C 시그널 핸들러"""
-    print("\n\n⚠️  중단 신호 수신. 모든 프로세스를 정상 종료합니다...")
-    
-    for i, proc in enumerate(processes):
-        if proc.poll() is None:  # 아직 실행 중인 경우
-            print(f"   프로세스 {i+1} 종료 중 (PID: {proc.pid})...")
-            proc.terminate()
-    
-    # 모든 프로세스가 종료될 때까지 대기
-    time.sleep(2)
-    
-    for proc in processes:
-        if proc.poll() is None:
-            proc.kill()
-    
-    print("\n💾 체크포인트 저장 중...")
-    try:
-        subprocess.run([sys.executable, 'scripts/save_collection_checkpoint.py'], 
-                      cwd=PROJECT_ROOT, check=False)
-    except:
-        pass
-    
-    print("✅ 정상 종료되었습니다.")
-    sys.exit(0)
-
-# 시그널 핸들러 등록
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+LOG_DIR = ROOT / 'logs' / 'pipeline'
+STATUS_PATH = ROOT / 'logs' / 'pipeline_status.json'
+STATE_DB_PATH = ROOT / 'data' / 'project.db'
 
-def get_log_filename(prefix: str) -> str:
-    """로그 파일명 생성"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    return f"logs/{prefix}_{timestamp}.log"
+def parse_args():
+    """명령행 인자"""
+    parser = argparse.ArgumentParser(description='수집 파이프라인 DAG 실행')
+    parser.add_argument('--workers', type=int, default=4, help='동시 실행 작업 수 (기본: 4)')
+    parser.add_argument('--run-id', type=str, default=None,
+                        help='실행 ID (같은 ID로 재실행하면 성공한 작업을 건너뜀, 기본: 오늘 날짜 UTC)')
+    parser.add_argument('--fresh', action='store_true', help='새 실행 ID로 모든 작업을 처음부터 실행')
+    parser.add_argument('--only', nargs='+', default=None, help='지정한 작업과 선행 작업만 실행')
+    parser.add_argument('--min-bnb', type=float, default=1000, help='BSC 상세 페이지 스크래핑 기준 금액 (기본: 1000 BNB)')
+    parser.add_argument('--progress-interval', type=float, default=30.0, help='진행 현황 출력 주기(초, 기본: 30)')
+    parser.add_argument('--list', action='store_true', help='작업 DAG만 출력하고 종료')
+    return parser.parse_args()
 
-def print_header():
-    """헤더 출력"""
+def print_graph(graph):
+    """작업 DAG 출력"""
     print("=" * 80)
-    print("🚀 병렬 데이터 수집 시작")
+    print("📋 수집 파이프라인 작업")
     print("=" * 80)
-    print(f"\n시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("\n수집 작업:")
-    print("  1. 📊 가격 데이터 (price_history) - 재개 모드")
-    print("  2. 🐋 BTC 고래 거래 (whale_transactions) - 재개 모드")
-    print("  3. 🟡 BSC 고래 거래 (whale_transactions) - 전체 수집 (고액만 스크래핑)")
-    print("\n예상 소요 시간: 약 60분")
+    for name in graph.order():
+        job = graph.jobs[name]
+        deps = ', '.join(job.deps) if job.deps else '-'
+        resources = ', '.join(f"{key}×{value}" for key, value in job.resources.items()) or '-'
+        print(f"  [{job.stage}] {name}: {job.description}")
+        print(f"      선행: {deps} | 자원: {resources} | 재시도: {job.retries} | 제한: {job.timeout / 3600:.0f}시간")
+    print("\n자원 한도: " + ", ".join(f"{key}={value}" for key, value in RESOURCE_LIMITS.items()))
     print("=" * 80)
-    print()
-
-def create_log_dir():
-    """로그 디렉토리 생성"""
-    log_dir = PROJECT_ROOT / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    return log_dir
 
-def start_process(name: str, command: List[str], log_file: str) -> subprocess.Popen:
-    """프로세스 시작"""
-    print(f"🚀 {name} 시작 중...")
-    print(f"   명령어: {' '.join(command)}")
-    print(f"   로그: {log_file}")
-    
-    log_path = PROJECT_ROOT / log_file
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(log_path, 'w') as f:
-        proc = subprocess.Popen(
-            command,
-            cwd=PROJECT_ROOT,
-            stdout=f,
-            stderr=subprocess.STDOUT,
-            text=True
-        )
-    
-    print(f"   PID: {proc.pid}")
-    print()
-    return proc
+def print_change(name, entry):
+    """상태 전이 출력"""
+    timestamp = datetime.now().strftime('%H:%M:%S')
+    line = f"[{timestamp}] {STATUS_ICONS.get(entry['status'], '•')} {name}: {entry['status']}"
+    if entry['status'] == 'running':
+        line += f" (시도 {entry['attempts']}, 로그: {entry['log']})"
+    elif entry.get('error'):
+        line += f" - {entry['error']}"
+    print(line, flush=True)
 
-def monitor_processes(processes: List[Dict]):
-    """프로세스 모니터링"""
-    print("📊 프로세스 모니터링 시작...")
-    print("   10분마다 진행 상황을 출력합니다.")
-    print("   중단하려면 Ctrl+C를 누르세요.")
-    print()
-    
-    last_check = time.time()
-    check_interval = 600  # 10분
-    
-    while True:
-        # 모든 프로세스가 종료되었는지 확인
-        all_done = all(proc['process'].poll() is not None for proc in processes)
-        
-        if all_done:
-            print("\n✅ 모든 프로세스가 완료되었습니다!")
-            break
-        
-        # 10분마다 진행 상황 출력
-        current_time = time.time()
-        if current_time - last_check >= check_interval:
-            elapsed = int(current_time - start_time)
-            elapsed_min = elapsed // 60
-            elapsed_sec = elapsed % 60
-            
-            print("\n" + "=" * 80)
-            print(f"⏱️  진행 상황 (경과 시간: {elapsed_min}분 {elapsed_sec}초)")
-            print("=" * 80)
-            
-            for proc_info in processes:
-                name = proc_info['name']
-                proc = proc_info['process']
-                status = "🟢 실행 중" if proc.poll() is None else "✅ 완료"
-                print(f"  {name}: {status}")
-            
-            print("=" * 80)
-            print()
-            
-            last_check = current_time
-        
-        time.sleep(10)  # 10초마다 체크
+def print_progress(snapshot):
+    """주기적 진행 현황 출력"""
+    print("\n" + "-" * 80)
+    print(format_progress(snapshot))
+    print("-" * 80 + "\n", flush=True)
 
-def print_summary(processes: List[Dict]):
+def print_summary(snapshot):
     """결과 요약 출력"""
-    elapsed = int(time.time() - start_time)
-    elapsed_min = elapsed // 60
-    elapsed_sec = elapsed % 60
-    
     print("\n" + "=" * 80)
-    print("📋 수집 결과 요약")
+    print("📋 수집 파이프라인 결과")
     print("=" * 80)
-    print(f"\n총 소요 시간: {elapsed_min}분 {elapsed_sec}초\n")
-    
-    for proc_info in processes:
-        name = proc_info['name']
-        proc = proc_info['process']
-        log_file = proc_info['log']
-        
-        return_code = proc.poll()
-        
-        if return_code == 0:
-            status = "✅ 성공"
-        elif return_code is None:
-            status = "⚠️ 아직 실행 중"
-        else:
-            status = f"❌ 실패 (코드: {return_code})"
-        
-        print(f"{name}:")
-        print(f"  상태: {status}")
-        print(f"  로그: {log_file}")
-        print()
-    
+    print(format_progress(snapshot))
     print("=" * 80)
     print("\n다음 단계:")
-    print("  1. 로그 파일을 확인하여 세부 내용 검토")
-    print("  2. 검증 스크립트 실행: python3 scripts/verify_data_collection_2025.py")
-    print("  3. 체크포인트 확인: cat collection_checkpoint.json")
+    print(f"  1. 실패 작업 로그 확인: {LOG_DIR}")
+    print(f"  2. 실패 지점부터 재개: python3 scripts/main/run_parallel_collection.py --run-id {snapshot['run_id']}")
+    print("  3. 수집 워터마크 확인: python3 scripts/show_ingestion_state.py")
     print()
 
 def main():
     """메인 함수"""
-    global start_time, processes
+    args = parse_args()
     
-    # 로그 디렉토리 생성
-    create_log_dir()
+    graph = build_collection_graph(min_bnb=args.min_bnb)
+    if args.only:
+        graph = graph.subgraph(args.only)
     
-    # 헤더 출력
-    print_header()
+    if args.list:
+        print_graph(graph)
+        return 0
     
-    # 시작 시간 기록
-    start_time = time.time()
+    run_id = args.run_id
+    if args.fresh:
+        run_id = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%M%S')
+    
+    scheduler = Scheduler(
+        graph,
+        max_workers=args.workers,
+        resource_limits=RESOURCE_LIMITS,
+        state=SQLiteIngestionState(STATE_DB_PATH),
+        run_id=run_id,
+        cwd=ROOT,
+        log_dir=LOG_DIR,
+        status_path=STATUS_PATH,
+        progress_interval=args.progress_interval,
+        on_change=print_change,
+        on_progress=print_progress
+    )
     
-    # 프로세스 정보
-    process_configs = [
-        {
-            'name': '📊 가격 데이터 수집',
-            'command': [sys.executable, 'collect_price_history_hourly.py', '--resume'],
-            'log': get_log_filename('price_history')
-        },
-        {
-            'name': '🐋 BTC 고래 거래 수집',
-            'command': [sys.executable, 'collect_btc_whale_transactions.py', '--resume'],
-            'log': get_log_filename('btc_whale')
-        },
-        {
-            'name': '🟡 BSC 고래 거래 수집',
-            'command': [sys.executable, 'scripts/collectors/bsc_hybrid_collector.py', '--min-bnb', '1000'],
-            'log': get_log_filename('bsc_whale')
-        }
-    ]
+    print("=" * 80)
+    print("🚀 수집 파이프라인 시작")
+    print("=" * 80)
+    print(f"실행 ID: {scheduler.run_id} | 작업 {len(graph.jobs)}개 | 워커 {args.workers}개")
+    print(f"상태 파일: {STATUS_PATH}")
+    print("중단하려면 Ctrl+C (실행 중인 작업은 종료되고, 같은 실행 ID로 재개 가능)")
+    print("=" * 80 + "\n")
     
-    # 프로세스 시작
-    running_processes = []
-    for config in process_configs:
-        proc = start_process(config['name'], config['command'], config['log'])
-        running_processes.append({
-            'name': config['name'],
-            'process': proc,
-            'log': config['log']
-        })
-        processes.append(proc)
-        time.sleep(2)  # 프로세스 간 간격
+    # SIGTERM도 Ctrl+C와 같이 하위 프로세스를 정리하고 종료
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     
-    # 프로세스 모니터링
     try:
-        monitor_processes(running_processes)
+        snapshot = scheduler.run()
     except KeyboardInterrupt:
-        signal_handler(signal.SIGINT, None)
-    
-    # 결과 요약
-    print_summary(running_processes)
+        print("\n\n⚠️  중단 신호 수신. 실행 중인 작업을 종료했습니다.")
+        print_summary(scheduler.snapshot())
+        return 130
     
-    # 모든 프로세스가 성공했는지 확인
-    all_success = all(proc['process'].poll() == 0 for proc in running_processes)
+    print_summary(snapshot)
     
-    if all_success:
-        print("✅ 모든 수집 작업이 성공적으로 완료되었습니다!")
-        return 0
-    else:
-        print("⚠️ 일부 수집 작업이 실패했습니다. 로그를 확인하세요.")
+    failed = [job['name'] for job in snapshot['jobs'] if job['status'] in (FAILED, BLOCKED, CANCELLED)]
+    if failed:
+        print(f"⚠️ 완료되지 않은 작업: {', '.join(failed)}")
         return 1
+    
+    print("✅ 모든 작업이 완료되었습니다!")
+    return 0
 
 if __name__ == '__main__':
     sys.exit(main())
-
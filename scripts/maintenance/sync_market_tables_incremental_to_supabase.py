@@ -1,5 +1,6 @@
 import os
 import sqlite3
+import sys
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 
@@ -9,8 +10,15 @@ from supabase import create_client
 
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
 DB_PATH = ROOT / "data" / "project.db"
 
+from src.collectors.ingestion_state import SupabaseIngestionState
+
+# ingestion_state 키: ('sqlite_sync', 테이블, 'supabase')
+SYNC_SOURCE = "sqlite_sync"
+SYNC_STREAM = "supabase"
+
 
 def get_supabase():
     load_dotenv(ROOT / "config" / ".env", override=True)
@@ -21,17 +29,10 @@ def get_supabase():
     return create_client(url, key)
 
 
-def supabase_max_date(
-    supabase, table: str, date_col: str = "date", eq_filters: Optional[Dict[str, Any]] = None
-) -> Optional[str]:
-    q = supabase.table(table).select(date_col).order(date_col, desc=True).limit(1)
-    if eq_filters:
-        for k, v in eq_filters.items():
-            q = q.eq(k, v)
-    res = q.execute()
-    if not res.data:
-        return None
-    return res.data[0].get(date_col)
+def synced_until(state: SupabaseIngestionState, table: str) -> Optional[str]:
+    """테이블 동기화 워터마크 (YYYY-MM-DD, 없으면 None)"""
+    last = state.last_timestamp(SYNC_SOURCE, table, SYNC_STREAM)
+    return last[:10] if last else None
 
 
 def read_sqlite_new_rows(
@@ -81,6 +82,7 @@ def upsert_batches(supabase, table: str, records: List[Dict[str, Any]], on_confl
 
 def main():
     supabase = get_supabase()
+    state = SupabaseIngestionState(supabase)
 
     # Streamlit Cloud의 "사용 가능한 데이터 기간" 계산에 직접 관여하는 핵심 테이블들
     table_specs = [
@@ -102,8 +104,8 @@ def main():
             table = spec["table"]
             date_col = spec["date_col"]
 
-            max_date = supabase_max_date(supabase, table, date_col=date_col)
-            print(f"\n[{table}] Supabase max({date_col}) = {max_date}")
+            max_date = synced_until(state, table)
+            print(f"\n[{table}] 동기화 워터마크({date_col}) = {max_date}")
 
             df_new = read_sqlite_new_rows(
                 conn,
@@ -116,15 +118,16 @@ def main():
             print(f"[{table}] SQLite 신규 rows = {len(df_new)}")
 
             records = clean_records(df_new)
-            upsert_batches(supabase, table, records, on_conflict=spec["on_conflict"], batch_size=1000)
-
-        # 최종 확인 (핵심 테이블 max date)
-        print("\n✅ Supabase max dates (after sync):")
-        print("  upbit_daily KRW-BTC:", supabase_max_date(supabase, "upbit_daily", eq_filters={"market": "KRW-BTC"}))
-        print("  upbit_daily KRW-ETH:", supabase_max_date(supabase, "upbit_daily", eq_filters={"market": "KRW-ETH"}))
-        print("  binance_spot_daily BTCUSDT:", supabase_max_date(supabase, "binance_spot_daily", eq_filters={"symbol": "BTCUSDT"}))
-        print("  binance_spot_daily ETHUSDT:", supabase_max_date(supabase, "binance_spot_daily", eq_filters={"symbol": "ETHUSDT"}))
-        print("  exchange_rate:", supabase_max_date(supabase, "exchange_rate"))
+            # 모든 배치 upsert가 끝난 뒤에만 워터마크 전진 (중간 실패 시 다음 실행에서 같은 구간 재전송)
+            with state.advancing(SYNC_SOURCE, table, SYNC_STREAM) as mark:
+                upsert_batches(supabase, table, records, on_conflict=spec["on_conflict"], batch_size=1000)
+                if not df_new.empty:
+                    mark["last_timestamp"] = str(df_new[date_col].max())[:10]
+
+        # 최종 확인 (테이블별 워터마크)
+        print("\n✅ 동기화 워터마크 (after sync):")
+        for row in state.all(source=SYNC_SOURCE):
+            print(f"  {row['entity']}: {(row.get('last_timestamp') or '')[:10]}")
     finally:
         conn.close()
 
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """
 데이터 수집 진행률 모니터링 스크립트
-10분마다 현재 진행 상황을 확인하여 출력
+수집 파이프라인(run_parallel_collection.py)이 기록하는 상태 파일을 읽어 작업별 진행 현황을 실시간 출력
+- --db: Supabase 테이블 건수 기준 진행률도 함께 확인 (쿼리 부하가 커서 별도 주기)
 """
 
 import os
 import sys
+import json
 import time
+import argparse
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
@@ -17,6 +20,10 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
 
+from src.pipeline import format_progress
+
+STATUS_PATH = PROJECT_ROOT / 'logs' / 'pipeline_status.json'
+
 # 검증 기간
 START_DATE = datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
 END_DATE = datetime.now(timezone.utc)
@@ -71,7 +78,7 @@ def check_price_history_progress(supabase):
                     'expected': total_hours,
                     'progress': progress_pct
                 }
-                
+            
             except Exception as e:
                 coin_progress[symbol] = {'error': str(e)}
         
@@ -83,7 +90,7 @@ def check_price_history_progress(supabase):
             'overall_progress': overall_progress,
             'coin_progress': coin_progress
         }
-        
+    
     except Exception as e:
         return {'error': str(e)}
 
@@ -126,7 +133,7 @@ def check_whale_transactions_progress(supabase):
             'BSC': bsc_count,
             'total': btc_count + eth_count + bsc_count
         }
-        
+    
     except Exception as e:
         return {'error': str(e)}
 
@@ -165,34 +172,54 @@ def print_progress_report(price_progress, whale_progress):
     
     print("=" * 70)
 
-def main():
-    """메인 함수 - 10분마다 진행률 확인"""
-    print("=" * 70)
-    print("📊 데이터 수집 진행률 모니터링 시작")
-    print("=" * 70)
-    print(f"모니터링 기간: {START_DATE.strftime('%Y-%m-%d')} ~ {END_DATE.strftime('%Y-%m-%d')}")
-    print(f"확인 주기: 10분")
+def load_pipeline_status(path: Path):
+    """파이프라인 상태 스냅샷 (없거나 기록 중이면 None)"""
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+def print_pipeline_status(path: Path):
+    """파이프라인 작업별 진행 현황 출력"""
+    snapshot = load_pipeline_status(path)
+    print("\n" + "=" * 70)
+    print(f"🧩 수집 파이프라인 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
     print("=" * 70)
+    if snapshot is None:
+        print(f"   상태 파일 없음: {path}")
+        print("   python3 scripts/main/run_parallel_collection.py 로 파이프라인을 시작하세요.")
+        return
+    print(format_progress(snapshot))
+    print(f"   (상태 갱신: {snapshot.get('updated_at')})")
+
+def main():
+    """메인 함수 - 파이프라인 상태를 주기적으로 출력"""
+    parser = argparse.ArgumentParser(description='데이터 수집 진행률 모니터링')
+    parser.add_argument('--interval', type=float, default=5.0, help='상태 출력 주기(초, 기본: 5)')
+    parser.add_argument('--status-file', type=str, default=str(STATUS_PATH), help='파이프라인 상태 파일')
+    parser.add_argument('--db', action='store_true', help='Supabase 테이블 건수 기준 진행률도 확인')
+    parser.add_argument('--db-interval', type=float, default=600.0, help='테이블 건수 확인 주기(초, 기본: 600)')
+    parser.add_argument('--once', action='store_true', help='한 번만 출력하고 종료')
+    args = parser.parse_args()
+    status_path = Path(args.status_file)
     
     try:
-        supabase = get_supabase_client()
+        supabase = get_supabase_client() if args.db else None
+        last_db_check = None
         
-        iteration = 0
         while True:
-            iteration += 1
-            print(f"\n🔄 {iteration}번째 확인 중...")
-            
-            # 진행률 확인
-            price_progress = check_price_history_progress(supabase)
-            whale_progress = check_whale_transactions_progress(supabase)
-            
-            # 리포트 출력
-            print_progress_report(price_progress, whale_progress)
+            print_pipeline_status(status_path)
             
-            # 10분 대기
-            print(f"\n⏳ 다음 확인까지 10분 대기 중... (Ctrl+C로 종료)")
-            time.sleep(600)  # 10분 = 600초
+            if supabase is not None and (last_db_check is None or time.time() - last_db_check >= args.db_interval):
+                last_db_check = time.time()
+                price_progress = check_price_history_progress(supabase)
+                whale_progress = check_whale_transactions_progress(supabase)
+                print_progress_report(price_progress, whale_progress)
             
+            if args.once:
+                break
+            time.sleep(args.interval)
+    
     except KeyboardInterrupt:
         print("\n\n⚠️ 모니터링이 중단되었습니다.")
         sys.exit(0)
@@ -204,4 +231,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -115,7 +115,8 @@ def check_database_tables():
             'cryptocurrencies',
             'price_history',
             'whale_address',
-            'whale_transactions'
+            'whale_transactions',
+            'ingestion_state'
         ]
         
         all_exist = True
@@ -191,19 +192,28 @@ def check_btc_addresses():
         print(f"   {RED}✗ 실패{RESET}: {e}")
         return False
 
-def check_checkpoint_files():
-    """체크포인트 파일 확인"""
-    print("\n7. 체크포인트 파일 확인...")
+def check_ingestion_state():
+    """수집 워터마크(ingestion_state) 확인"""
+    print("\n7. 수집 워터마크 확인...")
     
-    checkpoint_file = PROJECT_ROOT / 'collection_checkpoint.json'
-    
-    if checkpoint_file.exists():
-        print(f"   {GREEN}✓ 기존 체크포인트 발견{RESET}: {checkpoint_file}")
-        print(f"   재개 모드로 실행됩니다")
-        return True
-    else:
-        print(f"   {YELLOW}⚠ 체크포인트 없음{RESET}: 처음부터 시작합니다")
+    try:
+        from supabase import create_client
+        from src.collectors.ingestion_state import SupabaseIngestionState
+        supabase = create_client(
+            os.getenv('SUPABASE_URL'),
+            os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        )
+        rows = SupabaseIngestionState(supabase).all()
+        
+        if rows:
+            print(f"   {GREEN}✓ 워터마크 {len(rows)}개 발견{RESET}: 마지막 수집 지점부터 재개합니다")
+        else:
+            print(f"   {YELLOW}⚠ 워터마크 없음{RESET}: 처음부터 시작합니다")
         return True
+        
+    except Exception as e:
+        print(f"   {RED}✗ 실패{RESET}: {e} (sql/create_ingestion_state.sql 적용 필요)")
+        return False
 
 def check_disk_space():
     """디스크 공간 확인"""
@@ -232,10 +242,10 @@ def check_collection_scripts():
     print("\n9. 수집 스크립트 확인...")
     
     scripts = [
-        'collect_price_history_hourly.py',
-        'collect_btc_whale_transactions.py',
+        'scripts/collectors/collect_price_history_hourly.py',
+        'scripts/collectors/collect_btc_whale_transactions.py',
         'scripts/collectors/bsc_hybrid_collector.py',
-        'run_parallel_collection.py'
+        'scripts/main/run_parallel_collection.py'
     ]
     
     all_exist = True
@@ -266,7 +276,7 @@ def print_summary(results):
     if failed == 0:
         print(f"\n{GREEN}✓ 모든 검증 통과! 데이터 수집을 시작할 수 있습니다.{RESET}")
         print("\n다음 명령어로 수집을 시작하세요:")
-        print("  python3 run_parallel_collection.py")
+        print("  python3 scripts/main/run_parallel_collection.py")
         return True
     else:
         print(f"\n{RED}✗ 일부 검증 실패. 위의 문제를 해결 후 다시 시도하세요.{RESET}")
@@ -283,7 +293,7 @@ def main():
         'tables': check_database_tables(),
         'bsc_addresses': check_bsc_addresses(),
         'btc_addresses': check_btc_addresses(),
-        'checkpoint': check_checkpoint_files(),
+        'ingestion_state': check_ingestion_state(),
         'disk_space': check_disk_space(),
         'scripts': check_collection_scripts()
     }
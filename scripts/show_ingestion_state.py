@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+수집 워터마크(ingestion_state) 현황 출력
+(기존 collection_checkpoint.json / checkpoints/bsc_hybrid_checkpoint.json 대체)
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+from supabase import create_client
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+load_dotenv(PROJECT_ROOT / 'config' / '.env')
+
+from src.collectors.ingestion_state import SQLiteIngestionState, SupabaseIngestionState
+
+SQLITE_DB_PATH = PROJECT_ROOT / 'data' / 'project.db'
+
+def get_supabase_client():
+    """Supabase 클라이언트 생성"""
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    
+    if not supabase_url or not supabase_key:
+        raise ValueError("❌ SUPABASE_URL 또는 SUPABASE_SERVICE_ROLE_KEY이 설정되지 않았습니다")
+    
+    return create_client(supabase_url, supabase_key)
+
+def print_state(title: str, rows):
+    """(source, stream)별 워터마크 요약 출력"""
+    print(f"\n{title}")
+    if not rows:
+        print("   (워터마크 없음 - 다음 실행은 처음부터 수집)")
+        return
+    
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['source'], row['stream']), []).append(row)
+    
+    for (source, stream), group in sorted(groups.items()):
+        timestamps = [row['last_timestamp'] for row in group if row.get('last_timestamp')]
+        blocks = [row['last_block'] for row in group if row.get('last_block') is not None]
+        line = f"   {source}/{stream}: {len(group)}개"
+        if timestamps:
+            line += f", 가장 늦은 {min(timestamps)} ~ 가장 최근 {max(timestamps)}"
+        if blocks:
+            line += f", 블록 ~{max(blocks):,}"
+        print(line)
+        for row in group[:5]:
+            print(f"      - {row['entity']}: {row.get('last_timestamp') or '-'} (블록 {row.get('last_block') or '-'})")
+        if len(group) > 5:
+            print(f"      ... 외 {len(group) - 5}개")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='수집 워터마크(ingestion_state) 현황 출력')
+    parser.add_argument('--source', default=None, help='특정 source만 출력 (예: binance, blockstream, bscscan)')
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("📋 수집 워터마크 (ingestion_state)")
+    print("=" * 70)
+    
+    try:
+        print_state("☁️  Supabase", SupabaseIngestionState(get_supabase_client()).all(source=args.source))
+    except Exception as e:
+        print(f"\n⚠️ Supabase 워터마크 조회 실패: {e} (sql/create_ingestion_state.sql 적용 필요)")
+    
+    if SQLITE_DB_PATH.exists():
+        print_state("🗄️  SQLite (data/project.db)", SQLiteIngestionState(SQLITE_DB_PATH).all(source=args.source))
+
+if __name__ == '__main__':
+    main()
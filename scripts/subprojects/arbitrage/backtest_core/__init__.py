@@ -0,0 +1,21 @@
+"""
+Project 2: 통합 차익거래 백테스트 엔진
+- components: 시그널 / 청산 규칙 / 비용 모델
+- core: 배열 기반 단일 포지션 백테스트 루프
+- engine: 단계별 API (load_data → calculate_indicators → generate_signals → run_backtest)
+- presets: 기존 backtest_engine* 4종 설정
+"""
+
+from .components import (
+    PAIR_PRICES,
+    ALL_PAIRS,
+    BestPairSignal,
+    ZScoreExit,
+    StopLossExit,
+    MaxHoldingExit,
+    RoundTripCost,
+)
+from .core import PositionState, close_open_position, gross_return, simulate
+from .engine import UnifiedArbitrageBacktest, trade_metrics
+from .presets import PRESETS, make_backtest, legacy_trades
+
@@ -0,0 +1,120 @@
+"""
+통합 백테스트 엔진 컴포넌트
+- 시그널: 진입 시그널 생성 (쌍별 Z-Score 행렬 → 시그널 / 선택 쌍)
+- 청산 규칙: 보유 포지션 청산 여부 판단 (순서대로 확인, 먼저 만족한 규칙이 청산 사유)
+- 비용 모델: 총 수익률 → 순수익률
+"""
+
+import numpy as np
+
+
+# 거래소 쌍별 가격 컬럼 (높은 쪽, 낮은 쪽)
+PAIR_PRICES = {
+    'upbit_binance': ('upbit_price', 'binance_krw'),
+    'upbit_bitget': ('upbit_price', 'bitget_krw'),
+    'upbit_bybit': ('upbit_price', 'bybit_krw'),
+    'binance_bitget': ('binance_krw', 'bitget_krw'),
+    'binance_bybit': ('binance_krw', 'bybit_krw'),
+    'bitget_bybit': ('bitget_krw', 'bybit_krw')
+}
+
+ALL_PAIRS = list(PAIR_PRICES.keys())
+
+
+def pair_exchanges(pairs):
+    """거래소 쌍 목록에 포함된 거래소 (등장 순서 유지)"""
+    exchanges = []
+    for pair in pairs:
+        for exchange in pair.split('_'):
+            if exchange not in exchanges:
+                exchanges.append(exchange)
+    return exchanges
+
+
+class BestPairSignal:
+    """|Z-Score|가 가장 큰 쌍을 선택해 entry_z 초과 시 Z-Score 부호 방향으로 진입"""
+
+    def __init__(self, entry_z=2.5, exclude=()):
+        self.entry_z = entry_z
+        self.exclude = tuple(exclude)
+
+    def generate(self, z, pairs):
+        """
+        Args:
+            z: (봉 수 × 쌍 수) Z-Score 행렬
+            pairs: 행렬 열 순서의 쌍 이름
+
+        Returns:
+            (signal, best): 봉별 시그널 (1: Short Premium, -1: Long Premium, 0: 없음),
+            봉별 선택 쌍 인덱스
+        """
+        abs_z = np.nan_to_num(np.abs(z), nan=0.0)
+        for pair in self.exclude:
+            if pair in pairs:
+                abs_z[:, pairs.index(pair)] = 0
+
+        rows = np.arange(len(z))
+        # argmax는 동률일 때 앞쪽 쌍 선택 (기존 dict max와 동일)
+        best = abs_z.argmax(axis=1) if len(z) else np.empty(0, dtype=int)
+        best_z = abs_z[rows, best]
+        signal = np.where(best_z > self.entry_z, np.sign(z[rows, best]), 0).astype(int)
+        return signal, best
+
+
+class ZScoreExit:
+    """Z-Score 평균 회귀 청산"""
+
+    reason = 'z_score_reversion'
+
+    def __init__(self, exit_z=0.0, symmetric=True):
+        """
+        Args:
+            exit_z: 청산 기준
+            symmetric: True면 |Z| < |exit_z|, False면 포지션 방향 기준 (position × Z < exit_z)
+        """
+        self.exit_z = exit_z
+        self.symmetric = symmetric
+
+    def check(self, z, position, current_return, held_days):
+        if self.symmetric:
+            return abs(z) < abs(self.exit_z)
+        return position * z < self.exit_z
+
+
+class StopLossExit:
+    """보유 수익률 손절매"""
+
+    reason = 'stop_loss'
+
+    def __init__(self, stop_loss=-0.03):
+        self.stop_loss = stop_loss
+
+    def check(self, z, position, current_return, held_days):
+        return current_return <= self.stop_loss
+
+
+class MaxHoldingExit:
+    """최대 보유 기간 초과 청산"""
+
+    reason = 'max_holding_days'
+
+    def __init__(self, max_holding_days=30):
+        self.max_holding_days = max_holding_days
+
+    def check(self, z, position, current_return, held_days):
+        return held_days >= self.max_holding_days
+
+
+class RoundTripCost:
+    """진입 / 청산 각 1회 수수료 + 슬리피지"""
+
+    def __init__(self, fee_rate=0.0005, slippage=0.0002):
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+
+    @property
+    def cost_rate(self):
+        return self.fee_rate + self.slippage
+
+    def net_return(self, gross_return, pair=None):
+        return gross_return - (self.cost_rate * 2)
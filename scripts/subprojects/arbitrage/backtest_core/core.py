@@ -0,0 +1,156 @@
+"""
+통합 백테스트 엔진 배열 코어
+- 지표 / 시그널이 붙은 봉 배열을 순회하며 단일 포지션 진입 / 청산 / 자본 갱신
+- 포지션 상태(PositionState)를 호출 간 유지 가능 (청크 스트리밍)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+class PositionState:
+    """보유 포지션 / 자본 상태"""
+
+    def __init__(self, capital):
+        self.capital = capital
+        self.position = 0
+        self.pair = -1
+        self.entry_price_high = 0.0
+        self.entry_price_low = 0.0
+        self.entry_date = None
+        self.entry_bar = None
+        self.bar_count = 0
+
+    def close(self):
+        self.position = 0
+        self.pair = -1
+        self.entry_date = None
+        self.entry_bar = None
+
+
+def gross_return(position, entry_high, entry_low, current_high, current_low, signed_long_premium=False):
+    """
+    두 거래소 50:50 포지션 수익률
+
+    Short Premium: 높은 쪽 매도 / 낮은 쪽 매수.
+    signed_long_premium=False이면 Long Premium도 같은 식을 사용 (기존 3거래소 이후 엔진의
+    진입가 뒤바꿈과 동일), True이면 두 레그 부호를 반대로 계산 (기존 v1 엔진)
+    """
+    ret = ((entry_high - current_high) / entry_high + (current_low - entry_low) / entry_low) / 2
+    if signed_long_premium and position == -1:
+        return -ret
+    return ret
+
+
+def _exit(state, current_date, current_return, pair, cost_model, exit_reason, bar):
+    """bar번째 봉에서 청산 반영 (자본 갱신, 상태 초기화) → 거래 기록"""
+    net_return = cost_model.net_return(current_return, pair)
+    profit = state.capital * net_return
+    state.capital += profit
+    held = current_date - state.entry_date
+
+    record = {
+        'entry_date': pd.Timestamp(state.entry_date),
+        'exit_date': pd.Timestamp(current_date),
+        'holding_days': pd.Timedelta(held).days,
+        'holding_bars': bar - state.entry_bar,
+        'pair': pair,
+        'direction': 'Short Premium' if state.position == 1 else 'Long Premium',
+        'return': net_return,
+        'profit': profit,
+        'capital': state.capital,
+        'exit_reason': exit_reason
+    }
+    state.close()
+    return record
+
+
+def simulate(dates, high, low, z, signal, signal_pair, pairs, exits, cost_model, state,
+             signed_long_premium=False):
+    """
+    봉 배열 백테스트
+
+    Args:
+        dates: 봉 시각 (datetime64 배열)
+        high / low: (봉 수 × 쌍 수) 쌍별 높은 쪽 / 낮은 쪽 원화 가격
+        z: (봉 수 × 쌍 수) 쌍별 Z-Score
+        signal: 봉별 진입 시그널 (1 / -1 / 0)
+        signal_pair: 봉별 진입 쌍 인덱스 (없으면 -1)
+        pairs: 쌍 이름 (열 순서)
+        exits: 청산 규칙 목록 (앞에서부터 확인)
+        cost_model: net_return(gross, pair)을 제공하는 비용 모델
+        state: PositionState (호출 후 갱신된 상태 유지)
+
+    Returns:
+        (history, equity): 거래 기록 dict 목록, 봉별 자본 배열
+    """
+    history = []
+    n = len(dates)
+    equity = np.empty(n)
+
+    for i in range(n):
+        current_date = dates[i]
+
+        if state.position == 0:
+            if signal[i] != 0 and signal_pair[i] >= 0:
+                j = int(signal_pair[i])
+                state.position = int(signal[i])
+                state.pair = j
+                state.entry_date = current_date
+                state.entry_bar = state.bar_count
+                state.entry_price_high = high[i, j]
+                state.entry_price_low = low[i, j]
+        else:
+            j = state.pair
+            current_return = gross_return(
+                state.position, state.entry_price_high, state.entry_price_low,
+                high[i, j], low[i, j], signed_long_premium
+            )
+            held = current_date - state.entry_date
+            held_days = held / ONE_DAY
+
+            exit_reason = None
+            for rule in exits:
+                if rule.check(z[i, j], state.position, current_return, held_days):
+                    exit_reason = rule.reason
+                    break
+
+            if exit_reason:
+                history.append(
+                    _exit(state, current_date, current_return, pairs[j], cost_model, exit_reason, state.bar_count)
+                )
+
+        equity[i] = state.capital
+        state.bar_count += 1
+
+    return history, equity
+
+
+def close_open_position(state, current_date, high, low, pairs, cost_model, reason='end_of_period',
+                        signed_long_premium=False):
+    """
+    구간 마지막 봉에서 보유 포지션 강제 청산 (Walk-Forward 폴드 종료 등)
+
+    Args:
+        state: simulate를 마친 PositionState
+        current_date: 마지막 봉 시각
+        high / low: 마지막 봉의 쌍별 높은 쪽 / 낮은 쪽 가격 (쌍 수 길이 배열)
+        pairs: 쌍 이름 (열 순서)
+        cost_model: 비용 모델
+        reason: 청산 사유
+
+    Returns:
+        거래 기록 dict (보유 포지션이 없으면 None)
+    """
+    if state.position == 0:
+        return None
+    j = state.pair
+    current_return = gross_return(
+        state.position, state.entry_price_high, state.entry_price_low,
+        high[j], low[j], signed_long_premium
+    )
+    # simulate가 마지막 봉까지 bar_count를 증가시켰으므로 마지막 봉 = bar_count - 1
+    return _exit(state, current_date, current_return, pairs[j], cost_model, reason, state.bar_count - 1)
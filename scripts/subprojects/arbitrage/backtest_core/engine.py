@@ -0,0 +1,366 @@
+"""
+통합 차익거래 백테스트 엔진
+- 데이터 로드 → 지표 → 시그널 → 백테스트 → 성과 분석 단계 API (기존 엔진과 동일)
+- 시그널 / 청산 / 비용 컴포넌트 교체 가능
+- 백테스트 루프는 배열 코어(core.simulate) 공유
+"""
+
+import sqlite3
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import os
+
+from .components import (
+    PAIR_PRICES,
+    ALL_PAIRS,
+    pair_exchanges,
+    BestPairSignal,
+    ZScoreExit,
+    StopLossExit,
+    MaxHoldingExit,
+    RoundTripCost,
+)
+from .core import PositionState, simulate
+
+# 환경별 경로 설정
+if os.path.exists('/mount/src'):
+    # Streamlit Cloud
+    ROOT = Path('/mount/src/whale-arbitrage')
+    DB_PATH = Path('/tmp') / "project.db"
+elif os.path.exists('/app'):
+    # Docker 컨테이너 내부
+    ROOT = Path('/app')
+    DB_PATH = ROOT / "data" / "project.db"
+else:
+    # 로컬 개발 환경
+    ROOT = Path(__file__).resolve().parents[4]
+    DB_PATH = ROOT / "data" / "project.db"
+
+
+class UnifiedArbitrageBacktest:
+    def __init__(
+        self,
+        initial_capital=100_000_000,
+        fee_rate=0.0005,
+        slippage=0.0002,
+        pairs=None,
+        rolling_window=30,
+        entry_z=2.5,
+        exit_z=0.0,
+        symmetric_exit=True,
+        stop_loss=-0.03,
+        max_holding_days=30,
+        exclude_pairs=(),
+        dropna='prices',
+        drop_warmup=True,
+        join='left',
+        fill_krw_usd='ffill_bfill',
+        signed_long_premium=False,
+        signal=None,
+        exits=None,
+        cost_model=None,
+        db_path=None,
+        data_loader=None
+    ):
+        """
+        Args:
+            pairs: 거래소 쌍 목록 (기본: 6개 쌍 전체, 순서가 동률 시 선택 우선순위)
+            rolling_window: Z-Score 이동평균 기간
+            entry_z / exit_z: 진입 / 청산 Z-Score 기준
+            symmetric_exit: True면 |Z| < |exit_z| 청산, False면 포지션 방향 기준 청산 (v1)
+            stop_loss / max_holding_days: None이면 해당 청산 규칙 미사용
+            exclude_pairs: 진입 후보에서 제외할 쌍
+            dropna: 'prices'면 거래소 가격 NULL 행만 제거, 'all'이면 지표 NULL 행도 제거
+            drop_warmup: 처음 rolling_window개 행 추가 제외 (Look-ahead Bias 방지)
+            join: 'left'면 업비트 기준 LEFT JOIN, 'inner'면 모든 거래소 가격이 있는 날만 사용
+            fill_krw_usd: 'ffill' 또는 'ffill_bfill'
+            signed_long_premium: Long Premium 수익률 부호 반전 여부 (core.gross_return 참고)
+            signal / exits / cost_model: 컴포넌트 직접 지정 (기본: 위 인자로 생성)
+            db_path: SQLite 경로 (첫 load_data 호출 시 연결)
+            data_loader: load_exchange_data()를 제공하는 로더 (Supabase 지원, 실패 시 SQLite)
+        """
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.pairs = list(pairs) if pairs else list(ALL_PAIRS)
+        self.rolling_window = rolling_window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.stop_loss = stop_loss
+        self.max_holding_days = max_holding_days
+        self.exclude_pairs = tuple(exclude_pairs)
+        self.dropna = dropna
+        self.drop_warmup = drop_warmup
+        self.join = join
+        self.fill_krw_usd = fill_krw_usd
+        self.signed_long_premium = signed_long_premium
+        self.db_path = db_path or DB_PATH
+        self.data_loader = data_loader
+        self.conn = None
+
+        unknown = [p for p in self.pairs if p not in PAIR_PRICES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 거래소 쌍: {unknown}")
+        if dropna not in ('prices', 'all'):
+            raise ValueError(f"dropna는 'prices' 또는 'all'이어야 합니다: {dropna}")
+        if join not in ('left', 'inner'):
+            raise ValueError(f"join은 'left' 또는 'inner'여야 합니다: {join}")
+
+        self.exchanges = pair_exchanges(['upbit'] + self.pairs)
+        self.price_cols = [f'{ex}_price' for ex in self.exchanges]
+
+        self.signal = signal or BestPairSignal(entry_z, exclude=self.exclude_pairs)
+        if exits is None:
+            exits = [ZScoreExit(exit_z, symmetric=symmetric_exit)]
+            if stop_loss is not None:
+                exits.append(StopLossExit(stop_loss))
+            if max_holding_days is not None:
+                exits.append(MaxHoldingExit(max_holding_days))
+        self.exits = list(exits)
+        self.cost_model = cost_model or RoundTripCost(fee_rate, slippage)
+
+    def set_thresholds(self, entry_z=None, exit_z=None):
+        """진입 / 청산 기준 변경 (시그널 / Z-Score 청산 컴포넌트에 반영)"""
+        if entry_z is not None:
+            self.entry_z = entry_z
+            self.signal.entry_z = entry_z
+        if exit_z is not None:
+            self.exit_z = exit_z
+            for rule in self.exits:
+                if isinstance(rule, ZScoreExit):
+                    rule.exit_z = exit_z
+
+    def load_data(self, start_date, end_date, coin='BTC'):
+        """거래소 데이터 로드 및 병합 (선택된 쌍에 필요한 거래소만)"""
+        if self.data_loader is not None:
+            try:
+                df = self.data_loader.load_exchange_data(start_date, end_date, coin)
+                if not df.empty:
+                    return df
+            except Exception as e:
+                import logging
+                logging.warning(f"DataLoader를 통한 데이터 로드 실패, SQLite 직접 사용: {e}")
+
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path)
+
+        join = "JOIN" if self.join == 'inner' else "LEFT JOIN"
+        columns = ["u.date", "u.trade_price as upbit_price"]
+        joins = []
+        params = []
+        for ex in self.exchanges:
+            if ex == 'upbit':
+                continue
+            columns.append(f"{ex}.close as {ex}_price")
+            joins.append(f"{join} {ex}_spot_daily {ex} ON u.date = {ex}.date AND {ex}.symbol = ?")
+            params.append(f"{coin}USDT")
+        columns.append("e.krw_usd")
+        joins.append("LEFT JOIN exchange_rate e ON u.date = e.date")
+
+        query = f"""
+        SELECT {', '.join(columns)}
+        FROM upbit_daily u
+        {' '.join(joins)}
+        WHERE u.market = ?
+        AND u.date BETWEEN ? AND ?
+        ORDER BY u.date
+        """
+        df = pd.read_sql(query, self.conn, params=(*params, f"KRW-{coin}", start_date, end_date))
+        return self.prepare(df)
+
+    def prepare(self, df):
+        """조인 결과 후처리 (조인 방식, 환율 결측치, USDT 가격 원화 환산)"""
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date'])
+
+        if self.join == 'inner':
+            df = df.dropna(subset=self.price_cols).reset_index(drop=True)
+
+        # 환율 결측치 처리 (전일 값으로 채움)
+        df['krw_usd'] = df['krw_usd'].ffill()
+        if self.fill_krw_usd == 'ffill_bfill':
+            df['krw_usd'] = df['krw_usd'].bfill()
+
+        self._add_krw_columns(df)
+        return df
+
+    def _add_krw_columns(self, df):
+        for ex in self.exchanges:
+            if ex != 'upbit' and f'{ex}_krw' not in df.columns:
+                df[f'{ex}_krw'] = df[f'{ex}_price'] * df['krw_usd']
+
+    def calculate_indicators(self, df):
+        """쌍별 프리미엄 및 Z-Score 계산"""
+        df = df.copy()
+        self._add_krw_columns(df)
+
+        premiums = pd.DataFrame({
+            pair: (df[high] - df[low]) / df[low]
+            for pair, (high, low) in ((p, PAIR_PRICES[p]) for p in self.pairs)
+        }, index=df.index)
+        rolling = premiums.rolling(window=self.rolling_window)
+        means = rolling.mean()
+        stds = rolling.std()
+
+        indicator_cols = []
+        for pair in self.pairs:
+            df[f'premium_{pair}'] = premiums[pair]
+            df[f'premium_{pair}_mean'] = means[pair]
+            df[f'premium_{pair}_std'] = stds[pair]
+            df[f'z_score_{pair}'] = (premiums[pair] - means[pair]) / stds[pair]
+            indicator_cols += [f'premium_{pair}', f'premium_{pair}_mean', f'premium_{pair}_std', f'z_score_{pair}']
+
+        # NULL 값 처리
+        if self.dropna == 'all':
+            krw_cols = [f'{ex}_krw' for ex in self.exchanges if ex != 'upbit']
+            subset = self.price_cols + krw_cols + (['krw_usd'] if krw_cols else []) + indicator_cols
+        else:
+            subset = self.price_cols
+        df = df.dropna(subset=subset)
+
+        # 처음 rolling_window개 행 제외 (Look-ahead Bias 방지)
+        if self.drop_warmup and len(df) > self.rolling_window:
+            df = df.iloc[self.rolling_window:].reset_index(drop=True)
+
+        return df
+
+    def generate_signals(self, df):
+        """시그널 컴포넌트로 진입 시그널 생성 (벡터화)"""
+        df = df.copy()
+        z = df[[f'z_score_{p}' for p in self.pairs]].to_numpy(dtype=float)
+        signal, best = self.signal.generate(z, self.pairs)
+
+        pair_names = np.array(self.pairs, dtype=object)
+        df['signal'] = signal
+        df['signal_pair'] = np.where(signal != 0, pair_names[best], None)
+        df['signal_direction'] = np.where(
+            signal == 1, 'short_premium', np.where(signal == -1, 'long_premium', None)
+        )
+        return df
+
+    def run_backtest(self, df):
+        """
+        백테스트 실행
+
+        Returns:
+            (trade_df, daily_capital_df)
+        """
+        n = len(df)
+        z = df[[f'z_score_{p}' for p in self.pairs]].to_numpy(dtype=float).reshape(n, len(self.pairs))
+        high = np.column_stack([df[PAIR_PRICES[p][0]].to_numpy(dtype=float) for p in self.pairs]) if n else z
+        low = np.column_stack([df[PAIR_PRICES[p][1]].to_numpy(dtype=float) for p in self.pairs]) if n else z
+
+        pair_index = {p: j for j, p in enumerate(self.pairs)}
+        signal_pair = np.array([pair_index.get(p, -1) for p in df['signal_pair']], dtype=int)
+
+        state = PositionState(self.initial_capital)
+        history, equity = simulate(
+            df['date'].to_numpy(), high, low, z,
+            df['signal'].to_numpy(), signal_pair, self.pairs,
+            self.exits, self.cost_model, state, self.signed_long_premium
+        )
+        return pd.DataFrame(history), pd.DataFrame({'date': df['date'].to_numpy(), 'capital': equity})
+
+    def calculate_benchmark(self, df):
+        """벤치마크 계산 (Buy & Hold)"""
+        if len(df) < 2:
+            return 0.0
+        first_price = df['upbit_price'].iloc[0]
+        last_price = df['upbit_price'].iloc[-1]
+        return (last_price - first_price) / first_price
+
+    def analyze_performance(self, trade_df, daily_capital_df, benchmark_return):
+        """성과 분석 (일별 자본 곡선 기준 MDD / 연율화 Sharpe)"""
+        if trade_df.empty:
+            return {
+                "total_trades": 0,
+                "final_return": 0.0,
+                "annualized_return": 0.0,
+                "sharpe_ratio": 0.0,
+                "win_rate": 0.0,
+                "mdd": 0.0,
+                "max_holding_days": 0,
+                "avg_holding_days": 0.0,
+                "benchmark_return": benchmark_return,
+                "excess_return": 0.0
+            }
+
+        total_trades = len(trade_df)
+        final_capital = trade_df['capital'].iloc[-1]
+        final_return = (final_capital - self.initial_capital) / self.initial_capital
+
+        if len(daily_capital_df) > 1:
+            days = (daily_capital_df['date'].iloc[-1] - daily_capital_df['date'].iloc[0]).days
+            years = days / 365.25
+            annualized_return = (1 + final_return) ** (1 / years) - 1 if years > 0 else 0.0
+        else:
+            annualized_return = 0.0
+
+        win_rate = (trade_df['return'] > 0).mean()
+
+        capital = daily_capital_df['capital']
+        peak = capital.cummax()
+        mdd = ((capital - peak) / peak).min()
+
+        if len(daily_capital_df) > 1:
+            daily_returns = capital.pct_change().dropna()
+            if len(daily_returns) > 0 and daily_returns.std() > 0:
+                sharpe = (daily_returns.mean() / daily_returns.std()) * np.sqrt(365.25)
+            else:
+                sharpe = 0.0
+        else:
+            sharpe = 0.0
+
+        max_holding = trade_df['holding_days'].max() if 'holding_days' in trade_df.columns else 0
+        avg_holding = trade_df['holding_days'].mean() if 'holding_days' in trade_df.columns else 0.0
+
+        return {
+            "total_trades": total_trades,
+            "final_return": final_return,
+            "annualized_return": annualized_return,
+            "sharpe_ratio": sharpe,
+            "win_rate": win_rate,
+            "mdd": mdd,
+            "max_holding_days": max_holding,
+            "avg_holding_days": avg_holding,
+            "benchmark_return": benchmark_return,
+            "excess_return": final_return - benchmark_return
+        }
+
+
+def trade_metrics(trade_df, initial_capital):
+    """거래 내역 기준 성과 (일별 자본 곡선이 없는 기존 v1 / 3거래소 엔진 지표)"""
+    if trade_df.empty:
+        return {
+            "total_trades": 0,
+            "final_return": 0.0,
+            "sharpe_ratio": 0.0,
+            "win_rate": 0.0,
+            "mdd": 0.0
+        }
+
+    total_trades = len(trade_df)
+    final_return = (trade_df['capital'].iloc[-1] - initial_capital) / initial_capital
+
+    # 승률
+    win_rate = (trade_df['return'] > 0).mean()
+
+    # MDD (자본금 기준)
+    capital_curve = trade_df['capital']
+    peak = capital_curve.cummax()
+    mdd = ((capital_curve - peak) / peak).min()
+
+    # Sharpe (간단 계산: 평균 수익률 / 표준편차) * sqrt(거래횟수)
+    if trade_df['return'].std() == 0:
+        sharpe = 0
+    else:
+        sharpe = (trade_df['return'].mean() / trade_df['return'].std()) * np.sqrt(total_trades)
+
+    return {
+        "total_trades": total_trades,
+        "final_return": final_return,
+        "sharpe_ratio": sharpe,
+        "win_rate": win_rate,
+        "mdd": mdd
+    }
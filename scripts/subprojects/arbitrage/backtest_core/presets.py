@@ -0,0 +1,80 @@
+"""
+기존 백테스트 엔진 설정 프리셋
+- v1: backtest_engine.ArbitrageBacktest (업비트-바이낸스)
+- 3exchanges: backtest_engine_3exchanges.ArbitrageBacktest3Exchanges
+- improved: backtest_engine_improved.ImprovedArbitrageBacktest (손절매 / 최대 보유 기간)
+- optimized: backtest_engine_optimized.OptimizedArbitrageBacktest (6개 쌍)
+"""
+
+from .engine import UnifiedArbitrageBacktest
+
+
+THREE_EXCHANGE_PAIRS = ['upbit_binance', 'upbit_bitget', 'binance_bitget']
+
+PRESETS = {
+    'v1': {
+        'pairs': ['upbit_binance'],
+        'entry_z': 2.0,
+        'exit_z': 0.5,
+        'symmetric_exit': False,
+        'stop_loss': None,
+        'max_holding_days': None,
+        'dropna': 'all',
+        'drop_warmup': False,
+        'join': 'inner',
+        'fill_krw_usd': 'ffill',
+        'signed_long_premium': True,
+    },
+    '3exchanges': {
+        'pairs': THREE_EXCHANGE_PAIRS,
+        'entry_z': 2.0,
+        'exit_z': 0.5,
+        'stop_loss': None,
+        'max_holding_days': None,
+        'dropna': 'all',
+        'drop_warmup': False,
+        'fill_krw_usd': 'ffill',
+    },
+    'improved': {
+        'pairs': THREE_EXCHANGE_PAIRS,
+        'entry_z': 2.0,
+        'exit_z': 0.5,
+        'stop_loss': -0.03,
+        'max_holding_days': 30,
+        'dropna': 'all',
+    },
+    'optimized': {
+        'entry_z': 2.5,
+        'exit_z': 0.0,
+        'stop_loss': -0.03,
+        'max_holding_days': 30,
+    },
+}
+
+# 프리셋별 기존 엔진 거래 내역 컬럼 (v1은 direction을 position 컬럼으로 기록)
+TRADE_COLUMNS = {
+    'v1': ['entry_date', 'exit_date', 'direction', 'return', 'profit', 'capital'],
+    '3exchanges': ['entry_date', 'exit_date', 'pair', 'direction', 'return', 'profit', 'capital'],
+    'improved': [
+        'entry_date', 'exit_date', 'holding_days', 'pair', 'direction',
+        'return', 'profit', 'capital', 'exit_reason'
+    ],
+}
+TRADE_COLUMNS['optimized'] = TRADE_COLUMNS['improved']
+
+
+def make_backtest(preset='optimized', **overrides):
+    """프리셋 설정으로 통합 엔진 생성 (overrides가 프리셋 값을 덮어씀)"""
+    if preset not in PRESETS:
+        raise ValueError(f"알 수 없는 프리셋: {preset} (사용 가능: {list(PRESETS)})")
+    return UnifiedArbitrageBacktest(**{**PRESETS[preset], **overrides})
+
+
+def legacy_trades(trade_df, preset):
+    """통합 엔진 거래 내역을 기존 엔진 컬럼 형식으로 변환"""
+    if trade_df.empty:
+        return trade_df
+    trades = trade_df[TRADE_COLUMNS[preset]]
+    if preset == 'v1':
+        trades = trades.rename(columns={'direction': 'position'})
+    return trades
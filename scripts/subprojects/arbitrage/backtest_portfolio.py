@@ -0,0 +1,297 @@
+"""
+Project 2: 포트폴리오 모드 차익거래 백테스트 엔진
+- 거래소 쌍별 독립 포지션 동시 보유 (최대 6개 쌍)
+- 자본 배분기: 균등(equal) / Z-Score 가중(zscore) / 상한(capped)
+- 보유 포지션 봉마다 시가평가(Mark-to-Market)
+- 청산 규칙 / 비용 모델 / 레그 수익률은 backtest_core 컴포넌트 공유 (쌍 배열에 그대로 적용)
+- 쌍 차원은 numpy 배열 연산 → 쌍을 늘려도 Python 루프는 봉 개수만큼만 실행
+- 쌍별 성과 기여도 + 통합 자본 곡선
+"""
+
+import pandas as pd
+import numpy as np
+
+from backtest_core import PAIR_PRICES, ALL_PAIRS, ZScoreExit, StopLossExit, MaxHoldingExit, RoundTripCost, gross_return
+from backtest_streaming import periods_per_year, iter_daily_chunks
+
+
+def allocate_equal(free_cash, equity, abs_z, n_flat, entry_z, max_pair_weight):
+    """균등 배분: 비어있는 쌍 슬롯마다 남은 현금의 1/n"""
+    per_slot = free_cash / max(n_flat, 1)
+    return np.full(len(abs_z), per_slot)
+
+
+def allocate_zscore(free_cash, equity, abs_z, n_flat, entry_z, max_pair_weight):
+    """Z-Score 가중 배분: 시그널 없는 빈 슬롯은 entry_z 가중치로 예약"""
+    reserved = entry_z * max(n_flat - len(abs_z), 0)
+    weights = abs_z / (abs_z.sum() + reserved)
+    return free_cash * weights
+
+
+def allocate_capped(free_cash, equity, abs_z, n_flat, entry_z, max_pair_weight):
+    """상한 배분: 남은 현금을 시그널 쌍끼리 나누되 쌍별 총자본의 max_pair_weight 이하"""
+    per_pair = min(free_cash / len(abs_z), equity * max_pair_weight)
+    return np.full(len(abs_z), per_pair)
+
+
+ALLOCATORS = {
+    'equal': allocate_equal,
+    'zscore': allocate_zscore,
+    'capped': allocate_capped,
+}
+
+
+class PortfolioArbitrageBacktest:
+    def __init__(
+        self,
+        initial_capital=100_000_000,
+        fee_rate=0.0005,
+        slippage=0.0002,
+        stop_loss=-0.03,
+        max_holding_days=30,
+        rolling_window=30,
+        entry_z=2.5,
+        exit_z=0.5,
+        pairs=None,
+        allocator='equal',
+        max_pair_weight=0.5,
+        bar_interval='1d'
+    ):
+        if allocator not in ALLOCATORS:
+            raise ValueError(f"지원하지 않는 배분 방식: {allocator} (가능: {list(ALLOCATORS)})")
+
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.stop_loss = stop_loss
+        self.max_holding_days = max_holding_days
+        self.rolling_window = rolling_window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.pairs = list(pairs) if pairs else list(ALL_PAIRS)
+        self.allocator = allocator
+        self.max_pair_weight = max_pair_weight
+        self.bar_interval = bar_interval
+
+        # 단일 포지션 엔진과 같은 청산 규칙 / 비용 모델 (check는 쌍 배열에 원소별로 적용)
+        self.exits = [ZScoreExit(exit_z), StopLossExit(stop_loss), MaxHoldingExit(max_holding_days)]
+        self.cost_model = RoundTripCost(fee_rate, slippage)
+
+        self.required_cols = []
+        for pair in self.pairs:
+            for col in PAIR_PRICES[pair]:
+                if col not in self.required_cols:
+                    self.required_cols.append(col)
+
+    def load_data(self, start_date, end_date, coin='BTC', db_path=None):
+        """4개 거래소 일봉 데이터 로드 (스트리밍 로더를 한 번에 병합)"""
+        chunks = list(iter_daily_chunks(start_date, end_date, coin=coin, db_path=db_path))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def calculate_indicators(self, df):
+        """쌍별 프리미엄 및 Z-Score 계산 (모든 쌍을 한 번의 rolling으로)"""
+        df = df.copy()
+        premiums = pd.DataFrame({
+            pair: (df[PAIR_PRICES[pair][0]] - df[PAIR_PRICES[pair][1]]) / df[PAIR_PRICES[pair][1]]
+            for pair in self.pairs
+        })
+        rolling = premiums.rolling(window=self.rolling_window)
+        z_scores = (premiums - rolling.mean()) / rolling.std()
+
+        for pair in self.pairs:
+            df[f'premium_{pair}'] = premiums[pair]
+            df[f'z_score_{pair}'] = z_scores[pair]
+
+        # NULL 값 처리 후 처음 rolling_window일 제거 (Look-ahead Bias 방지)
+        df = df.dropna(subset=self.required_cols)
+        if len(df) > self.rolling_window:
+            df = df.iloc[self.rolling_window:]
+        return df.reset_index(drop=True)
+
+    def run_backtest(self, df):
+        """
+        포트폴리오 백테스트 실행
+
+        Returns:
+            trades_df: 청산된 거래 (쌍, 배분 금액, 수익률, 손익)
+            equity_df: 봉별 현금 / 투자금 / 시가평가 자본 + 쌍별 누적 손익(pnl_<pair>)
+        """
+        n_bars = len(df)
+        n_pairs = len(self.pairs)
+        allocate = ALLOCATORS[self.allocator]
+        one_day = np.timedelta64(1, 'D')
+
+        dates = df['date'].to_numpy()
+        high = np.column_stack([df[PAIR_PRICES[p][0]].to_numpy(dtype=float) for p in self.pairs])
+        low = np.column_stack([df[PAIR_PRICES[p][1]].to_numpy(dtype=float) for p in self.pairs])
+        z = np.column_stack([df[f'z_score_{p}'].to_numpy(dtype=float) for p in self.pairs])
+        abs_z = np.nan_to_num(np.abs(z), nan=0.0)
+
+        # 쌍별 포지션 상태 (길이 n_pairs 배열)
+        position = np.zeros(n_pairs, dtype=int)
+        entry_high = np.zeros(n_pairs)
+        entry_low = np.zeros(n_pairs)
+        entry_time = np.full(n_pairs, np.datetime64('NaT'), dtype='datetime64[ns]')
+        entry_bar = np.zeros(n_pairs, dtype=int)
+        allocation = np.zeros(n_pairs)
+        realized = np.zeros(n_pairs)
+
+        cash = float(self.initial_capital)
+        trades = []
+        cash_curve = np.empty(n_bars)
+        equity_curve = np.empty(n_bars)
+        invested_curve = np.empty(n_bars)
+        open_count = np.empty(n_bars, dtype=int)
+        pair_pnl = np.empty((n_bars, n_pairs))
+
+        for t in range(n_bars):
+            is_open = position != 0
+
+            # 1. 보유 포지션 수익률 (공통 코어의 레그 수익률 정의)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                current_return = gross_return(position, entry_high, entry_low, high[t], low[t])
+            current_return = np.where(is_open, current_return, 0.0)
+
+            # 2. 청산: 청산 규칙을 앞에서부터 확인, 먼저 만족한 규칙이 청산 사유
+            held = dates[t] - entry_time
+            held_days = held / one_day
+            reasons = np.full(n_pairs, '', dtype=object)
+            for rule in self.exits:
+                pending = is_open & (reasons == '')
+                hit = np.asarray(rule.check(z[t], position, current_return, held_days), dtype=bool)
+                reasons[pending & hit] = rule.reason
+            exit_mask = reasons != ''
+
+            for j in np.flatnonzero(exit_mask):
+                net_return = self.cost_model.net_return(current_return[j], self.pairs[j])
+                profit = allocation[j] * net_return
+                cash += allocation[j] + profit
+                realized[j] += profit
+                trades.append({
+                    'entry_date': pd.Timestamp(entry_time[j]),
+                    'exit_date': pd.Timestamp(dates[t]),
+                    'holding_days': pd.Timedelta(held[j]).days,
+                    'holding_bars': t - entry_bar[j],
+                    'pair': self.pairs[j],
+                    'direction': 'Short Premium' if position[j] == 1 else 'Long Premium',
+                    'allocation': allocation[j],
+                    'return': net_return,
+                    'profit': profit,
+                    'exit_reason': reasons[j]
+                })
+
+            position[exit_mask] = 0
+            allocation[exit_mask] = 0.0
+            entry_time[exit_mask] = np.datetime64('NaT')
+            current_return[exit_mask] = 0.0
+
+            # 3. 진입: 같은 봉에 청산된 쌍은 제외 (기존 엔진과 동일)
+            flat = (position == 0) & ~exit_mask
+            candidates = np.flatnonzero(flat & (abs_z[t] > self.entry_z))
+            unrealized = allocation * current_return
+            equity = cash + allocation.sum() + unrealized.sum()
+
+            if len(candidates) and cash > 0:
+                amounts = allocate(
+                    cash, equity, abs_z[t, candidates], int(flat.sum()), self.entry_z, self.max_pair_weight
+                )
+                if amounts.sum() > cash:
+                    amounts = amounts * (cash / amounts.sum())
+                signs = np.sign(z[t, candidates]).astype(int)
+
+                position[candidates] = signs
+                allocation[candidates] = amounts
+                entry_time[candidates] = dates[t]
+                entry_bar[candidates] = t
+                entry_high[candidates] = high[t, candidates]
+                entry_low[candidates] = low[t, candidates]
+                cash -= float(amounts.sum())
+
+            # 4. 시가평가 기록
+            cash_curve[t] = cash
+            invested_curve[t] = allocation.sum()
+            equity_curve[t] = cash + allocation.sum() + unrealized.sum()
+            open_count[t] = int((position != 0).sum())
+            pair_pnl[t] = realized + unrealized
+
+        equity_df = pd.DataFrame({
+            'date': dates,
+            'cash': cash_curve,
+            'invested': invested_curve,
+            'capital': equity_curve,
+            'open_positions': open_count,
+        })
+        for j, pair in enumerate(self.pairs):
+            equity_df[f'pnl_{pair}'] = pair_pnl[:, j]
+
+        trades_df = pd.DataFrame(trades)
+        if not trades_df.empty:
+            trades_df = trades_df.sort_values(['exit_date', 'pair'], kind='stable').reset_index(drop=True)
+        return trades_df, equity_df
+
+    def pair_attribution(self, trades_df, equity_df):
+        """쌍별 성과 기여도"""
+        rows = []
+        n_bars = max(len(equity_df), 1)
+        for pair in self.pairs:
+            pair_trades = trades_df[trades_df['pair'] == pair] if not trades_df.empty else trades_df
+            final_pnl = equity_df[f'pnl_{pair}'].iloc[-1] if len(equity_df) else 0.0
+            exposure = (pair_trades['holding_bars'].sum() / n_bars) if len(pair_trades) else 0.0
+            rows.append({
+                'pair': pair,
+                'total_trades': len(pair_trades),
+                'win_rate': (pair_trades['return'] > 0).mean() if len(pair_trades) else 0.0,
+                'avg_return': pair_trades['return'].mean() if len(pair_trades) else 0.0,
+                'total_profit': final_pnl,
+                'contribution': final_pnl / self.initial_capital,
+                'avg_allocation': pair_trades['allocation'].mean() if len(pair_trades) else 0.0,
+                'exposure': exposure,
+            })
+        return pd.DataFrame(rows).set_index('pair')
+
+    def calculate_benchmark(self, df):
+        """벤치마크 계산 (업비트 Buy & Hold)"""
+        if len(df) < 2:
+            return 0.0
+        return (df['upbit_price'].iloc[-1] - df['upbit_price'].iloc[0]) / df['upbit_price'].iloc[0]
+
+    def analyze_performance(self, trades_df, equity_df, benchmark_return):
+        """성과 분석 (시가평가 자본 곡선 기준)"""
+        if equity_df.empty:
+            final_return = 0.0
+        else:
+            final_return = (equity_df['capital'].iloc[-1] - self.initial_capital) / self.initial_capital
+
+        if len(equity_df) > 1:
+            years = (equity_df['date'].iloc[-1] - equity_df['date'].iloc[0]) / pd.Timedelta(days=365.25)
+            annualized_return = (1 + final_return) ** (1 / years) - 1 if years > 0 else 0.0
+            capital = equity_df['capital']
+            mdd = ((capital - capital.cummax()) / capital.cummax()).min()
+            bar_returns = capital.pct_change().dropna()
+            if len(bar_returns) > 0 and bar_returns.std() > 0:
+                sharpe = (bar_returns.mean() / bar_returns.std()) * np.sqrt(periods_per_year(self.bar_interval))
+            else:
+                sharpe = 0.0
+            avg_utilization = (equity_df['invested'] / capital).mean()
+            max_concurrent = int(equity_df['open_positions'].max())
+        else:
+            annualized_return = mdd = sharpe = avg_utilization = 0.0
+            max_concurrent = 0
+
+        has_trades = not trades_df.empty
+        return {
+            "total_trades": len(trades_df),
+            "final_return": final_return,
+            "annualized_return": annualized_return,
+            "sharpe_ratio": sharpe,
+            "win_rate": (trades_df['return'] > 0).mean() if has_trades else 0.0,
+            "mdd": mdd,
+            "max_holding_days": trades_df['holding_days'].max() if has_trades else 0,
+            "avg_holding_days": trades_df['holding_days'].mean() if has_trades else 0.0,
+            "max_concurrent_positions": max_concurrent,
+            "avg_capital_utilization": avg_utilization,
+            "benchmark_return": benchmark_return,
+            "excess_return": final_return - benchmark_return
+        }
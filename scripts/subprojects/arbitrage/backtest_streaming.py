@@ -0,0 +1,416 @@
+"""
+Project 2: 스트리밍 차익거래 백테스트 엔진
+- 임의의 봉 주기 지원 (1d, 1h, 15m ...)
+- 날짜 구간별 청크 단위 처리 (다년간 시간봉도 메모리 일정)
+- 청크 경계를 넘어 Rolling 통계 / 보유 포지션 / 자본 상태 유지
+- OptimizedArbitrageBacktest와 동일한 진입/청산 규칙 (backtest_core 컴포넌트 / 코어 공유)
+"""
+
+import sqlite3
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from datetime import datetime, timedelta
+import os
+
+from backtest_core import (
+    PAIR_PRICES,
+    ALL_PAIRS,
+    BestPairSignal,
+    ZScoreExit,
+    StopLossExit,
+    MaxHoldingExit,
+    RoundTripCost,
+    PositionState,
+    close_open_position,
+    simulate,
+)
+
+# 환경별 경로 설정
+if os.path.exists('/mount/src'):
+    # Streamlit Cloud
+    ROOT = Path('/mount/src/whale-arbitrage')
+    DB_PATH = Path('/tmp') / "project.db"
+elif os.path.exists('/app'):
+    # Docker 컨테이너 내부
+    ROOT = Path('/app')
+    DB_PATH = ROOT / "data" / "project.db"
+else:
+    # 로컬 개발 환경
+    ROOT = Path(__file__).resolve().parents[3]
+    DB_PATH = ROOT / "data" / "project.db"
+
+
+def periods_per_year(bar_interval):
+    """봉 주기('1d', '1h', '15min' 등)로부터 연간 봉 개수 계산"""
+    # pandas는 소문자 'd' 단위를 더 이상 권장하지 않음 → '1d'를 '1D'로 정규화
+    return pd.Timedelta(days=365.25) / pd.Timedelta(bar_interval.replace('d', 'D'))
+
+
+class StreamingArbitrageBacktest:
+    def __init__(
+        self,
+        initial_capital=100_000_000,
+        fee_rate=0.0005,
+        slippage=0.0002,
+        stop_loss=-0.03,
+        max_holding_days=30,
+        rolling_window=30,
+        entry_z=2.5,
+        exit_z=0.0,
+        exclude_upbit_binance=False,
+        pairs=None,
+        bar_interval='1d'
+    ):
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.stop_loss = stop_loss
+        self.max_holding_days = max_holding_days
+        self.rolling_window = rolling_window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.exclude_upbit_binance = exclude_upbit_binance
+        self.pairs = list(pairs) if pairs else list(ALL_PAIRS)
+        self.bar_interval = bar_interval
+
+        unknown = [p for p in self.pairs if p not in PAIR_PRICES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 거래소 쌍: {unknown}")
+
+        # 선택된 쌍에 필요한 가격 컬럼 (NULL 제거 기준)
+        self.required_cols = []
+        for pair in self.pairs:
+            for col in PAIR_PRICES[pair]:
+                if col not in self.required_cols:
+                    self.required_cols.append(col)
+
+        self.signal = BestPairSignal(entry_z, exclude=('upbit_binance',) if exclude_upbit_binance else ())
+        self.exits = [ZScoreExit(exit_z), StopLossExit(stop_loss), MaxHoldingExit(max_holding_days)]
+        self.cost_model = RoundTripCost(fee_rate, slippage)
+
+        self.reset()
+
+    def reset(self):
+        """청크 간 유지되는 상태 초기화"""
+        # Rolling 통계용 직전 (rolling_window - 1)개 프리미엄 (쌍별 열)
+        self._tail = np.empty((0, len(self.pairs)))
+        # Look-ahead Bias 방지: 유효 봉 기준 처음 rolling_window개 제외
+        self._warmup_remaining = self.rolling_window
+
+        # 보유 포지션 / 자본 (청크 간 유지)
+        self.state = PositionState(self.initial_capital)
+
+        self.first_price = None
+        self.last_price = None
+        self.chunks_processed = 0
+
+    def _rolling_z_scores(self, premiums):
+        """직전 청크 꼬리값을 이어붙여 전체 시계열과 동일한 Rolling Z-Score 계산"""
+        n_tail = len(self._tail)
+        stacked = np.vstack([self._tail, premiums])
+        frame = pd.DataFrame(stacked)
+        rolling = frame.rolling(window=self.rolling_window)
+        mean = rolling.mean().to_numpy()[n_tail:]
+        std = rolling.std().to_numpy()[n_tail:]
+
+        keep = self.rolling_window - 1
+        self._tail = stacked[-keep:] if keep > 0 else stacked[:0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (premiums - mean) / std
+
+    def calculate_indicators(self, df):
+        """청크의 쌍별 프리미엄 및 Z-Score 계산 (상태 갱신)"""
+        df = df.reset_index(drop=True)
+
+        premiums = np.column_stack([
+            ((df[high] - df[low]) / df[low]).to_numpy(dtype=float)
+            for high, low in (PAIR_PRICES[p] for p in self.pairs)
+        ]) if len(df) else np.empty((0, len(self.pairs)))
+        z_scores = self._rolling_z_scores(premiums)
+
+        for j, pair in enumerate(self.pairs):
+            df[f'premium_{pair}'] = premiums[:, j]
+            df[f'z_score_{pair}'] = z_scores[:, j]
+
+        # NULL 값 처리: 핵심 가격 데이터만 확인
+        df = df.dropna(subset=self.required_cols)
+
+        # 청크 경계를 넘어 처음 rolling_window개 유효 봉 제외
+        if self._warmup_remaining > 0:
+            skip = min(self._warmup_remaining, len(df))
+            df = df.iloc[skip:]
+            self._warmup_remaining -= skip
+
+        return df.reset_index(drop=True)
+
+    def generate_signals(self, df):
+        """쌍별 |Z-Score| 최댓값 기준 진입 시그널 (벡터화)"""
+        df = df.copy()
+        z = df[[f'z_score_{p}' for p in self.pairs]].to_numpy(dtype=float)
+        signal, best = self.signal.generate(z, self.pairs)
+
+        pair_names = np.array(self.pairs, dtype=object)
+        df['signal'] = signal
+        df['signal_pair'] = np.where(signal != 0, pair_names[best], None)
+        df['signal_direction'] = np.where(
+            signal == 1, 'short_premium', np.where(signal == -1, 'long_premium', None)
+        )
+        return df
+
+    def run_backtest(self, df, close_at_end=False):
+        """
+        시그널이 붙은 청크를 공통 코어로 처리 (포지션 / 자본 상태는 다음 청크로 이어짐)
+
+        close_at_end=True면 마지막 봉에서 보유 포지션을 청산 (구간 단독 평가, 사유 'end_of_period')
+        """
+        n = len(df)
+        z = df[[f'z_score_{p}' for p in self.pairs]].to_numpy(dtype=float).reshape(n, len(self.pairs))
+        high = np.column_stack([df[PAIR_PRICES[p][0]].to_numpy(dtype=float) for p in self.pairs]) if n else z
+        low = np.column_stack([df[PAIR_PRICES[p][1]].to_numpy(dtype=float) for p in self.pairs]) if n else z
+        pair_index = {p: j for j, p in enumerate(self.pairs)}
+        signal_pair = np.array([pair_index.get(p, -1) for p in df['signal_pair']], dtype=int)
+
+        history, equity = simulate(
+            df['date'].to_numpy(), high, low, z,
+            df['signal'].to_numpy(), signal_pair, self.pairs,
+            self.exits, self.cost_model, self.state
+        )
+
+        if close_at_end and n:
+            record = close_open_position(
+                self.state, df['date'].to_numpy()[-1], high[-1], low[-1], self.pairs, self.cost_model
+            )
+            if record is not None:
+                history.append(record)
+                equity[-1] = self.state.capital
+
+        if n:
+            if self.first_price is None:
+                self.first_price = df['upbit_price'].iloc[0] if 'upbit_price' in df else None
+            if 'upbit_price' in df:
+                self.last_price = df['upbit_price'].iloc[-1]
+
+        return pd.DataFrame(history), pd.DataFrame({'date': df['date'].to_numpy(), 'capital': equity})
+
+    def process_chunk(self, df):
+        """청크 1개 처리: 지표 → 시그널 → 백테스트 (상태는 다음 청크로 이어짐)"""
+        df = self.calculate_indicators(df)
+        df = self.generate_signals(df)
+        trades, equity = self.run_backtest(df)
+        self.chunks_processed += 1
+        return trades, equity
+
+    def run(self, chunks):
+        """청크 이터레이터 전체 처리 후 거래 내역 / 자본 곡선 반환"""
+        self.reset()
+        trade_parts = []
+        equity_parts = []
+        for chunk in chunks:
+            trades, equity = self.process_chunk(chunk)
+            if not trades.empty:
+                trade_parts.append(trades)
+            if not equity.empty:
+                equity_parts.append(equity)
+
+        trades_df = pd.concat(trade_parts, ignore_index=True) if trade_parts else pd.DataFrame()
+        equity_df = (
+            pd.concat(equity_parts, ignore_index=True)
+            if equity_parts else pd.DataFrame(columns=['date', 'capital'])
+        )
+        return trades_df, equity_df
+
+    def calculate_benchmark(self):
+        """벤치마크 계산 (처리된 전체 구간 Buy & Hold)"""
+        if not self.first_price or self.last_price is None:
+            return 0.0
+        return (self.last_price - self.first_price) / self.first_price
+
+    def analyze_performance(self, trade_df, equity_df, benchmark_return):
+        """성과 분석 (봉 주기에 맞춘 연율화)"""
+        if trade_df.empty:
+            return {
+                "total_trades": 0,
+                "final_return": 0.0,
+                "annualized_return": 0.0,
+                "sharpe_ratio": 0.0,
+                "win_rate": 0.0,
+                "mdd": 0.0,
+                "max_holding_days": 0,
+                "avg_holding_days": 0.0,
+                "benchmark_return": benchmark_return,
+                "excess_return": 0.0
+            }
+
+        total_trades = len(trade_df)
+        final_capital = trade_df['capital'].iloc[-1]
+        final_return = (final_capital - self.initial_capital) / self.initial_capital
+
+        if len(equity_df) > 1:
+            elapsed = equity_df['date'].iloc[-1] - equity_df['date'].iloc[0]
+            years = elapsed / pd.Timedelta(days=365.25)
+            annualized_return = (1 + final_return) ** (1 / years) - 1 if years > 0 else 0.0
+        else:
+            annualized_return = 0.0
+
+        win_rate = (trade_df['return'] > 0).mean()
+
+        capital = equity_df['capital']
+        mdd = ((capital - capital.cummax()) / capital.cummax()).min()
+
+        bar_returns = capital.pct_change().dropna()
+        if len(bar_returns) > 0 and bar_returns.std() > 0:
+            sharpe = (bar_returns.mean() / bar_returns.std()) * np.sqrt(periods_per_year(self.bar_interval))
+        else:
+            sharpe = 0.0
+
+        holding_hours = (trade_df['exit_date'] - trade_df['entry_date']) / pd.Timedelta(hours=1)
+
+        return {
+            "total_trades": total_trades,
+            "final_return": final_return,
+            "annualized_return": annualized_return,
+            "sharpe_ratio": sharpe,
+            "win_rate": win_rate,
+            "mdd": mdd,
+            "max_holding_days": trade_df['holding_days'].max(),
+            "avg_holding_days": trade_df['holding_days'].mean(),
+            "avg_holding_hours": holding_hours.mean(),
+            "benchmark_return": benchmark_return,
+            "excess_return": final_return - benchmark_return
+        }
+
+
+def _date_partitions(start_date, end_date, chunk_days):
+    """[start_date, end_date] 구간을 chunk_days 단위의 (시작, 종료) 날짜 쌍으로 분할"""
+    current = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    while current <= end:
+        part_end = min(current + timedelta(days=chunk_days - 1), end)
+        yield current, part_end
+        current = part_end + timedelta(days=1)
+
+
+def _apply_krw_conversion(df, last_rate):
+    """환율 결측치를 직전 청크 값으로 이어서 채우고 USDT 가격을 원화로 환산"""
+    if last_rate is not None and len(df) and pd.isna(df['krw_usd'].iloc[0]):
+        df.loc[df.index[0], 'krw_usd'] = last_rate
+    df['krw_usd'] = df['krw_usd'].ffill()
+    if last_rate is None:
+        df['krw_usd'] = df['krw_usd'].bfill()
+    for exchange in ('binance', 'bitget', 'bybit'):
+        if f'{exchange}_price' in df:
+            df[f'{exchange}_krw'] = df[f'{exchange}_price'] * df['krw_usd']
+    rate = df['krw_usd'].dropna()
+    return rate.iloc[-1] if len(rate) else last_rate
+
+
+def iter_daily_chunks(start_date, end_date, coin='BTC', chunk_days=90, db_path=None):
+    """SQLite 일봉 4개 거래소 조인을 날짜 구간별 청크로 스트리밍"""
+    conn = sqlite3.connect(db_path or DB_PATH)
+    market = f"KRW-{coin}"
+    symbol = f"{coin}USDT"
+    last_rate = None
+    try:
+        for part_start, part_end in _date_partitions(start_date, end_date, chunk_days):
+            query = """
+            SELECT
+                u.date,
+                u.trade_price as upbit_price,
+                b.close as binance_price,
+                bg.close as bitget_price,
+                bb.close as bybit_price,
+                e.krw_usd
+            FROM upbit_daily u
+            LEFT JOIN binance_spot_daily b ON u.date = b.date AND b.symbol = ?
+            LEFT JOIN bitget_spot_daily bg ON u.date = bg.date AND bg.symbol = ?
+            LEFT JOIN bybit_spot_daily bb ON u.date = bb.date AND bb.symbol = ?
+            LEFT JOIN exchange_rate e ON u.date = e.date
+            WHERE u.market = ?
+            AND u.date BETWEEN ? AND ?
+            ORDER BY u.date
+            """
+            df = pd.read_sql(query, conn, params=(
+                symbol, symbol, symbol, market,
+                part_start.strftime("%Y-%m-%d"), part_end.strftime("%Y-%m-%d")
+            ))
+            if df.empty:
+                continue
+            df['date'] = pd.to_datetime(df['date'])
+            last_rate = _apply_krw_conversion(df, last_rate)
+            yield df
+    finally:
+        conn.close()
+
+
+def _fetch_price_history(supabase, crypto_id, data_source, start_ts, end_ts, page_size=1000):
+    """price_history에서 구간 [start_ts, end_ts) 종가 조회 (페이지네이션)"""
+    rows = []
+    offset = 0
+    while True:
+        response = supabase.table('price_history')\
+            .select('timestamp,close_price')\
+            .eq('crypto_id', crypto_id)\
+            .eq('data_source', data_source)\
+            .gte('timestamp', start_ts)\
+            .lt('timestamp', end_ts)\
+            .order('timestamp', desc=False)\
+            .range(offset, offset + page_size - 1)\
+            .execute()
+        if not response.data:
+            break
+        rows.extend(response.data)
+        offset += page_size
+        if len(response.data) < page_size:
+            break
+
+    df = pd.DataFrame(rows, columns=['timestamp', 'close_price'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True).dt.tz_localize(None)
+    df['close_price'] = df['close_price'].astype(float)
+    return df
+
+
+def iter_hourly_chunks(supabase, start_date, end_date, coin='BTC', chunk_days=30, db_path=None):
+    """
+    Supabase price_history 시간봉(업비트 KRW / 바이낸스 USDT)을 날짜 구간별 청크로 스트리밍
+
+    - 업비트: collect_upbit_price_history_hourly.py (data_source='upbit')
+    - 바이낸스: collect_price_history_hourly.py (data_source='binance')
+    - 환율은 일별 exchange_rate를 UTC 날짜 기준으로 매핑
+    """
+    response = supabase.table('cryptocurrencies').select('id').eq('symbol', coin).limit(1).execute()
+    if not response.data:
+        raise ValueError(f"cryptocurrencies 테이블에 {coin}이(가) 없습니다.")
+    crypto_id = response.data[0]['id']
+
+    conn = sqlite3.connect(db_path or DB_PATH)
+    last_rate = None
+    try:
+        for part_start, part_end in _date_partitions(start_date, end_date, chunk_days):
+            start_ts = part_start.strftime("%Y-%m-%dT00:00:00+00:00")
+            end_ts = (part_end + timedelta(days=1)).strftime("%Y-%m-%dT00:00:00+00:00")
+
+            upbit = _fetch_price_history(supabase, crypto_id, 'upbit', start_ts, end_ts)
+            binance = _fetch_price_history(supabase, crypto_id, 'binance', start_ts, end_ts)
+            if upbit.empty:
+                continue
+
+            df = upbit.rename(columns={'timestamp': 'date', 'close_price': 'upbit_price'}).merge(
+                binance.rename(columns={'timestamp': 'date', 'close_price': 'binance_price'}),
+                on='date', how='left'
+            )
+
+            rates = pd.read_sql(
+                "SELECT date, krw_usd FROM exchange_rate WHERE date BETWEEN ? AND ?",
+                conn,
+                params=(part_start.strftime("%Y-%m-%d"), part_end.strftime("%Y-%m-%d"))
+            )
+            rates['date'] = pd.to_datetime(rates['date'])
+            df['day'] = df['date'].dt.normalize()
+            df = df.merge(rates.rename(columns={'date': 'day'}), on='day', how='left').drop(columns='day')
+
+            last_rate = _apply_krw_conversion(df, last_rate)
+            yield df
+    finally:
+        conn.close()
@@ -1,44 +1,111 @@
 #!/usr/bin/env python3
 """
-업비트/KRW와 바이낸스/USDT 과거 일봉 데이터를 수집하여 SQLite에 저장하는 서브 프로젝트 스크립트입니다.
+업비트/KRW와 바이낸스·비트겟·바이비트/USDT 과거 일봉 데이터를 수집하여 SQLite에 저장하는 서브 프로젝트 스크립트입니다.
+
+- (거래소, 심볼)의 수집 구간을 요청 1~2회 크기의 날짜 구간으로 나눠 워커 풀에서 동시에 요청
+  (거래소 호스트별 호출 한도 / 429·5xx 재시도는 공용 HTTP 클라이언트가 적용)
+- 받은 페이지는 writer 스레드 1개가 모아 큰 트랜잭션으로 저장
+- 워터마크는 (거래소, 심볼)의 모든 구간이 저장된 트랜잭션에서만 전진 (실패 시 다음 실행에서 같은 구간부터 다시 수집)
 """
 
 import os
+import queue
 import sqlite3
+import sys
+import threading
 import time
 import argparse
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
 ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
 load_dotenv(ROOT / "config" / ".env")
 DB_PATH = ROOT / "data" / "project.db"
 
+from src.collectors.ingestion_state import SQLiteIngestionState
+from src.http_client import REQUEST_METRICS, get_client
+
+# ingestion_state stream 이름 (source = 거래소, entity = 마켓/심볼)
+STREAM = "spot_daily"
+# (source, 테이블, 마켓/심볼 컬럼)
+SPOT_TABLES = [
+    ("upbit", "upbit_daily", "market"),
+    ("binance", "binance_spot_daily", "symbol"),
+    ("bitget", "bitget_spot_daily", "symbol"),
+    ("bybit", "bybit_spot_daily", "symbol"),
+]
+
 UPBIT_BASE = "https://api.upbit.com/v1/candles/days"
 BINANCE_BASE = "https://api.binance.com/api/v3/klines"
 BITGET_BASE = "https://api.bitget.com/api/v2/spot/market/candles"  # V2 API
 BYBIT_BASE = "https://api.bybit.com/v5/market/kline"
 
+UPBIT_COLUMNS = ["market", "date", "opening_price", "high_price", "low_price", "trade_price", "acc_trade_volume_24h", "acc_trade_price_24h"]
+SPOT_COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume", "quote_volume"]
+
+# 거래소별 1회 요청 최대 캔들 수
+UPBIT_PAGE = 200
+BINANCE_PAGE = 1000
+BITGET_PAGE = 200
+BYBIT_PAGE = 1000
+
+DEFAULT_WORKERS = 8
+# writer 트랜잭션 1개의 최대 행 수 / 첫 페이지 이후 더 모으려고 기다리는 최대 시간(초)
+WRITER_BATCH_ROWS = 20000
+WRITER_FLUSH_INTERVAL = 0.5
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def _parse_ymd(s: str) -> date:
+    return datetime.strptime(s[:10], "%Y-%m-%d").date()
+
+
+def _utc_ms(day: date) -> int:
+    """해당 날짜 UTC 자정 (epoch ms)"""
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
 
-def _parse_ymd(s: str) -> datetime:
-    return datetime.strptime(s, "%Y-%m-%d")
 
+def _utc_date(ts_ms) -> str:
+    return datetime.fromtimestamp(int(ts_ms) / 1000, tz=timezone.utc).date().isoformat()
 
-def _get_max_date(conn: sqlite3.Connection, table: str, where_sql: str, params: tuple) -> str:
-    cur = conn.cursor()
-    cur.execute(f"SELECT MAX(date) FROM {table} WHERE {where_sql}", params)
-    row = cur.fetchone()
-    cur.close()
-    return row[0] if row and row[0] else None
 
+def date_partitions(start: date, end_exclusive: date, days: int):
+    """[start, end_exclusive)를 days일 단위 구간 [(시작, 끝(미포함)), ...]으로 분할"""
+    partitions = []
+    current = start
+    while current < end_exclusive:
+        upper = min(current + timedelta(days=days), end_exclusive)
+        partitions.append((current, upper))
+        current = upper
+    return partitions
 
-def ensure_db():
+
+def _seed_ingestion_state(conn: sqlite3.Connection):
+    """워터마크가 없는 마켓/심볼은 기존 테이블의 마지막 날짜로 한 번만 채움"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    now = datetime.utcnow().isoformat()
+    for source, table, key_col in SPOT_TABLES:
+        if table not in existing:
+            continue
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO ingestion_state (source, entity, stream, last_timestamp, updated_at)
+            SELECT ?, {key_col}, ?, MAX(date), ? FROM {table} GROUP BY {key_col}
+            """,
+            (source, STREAM, now),
+        )
+
+
+def ensure_db(db_path=DB_PATH):
     """DB 초기화 및 필요한 테이블 생성"""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA journal_mode=WAL;")
     
     cursor = conn.cursor()
@@ -84,542 +151,415 @@ def ensure_db():
     conn.commit()
     cursor.close()
     conn.close()
+    
+    state = SQLiteIngestionState(db_path)
+    with sqlite3.connect(db_path) as conn:
+        _seed_ingestion_state(conn)
+    return state
 
 
-def upsert_rows(table, rows, columns):
-    if not rows:
-        return
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def _upsert_sql(table, columns):
     placeholders = ", ".join("?" for _ in columns)
-    column_list = ", ".join(columns)
-    stmt = f"INSERT OR REPLACE INTO {table} ({column_list}) VALUES ({placeholders})"
-    cursor.executemany(stmt, rows)
-    conn.commit()
-    cursor.close()
-    conn.close()
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
 
 
-def fetch_upbit_daily(market, end_date: datetime, stop_date: datetime):
-    """Upbit 지정 기간 수집 (역순, end_date ~ stop_date)"""
-    target_date = end_date
-    stop_date = stop_date
+class SpotWriter:
+    """
+    단일 SQLite writer 스레드
+    
+    - 수집 스레드는 submit()으로 페이지를 큐에 넣기만 하고, writer가 batch_rows행
+      (또는 flush_interval초 동안 모인 만큼)을 트랜잭션 1개로 저장
+    - mark()도 같은 큐로 보내므로 워터마크는 앞서 넣은 행이 모두 저장된 트랜잭션에서만 전진
+    - 저장 오류가 나면 이후 항목은 버리고 close()에서 예외를 다시 발생
+    """
     
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
-
-    while target_date > stop_date:
-        to_str = target_date.strftime("%Y-%m-%d %H:%M:%S")
-        params = {"market": market, "to": to_str, "count": 200}
-        headers = {"Accept": "application/json"}
+    def __init__(
+        self,
+        db_path=DB_PATH,
+        state=None,
+        batch_rows: int = WRITER_BATCH_ROWS,
+        flush_interval: float = WRITER_FLUSH_INTERVAL,
+        max_pending: int = 256
+    ):
+        """
+        초기화 (writer 스레드 시작)
         
-        try:
-            response = session.get(UPBIT_BASE, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if not data:
+        Args:
+            db_path: SQLite 경로
+            state: 워터마크 저장소 (None이면 db_path의 ingestion_state)
+            batch_rows: 트랜잭션 1개의 최대 행 수
+            flush_interval: 첫 항목 이후 더 모으는 최대 대기 시간 (초)
+            max_pending: 큐 최대 항목 수 (가득 차면 submit()이 대기 → 수집이 저장보다 앞서 나가지 않음)
+        """
+        self.db_path = db_path
+        self.state = state if state is not None else SQLiteIngestionState(db_path)
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self.transactions = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="spot-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, table, columns, rows):
+        """행 저장 요청"""
+        if rows:
+            self._queue.put(("rows", table, tuple(columns), rows))
+    
+    def mark(self, source, entity, last_timestamp):
+        """워터마크 전진 요청 (앞서 submit()한 행과 같은 / 이후 트랜잭션에서 반영)"""
+        self._queue.put(("mark", source, entity, last_timestamp))
+    
+    def close(self):
+        """남은 항목 저장 후 종료 (저장 오류가 있었으면 다시 발생)"""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+    
+    def _collect(self):
+        """첫 항목을 기다린 뒤 batch_rows행이 차거나 flush_interval이 지날 때까지 더 모음"""
+        batch = [self._queue.get()]
+        count = len(batch[0][3]) if batch[0] and batch[0][0] == "rows" else 0
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not None and count < self.batch_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
                 break
-                
-            rows = []
-            min_date = None
-            
-            for candle in data:
-                kst_str = candle["candle_date_time_kst"]
-                dt_obj = datetime.strptime(kst_str, "%Y-%m-%dT%H:%M:%S")
-                rows.append(
-                    (
-                        market,
-                        kst_str.split("T")[0],
-                        candle.get("opening_price", candle.get("trade_price")),  # opening_price
-                        candle.get("high_price", candle.get("trade_price")),     # high_price
-                        candle.get("low_price", candle.get("trade_price")),      # low_price
-                        candle["trade_price"],                                    # trade_price (close)
-                        candle.get("candle_acc_trade_volume", candle.get("acc_trade_volume", 0.0)),
-                        candle.get("candle_acc_trade_price", candle.get("acc_trade_price", 0.0)),
-                    )
+            batch.append(item)
+            if item and item[0] == "rows":
+                count += len(item[3])
+        return batch
+    
+    def _write(self, conn, items):
+        rows = 0
+        with conn:
+            for item in items:
+                if item[0] == "rows":
+                    _, table, columns, values = item
+                    conn.executemany(_upsert_sql(table, columns), values)
+                    rows += len(values)
+                else:
+                    _, source, entity, last_timestamp = item
+                    self.state.advance(source, entity, STREAM, last_timestamp=last_timestamp, conn=conn)
+        self.rows += rows
+        self.transactions += 1
+    
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                batch = self._collect()
+                items = [item for item in batch if item is not None]
+                if items and self.error is None:
+                    try:
+                        self._write(conn, items)
+                    except Exception as e:
+                        self.error = e
+                if batch[-1] is None:
+                    break
+        finally:
+            conn.close()
+
+
+def fetch_upbit_partition(client, market, start: date, end_exclusive: date):
+    """Upbit [start, end_exclusive) 일봉 (to 기준 역순 페이지)"""
+    lower, upper = start.isoformat(), end_exclusive.isoformat()
+    rows = []
+    to = upper
+    while to > lower:
+        # to: 마지막 캔들 시각(미포함, UTC) → 일봉 시작 시각(UTC 00:00)의 날짜가 KST 날짜와 같음
+        params = {"market": market, "to": f"{to} 00:00:00", "count": UPBIT_PAGE}
+        response = client.get(UPBIT_BASE, params=params, headers={"Accept": "application/json"}, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        if not data:
+            break
+        
+        for candle in data:
+            day = candle["candle_date_time_kst"].split("T")[0]
+            if not lower <= day < upper:
+                continue
+            rows.append(
+                (
+                    market,
+                    day,
+                    candle.get("opening_price", candle.get("trade_price")),  # opening_price
+                    candle.get("high_price", candle.get("trade_price")),     # high_price
+                    candle.get("low_price", candle.get("trade_price")),      # low_price
+                    candle["trade_price"],                                    # trade_price (close)
+                    candle.get("candle_acc_trade_volume", candle.get("acc_trade_volume", 0.0)),
+                    candle.get("candle_acc_trade_price", candle.get("acc_trade_price", 0.0)),
                 )
-                if min_date is None or dt_obj < min_date:
-                    min_date = dt_obj
-
-            upsert_rows(
-                "upbit_daily",
-                rows,
-                ["market", "date", "opening_price", "high_price", "low_price", "trade_price", "acc_trade_volume_24h", "acc_trade_price_24h"],
             )
-            print(f"✅ Upbit {market}: ~{to_str.split()[0]} ({len(rows)}건)")
-            
-            if min_date:
-                target_date = min_date - timedelta(days=1)
-                if min_date.date() <= stop_date.date():
-                    break
-            else:
-                break
-                
-            time.sleep(0.1) # Rate limit 조절
-            
-        except Exception as e:
-            print(f"⚠️ Upbit {market} fetch error: {e}")
-            time.sleep(1)
+        
+        if len(data) < UPBIT_PAGE:
             break
+        to = min(candle["candle_date_time_utc"].split("T")[0] for candle in data)
+    return rows
 
 
-def fetch_binance_spot(symbol, start_dt: datetime, end_dt_exclusive: datetime):
-    """Binance 지정 기간 수집 (정순, start_dt ~ end_dt_exclusive)"""
-    start_ts = int(start_dt.timestamp() * 1000)
-    end_ts = int(end_dt_exclusive.timestamp() * 1000)
-    
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
-
+def fetch_binance_partition(client, symbol, start: date, end_exclusive: date):
+    """Binance [start, end_exclusive) 일봉 (정순 페이지)"""
+    start_ts = _utc_ms(start)
+    end_ts = _utc_ms(end_exclusive)
+    rows = []
     while start_ts < end_ts:
-        # endTime을 반드시 지정해야 end_dt_exclusive 이후 데이터가 섞이지 않음
-        params = {"symbol": symbol, "interval": "1d", "startTime": start_ts, "endTime": end_ts - 1, "limit": 1000}
-        try:
-            response = session.get(BINANCE_BASE, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data:
-                break
-                
-            rows = []
-            last_ts = start_ts
-            
-            for kline in data:
-                ts = int(kline[0])
-                dt_str = datetime.utcfromtimestamp(ts / 1000).date().isoformat()
-                # kline: [open_time, open, high, low, close, volume, close_time, quote_volume, ...]
-                rows.append((
-                    symbol, 
-                    dt_str, 
-                    float(kline[1]),  # open
-                    float(kline[2]),  # high
-                    float(kline[3]),  # low
-                    float(kline[4]),  # close
-                    float(kline[5]),  # volume
-                    float(kline[7])   # quote_volume
-                ))
-                last_ts = ts
-            
-            upsert_rows(
-                "binance_spot_daily",
-                rows,
-                ["symbol", "date", "open", "high", "low", "close", "volume", "quote_volume"],
-            )
-            
-            last_dt_str = datetime.utcfromtimestamp(last_ts / 1000).strftime('%Y-%m-%d')
-            print(f"✅ Binance {symbol}: ~{last_dt_str} ({len(rows)}건)")
-            
-            start_ts = last_ts + 24 * 60 * 60 * 1000 # Next day
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"⚠️ Binance {symbol} fetch error: {e}")
-            time.sleep(1)
+        # endTime을 반드시 지정해야 구간 이후 데이터가 섞이지 않음
+        params = {"symbol": symbol, "interval": "1d", "startTime": start_ts, "endTime": end_ts - 1, "limit": BINANCE_PAGE}
+        response = client.get(BINANCE_BASE, params=params, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        if not data:
             break
-
-
-def fetch_bitget_spot(symbol, start_date_str="2024-01-01", end_dt_exclusive: datetime = None):
-    """Bitget V2 API로 지정 날짜부터 end_dt_exclusive까지 수집 (역순)"""
-    # Bitget V2 API는 symbol 형식: BTCUSDT (SPBL 없이)
-    symbol_api = symbol
-    
-    start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
-    start_ts = int(start_dt.timestamp() * 1000)
-    if end_dt_exclusive is None:
-        end_ts = int(datetime.now().timestamp() * 1000)
-    else:
-        end_ts = int(end_dt_exclusive.timestamp() * 1000)
-    
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
-
-    print(f"🔄 Bitget V2 {symbol} 수집 시작 ({start_date_str} ~ 현재)...")
-    
-    current_end_ts = end_ts
-    
+        
+        for kline in data:
+            # kline: [open_time, open, high, low, close, volume, close_time, quote_volume, ...]
+            rows.append((
+                symbol,
+                _utc_date(kline[0]),
+                float(kline[1]),  # open
+                float(kline[2]),  # high
+                float(kline[3]),  # low
+                float(kline[4]),  # close
+                float(kline[5]),  # volume
+                float(kline[7])   # quote_volume
+            ))
+        
+        if len(data) < BINANCE_PAGE:
+            break
+        start_ts = int(data[-1][0]) + DAY_MS
+    return rows
+
+
+def _bitget_candle(candle):
+    """V2 API 캔들 → (ts, open, high, low, close, baseVol, quoteVol), 배열 / 객체 형식 모두 처리"""
+    if isinstance(candle, list):
+        # 배열 형식: [timestamp, open, high, low, close, baseVol, quoteVol]
+        return (
+            int(candle[0]),
+            float(candle[1]),
+            float(candle[2]),
+            float(candle[3]),
+            float(candle[4]),
+            float(candle[5]) if len(candle) > 5 else 0,
+            float(candle[6]) if len(candle) > 6 else 0,
+        )
+    # 객체 형식: {"ts": ..., "open": ..., ...}
+    return (
+        int(candle.get("ts", candle.get("timestamp", candle.get("time", 0)))),
+        float(candle.get("open", candle.get("o", 0))),
+        float(candle.get("high", candle.get("h", 0))),
+        float(candle.get("low", candle.get("l", 0))),
+        float(candle.get("close", candle.get("c", 0))),
+        float(candle.get("baseVol", candle.get("vol", candle.get("volume", 0)))),
+        float(candle.get("quoteVol", candle.get("usdtVol", candle.get("quoteVolume", 0)))),
+    )
+
+
+def fetch_bitget_partition(client, symbol, start: date, end_exclusive: date):
+    """Bitget V2 [start, end_exclusive) 일봉 (endTime 기준 역순 페이지)"""
+    lower, upper = start.isoformat(), end_exclusive.isoformat()
+    start_ts = _utc_ms(start)
+    # Bitget은 일봉 경계가 UTC+8(=UTC 16:00)로 잡히는 경우가 있어,
+    # 구간 마지막 일봉이 누락되지 않도록 1일 버퍼를 두고 요청한 뒤 날짜로 거름
+    current_end_ts = _utc_ms(end_exclusive + timedelta(days=1))
+    rows = []
     while current_end_ts > start_ts:
-        # Bitget V2 API 파라미터
         # V2 API 문서: https://www.bitget.com/api-doc/spot/market/Get-Candle-Data
         # granularity 허용값: 1min,3min,5min,15min,30min,1h,4h,6h,12h,1day,1week,1M,6Hutc,12Hutc,1Dutc,3Dutc,1Wutc,1Mutc
         params = {
-            "symbol": symbol_api,
+            "symbol": symbol,  # V2 API는 SPBL 없이 BTCUSDT 형식
             "productType": "spot",
-            "granularity": "1day",  # 1일봉 (허용값: 1day 또는 1Dutc)
+            "granularity": "1day",
             "startTime": str(start_ts),
             "endTime": str(current_end_ts),
-            "limit": 200
+            "limit": BITGET_PAGE
         }
+        response = client.get(BITGET_BASE, params=params, timeout=10)
+        response.raise_for_status()
+        result = response.json()
         
-        try:
-            response = session.get(BITGET_BASE, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"⚠️ Bitget {symbol} HTTP {response.status_code}: {response.text[:200]}")
-                break
-            
-            result = response.json()
-            
-            # V2 API 응답 형식: {"code": "00000", "msg": "success", "data": [...]}
-            if result.get("code") != "00000" or not result.get("data"):
-                error_msg = result.get('msg', result.get('message', 'Unknown error'))
-                print(f"⚠️ Bitget {symbol} API 응답 오류: {error_msg}")
-                print(f"   응답: {result}")
-                break
-            
-            data = result.get("data", [])
-            if not data:
-                break
-                
-            rows = []
-            timestamps = []
-            
-            for candle in data:
-                # V2 API 응답 형식: [ts, open, high, low, close, baseVol, quoteVol] 또는 객체 형식
-                if isinstance(candle, list):
-                    # 배열 형식: [timestamp, open, high, low, close, baseVol, quoteVol]
-                    ts = int(candle[0])
-                    open_price = float(candle[1])
-                    high_price = float(candle[2])
-                    low_price = float(candle[3])
-                    close_price = float(candle[4])
-                    base_vol = float(candle[5]) if len(candle) > 5 else 0
-                    quote_vol = float(candle[6]) if len(candle) > 6 else 0
-                else:
-                    # 객체 형식: {"ts": ..., "open": ..., ...}
-                    ts = int(candle.get("ts", candle.get("timestamp", candle.get("time", 0))))
-                    open_price = float(candle.get("open", candle.get("o", 0)))
-                    high_price = float(candle.get("high", candle.get("h", 0)))
-                    low_price = float(candle.get("low", candle.get("l", 0)))
-                    close_price = float(candle.get("close", candle.get("c", 0)))
-                    base_vol = float(candle.get("baseVol", candle.get("vol", candle.get("volume", 0))))
-                    quote_vol = float(candle.get("quoteVol", candle.get("usdtVol", candle.get("quoteVolume", 0))))
-                
-                if ts == 0:
-                    continue
-                    
-                timestamps.append(ts)
-                dt_str = datetime.utcfromtimestamp(ts / 1000).date().isoformat()
-                
-                rows.append((
-                    symbol,
-                    dt_str,
-                    open_price,
-                    high_price,
-                    low_price,
-                    close_price,
-                    base_vol,
-                    quote_vol,
-                ))
-            
-            if rows:
-                upsert_rows(
-                    "bitget_spot_daily",
-                    rows,
-                    ["symbol", "date", "open", "high", "low", "close", "volume", "quote_volume"],
-                )
-                
-                oldest_ts = min(timestamps)
-                newest_ts = max(timestamps)
-                oldest_dt = datetime.utcfromtimestamp(oldest_ts / 1000).strftime('%Y-%m-%d')
-                newest_dt = datetime.utcfromtimestamp(newest_ts / 1000).strftime('%Y-%m-%d')
-                
-                print(f"✅ Bitget {symbol}: {oldest_dt} ~ {newest_dt} ({len(rows)}건)")
-                
-                current_end_ts = oldest_ts - 1
-                
-                if oldest_ts <= start_ts:
-                    print(f"✅ Bitget {symbol}: 수집 완료 (시작일 도달)")
-                    break
-            else:
-                print(f"⚠️ Bitget {symbol}: 더 이상 데이터 없음")
-                break
-                
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"⚠️ Bitget {symbol} fetch error: {e}")
-            import traceback
-            traceback.print_exc()
-            time.sleep(1)
+        # V2 API 응답 형식: {"code": "00000", "msg": "success", "data": [...]}
+        if result.get("code") != "00000":
+            raise RuntimeError(f"Bitget API 응답 오류: {result.get('msg', result.get('message', 'Unknown error'))}")
+        
+        timestamps = []
+        for candle in result.get("data") or []:
+            ts, open_price, high_price, low_price, close_price, base_vol, quote_vol = _bitget_candle(candle)
+            if ts == 0:
+                continue
+            timestamps.append(ts)
+            day = _utc_date(ts)
+            if lower <= day < upper:
+                rows.append((symbol, day, open_price, high_price, low_price, close_price, base_vol, quote_vol))
+        
+        if not timestamps:
             break
-
-
-def fetch_bybit_spot(symbol, start_date_str="2024-01-01"):
-    """Bybit 지정 날짜부터 현재까지 수집 (레거시)"""
-    start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
-    end_ts = int(datetime.now().timestamp() * 1000)
+        oldest_ts = min(timestamps)
+        if oldest_ts <= start_ts:
+            break
+        current_end_ts = oldest_ts - 1
+    return rows
+
+
+def fetch_bybit_partition(client, symbol, start: date, end_exclusive: date):
+    """Bybit [start, end_exclusive) 일봉 (end 기준 역순 페이지, 응답은 최신순)"""
+    lower, upper = start.isoformat(), end_exclusive.isoformat()
+    start_ts = _utc_ms(start)
+    end_ts = _utc_ms(end_exclusive) - 1
+    rows = []
+    while end_ts >= start_ts:
+        params = {"category": "spot", "symbol": symbol, "interval": "D", "start": start_ts, "end": end_ts, "limit": BYBIT_PAGE}
+        response = client.get(BYBIT_BASE, params=params, timeout=10)
+        response.raise_for_status()
+        result = response.json()
+        if result.get("retCode") != 0:
+            raise RuntimeError(f"Bybit API 오류: {result.get('retMsg')}")
+        
+        data = result.get("result", {}).get("list") or []
+        for candle in data:
+            # Bybit 응답: [timestamp, open, high, low, close, volume, turnover]
+            day = _utc_date(candle[0])
+            if not lower <= day < upper:
+                continue
+            rows.append((
+                symbol,
+                day,
+                float(candle[1]),  # open
+                float(candle[2]),  # high
+                float(candle[3]),  # low
+                float(candle[4]),  # close
+                float(candle[5]),  # volume
+                float(candle[6])   # turnover (quote_volume)
+            ))
+        
+        if len(data) < BYBIT_PAGE:
+            break
+        end_ts = min(int(candle[0]) for candle in data) - 1
+    return rows
+
+
+# 거래소별 수집 설정
+# - partition_days: 동시에 요청하는 날짜 구간 크기 (요청 1회 최대 캔들 수와 같게 → 구간당 보통 1회 요청)
+# - default_start: 워터마크가 없을 때 수집 시작일
+EXCHANGES = {
+    "upbit": {
+        "label": "Upbit", "table": "upbit_daily", "columns": UPBIT_COLUMNS, "fetch": fetch_upbit_partition,
+        "partition_days": UPBIT_PAGE, "default_start": "2023-01-01", "env": "UPBIT_MARKETS", "default_symbols": "KRW-BTC,KRW-ETH",
+    },
+    "binance": {
+        "label": "Binance", "table": "binance_spot_daily", "columns": SPOT_COLUMNS, "fetch": fetch_binance_partition,
+        "partition_days": BINANCE_PAGE, "default_start": "2023-01-01", "env": "BINANCE_SYMBOLS", "default_symbols": "BTCUSDT,ETHUSDT",
+    },
+    "bitget": {
+        "label": "Bitget", "table": "bitget_spot_daily", "columns": SPOT_COLUMNS, "fetch": fetch_bitget_partition,
+        "partition_days": BITGET_PAGE, "default_start": "2024-01-01", "env": "BITGET_SYMBOLS", "default_symbols": "BTCUSDT,ETHUSDT",
+    },
+    "bybit": {
+        "label": "Bybit", "table": "bybit_spot_daily", "columns": SPOT_COLUMNS, "fetch": fetch_bybit_partition,
+        "partition_days": BYBIT_PAGE, "default_start": "2024-01-01", "env": "BYBIT_SYMBOLS", "default_symbols": "BTCUSDT,ETHUSDT",
+    },
+}
+
+
+def run_backfill(tasks, writer, client=None, workers=DEFAULT_WORKERS, clamp=None):
+    """
+    (거래소, 심볼) 작업을 날짜 구간으로 나눠 워커 풀에서 동시에 요청하고, 받은 행을 writer로 전달
     
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
-
-    print(f"🔄 Bybit {symbol} 수집 시작 ({start_date_str} ~ 현재)...")
+    작업의 모든 구간이 성공하면 writer 큐 맨 뒤에 워터마크 전진을 넣음 (구간 일부가 실패하면 전진하지 않음)
     
-    # Bybit API는 최신 데이터부터 역순으로 반환
-    cursor = None
-    all_rows = []
+    Args:
+        tasks: {'source', 'symbol', 'start', 'end_exclusive'} 목록 ('rows', 'newest', 'error' 결과 필드가 채워짐)
+        writer: SpotWriter
+        client: HTTP 클라이언트 (None이면 공용 클라이언트)
+        workers: 동시 요청 수
+        clamp: 워터마크 상한 (YYYY-MM-DD, --end-date)
     
-    while True:
-        params = {
-            "category": "spot",
-            "symbol": symbol,
-            "interval": "D",
-            "limit": 200
-        }
-        if cursor:
-            params["cursor"] = cursor
+    Returns:
+        tasks
+    """
+    client = client or get_client()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spot") as pool:
+        futures = {}
+        for task in tasks:
+            spec = EXCHANGES[task["source"]]
+            partitions = date_partitions(task["start"], task["end_exclusive"], spec["partition_days"])
+            task.update(rows=0, newest=None, error=None, pending=len(partitions))
+            for partition in partitions:
+                futures[pool.submit(spec["fetch"], client, task["symbol"], *partition)] = (task, partition)
         
-        try:
-            response = session.get(BYBIT_BASE, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"⚠️ Bybit {symbol} HTTP {response.status_code}: {response.text[:200]}")
-                break
-            
-            result = response.json()
-            
-            if result.get("retCode") != 0:
-                print(f"⚠️ Bybit {symbol} API 오류: {result.get('retMsg')}")
-                break
-            
-            data = result.get("result", {}).get("list", [])
-            if not data:
-                break
-            
-            rows = []
-            oldest_ts = None
-            
-            for candle in data:
-                # Bybit 응답: [timestamp, open, high, low, close, volume, turnover]
-                ts = int(candle[0])
-                dt = datetime.utcfromtimestamp(ts / 1000)
-                
-                # 시작일 이전 데이터는 제외
-                if dt < start_dt:
-                    continue
-                
-                if oldest_ts is None or ts < oldest_ts:
-                    oldest_ts = ts
-                
-                dt_str = dt.date().isoformat()
-                rows.append((
-                    symbol,
-                    dt_str,
-                    float(candle[1]),  # open
-                    float(candle[2]),  # high
-                    float(candle[3]),  # low
-                    float(candle[4]),  # close
-                    float(candle[5]),  # volume
-                    float(candle[6])   # turnover (quote_volume)
-                ))
-            
-            if rows:
-                upsert_rows(
-                    "bybit_spot_daily",
-                    rows,
-                    ["symbol", "date", "open", "high", "low", "close", "volume", "quote_volume"],
-                )
-                all_rows.extend(rows)
-                
-                oldest_dt = datetime.utcfromtimestamp(oldest_ts / 1000).strftime('%Y-%m-%d')
-                print(f"✅ Bybit {symbol}: ~{oldest_dt} ({len(rows)}건)")
-            
-            # 다음 페이지 확인
-            next_cursor = result.get("result", {}).get("nextPageCursor")
-            if not next_cursor or oldest_ts and datetime.utcfromtimestamp(oldest_ts / 1000) <= start_dt:
-                break
-            cursor = next_cursor
-            
-            time.sleep(0.1)
+        for future in as_completed(futures):
+            task, (start, end_exclusive) = futures[future]
+            spec = EXCHANGES[task["source"]]
+            span = f"{start} ~ {end_exclusive - timedelta(days=1)}"
+            task["pending"] -= 1
+            try:
+                rows = future.result()
+            except Exception as e:
+                task["error"] = task["error"] or f"{span}: {e}"
+                print(f"⚠️ {spec['label']} {task['symbol']} {span} fetch error: {e}")
+            else:
+                writer.submit(spec["table"], spec["columns"], rows)
+                task["rows"] += len(rows)
+                if rows:
+                    date_idx = spec["columns"].index("date")
+                    task["newest"] = max(task["newest"] or "", max(row[date_idx] for row in rows))
+                print(f"✅ {spec['label']} {task['symbol']}: {span} ({len(rows)}건)")
             
-        except Exception as e:
-            print(f"⚠️ Bybit {symbol} fetch error: {e}")
-            import traceback
-            traceback.print_exc()
-            time.sleep(1)
-            break
-    
-    print(f"✅ Bybit {symbol}: 총 {len(all_rows)}건 수집 완료")
-
-
-def fetch_bybit_spot_range(symbol, start_date_str="2024-01-01", end_dt_exclusive: datetime = None):
-    """Bybit 지정 날짜부터 end_dt_exclusive까지 수집 (역순 페이지네이션, 필터링)"""
-    start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
-    if end_dt_exclusive is None:
-        end_dt_exclusive = datetime.now()
-
-    # end_dt_exclusive 이전(포함)의 데이터만 저장하기 위해 마지막 포함일을 계산
-    end_inclusive = (end_dt_exclusive - timedelta(days=1)).date()
-
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
-
-    print(f"🔄 Bybit {symbol} 수집 시작 ({start_date_str} ~ {end_inclusive.isoformat()})...")
-
-    cursor = None
-    total_saved = 0
-
-    while True:
-        params = {"category": "spot", "symbol": symbol, "interval": "D", "limit": 200}
-        if cursor:
-            params["cursor"] = cursor
-
-        try:
-            response = session.get(BYBIT_BASE, params=params, timeout=10)
-            if response.status_code != 200:
-                print(f"⚠️ Bybit {symbol} HTTP {response.status_code}: {response.text[:200]}")
-                break
-
-            result = response.json()
-            if result.get("retCode") != 0:
-                print(f"⚠️ Bybit {symbol} API 오류: {result.get('retMsg')}")
-                break
-
-            data = result.get("result", {}).get("list", [])
-            if not data:
-                break
-
-            rows = []
-            oldest_ts = None
-
-            for candle in data:
-                ts = int(candle[0])
-                dt = datetime.utcfromtimestamp(ts / 1000)
-
-                # end 범위 초과(미래) 데이터는 스킵
-                if dt.date() > end_inclusive:
-                    continue
-
-                # start 범위 이전이면 종료 조건으로 사용
-                if dt < start_dt:
-                    continue
-
-                if oldest_ts is None or ts < oldest_ts:
-                    oldest_ts = ts
-
-                dt_str = dt.date().isoformat()
-                rows.append(
-                    (
-                        symbol,
-                        dt_str,
-                        float(candle[1]),
-                        float(candle[2]),
-                        float(candle[3]),
-                        float(candle[4]),
-                        float(candle[5]),
-                        float(candle[6]),
-                    )
-                )
-
-            if rows:
-                upsert_rows(
-                    "bybit_spot_daily",
-                    rows,
-                    ["symbol", "date", "open", "high", "low", "close", "volume", "quote_volume"],
-                )
-                total_saved += len(rows)
-                oldest_dt = datetime.utcfromtimestamp(oldest_ts / 1000).strftime("%Y-%m-%d") if oldest_ts else "N/A"
-                print(f"✅ Bybit {symbol}: ~{oldest_dt} ({len(rows)}건)")
-
-            next_cursor = result.get("result", {}).get("nextPageCursor")
-            if not next_cursor:
-                break
-
-            # start_date 이전까지 도달했는지 체크
-            if oldest_ts and datetime.utcfromtimestamp(oldest_ts / 1000) <= start_dt:
-                break
-
-            cursor = next_cursor
-            time.sleep(0.1)
-
-        except Exception as e:
-            print(f"⚠️ Bybit {symbol} fetch error: {e}")
-            import traceback
-            traceback.print_exc()
-            time.sleep(1)
-            break
-
-    print(f"✅ Bybit {symbol}: 총 {total_saved}건 수집 완료")
+            if task["pending"] == 0 and task["error"] is None and task["newest"]:
+                # end-date 이후(클램프로 지워질 날짜)로는 전진하지 않음
+                writer.mark(task["source"], task["symbol"], min(task["newest"], clamp) if clamp else task["newest"])
+    return tasks
+
+
+def plan_tasks(state, end_exclusive: date, end_date=None):
+    """환경 변수의 마켓/심볼별 수집 구간 (워터마크 마지막 저장일부터, 진행 중이던 일봉도 다시 받아 갱신)"""
+    tasks = []
+    for source, spec in EXCHANGES.items():
+        for symbol in os.getenv(spec["env"], spec["default_symbols"]).split(","):
+            symbol = symbol.strip()
+            if not symbol:
+                continue
+            max_date = state.last_timestamp(source, symbol, STREAM)
+            if max_date and end_date and max_date[:10] >= end_date:
+                print(f"⏭️ {spec['label']} {symbol}: 이미 최신 ({max_date})")
+                continue
+            start = _parse_ymd(max_date) if max_date else _parse_ymd(spec["default_start"])
+            tasks.append({"source": source, "symbol": symbol, "start": start, "end_exclusive": end_exclusive})
+    return tasks
 
 
 def main():
-    ensure_db()
     parser = argparse.ArgumentParser(description="Spot daily data collection for Upbit/Binance/Bitget/Bybit into SQLite")
-    parser.add_argument("--end-date", type=str, default=None, help="포함되는 종료일 (YYYY-MM-DD). 미지정 시 오늘(로컬) 기준")
+    parser.add_argument("--end-date", type=str, default=None, help="포함되는 종료일 (YYYY-MM-DD). 미지정 시 오늘(UTC) 진행 중인 일봉까지")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"동시 요청 수 (기본: {DEFAULT_WORKERS}, 거래소별 호출 한도는 별도 적용)")
     args = parser.parse_args()
-
+    state = ensure_db()
+    
     if args.end_date:
-        end_date = _parse_ymd(args.end_date)
-        end_dt_exclusive = end_date + timedelta(days=1)
-        # Bitget은 일봉 경계가 UTC+8(=UTC 16:00)로 잡히는 경우가 있어,
-        # end-date(포함) 일봉이 누락되지 않도록 1일 버퍼를 둔 뒤 저장 후 클램프합니다.
-        bitget_end_dt_exclusive = end_dt_exclusive + timedelta(days=1)
-        # Upbit은 'to'로 inclusive 성격이므로 23:59:59로 맞춤
-        upbit_end_dt = end_date.replace(hour=23, minute=59, second=59)
+        end_exclusive = _parse_ymd(args.end_date) + timedelta(days=1)
     else:
-        # 기본: 오늘까지(실행 시점)
-        today = datetime.now().date()
-        upbit_end_dt = datetime.now()
-        end_dt_exclusive = datetime.now()
-        bitget_end_dt_exclusive = datetime.now()
-
-    upbit_markets = os.getenv("UPBIT_MARKETS", "KRW-BTC,KRW-ETH").split(",")
-    binance_symbols = os.getenv("BINANCE_SYMBOLS", "BTCUSDT,ETHUSDT").split(",")
-    bitget_symbols = os.getenv("BITGET_SYMBOLS", "BTCUSDT,ETHUSDT").split(",")
-    bybit_symbols = os.getenv("BYBIT_SYMBOLS", "BTCUSDT,ETHUSDT").split(",")
-
-    # DB에서 각 심볼별 max(date) 기반으로 증분 수집
-    conn = sqlite3.connect(DB_PATH)
-
-    print("📊 업비트 데이터 수집 시작...")
-    for market in upbit_markets:
-        m = market.strip()
-        max_date = _get_max_date(conn, "upbit_daily", "market = ?", (m,))
-        stop_dt = datetime(2023, 1, 1)
-        if max_date:
-            stop_dt = _parse_ymd(max_date)
-            if args.end_date and max_date >= args.end_date:
-                print(f"⏭️ Upbit {m}: 이미 최신 ({max_date})")
-                continue
-        fetch_upbit_daily(m, upbit_end_dt, stop_dt)
+        end_exclusive = datetime.now(timezone.utc).date() + timedelta(days=1)
     
-    print("\n📊 바이낸스 데이터 수집 시작...")
-    for symbol in binance_symbols:
-        s = symbol.strip()
-        max_date = _get_max_date(conn, "binance_spot_daily", "symbol = ?", (s,))
-        if max_date and args.end_date and max_date >= args.end_date:
-            print(f"⏭️ Binance {s}: 이미 최신 ({max_date})")
-            continue
-        start_dt = _parse_ymd(max_date) + timedelta(days=1) if max_date else datetime(2023, 1, 1)
-        fetch_binance_spot(s, start_dt, end_dt_exclusive)
+    # ingestion_state 워터마크(마지막 저장일) 기준으로 증분 수집
+    tasks = plan_tasks(state, end_exclusive, args.end_date)
+    partitions = sum(
+        len(date_partitions(task["start"], task["end_exclusive"], EXCHANGES[task["source"]]["partition_days"]))
+        for task in tasks
+    )
+    print(f"📊 현물 일봉 수집 시작: (거래소, 심볼) {len(tasks)}개, 날짜 구간 {partitions}개, 워커 {args.workers}개")
     
-    print("\n📊 비트겟 데이터 수집 시작...")
-    for symbol in bitget_symbols:
-        s = symbol.strip()
-        max_date = _get_max_date(conn, "bitget_spot_daily", "symbol = ?", (s,))
-        if max_date and args.end_date and max_date >= args.end_date:
-            print(f"⏭️ Bitget {s}: 이미 최신 ({max_date})")
-            continue
-        start_date_str = (datetime.strptime(max_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d") if max_date else "2024-01-01"
-        fetch_bitget_spot(s, start_date_str=start_date_str, end_dt_exclusive=bitget_end_dt_exclusive)
+    started = time.monotonic()
+    writer = SpotWriter(DB_PATH, state)
+    try:
+        run_backfill(tasks, writer, workers=args.workers, clamp=args.end_date)
+    finally:
+        writer.close()
     
-    print("\n📊 바이비트 데이터 수집 시작...")
-    for symbol in bybit_symbols:
-        s = symbol.strip()
-        max_date = _get_max_date(conn, "bybit_spot_daily", "symbol = ?", (s,))
-        if max_date and args.end_date and max_date >= args.end_date:
-            print(f"⏭️ Bybit {s}: 이미 최신 ({max_date})")
-            continue
-        start_date_str = (datetime.strptime(max_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d") if max_date else "2024-01-01"
-        fetch_bybit_spot_range(s, start_date_str=start_date_str, end_dt_exclusive=end_dt_exclusive)
-
-    conn.close()
-
     # end-date가 지정된 경우, 방어적으로 초과 데이터 제거 (특히 Binance/Bitget)
     if args.end_date:
         conn = sqlite3.connect(DB_PATH)
@@ -631,8 +571,19 @@ def main():
         conn.commit()
         cur.close()
         conn.close()
+    
+    print(f"\n📋 수집 결과 ({time.monotonic() - started:.1f}초, 저장 {writer.rows}건 / 트랜잭션 {writer.transactions}회)")
+    failed = 0
+    for task in tasks:
+        label = EXCHANGES[task["source"]]["label"]
+        if task["error"]:
+            failed += 1
+            print(f"  ⚠️ {label} {task['symbol']}: {task['rows']}건, 워터마크 유지 ({task['error']})")
+        else:
+            print(f"  ✅ {label} {task['symbol']}: {task['rows']}건, 마지막 {task['newest'] or '-'}")
+    print(f"\n🌐 API 요청 지표\n{REQUEST_METRICS.format_summary()}")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Project 2: 백테스트 결과 Monte Carlo 부트스트랩
+- 거래 수익률 리샘플링: (n_sims × n_trades) 행렬 한 번에 생성
+- 일별 수익률 블록 부트스트랩: 자기상관 보존 (circular block bootstrap)
+- 최종 수익률 / MDD / Sharpe 신뢰구간
+- 시드 고정 가능한 numpy Generator
+- 시드가 같은 재실행은 결과 캐시 재사용 (UI에서 같은 조건 재계산 시 시뮬레이션 생략)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# 시드 고정 실행 결과 캐시 (입력 수익률 / 설정 기준, 최근 사용 순 최대 CACHE_SIZE개)
+CACHE_SIZE = 32
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _max_drawdown(equity):
+    """행(시뮬레이션)별 MDD. equity는 초기값 1 기준 누적 자본 (n_sims × n_steps)"""
+    peak = np.maximum.accumulate(equity, axis=1)
+    # 초기 자본 1.0도 고점 후보 (첫 거래부터 손실인 경로)
+    peak = np.maximum(peak, 1.0)
+    return (equity / peak - 1.0).min(axis=1)
+
+
+def _sharpe(returns, scale):
+    """행별 평균 / 표본표준편차(ddof=1) × scale (무위험 수익률 0, 표준편차 0이면 0)"""
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.zeros(len(returns))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * scale, 0.0)
+    return sharpe
+
+
+def bootstrap_trades(trade_returns, n_sims=10_000, rng=None):
+    """
+    거래 단위 i.i.d. 부트스트랩
+
+    Returns:
+        {'final_return', 'mdd', 'sharpe_ratio'}: 길이 n_sims 배열
+        (Sharpe는 trade_metrics의 거래 기준 정의: 거래 수익률 평균 / 표준편차 × sqrt(거래 수),
+        연율화하지 않고 무위험 수익률은 빼지 않음)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    r = np.asarray(trade_returns, dtype=float)
+    n = len(r)
+    paths = r[rng.integers(0, n, size=(n_sims, n))]
+    equity = np.cumprod(1.0 + paths, axis=1)
+    return {
+        'final_return': equity[:, -1] - 1.0,
+        'mdd': _max_drawdown(equity),
+        'sharpe_ratio': _sharpe(paths, np.sqrt(n)),
+    }
+
+
+def default_block_size(n):
+    """블록 길이 기본값 n^(1/3) (최소 1)"""
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def block_bootstrap_returns(returns, n_sims=10_000, block_size=None, periods_per_year=365.25, rng=None):
+    """
+    일별(봉별) 수익률 circular block 부트스트랩
+
+    연속 block_size개 수익률을 하나의 블록으로 뽑아 이어붙이므로
+    블록 내부 자기상관(보유 포지션의 연속 손익)이 유지됨
+
+    Returns:
+        {'final_return', 'mdd', 'sharpe_ratio'}: 길이 n_sims 배열
+        (Sharpe는 analyze_performance와 같은 정의: 봉 수익률 평균 / 표준편차 × sqrt(periods_per_year),
+        무위험 수익률은 빼지 않음)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    r = np.asarray(returns, dtype=float)
+    n = len(r)
+    block_size = block_size or default_block_size(n)
+    n_blocks = -(-n // block_size)
+
+    starts = rng.integers(0, n, size=(n_sims, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    paths = r[idx.reshape(n_sims, n_blocks * block_size)[:, :n]]
+
+    equity = np.cumprod(1.0 + paths, axis=1)
+    return {
+        'final_return': equity[:, -1] - 1.0,
+        'mdd': _max_drawdown(equity),
+        'sharpe_ratio': _sharpe(paths, np.sqrt(periods_per_year)),
+    }
+
+
+def confidence_intervals(samples, observed=None, confidence=0.90):
+    """
+    지표별 신뢰구간 요약
+
+    Args:
+        samples: {지표명: 시뮬레이션 배열}
+        observed: {지표명: 실제 백테스트 값} (선택)
+        confidence: 양측 신뢰수준 (0.90 → 5% ~ 95%)
+    """
+    alpha = (1 - confidence) / 2
+    rows = []
+    for metric, values in samples.items():
+        low, median, high = np.quantile(values, [alpha, 0.5, 1 - alpha])
+        rows.append({
+            'metric': metric,
+            'observed': (observed or {}).get(metric, np.nan),
+            'mean': values.mean(),
+            'median': median,
+            'lower': low,
+            'upper': high,
+        })
+    return pd.DataFrame(rows).set_index('metric')
+
+
+def _cache_key(trade_returns, daily_returns, observed, settings):
+    digest = hashlib.sha256()
+    for values in (trade_returns, daily_returns):
+        digest.update(b'-' if values is None else np.ascontiguousarray(values, dtype=float).tobytes())
+        digest.update(b'|')
+    return digest.hexdigest(), tuple(sorted(observed.items())), settings
+
+
+def _copy_result(result):
+    return {k: v.copy() if isinstance(v, pd.DataFrame) else v for k, v in result.items()}
+
+
+class MonteCarloBootstrap:
+    def __init__(self, n_sims=10_000, block_size=None, confidence=0.90, periods_per_year=365.25, seed=None):
+        """
+        Args:
+            n_sims: 시뮬레이션 횟수 (UI 등 대화형 호출은 더 작은 값 권장)
+            block_size: 일별 블록 길이 (None이면 n^(1/3))
+            confidence: 양측 신뢰수준
+            periods_per_year: 일별 Sharpe 연율화 봉 수
+            seed: 난수 시드 (None이 아니면 같은 입력 / 설정의 결과를 캐시에서 재사용)
+        """
+        self.n_sims = n_sims
+        self.block_size = block_size
+        self.confidence = confidence
+        self.periods_per_year = periods_per_year
+        self.seed = seed
+
+    def run(self, trade_df, daily_capital_df=None, metrics=None):
+        """
+        거래 내역 / 일별 자본 곡선 부트스트랩
+
+        Args:
+            trade_df: run_backtest 거래 내역 ('return' 컬럼)
+            daily_capital_df: 일별 자본 곡선 ('capital' 컬럼, 선택)
+            metrics: analyze_performance 결과 (observed 값 표시용, 선택)
+
+        Returns:
+            {
+                'trades': 거래 부트스트랩 신뢰구간 DataFrame (거래 없으면 None),
+                'daily': 일별 블록 부트스트랩 신뢰구간 DataFrame (자본 곡선 없으면 None),
+                'prob_loss': 일별(없으면 거래) 기준 손실 확률,
+                'n_sims': 시뮬레이션 횟수,
+                'block_size': 사용된 블록 길이
+            }
+        """
+        observed = {k: metrics[k] for k in ('final_return', 'mdd', 'sharpe_ratio') if k in metrics} if metrics else {}
+        trade_returns = trade_df['return'].to_numpy() if trade_df is not None and not trade_df.empty else None
+        daily_returns = (
+            daily_capital_df['capital'].pct_change().dropna().to_numpy()
+            if daily_capital_df is not None and len(daily_capital_df) > 2 else None
+        )
+
+        key = None
+        if self.seed is not None:
+            settings = (self.n_sims, self.block_size, self.confidence, self.periods_per_year, self.seed)
+            key = _cache_key(trade_returns, daily_returns, observed, settings)
+            with _cache_lock:
+                if key in _cache:
+                    _cache.move_to_end(key)
+                    return _copy_result(_cache[key])
+
+        result = self._simulate(trade_returns, daily_returns, observed)
+
+        if key is not None:
+            with _cache_lock:
+                _cache[key] = _copy_result(result)
+                while len(_cache) > CACHE_SIZE:
+                    _cache.popitem(last=False)
+        return result
+
+    def _simulate(self, trade_returns, daily_returns, observed):
+        rng = np.random.default_rng(self.seed)
+        result = {'trades': None, 'daily': None, 'prob_loss': None, 'n_sims': self.n_sims, 'block_size': None}
+
+        if trade_returns is not None:
+            samples = bootstrap_trades(trade_returns, self.n_sims, rng)
+            # 거래 기준 MDD / Sharpe는 일별 지표와 정의가 달라 최종 수익률만 비교
+            trade_observed = {k: v for k, v in observed.items() if k == 'final_return'}
+            result['trades'] = confidence_intervals(samples, trade_observed, self.confidence)
+            result['prob_loss'] = float((samples['final_return'] < 0).mean())
+
+        if daily_returns is not None:
+            block_size = self.block_size or default_block_size(len(daily_returns))
+            samples = block_bootstrap_returns(
+                daily_returns, self.n_sims, block_size, self.periods_per_year, rng
+            )
+            result['daily'] = confidence_intervals(samples, observed, self.confidence)
+            result['prob_loss'] = float((samples['final_return'] < 0).mean())
+            result['block_size'] = block_size
+
+        return result
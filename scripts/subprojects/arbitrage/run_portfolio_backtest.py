@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Project 2: 포트폴리오 모드 차익거래 백테스트 실행
+- 6개 거래소 쌍 동시 포지션
+- 자본 배분 방식별 비교 (equal / zscore / capped)
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from backtest_portfolio import PortfolioArbitrageBacktest, ALLOCATORS
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쌍별 독립 포지션 포트폴리오 백테스트")
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--end-date", default="2025-11-22")
+    parser.add_argument("--coin", default="BTC")
+    parser.add_argument("--entry-z", type=float, default=2.5)
+    parser.add_argument("--exit-z", type=float, default=0.5)
+    parser.add_argument("--max-pair-weight", type=float, default=0.5, help="capped 배분 시 쌍별 최대 비중")
+    args = parser.parse_args()
+
+    print("🚀 Project 2: 포트폴리오 모드 차익거래 백테스트")
+    print("=" * 60)
+    print(f"기간: {args.start_date} ~ {args.end_date}")
+    print("=" * 60)
+
+    summary = []
+    output_dir = ROOT / "data"
+    output_dir.mkdir(exist_ok=True)
+
+    for allocator in ALLOCATORS:
+        backtest = PortfolioArbitrageBacktest(
+            entry_z=args.entry_z,
+            exit_z=args.exit_z,
+            allocator=allocator,
+            max_pair_weight=args.max_pair_weight
+        )
+        df = backtest.load_data(args.start_date, args.end_date, coin=args.coin)
+        df = backtest.calculate_indicators(df)
+        benchmark_return = backtest.calculate_benchmark(df)
+
+        trades_df, equity_df = backtest.run_backtest(df)
+        metrics = backtest.analyze_performance(trades_df, equity_df, benchmark_return)
+        attribution = backtest.pair_attribution(trades_df, equity_df)
+
+        print(f"\n📊 배분 방식: {allocator}")
+        print(f"   총 거래: {metrics['total_trades']}회, 최대 동시 포지션: {metrics['max_concurrent_positions']}개")
+        print(f"   최종 수익률: {metrics['final_return'] * 100:.2f}%, MDD: {metrics['mdd'] * 100:.2f}%, "
+              f"Sharpe: {metrics['sharpe_ratio']:.2f}, 평균 자본 활용률: {metrics['avg_capital_utilization'] * 100:.1f}%")
+        print(attribution[['total_trades', 'win_rate', 'total_profit', 'contribution']])
+
+        summary.append({'allocator': allocator, **metrics})
+        trades_df.to_csv(output_dir / f"project2_portfolio_{allocator}_trades.csv", index=False)
+        equity_df.to_csv(output_dir / f"project2_portfolio_{allocator}_capital.csv", index=False)
+
+    print("\n" + "=" * 60)
+    print(pd.DataFrame(summary).set_index('allocator')[
+        ['total_trades', 'final_return', 'mdd', 'sharpe_ratio', 'avg_capital_utilization']
+    ])
+    print(f"벤치마크 (Buy & Hold): {benchmark_return * 100:.2f}%")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Project 2: 스트리밍 차익거래 백테스트 실행
+- 일봉: SQLite 4개 거래소 조인 (6개 쌍)
+- 시간봉: Supabase price_history (업비트 / 바이낸스, upbit_binance 쌍)
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+from backtest_streaming import StreamingArbitrageBacktest, iter_daily_chunks, iter_hourly_chunks
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 단위 스트리밍 차익거래 백테스트")
+    parser.add_argument("--interval", choices=["1d", "1h"], default="1d", help="봉 주기")
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--end-date", default="2025-11-22")
+    parser.add_argument("--coin", default="BTC")
+    parser.add_argument("--chunk-days", type=int, default=None, help="청크 크기 (일). 기본: 일봉 90, 시간봉 30")
+    parser.add_argument("--entry-z", type=float, default=2.5)
+    parser.add_argument("--exit-z", type=float, default=0.5)
+    parser.add_argument("--rolling-window", type=int, default=None, help="Z-Score 기간 (봉 개수). 기본: 일봉 30, 시간봉 720")
+    args = parser.parse_args()
+
+    if args.interval == "1d":
+        backtest = StreamingArbitrageBacktest(
+            entry_z=args.entry_z,
+            exit_z=args.exit_z,
+            rolling_window=args.rolling_window or 30,
+            exclude_upbit_binance=True,
+            bar_interval="1d"
+        )
+        chunks = iter_daily_chunks(args.start_date, args.end_date, coin=args.coin, chunk_days=args.chunk_days or 90)
+    else:
+        from dotenv import load_dotenv
+        from supabase import create_client
+
+        load_dotenv(ROOT / "config" / ".env")
+        supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+        backtest = StreamingArbitrageBacktest(
+            entry_z=args.entry_z,
+            exit_z=args.exit_z,
+            rolling_window=args.rolling_window or 30 * 24,
+            pairs=["upbit_binance"],
+            bar_interval="1h"
+        )
+        chunks = iter_hourly_chunks(supabase, args.start_date, args.end_date, coin=args.coin, chunk_days=args.chunk_days or 30)
+
+    print("🚀 Project 2: 스트리밍 차익거래 백테스트")
+    print("=" * 60)
+    print(f"기간: {args.start_date} ~ {args.end_date} ({args.interval})")
+    print(f"거래소 쌍: {', '.join(backtest.pairs)}")
+    print("=" * 60)
+
+    trades_df, equity_df = backtest.run(chunks)
+    benchmark_return = backtest.calculate_benchmark()
+    metrics = backtest.analyze_performance(trades_df, equity_df, benchmark_return)
+
+    print(f"처리 청크: {backtest.chunks_processed}개, 봉: {len(equity_df):,}개")
+    print(f"총 거래 횟수: {metrics['total_trades']}회")
+    print(f"최종 수익률: {metrics['final_return'] * 100:.2f}%")
+    print(f"연율화 수익률: {metrics['annualized_return'] * 100:.2f}%")
+    print(f"승률: {metrics['win_rate'] * 100:.1f}%")
+    print(f"MDD: {metrics['mdd'] * 100:.2f}%")
+    print(f"Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+    print(f"벤치마크 (Buy & Hold): {metrics['benchmark_return'] * 100:.2f}%")
+    print("=" * 60)
+
+    output_dir = ROOT / "data"
+    output_dir.mkdir(exist_ok=True)
+    trades_df.to_csv(output_dir / f"project2_streaming_{args.interval}_trades.csv", index=False)
+    equity_df.to_csv(output_dir / f"project2_streaming_{args.interval}_capital.csv", index=False)
+
+
+if __name__ == "__main__":
+    main()
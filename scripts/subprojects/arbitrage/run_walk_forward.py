@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Project 2: 차익거래 전략 Walk-Forward 최적화 실행
+- entry_z / exit_z / rolling_window 구간별 재최적화
+- OOS 자본 곡선 및 파라미터 안정성 리포트
+"""
+
+import argparse
+from pathlib import Path
+
+from backtest_portfolio import PortfolioArbitrageBacktest
+from walk_forward import WalkForwardOptimizer
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-Forward 최적화")
+    parser.add_argument("--start-date", default="2023-01-01")
+    parser.add_argument("--end-date", default="2025-11-22")
+    parser.add_argument("--coin", default="BTC")
+    parser.add_argument("--train-days", type=int, default=365)
+    parser.add_argument("--test-days", type=int, default=90)
+    parser.add_argument("--anchored", action="store_true", help="학습 구간 시작 고정 (확장 윈도우)")
+    parser.add_argument("--objective", default="sharpe_ratio")
+    parser.add_argument("--n-jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    print("🚀 Project 2: Walk-Forward 최적화")
+    print("=" * 60)
+    print(f"기간: {args.start_date} ~ {args.end_date}")
+    print(f"학습 {args.train_days}일 / 검증 {args.test_days}일 ({'anchored' if args.anchored else 'rolling'})")
+    print("=" * 60)
+
+    df = PortfolioArbitrageBacktest().load_data(args.start_date, args.end_date, coin=args.coin)
+
+    optimizer = WalkForwardOptimizer(
+        train_days=args.train_days,
+        test_days=args.test_days,
+        anchored=args.anchored,
+        objective=args.objective,
+        n_jobs=args.n_jobs,
+        exclude_upbit_binance=True
+    )
+    result = optimizer.run(df)
+    metrics = optimizer.analyze_performance(result)
+
+    print("\n📊 폴드별 선택 파라미터")
+    print(result['folds'][['fold', 'train_end', 'entry_z', 'exit_z', 'rolling_window',
+                           'train_score', 'oos_trades', 'oos_return', 'oos_sharpe']].to_string(index=False))
+
+    print("\n📊 파라미터 안정성")
+    print(result['stability'])
+
+    print("\n" + "=" * 60)
+    print(f"폴드 수: {metrics['n_folds']}")
+    print(f"OOS 총 거래: {metrics['total_trades']}회")
+    print(f"OOS 최종 수익률: {metrics['final_return'] * 100:.2f}%")
+    print(f"OOS MDD: {metrics['mdd'] * 100:.2f}%")
+    print(f"OOS Sharpe: {metrics['sharpe_ratio']:.2f}")
+    print(f"Walk-Forward 효율 (OOS / 학습 Sharpe): {metrics['walk_forward_efficiency']:.2f}")
+    print("=" * 60)
+
+    output_dir = ROOT / "data"
+    output_dir.mkdir(exist_ok=True)
+    result['folds'].to_csv(output_dir / "project2_walk_forward_folds.csv", index=False)
+    result['trades'].to_csv(output_dir / "project2_walk_forward_trades.csv", index=False)
+    result['equity'].to_csv(output_dir / "project2_walk_forward_capital.csv", index=False)
+
+
+if __name__ == "__main__":
+    main()
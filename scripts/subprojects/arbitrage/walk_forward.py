@@ -0,0 +1,271 @@
+"""
+Project 2: 차익거래 전략 Walk-Forward 최적화
+- 학습(train) / 검증(test) 구간을 슬라이딩하며 구간별 파라미터 탐색
+- 학습 구간 최적 파라미터를 다음 검증 구간에 적용 (Out-of-Sample)
+- 검증 구간 자본 곡선을 이어붙인 OOS 자본 곡선 (폴드 종료 시 보유 포지션은 마지막 봉에서 청산)
+- 폴드 병렬 실행 (ProcessPoolExecutor)
+- rolling_window별 지표는 전체 기간에 한 번만 계산해 모든 폴드가 공유
+- 폴드별 선택 파라미터 안정성 리포트
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from backtest_streaming import StreamingArbitrageBacktest
+
+
+DEFAULT_PARAM_GRID = {
+    'entry_z': [2.0, 2.5, 3.0],
+    'exit_z': [0.0, 0.5, 1.0],
+    'rolling_window': [20, 30, 60],
+}
+
+
+def _evaluate(indicators, params, engine_kwargs):
+    """
+    지표가 계산된 구간에 파라미터 1세트 적용 → (거래, 자본 곡선, 성과)
+
+    구간 종료 시 보유 포지션은 마지막 봉에서 청산해 손익 반영 (다음 폴드로 넘어가거나 버려지지 않음)
+    """
+    backtest = StreamingArbitrageBacktest(
+        entry_z=params['entry_z'],
+        exit_z=params['exit_z'],
+        rolling_window=params['rolling_window'],
+        **engine_kwargs
+    )
+    df = backtest.generate_signals(indicators)
+    trades, equity = backtest.run_backtest(df, close_at_end=True)
+    metrics = backtest.analyze_performance(trades, equity, 0.0)
+    return trades, equity, metrics
+
+
+def _run_fold(fold, train_sets, test_sets, combos, objective, min_trades, engine_kwargs):
+    """폴드 1개: 학습 구간 그리드 탐색 → 최적 파라미터로 검증 구간 실행 (프로세스 워커)"""
+    best_params = None
+    best_score = -np.inf
+    search = []
+
+    for params in combos:
+        _, _, metrics = _evaluate(train_sets[params['rolling_window']], params, engine_kwargs)
+        score = metrics[objective] if metrics['total_trades'] >= min_trades else -np.inf
+        search.append({**params, 'score': score, 'total_trades': metrics['total_trades']})
+        if score > best_score:
+            best_score = score
+            best_params = params
+
+    if best_params is None:
+        # 학습 구간에서 최소 거래 수를 만족하는 조합이 없으면 첫 조합 사용
+        best_params = combos[0]
+
+    trades, equity, metrics = _evaluate(test_sets[best_params['rolling_window']], best_params, engine_kwargs)
+    return {
+        'fold': fold,
+        'params': best_params,
+        'train_score': best_score,
+        'search': pd.DataFrame(search),
+        'trades': trades,
+        'equity': equity,
+        'metrics': metrics,
+    }
+
+
+class WalkForwardOptimizer:
+    def __init__(
+        self,
+        param_grid=None,
+        train_days=365,
+        test_days=90,
+        step_days=None,
+        anchored=False,
+        objective='sharpe_ratio',
+        min_trades=3,
+        n_jobs=None,
+        initial_capital=100_000_000,
+        **engine_kwargs
+    ):
+        """
+        Args:
+            param_grid: {'entry_z': [...], 'exit_z': [...], 'rolling_window': [...]}
+            train_days / test_days: 학습 / 검증 구간 길이 (일)
+            step_days: 폴드 이동 간격 (기본: test_days → 검증 구간이 겹치지 않음)
+            anchored: True면 학습 구간 시작을 고정 (확장 윈도우)
+            objective: 학습 구간 선택 기준 (analyze_performance 지표명)
+            min_trades: 학습 구간 최소 거래 수 (미만이면 후보 제외)
+            n_jobs: 병렬 프로세스 수 (1이면 순차 실행)
+            engine_kwargs: StreamingArbitrageBacktest 공통 인자 (fee_rate, stop_loss, pairs ...)
+        """
+        self.param_grid = param_grid or DEFAULT_PARAM_GRID
+        self.train_days = train_days
+        self.test_days = test_days
+        self.step_days = step_days or test_days
+        self.anchored = anchored
+        self.objective = objective
+        self.min_trades = min_trades
+        self.n_jobs = n_jobs
+        self.initial_capital = initial_capital
+        self.engine_kwargs = {'initial_capital': initial_capital, **engine_kwargs}
+
+        keys = ['entry_z', 'exit_z', 'rolling_window']
+        missing = [k for k in keys if k not in self.param_grid]
+        if missing:
+            raise ValueError(f"param_grid에 {missing} 값이 필요합니다.")
+        self.combos = [dict(zip(keys, values)) for values in itertools.product(*(self.param_grid[k] for k in keys))]
+
+    def make_folds(self, dates):
+        """(학습 시작, 학습 종료=검증 시작, 검증 종료) 날짜 목록 (종료는 미포함)"""
+        first, last = pd.Timestamp(dates.min()), pd.Timestamp(dates.max())
+        train = pd.Timedelta(days=self.train_days)
+        test = pd.Timedelta(days=self.test_days)
+        step = pd.Timedelta(days=self.step_days)
+
+        folds = []
+        offset = pd.Timedelta(0)
+        while first + offset + train < last:
+            train_start = first if self.anchored else first + offset
+            train_end = first + offset + train
+            test_end = min(train_end + test, last + pd.Timedelta(days=1))
+            folds.append((train_start, train_end, test_end))
+            offset += step
+        return folds
+
+    def build_indicator_cache(self, df):
+        """rolling_window별 지표를 전체 기간에 한 번 계산 (폴드 간 공유, 과거 데이터만 사용)"""
+        cache = {}
+        engine_kwargs = {k: v for k, v in self.engine_kwargs.items() if k != 'initial_capital'}
+        for window in sorted(set(self.param_grid['rolling_window'])):
+            backtest = StreamingArbitrageBacktest(rolling_window=window, **engine_kwargs)
+            cache[window] = backtest.calculate_indicators(df)
+        return cache
+
+    def run(self, df):
+        """
+        Walk-Forward 실행
+
+        Returns:
+            {
+                'folds': 폴드별 선택 파라미터 / 학습 점수 / OOS 성과 DataFrame,
+                'trades': OOS 거래 내역 (폴드 번호 포함, 자본 연결),
+                'equity': 이어붙인 OOS 자본 곡선,
+                'stability': 파라미터 안정성 DataFrame,
+                'search': 폴드별 그리드 탐색 결과
+            }
+        """
+        cache = self.build_indicator_cache(df)
+        folds = self.make_folds(df['date'])
+        if not folds:
+            raise ValueError("데이터 기간이 학습 구간보다 짧아 폴드를 만들 수 없습니다.")
+
+        jobs = []
+        for i, (train_start, train_end, test_end) in enumerate(folds):
+            train_sets = {
+                w: ind[(ind['date'] >= train_start) & (ind['date'] < train_end)].reset_index(drop=True)
+                for w, ind in cache.items()
+            }
+            test_sets = {
+                w: ind[(ind['date'] >= train_end) & (ind['date'] < test_end)].reset_index(drop=True)
+                for w, ind in cache.items()
+            }
+            jobs.append((i, train_sets, test_sets, self.combos, self.objective, self.min_trades, self.engine_kwargs))
+
+        if self.n_jobs == 1 or len(jobs) == 1:
+            results = [_run_fold(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = [executor.submit(_run_fold, *job) for job in jobs]
+                results = [f.result() for f in futures]
+
+        return self._stitch(results, folds)
+
+    def _stitch(self, results, folds):
+        """폴드별 OOS 결과를 자본 연결하여 하나의 곡선 / 거래 내역으로 합침"""
+        base = float(self.initial_capital)
+        equity_parts = []
+        trade_parts = []
+        fold_rows = []
+        search_parts = []
+
+        for result, (train_start, train_end, test_end) in zip(results, folds):
+            scale = base / self.initial_capital
+            equity = result['equity'].copy()
+            trades = result['trades'].copy()
+
+            if not equity.empty:
+                equity['capital'] = equity['capital'] * scale
+                equity['fold'] = result['fold']
+                equity_parts.append(equity)
+            if not trades.empty:
+                trades['profit'] = trades['profit'] * scale
+                trades['capital'] = trades['capital'] * scale
+                trades['fold'] = result['fold']
+                trade_parts.append(trades)
+
+            end_capital = equity['capital'].iloc[-1] if not equity.empty else base
+            fold_rows.append({
+                'fold': result['fold'],
+                'train_start': train_start,
+                'train_end': train_end,
+                'test_end': test_end,
+                **result['params'],
+                'train_score': result['train_score'],
+                'oos_trades': result['metrics']['total_trades'],
+                'oos_return': end_capital / base - 1,
+                'oos_sharpe': result['metrics']['sharpe_ratio'],
+                'oos_mdd': result['metrics']['mdd'],
+            })
+            search = result['search'].copy()
+            search['fold'] = result['fold']
+            search_parts.append(search)
+            base = end_capital
+
+        folds_df = pd.DataFrame(fold_rows)
+        return {
+            'folds': folds_df,
+            'trades': pd.concat(trade_parts, ignore_index=True) if trade_parts else pd.DataFrame(),
+            'equity': (
+                pd.concat(equity_parts, ignore_index=True)
+                if equity_parts else pd.DataFrame(columns=['date', 'capital', 'fold'])
+            ),
+            'stability': self.parameter_stability(folds_df),
+            'search': pd.concat(search_parts, ignore_index=True),
+        }
+
+    def parameter_stability(self, folds_df):
+        """폴드별 선택 파라미터 안정성 (최빈값 비율, 변경 횟수, 표준편차)"""
+        rows = []
+        for param in ('entry_z', 'exit_z', 'rolling_window'):
+            values = folds_df[param]
+            mode = values.mode().iloc[0]
+            rows.append({
+                'param': param,
+                'mode': mode,
+                'mode_share': (values == mode).mean(),
+                'n_unique': values.nunique(),
+                'changes': int((values != values.shift()).iloc[1:].sum()),
+                'mean': values.mean(),
+                'std': values.std(ddof=0),
+            })
+        return pd.DataFrame(rows).set_index('param')
+
+    def analyze_performance(self, result):
+        """이어붙인 OOS 자본 곡선 성과 + 학습 대비 효율"""
+        equity = result['equity']
+        trades = result['trades']
+        folds = result['folds']
+        backtest = StreamingArbitrageBacktest(**self.engine_kwargs)
+        metrics = backtest.analyze_performance(trades, equity, 0.0)
+
+        if not equity.empty:
+            # 거래가 없는 경우에도 자본 곡선 기준 수익률 보고
+            metrics['final_return'] = equity['capital'].iloc[-1] / self.initial_capital - 1
+
+        finite_train = folds['train_score'].replace([np.inf, -np.inf], np.nan)
+        train_mean = finite_train.mean()
+        metrics['n_folds'] = len(folds)
+        metrics['mean_train_score'] = train_mean
+        metrics['walk_forward_efficiency'] = (
+            folds['oos_sharpe'].mean() / train_mean if train_mean and not np.isnan(train_mean) else 0.0
+        )
+        return metrics
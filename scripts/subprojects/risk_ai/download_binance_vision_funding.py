@@ -4,186 +4,79 @@ Binance Vision 아카이브에서 월별 Funding Rate 데이터 다운로드 및
 
 목표:
 - https://data.binance.vision/data/futures/um/monthly/fundingRate/{SYMBOL}/ 에서
-- 프로젝트 기간(2022-01-01 ~ 현재)에 해당하는 *.zip 파일 다운로드
-- 압축 해제 후 CSV에서 Funding Rate 데이터 추출
-- binance_futures_metrics 테이블에 저장
+- 프로젝트 기간(2022-01-01 ~ 현재)에 해당하는 *.zip 파일 병렬 다운로드 (월별 아카이브 우선, 없으면 일별)
+- 받은 zip은 temp/binance_vision 캐시에 보관 (재실행 시 네트워크 요청 없음)
+- CSV를 스트리밍으로 읽어 Funding Rate 데이터 추출
+- binance_futures_metrics 테이블에 여러 날짜씩 한 트랜잭션으로 저장
 """
 
 import argparse
 import logging
 import sqlite3
-import zipfile
-import io
-import re
-from datetime import datetime, timezone, timedelta
+import sys
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import time
-
-import pandas as pd
-import requests
+from typing import List, Dict, Any
 
 ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
 DB_PATH = ROOT / "data" / "project.db"
-BASE_URL = "https://data.binance.vision"
+CACHE_DIR = ROOT / "temp" / "binance_vision"
+
+from src.collectors.binance_vision import (
+    ArchiveCache,
+    csv_float,
+    ingest_archives,
+    plan_archives,
+    read_csv_columns,
+)
+
+MARKET = "futures/um"
+DATASET = "fundingRate"
+
+# 아카이브 시기에 따라 헤더가 다름 (calc_time / last_funding_rate 또는 funding_time / funding_rate)
+TIME_COLUMNS = ("calc_time", "funding_time", "timestamp")
+RATE_COLUMNS = ("last_funding_rate", "funding_rate")
+FUNDING_COLUMNS = {
+    **{name: csv_float for name in TIME_COLUMNS},
+    **{name: csv_float for name in RATE_COLUMNS},
+}
+
+
+def aggregate_funding(columns: Dict[str, List]) -> List[Dict[str, Any]]:
+    """펀딩 시점(ms) 컬럼을 UTC 날짜별 평균 Funding Rate로 집계"""
+    times = next((columns[name] for name in TIME_COLUMNS if name in columns), None)
+    rates = next((columns[name] for name in RATE_COLUMNS if name in columns), None)
+    if times is None or rates is None:
+        logging.warning("타임스탬프 / funding_rate 컬럼을 찾을 수 없습니다.")
+        return []
+    
+    days: Dict[date, List[float]] = {}
+    for ms, rate in zip(times, rates):
+        if ms is None or rate is None:
+            continue
+        day = datetime.fromtimestamp(ms / 1000, tz=timezone.utc).date()
+        days.setdefault(day, []).append(rate)
+    
+    return [
+        {"date": day, "avg_funding_rate": sum(values) / len(values)}
+        for day, values in sorted(days.items())
+    ]
 
 
-def list_available_funding_files(start_date: datetime, end_date: datetime, symbol: str = "BTCUSDT") -> List[Dict[str, Any]]:
-    """
-    Binance Vision에서 사용 가능한 Funding Rate zip 파일 목록 조회
-    파일명 패턴: {SYMBOL}-fundingRate-YYYY-MM.zip
-    """
-    logging.info(f"Binance Vision Funding Rate 파일 목록 조회 중... (symbol: {symbol})")
-    
-    funding_path = f"data/futures/um/monthly/fundingRate/{symbol}"
-    
-    # 월별 파일 생성
-    files = []
-    current = start_date.replace(day=1)  # 월의 첫날로 시작
-    
-    while current <= end_date:
-        filename = f"{symbol}-fundingRate-{current.strftime('%Y-%m')}.zip"
-        url = f"{BASE_URL}/{funding_path}/{filename}"
-        files.append({
-            "filename": filename,
-            "url": url,
-            "year": current.year,
-            "month": current.month,
-        })
-        
-        # 다음 달로 이동
-        if current.month == 12:
-            current = current.replace(year=current.year + 1, month=1)
-        else:
-            current = current.replace(month=current.month + 1)
-    
-    logging.info(f"총 {len(files)}개 파일 대상")
-    return files
-
-
-def download_file(url: str, max_retries: int = 3) -> Optional[bytes]:
-    """파일 다운로드 (재시도 포함)"""
-    for attempt in range(max_retries):
-        try:
-            resp = requests.get(url, timeout=30)
-            if resp.status_code == 200:
-                return resp.content
-            elif resp.status_code == 404:
-                logging.debug(f"파일 없음: {url}")
-                return None
-            else:
-                logging.warning(f"HTTP {resp.status_code} for {url}, 재시도 {attempt + 1}/{max_retries}")
-        except Exception as e:
-            logging.warning(f"다운로드 오류 ({url}): {e}, 재시도 {attempt + 1}/{max_retries}")
-        
-        if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)  # 지수 백오프
-    
-    return None
+def parse_funding_archive(zip_path: Path, archive: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """아카이브 → 일별 평균 Funding Rate 행"""
+    return aggregate_funding(read_csv_columns(zip_path, FUNDING_COLUMNS))
 
 
-def extract_funding_from_csv(csv_content: str) -> pd.DataFrame:
-    """
-    CSV 파일에서 Funding Rate 데이터 추출
-    
-    컬럼:
-    - funding_time: 타임스탬프 (ms)
-    - funding_rate: 펀딩비
-    """
-    try:
-        df = pd.read_csv(io.StringIO(csv_content))
-        
-        if len(df) == 0:
-            return pd.DataFrame()
-        
-        # 타임스탬프를 날짜로 변환
-        if 'funding_time' in df.columns:
-            df['date'] = pd.to_datetime(df['funding_time'], unit='ms', utc=True).dt.date
-        elif 'timestamp' in df.columns:
-            df['date'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True).dt.date
-        else:
-            logging.warning("타임스탬프 컬럼을 찾을 수 없습니다.")
-            return pd.DataFrame()
-        
-        # Funding Rate 추출
-        if 'funding_rate' in df.columns:
-            df['funding_rate'] = pd.to_numeric(df['funding_rate'], errors='coerce')
-        else:
-            logging.warning("funding_rate 컬럼을 찾을 수 없습니다.")
-            return pd.DataFrame()
-        
-        # 일별 평균 Funding Rate 계산
-        daily_funding = df.groupby('date')['funding_rate'].mean().reset_index()
-        daily_funding.columns = ['date', 'avg_funding_rate']
-        
-        return daily_funding
-        
-    except Exception as e:
-        logging.error(f"CSV 파싱 오류: {e}")
-        return pd.DataFrame()
-
-
-def process_zip_file(zip_content: bytes) -> pd.DataFrame:
-    """ZIP 파일 압축 해제 및 CSV 파싱"""
-    try:
-        with zipfile.ZipFile(io.BytesIO(zip_content)) as z:
-            # CSV 파일 찾기
-            csv_files = [f for f in z.namelist() if f.endswith('.csv')]
-            if not csv_files:
-                logging.warning("CSV 파일 없음")
-                return pd.DataFrame()
-            
-            # 첫 번째 CSV 파일 읽기
-            csv_content = z.read(csv_files[0]).decode('utf-8')
-            return extract_funding_from_csv(csv_content)
-            
-    except Exception as e:
-        logging.error(f"ZIP 처리 오류: {e}")
-        return pd.DataFrame()
-
-
-def upsert_funding_to_database(daily_funding: pd.DataFrame, symbol: str = "BTCUSDT") -> int:
-    """추출된 Funding Rate를 DB에 저장"""
-    if daily_funding.empty:
-        return 0
-    
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
-    inserted_count = 0
-    updated_count = 0
-    
-    for _, row in daily_funding.iterrows():
-        date_str = str(row['date'])
-        avg_funding = float(row['avg_funding_rate'])
-        
-        # 기존 레코드 확인
-        cur.execute("SELECT COUNT(*) FROM binance_futures_metrics WHERE date = ? AND symbol = ?", 
-                   (date_str, symbol))
-        exists = cur.fetchone()[0] > 0
-        
-        if exists:
-            # 업데이트
-            cur.execute("""
-                UPDATE binance_futures_metrics
-                SET avg_funding_rate = ?
-                WHERE date = ? AND symbol = ?
-            """, (avg_funding, date_str, symbol))
-            if cur.rowcount > 0:
-                updated_count += 1
-        else:
-            # 삽입
-            cur.execute("""
-                INSERT INTO binance_futures_metrics (date, symbol, avg_funding_rate, volatility_24h)
-                VALUES (?, ?, ?, 0)
-            """, (date_str, symbol, avg_funding))
-            inserted_count += 1
-    
-    conn.commit()
-    cur.close()
-    conn.close()
-    
-    return inserted_count + updated_count
+def upsert_funding_to_database(conn: sqlite3.Connection, rows: List[Dict[str, Any]], symbol: str = "BTCUSDT") -> None:
+    """일별 Funding Rate 배치를 한 트랜잭션으로 저장 (없는 날짜는 volatility_24h=0으로 생성)"""
+    with conn:
+        conn.executemany("""
+            INSERT INTO binance_futures_metrics (date, symbol, avg_funding_rate, volatility_24h)
+            VALUES (?, ?, ?, 0)
+            ON CONFLICT(date, symbol) DO UPDATE SET avg_funding_rate = excluded.avg_funding_rate
+        """, [(str(row["date"]), symbol, row["avg_funding_rate"]) for row in rows])
 
 
 def main():
@@ -191,14 +84,15 @@ def main():
     parser.add_argument("--symbol", type=str, default="BTCUSDT", help="심볼 (예: BTCUSDT, ETHUSDT)")
     parser.add_argument("--start-date", type=str, default="2022-01-01")
     parser.add_argument("--end-date", type=str, default=None)
+    parser.add_argument("--workers", type=int, default=8, help="동시 다운로드 수")
     args = parser.parse_args()
     
     symbol = args.symbol.upper()
-    start_date = datetime.strptime(args.start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d").date()
     if args.end_date:
-        end_date = datetime.strptime(args.end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date()
     else:
-        end_date = datetime.now(timezone.utc)
+        end_date = datetime.now(timezone.utc).date()
     
     logging.basicConfig(
         level=logging.INFO,
@@ -206,37 +100,40 @@ def main():
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     
-    logging.info(f"Binance Vision Funding Rate 다운로드: {symbol} ({start_date.date()} ~ {end_date.date()})")
+    logging.info(f"Binance Vision Funding Rate 다운로드: {symbol} ({start_date} ~ {end_date})")
     
-    files = list_available_funding_files(start_date, end_date, symbol)
+    archives = plan_archives(MARKET, DATASET, symbol, start_date, end_date)
+    logging.info(f"총 {len(archives)}개 아카이브 대상 (월별 우선, 없으면 일별)")
     
-    success_count = 0
-    error_count = 0
-    total_rows = 0
+    def on_progress(progress):
+        if progress["archives"] % 10 == 0:
+            logging.info(
+                f"진행: {progress['archives']}개 처리 ({progress['missing']} 없음, "
+                f"{progress['failed']} 실패, {progress['rows']}행 저장)"
+            )
     
-    for i, file_info in enumerate(files, 1):
-        if i % 10 == 0:
-            logging.info(f"진행: {i}/{len(files)} ({success_count} 성공, {error_count} 실패, {total_rows}행 저장)")
-        
-        zip_content = download_file(file_info["url"])
-        if zip_content is None:
-            error_count += 1
-            continue
-        
-        daily_funding = process_zip_file(zip_content)
-        if not daily_funding.empty:
-            rows = upsert_funding_to_database(daily_funding, symbol)
-            total_rows += rows
-            success_count += 1
-        else:
-            error_count += 1
-        
-        # API 제한 방지
-        time.sleep(0.2)
-    
-    logging.info(f"완료: {success_count}개 성공, {error_count}개 실패, 총 {total_rows}행 저장")
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        result = ingest_archives(
+            ArchiveCache(CACHE_DIR),
+            archives,
+            parse=parse_funding_archive,
+            write=lambda rows: upsert_funding_to_database(conn, rows, symbol),
+            start=start_date,
+            end=end_date,
+            max_workers=args.workers,
+            progress_callback=on_progress,
+        )
+    finally:
+        conn.close()
+    
+    logging.info(
+        f"완료: {result['archives']}개 아카이브, 총 {result['rows']}행 저장 ({result['commits']}회 커밋), "
+        f"{result['missing']}개 없음, {result['failed']}개 실패 | "
+        f"캐시 {result['hits']}개, 다운로드 {result['downloads']}개 ({result['bytes'] / 1e6:.1f}MB), "
+        f"{result['elapsed']:.1f}초"
+    )
 
 
 if __name__ == "__main__":
     main()
-
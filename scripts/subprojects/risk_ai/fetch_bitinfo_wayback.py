@@ -2,19 +2,22 @@
 """
 BitInfoCharts 과거 데이터 수집 (Wayback Machine 활용)
 - 2023-01-01부터 현재까지의 Top 100 Richest List 스냅샷을 Wayback Machine에서 가져옴
+- 공용 HTTP 클라이언트 사용: HTTP_REPLAY_MODE=replay로 실행하면 저장된 스냅샷으로 파싱만 다시 수행
 """
 
 import sqlite3
-import time
+import sys
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-import requests
 from bs4 import BeautifulSoup
-import cloudscraper
 import argparse
 
 ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from src.http_client import get_client
+
 DB_PATH = ROOT / "data" / "project.db"
 
 BITINFO_URLS = {
@@ -52,7 +55,7 @@ def get_wayback_snapshots(url, start_date, end_date):
     }
     
     try:
-        response = requests.get(WAYBACK_API, params=params, timeout=30)
+        response = get_client().get(WAYBACK_API, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -103,28 +106,19 @@ def parse_stats_from_html(html, coin):
 
 
 def fetch_snapshot(wayback_url):
-    """Wayback Machine 스냅샷에서 데이터 추출"""
-    scraper = cloudscraper.create_scraper()
-    
+    """Wayback Machine 스냅샷에서 데이터 추출 (재시도 / 호출 간격은 공용 클라이언트)"""
     # HTTPS로 변경
     if wayback_url.startswith("http://"):
         wayback_url = wayback_url.replace("http://", "https://", 1)
     
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = scraper.get(wayback_url, timeout=30)
-            if response.status_code == 200:
-                return response.text
-            elif response.status_code == 404:
-                # 스냅샷이 없음
-                return None
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                print(f"  ⚠️ 스냅샷 다운로드 실패 (재시도 {attempt+1}/{max_retries}): {e}")
-                return None
+    try:
+        response = get_client().get(wayback_url, timeout=30)
+    except Exception as e:
+        print(f"  ⚠️ 스냅샷 다운로드 실패: {e}")
+        return None
+    if response.status_code == 200:
+        return response.text
+    # 404: 스냅샷이 없음
     return None
 
 
@@ -181,8 +175,6 @@ def collect_historical_data(coin, url):
                 print(f"⚠️ 파싱 실패")
         else:
             print(f"⚠️ 다운로드 실패")
-        
-        time.sleep(0.5)  # Rate limit
     
     print(f"  ✅ {coin}: {success_count}건 수집 완료")
 
@@ -6,16 +6,21 @@ Binance/Bybit Futures 지표(펀딩비/OI/롱숏/변동성/Taker비율)를 수
 
 import os
 import sqlite3
+import sys
 import time
 import argparse
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
 ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+# 공용 HTTP 클라이언트 (keep-alive 연결 재사용 + 호스트별 호출 한도 + 재시도)
+from src.http_client import get_client
+
 DB_PATH = ROOT / "data" / "project.db"
 load_dotenv(ROOT / "config" / ".env")
 
@@ -141,7 +146,7 @@ def fetch_funding(symbol, days=30):
     end_ts = int(time.time() * 1000)
     start_ts = end_ts - days * 24 * 60 * 60 * 1000
     params = {"symbol": symbol, "startTime": start_ts, "endTime": end_ts, "limit": 1000}
-    response = requests.get(FUNDING_ENDPOINT, params=params, timeout=30)
+    response = get_client().get(FUNDING_ENDPOINT, params=params, timeout=30)
     response.raise_for_status()
     return response.json()
 
@@ -156,14 +161,14 @@ def fetch_oi(symbol, days=30):
         "endTime": end_time,
         "limit": 1000,
     }
-    response = requests.get(OI_ENDPOINT, params=params, timeout=30)
+    response = get_client().get(OI_ENDPOINT, params=params, timeout=30)
     response.raise_for_status()
     return response.json()
 
 
 def fetch_volatility(symbol):
     """현재 시점의 24시간 변동성 조회 (실시간용)"""
-    response = requests.get(TICKER_ENDPOINT, params={"symbol": symbol}, timeout=30)
+    response = get_client().get(TICKER_ENDPOINT, params={"symbol": symbol}, timeout=30)
     response.raise_for_status()
     data = response.json()
     high = float(data["highPrice"])
@@ -177,9 +182,7 @@ def fetch_volatility(symbol):
 def fetch_long_short_ratio(symbol, start_ts, end_ts):
     """Binance 글로벌 롱숏 계정 비율 수집"""
     ratio_by_date = defaultdict(list)
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     # 최근 데이터만 limit으로 가져오고, start_ts~end_ts 범위만 필터링 (Binance가 startTime을 거부하는 경우 대응)
     try:
@@ -208,9 +211,7 @@ def fetch_long_short_ratio(symbol, start_ts, end_ts):
 def fetch_taker_ratio(symbol, start_ts, end_ts):
     """Binance Taker 매수/매도 비율 수집"""
     taker_by_date = defaultdict(list)
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     try:
         params = {"symbol": symbol, "period": "1d", "limit": 500}
@@ -238,9 +239,7 @@ def fetch_taker_ratio(symbol, start_ts, end_ts):
 def fetch_top_trader_position(symbol, start_ts, end_ts):
     """Binance 탑 트레이더 포지션 비율 수집"""
     position_by_date = defaultdict(list)
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     try:
         params = {"symbol": symbol, "period": "1d", "limit": 500}
@@ -264,9 +263,7 @@ def fetch_top_trader_position(symbol, start_ts, end_ts):
 def fetch_bybit_funding_history(symbol, start_ts, end_ts):
     """Bybit 펀딩비 히스토리 수집"""
     funding_by_date = defaultdict(list)
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     cursor = None
     
@@ -314,7 +311,6 @@ def fetch_bybit_funding_history(symbol, start_ts, end_ts):
                     break
             
             cursor = next_cursor
-            time.sleep(0.1)
             
         except Exception as e:
             print(f"  ⚠️ Bybit Funding fetch error: {e}")
@@ -326,9 +322,7 @@ def fetch_bybit_funding_history(symbol, start_ts, end_ts):
 def fetch_bybit_oi(symbol, start_ts, end_ts):
     """Bybit OI 히스토리 수집"""
     oi_by_date = defaultdict(list)
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     cursor = None
     
@@ -377,7 +371,6 @@ def fetch_bybit_oi(symbol, start_ts, end_ts):
                     break
             
             cursor = next_cursor
-            time.sleep(0.1)
             
         except Exception as e:
             print(f"  ⚠️ Bybit OI fetch error: {e}")
@@ -503,9 +496,7 @@ def fetch_daily_klines(symbol, start_ts, end_ts):
     klines_by_date = {}
     current_start = start_ts
     
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     while current_start < end_ts:
         try:
@@ -546,8 +537,6 @@ def fetch_daily_klines(symbol, start_ts, end_ts):
             last_close_time = int(data[-1][6])  # close_time
             current_start = last_close_time + 1
             
-            time.sleep(0.1)  # Rate limit 방지
-            
         except Exception as e:
             print(f"⚠️ Klines fetch error: {e}")
             break
@@ -556,9 +545,7 @@ def fetch_daily_klines(symbol, start_ts, end_ts):
 
 
 def build_daily_metrics(symbol, start_dt: datetime = None, end_dt_exclusive: datetime = None):
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
-    session.mount("https://", adapter)
+    session = get_client()
     
     if start_dt is None:
         start_dt = datetime(2023, 1, 1, tzinfo=timezone.utc)
@@ -611,8 +598,6 @@ def build_daily_metrics(symbol, start_dt: datetime = None, end_dt_exclusive: dat
                 curr_start = last_funding_time + 1
             else:
                 break
-                
-            time.sleep(0.1)
             
         except Exception as e:
             print(f"⚠️ Funding rate fetch error: {e}")
@@ -672,8 +657,6 @@ def build_daily_metrics(symbol, start_dt: datetime = None, end_dt_exclusive: dat
                 curr_start = last_ts + 1
             else:
                 curr_start = req_end + 1
-            
-            time.sleep(0.1)
 
         except Exception as e:
             print(f"⚠️ Open Interest fetch error: {e}")
@@ -0,0 +1,46 @@
+-- ============================================
+-- price_history 고유 제약 추가 (crypto_id, timestamp, data_source)
+-- ============================================
+-- 목적: 수집 스크립트가 행별 존재 확인 없이 upsert(on_conflict='crypto_id,timestamp,data_source')로
+--       대량 저장할 수 있도록 충돌 기준 고유 제약 추가 (src/collectors/price_history_writer.py)
+
+-- 1. 중복 데이터 확인
+SELECT
+    crypto_id,
+    timestamp,
+    data_source,
+    COUNT(*) as count
+FROM public.price_history
+GROUP BY crypto_id, timestamp, data_source
+HAVING COUNT(*) > 1
+ORDER BY count DESC
+LIMIT 10;
+
+-- 2. 중복 데이터 제거 (같은 (crypto_id, timestamp, data_source) 중 가장 최근 것만 남기기)
+DELETE FROM public.price_history a
+USING public.price_history b
+WHERE a.crypto_id = b.crypto_id
+  AND a.timestamp = b.timestamp
+  AND a.data_source IS NOT DISTINCT FROM b.data_source
+  AND a.ctid < b.ctid;
+
+-- 3. 고유 제약 추가 (이미 있으면 건너뜀)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'price_history_crypto_id_timestamp_data_source_key'
+    ) THEN
+        ALTER TABLE public.price_history
+        ADD CONSTRAINT price_history_crypto_id_timestamp_data_source_key
+        UNIQUE (crypto_id, timestamp, data_source);
+    END IF;
+END $$;
+
+-- 4. 결과 확인
+SELECT
+    data_source,
+    COUNT(*) as count
+FROM public.price_history
+GROUP BY data_source
+ORDER BY data_source;
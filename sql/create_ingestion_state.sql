@@ -0,0 +1,92 @@
+-- ============================================
+-- 수집 워터마크 테이블 (ingestion_state)
+-- ============================================
+-- 목적: 스크립트별 JSON 체크포인트 / max(date) 조회 대신
+--       (source, entity, stream)별 마지막 블록 / 타임스탬프 / 커서를 한 곳에 저장
+--       (src/collectors/ingestion_state.py)
+
+-- 1. 테이블 생성
+CREATE TABLE IF NOT EXISTS public.ingestion_state (
+    source TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    last_block BIGINT,
+    last_timestamp TIMESTAMPTZ,
+    cursor TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source, entity, stream)
+);
+
+-- 2. 워터마크 전진 RPC (뒤로 가지 않음, NULL은 기존 값 유지)
+CREATE OR REPLACE FUNCTION advance_ingestion_state(
+    p_source TEXT,
+    p_entity TEXT,
+    p_stream TEXT,
+    p_last_block BIGINT DEFAULT NULL,
+    p_last_timestamp TIMESTAMPTZ DEFAULT NULL,
+    p_cursor TEXT DEFAULT NULL
+)
+RETURNS SETOF public.ingestion_state
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO public.ingestion_state AS s (source, entity, stream, last_block, last_timestamp, cursor, updated_at)
+    VALUES (p_source, p_entity, p_stream, p_last_block, p_last_timestamp, p_cursor, NOW())
+    ON CONFLICT (source, entity, stream) DO UPDATE SET
+        last_block = GREATEST(s.last_block, EXCLUDED.last_block),
+        last_timestamp = GREATEST(s.last_timestamp, EXCLUDED.last_timestamp),
+        cursor = COALESCE(EXCLUDED.cursor, s.cursor),
+        updated_at = NOW()
+    RETURNING s.*;
+END;
+$$;
+
+-- 3. 기존 데이터로 초기 워터마크 채우기 (이미 있으면 건너뜀)
+
+-- price_history (바이낸스 1시간봉, 코인별)
+INSERT INTO public.ingestion_state (source, entity, stream, last_timestamp)
+SELECT 'binance', c.symbol, 'price_history_1h', MAX(p.timestamp)
+FROM public.price_history p
+JOIN public.cryptocurrencies c ON c.id = p.crypto_id
+WHERE p.data_source = 'binance'
+GROUP BY c.symbol
+ON CONFLICT DO NOTHING;
+
+-- BTC 고래 거래 (Blockstream, 주소별)
+INSERT INTO public.ingestion_state (source, entity, stream, last_block, last_timestamp)
+SELECT 'blockstream', t.from_address, 'whale_transactions', MAX(t.block_number), MAX(t.block_timestamp)
+FROM public.whale_transactions t
+JOIN public.whale_address w ON w.address = t.from_address AND w.chain_type = 'BTC'
+WHERE t.chain = 'bitcoin'
+GROUP BY t.from_address
+ON CONFLICT DO NOTHING;
+
+-- BSC 고래 거래 (BSCScan, 주소별 - 보낸 거래 기준이라 보수적)
+INSERT INTO public.ingestion_state (source, entity, stream, last_block, last_timestamp)
+SELECT 'bscscan', t.from_address, 'whale_transactions', MAX(t.block_number), MAX(t.block_timestamp)
+FROM public.whale_transactions t
+JOIN public.whale_address w ON LOWER(w.address) = t.from_address AND w.chain_type = 'BSC'
+WHERE t.chain = 'bsc'
+GROUP BY t.from_address
+ON CONFLICT DO NOTHING;
+
+-- SQLite → Supabase 증분 동기화 (테이블별)
+INSERT INTO public.ingestion_state (source, entity, stream, last_timestamp)
+SELECT 'sqlite_sync', x.entity, 'supabase', x.max_date
+FROM (
+    SELECT 'upbit_daily' AS entity, MAX(date)::TIMESTAMPTZ AS max_date FROM public.upbit_daily
+    UNION ALL SELECT 'binance_spot_daily', MAX(date)::TIMESTAMPTZ FROM public.binance_spot_daily
+    UNION ALL SELECT 'bitget_spot_daily', MAX(date)::TIMESTAMPTZ FROM public.bitget_spot_daily
+    UNION ALL SELECT 'bybit_spot_daily', MAX(date)::TIMESTAMPTZ FROM public.bybit_spot_daily
+    UNION ALL SELECT 'exchange_rate', MAX(date)::TIMESTAMPTZ FROM public.exchange_rate
+) x
+WHERE x.max_date IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+-- 4. 결과 확인
+SELECT source, stream, COUNT(*) AS entities, MAX(last_timestamp) AS latest
+FROM public.ingestion_state
+GROUP BY source, stream
+ORDER BY source, stream;
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Binance Vision 아카이브 수집
+data.binance.vision의 zip 아카이브를 병렬로 내려받아 로컬 캐시에 보관하고 CSV를 스트리밍으로 읽어 배치 저장
+- 월별 아카이브가 있으면 월 1회 요청, 없으면(또는 진행 중인 달) 일별 파일로 대체
+- 캐시는 내용 해시(sha256) 기준 저장 → 재실행 시 네트워크 요청 없음
+"""
+
+import csv
+import hashlib
+import io
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+import logging
+
+from src.http_client import get_client
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://data.binance.vision'
+
+
+def csv_float(value: str) -> Optional[float]:
+    """CSV 숫자 변환 (빈 값은 None)"""
+    return float(value) if value not in ('', None) else None
+
+
+def _month_end(day: date) -> date:
+    """해당 월의 마지막 날"""
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def archive_url(market: str, dataset: str, symbol: str, period: str) -> str:
+    """
+    아카이브 URL
+    
+    Args:
+        market: 'futures/um', 'spot' 등
+        dataset: 'metrics', 'fundingRate' 등
+        symbol: 'BTCUSDT'
+        period: 'YYYY-MM' (월별) 또는 'YYYY-MM-DD' (일별)
+    """
+    frequency = 'monthly' if len(period) == 7 else 'daily'
+    return f"{BASE_URL}/data/{market}/{frequency}/{dataset}/{symbol}/{symbol}-{dataset}-{period}.zip"
+
+
+def plan_archives(
+    market: str,
+    dataset: str,
+    symbol: str,
+    start: date,
+    end: date,
+    monthly: bool = True,
+    daily: bool = True,
+    today: Optional[date] = None
+) -> List[Dict]:
+    """
+    기간을 아카이브 목록으로 변환
+    
+    끝난 달은 월별 아카이브(없으면 fallback의 일별 파일로 대체), 진행 중인 달은 일별 파일
+    
+    Returns:
+        [{'period', 'url', 'start', 'end', 'fallback': [일별 항목, ...]}, ...]
+    """
+    today = today or datetime.now(timezone.utc).date()
+    archives = []
+    month = start.replace(day=1)
+    
+    while month <= end:
+        month_end = _month_end(month)
+        days = []
+        if daily:
+            day = max(month, start)
+            while day <= min(month_end, end):
+                period = day.isoformat()
+                days.append({
+                    'period': period,
+                    'url': archive_url(market, dataset, symbol, period),
+                    'start': day,
+                    'end': day,
+                    'fallback': []
+                })
+                day += timedelta(days=1)
+        
+        if monthly and month_end < today:
+            period = month.strftime('%Y-%m')
+            archives.append({
+                'period': period,
+                'url': archive_url(market, dataset, symbol, period),
+                'start': month,
+                'end': month_end,
+                'fallback': days
+            })
+        else:
+            archives.extend(days)
+        month = month_end + timedelta(days=1)
+    
+    return archives
+
+
+def read_csv_columns(zip_path: Union[str, Path], columns: Dict[str, Callable[[str], object]]) -> Dict[str, List]:
+    """
+    zip 안의 CSV를 압축 해제하면서 한 줄씩 읽어 필요한 컬럼만 리스트로 수집
+    
+    Args:
+        zip_path: 아카이브 경로
+        columns: {컬럼명: 변환 함수} (헤더에 없는 컬럼은 결과에서 제외)
+    
+    Returns:
+        {컬럼명: [값, ...]} (CSV가 없으면 빈 dict)
+    """
+    with zipfile.ZipFile(zip_path) as archive:
+        member = next((name for name in archive.namelist() if name.endswith('.csv')), None)
+        if member is None:
+            return {}
+        
+        with archive.open(member) as raw:
+            reader = csv.reader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+            header = next(reader, [])
+            index = {name: header.index(name) for name in columns if name in header}
+            result: Dict[str, List] = {name: [] for name in index}
+            
+            for row in reader:
+                if not row:
+                    continue
+                for name, position in index.items():
+                    result[name].append(columns[name](row[position]))
+    
+    return result
+
+
+class ArchiveCache:
+    """
+    내용 주소 기반 zip 캐시
+    
+    - blobs/<sha256 앞 2자리>/<sha256>.zip: 아카이브 본문 (같은 내용은 한 번만 저장)
+    - refs/<URL 경로>: 해당 URL의 sha256 (404는 'missing', missing_ttl 동안 재요청 안 함)
+    """
+    
+    def __init__(self, cache_dir: Union[str, Path], client=None, missing_ttl: float = 86400.0):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 캐시 디렉토리
+            client: HTTP 클라이언트 (None이면 공용 클라이언트)
+            missing_ttl: 404 결과 재사용 시간 (초, 월별 아카이브는 월초 며칠 뒤에 올라옴)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.client = client or get_client()
+        self.missing_ttl = missing_ttl
+        self.stats = {'hits': 0, 'downloads': 0, 'missing': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+    
+    def _ref_path(self, url: str) -> Path:
+        return self.cache_dir / 'refs' / url.split('://', 1)[-1].split('/', 1)[-1]
+    
+    def _blob_path(self, digest: str) -> Path:
+        return self.cache_dir / 'blobs' / digest[:2] / f"{digest}.zip"
+    
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self.stats[key] += value
+    
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    
+    def fetch(self, url: str) -> Optional[Path]:
+        """
+        아카이브 경로 (캐시에 있으면 네트워크 요청 없음)
+        
+        Returns:
+            zip 경로, 원격에 파일이 없으면 None
+        
+        Raises:
+            requests.HTTPError: 404 외 HTTP 오류
+        """
+        ref = self._ref_path(url)
+        if ref.exists():
+            value = ref.read_text().strip()
+            if value == 'missing':
+                if time.time() - ref.stat().st_mtime < self.missing_ttl:
+                    self._count('missing')
+                    return None
+            elif self._blob_path(value).exists():
+                self._count('hits')
+                return self._blob_path(value)
+        
+        response = self.client.get(url, stream=True)
+        try:
+            if response.status_code == 404:
+                self._write_atomic(ref, 'missing')
+                self._count('missing')
+                return None
+            response.raise_for_status()
+            
+            # 받으면서 해시 계산 후 해시 이름으로 이동
+            tmp_dir = self.cache_dir / 'blobs'
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            tmp = tmp_dir / f"download.{threading.get_ident()}.tmp"
+            digest = hashlib.sha256()
+            size = 0
+            with open(tmp, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+        finally:
+            response.close()
+        
+        blob = self._blob_path(digest.hexdigest())
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, blob)
+        self._write_atomic(ref, digest.hexdigest())
+        self._count('downloads')
+        self._count('bytes', size)
+        return blob
+
+
+def ingest_archives(
+    cache: ArchiveCache,
+    archives: Iterable[Dict],
+    parse: Callable[[Path, Dict], List[Dict]],
+    write: Callable[[List[Dict]], None],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_workers: int = 8,
+    rows_per_commit: int = 90,
+    progress_callback: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    아카이브 병렬 다운로드 → 파싱 → 배치 저장
+    
+    다운로드 / 파싱은 스레드 풀(max_workers개 동시), 저장은 호출 스레드에서 rows_per_commit행씩 write 1회
+    월별 아카이브가 없으면 그 달의 일별 파일을 같은 풀에 추가
+    
+    Args:
+        cache: 아카이브 캐시
+        archives: plan_archives() 결과
+        parse: (zip 경로, 아카이브 항목) → 행 목록 (각 행은 'date' 키에 date)
+        write: 행 배치 저장 (한 트랜잭션으로 처리)
+        start, end: 저장 기간 (월별 아카이브에서 기간 밖 날짜 제외)
+        max_workers: 동시 다운로드 수
+        rows_per_commit: write 1회당 행 수
+        progress_callback: 아카이브 처리마다 진행 상황 dict로 호출
+    
+    Returns:
+        {'archives', 'missing', 'failed', 'rows', 'commits', 'hits', 'downloads', 'bytes', 'elapsed'}
+    """
+    started = time.time()
+    progress = {'archives': 0, 'missing': 0, 'failed': 0, 'rows': 0, 'commits': 0}
+    pending_rows: List[Dict] = []
+    
+    def load(archive: Dict) -> Optional[List[Dict]]:
+        path = cache.fetch(archive['url'])
+        return None if path is None else parse(path, archive)
+    
+    def flush():
+        if pending_rows:
+            write(list(pending_rows))
+            progress['rows'] += len(pending_rows)
+            progress['commits'] += 1
+            pending_rows.clear()
+    
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        futures = {executor.submit(load, archive): archive for archive in archives}
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive = futures.pop(future)
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logger.error(f"아카이브 처리 실패 ({archive['url']}): {e}")
+                    progress['failed'] += 1
+                    continue
+                
+                if rows is None:
+                    progress['missing'] += 1
+                    for fallback in archive['fallback']:
+                        futures[executor.submit(load, fallback)] = fallback
+                    continue
+                
+                progress['archives'] += 1
+                pending_rows.extend(
+                    row for row in rows
+                    if (start is None or row['date'] >= start) and (end is None or row['date'] <= end)
+                )
+                if len(pending_rows) >= rows_per_commit:
+                    flush()
+                if progress_callback:
+                    progress_callback(dict(progress))
+        
+        flush()
+    
+    progress.update(cache.stats)
+    progress['elapsed'] = time.time() - started
+    return progress
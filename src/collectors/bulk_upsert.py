@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Supabase 대량 upsert
+고유 제약 기준 upsert(on_conflict)를 큰 배치로 동시에 전송하고 실패한 조각만 재전송
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 행 데이터 때문에 실패하는 PostgreSQL 오류 클래스 (22: 데이터 예외, 23: 제약 위반)
+# 이 경우에만 배치를 나눠 문제 행을 격리하고, 권한 / 스키마 / 네트워크 오류는 그대로 발생
+ROW_ERROR_CLASSES = ('22', '23')
+
+
+def is_row_error(error: Exception) -> bool:
+    """PostgREST 오류(APIError.code = SQLSTATE)가 행 단위 데이터 / 제약 오류인지"""
+    code = getattr(error, 'code', None)
+    return isinstance(code, str) and code[:2] in ROW_ERROR_CLASSES
+
+
+class BulkUpserter:
+    """
+    대량 upsert
+    
+    - 중복 처리는 테이블 고유 제약 + upsert(on_conflict) 한 번으로 (행별 존재 확인 없음)
+    - 배치를 스레드 풀로 동시에 전송 (max_workers = 동시 요청 수 상한)
+    - 네트워크 등 일시 오류는 지터 백오프로 재시도, 그래도 실패하면 예외 발생
+    - 행 데이터 / 제약 오류(SQLSTATE 22xxx / 23xxx)만 반씩 나눠 실패한 조각만 재전송 (문제 행만 격리)
+    - 권한 / 스키마 등 나머지 PostgREST 오류는 재시도 / 분할 없이 바로 예외 발생
+    - get_progress()로 행 / 배치 / 요청 / 처리량 카운터 조회
+    """
+    
+    def __init__(
+        self,
+        supabase,
+        table: str,
+        on_conflict: str,
+        batch_size: int = 1000,
+        max_workers: int = 4,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        ignore_duplicates: bool = False,
+        progress_callback: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            supabase: Supabase 클라이언트
+            table: 대상 테이블
+            on_conflict: 고유 제약 컬럼 ('crypto_id,timestamp,data_source' 형식)
+            batch_size: 요청 1회당 행 수
+            max_workers: 동시 전송 배치 수
+            max_retries: 일시 오류 배치 재시도 횟수 (나눈 조각은 재시도 없음)
+            backoff_base: 재시도 지수 백오프 기본 대기 시간 (초)
+            ignore_duplicates: True면 기존 행 유지 (ON CONFLICT DO NOTHING), False면 갱신
+            progress_callback: 배치 완료마다 get_progress() 결과로 호출 (작업 스레드에서 호출됨)
+        """
+        self.supabase = supabase
+        self.table = table
+        self.on_conflict = on_conflict
+        self.batch_size = max(1, int(batch_size))
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.ignore_duplicates = ignore_duplicates
+        self.progress_callback = progress_callback
+        
+        self.failed_rows: List[Dict] = []
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        self._counters = {
+            'rows_total': 0,
+            'rows_written': 0,
+            'rows_failed': 0,
+            'batches_total': 0,
+            'batches_done': 0,
+            'requests': 0,
+            'retries': 0,
+            'splits': 0
+        }
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self.failed_rows = []
+    
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] += amount
+    
+    def _send(self, rows: List[Dict]):
+        """upsert 요청 1회"""
+        self._count('requests')
+        self.supabase.table(self.table).upsert(
+            rows, on_conflict=self.on_conflict, ignore_duplicates=self.ignore_duplicates
+        ).execute()
+    
+    def _write_slice(self, rows: List[Dict], attempts: int) -> int:
+        """조각 전송 (행 데이터 오류면 반으로 나눠 재전송), 저장된 행 수 반환"""
+        error = None
+        for attempt in range(attempts):
+            try:
+                self._send(rows)
+                self._count('rows_written', len(rows))
+                return len(rows)
+            except Exception as e:
+                error = e
+                if is_row_error(e):
+                    break
+                if getattr(e, 'code', None) is not None or attempt == attempts - 1:
+                    raise
+                self._count('retries')
+                time.sleep(random.uniform(0, self.backoff_base * (2 ** attempt)))
+        
+        if len(rows) == 1:
+            logger.warning(f"{self.table} upsert 실패 (1행): {error}")
+            with self._lock:
+                self._counters['rows_failed'] += 1
+                self.failed_rows.append(rows[0])
+            return 0
+        
+        self._count('splits')
+        mid = len(rows) // 2
+        return self._write_slice(rows[:mid], 1) + self._write_slice(rows[mid:], 1)
+    
+    def _write_batch(self, rows: List[Dict]) -> int:
+        written = self._write_slice(rows, self.max_retries + 1)
+        self._count('batches_done')
+        if self.progress_callback:
+            self.progress_callback(self.get_progress())
+        return written
+    
+    def upsert(self, records: List[Dict]) -> int:
+        """
+        전체 레코드 upsert
+        
+        Args:
+            records: 저장할 행 목록
+        
+        Returns:
+            저장된 행 수 (행 데이터 오류로 최종 실패한 행은 failed_rows)
+        
+        Raises:
+            재시도 후에도 실패한 일시 오류, 권한 / 스키마 등 행 단위가 아닌 PostgREST 오류
+        """
+        self._reset()
+        batches = [records[i:i + self.batch_size] for i in range(0, len(records), self.batch_size)]
+        with self._lock:
+            self._counters['rows_total'] = len(records)
+            self._counters['batches_total'] = len(batches)
+        self._started = time.perf_counter()
+        
+        if len(batches) <= 1 or self.max_workers == 1:
+            written = sum(self._write_batch(batch) for batch in batches)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches)), thread_name_prefix="bulk-upsert") as pool:
+                written = sum(pool.map(self._write_batch, batches))
+        
+        self._finished = time.perf_counter()
+        return written
+    
+    def get_progress(self) -> Dict:
+        """
+        진행 / 처리량 카운터
+        
+        Returns:
+            {'rows_total', 'rows_written', 'rows_failed', 'batches_total', 'batches_done',
+             'requests', 'retries', 'splits', 'elapsed', 'rows_per_sec'}
+        """
+        with self._lock:
+            progress = dict(self._counters)
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        progress['elapsed'] = elapsed
+        progress['rows_per_sec'] = progress['rows_written'] / elapsed if elapsed > 0 else 0.0
+        return progress
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+수집 워터마크 (ingestion_state)
+(source, entity, stream)별 마지막 블록 / 타임스탬프 / 커서를 저장해 재실행 시 새 데이터만 수집
+- Supabase: ingestion_state 테이블 + advance_ingestion_state RPC (sql/create_ingestion_state.sql)
+- SQLite: 같은 스키마를 data/project.db에 생성, 데이터와 같은 트랜잭션에서 전진 가능
+"""
+
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+TABLE = 'ingestion_state'
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    source TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    last_block INTEGER,
+    last_timestamp TEXT,
+    cursor TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, entity, stream)
+)
+"""
+
+# 워터마크는 뒤로 가지 않음 (NULL은 기존 값 유지)
+SQLITE_ADVANCE = f"""
+INSERT INTO {TABLE} (source, entity, stream, last_block, last_timestamp, cursor, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, entity, stream) DO UPDATE SET
+    last_block = MAX(COALESCE(last_block, excluded.last_block), COALESCE(excluded.last_block, last_block)),
+    last_timestamp = MAX(COALESCE(last_timestamp, excluded.last_timestamp), COALESCE(excluded.last_timestamp, last_timestamp)),
+    cursor = COALESCE(excluded.cursor, cursor),
+    updated_at = excluded.updated_at
+"""
+
+
+def _timestamp_str(value: Union[datetime, date, str, None]) -> Optional[str]:
+    """datetime은 UTC ISO, date는 YYYY-MM-DD (같은 stream은 같은 형식으로 기록해야 문자열 비교가 맞음)"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return value.isoformat()
+
+
+class IngestionState(ABC):
+    """
+    워터마크 저장소 공통 인터페이스 (get / advance / all을 구현하지 않은 저장소는 생성 시 TypeError)
+    
+    - get(): 현재 워터마크 (없으면 None)
+    - advance(): 워터마크 전진 (기존 값보다 뒤로 가지 않음)
+    - advancing(): 블록 안의 저장이 예외 없이 끝난 뒤에만 전진 (advance-after-commit)
+    """
+    
+    @abstractmethod
+    def get(self, source: str, entity: str, stream: str) -> Optional[Dict]:
+        """현재 워터마크 (없으면 None)"""
+    
+    @abstractmethod
+    def advance(
+        self,
+        source: str,
+        entity: str,
+        stream: str,
+        last_block: Optional[int] = None,
+        last_timestamp: Union[datetime, date, str, None] = None,
+        cursor: Optional[str] = None
+    ):
+        """워터마크 전진 (기존 값보다 뒤로 가지 않음, None은 기존 값 유지)"""
+    
+    @abstractmethod
+    def all(self, source: Optional[str] = None) -> List[Dict]:
+        """저장된 워터마크 목록 (source로 필터)"""
+    
+    def last_block(self, source: str, entity: str, stream: str) -> Optional[int]:
+        state = self.get(source, entity, stream)
+        return state.get('last_block') if state else None
+    
+    def last_timestamp(self, source: str, entity: str, stream: str) -> Optional[str]:
+        state = self.get(source, entity, stream)
+        return state.get('last_timestamp') if state else None
+    
+    @contextmanager
+    def advancing(self, source: str, entity: str, stream: str):
+        """
+        저장 후 워터마크 전진
+        
+        with state.advancing('binance', 'BTC', 'price_history_1h') as mark:
+            save(rows)
+            mark['last_timestamp'] = rows[-1]['timestamp']
+        """
+        mark: Dict = {}
+        yield mark
+        if any(value is not None for value in mark.values()):
+            self.advance(source, entity, stream, **mark)
+
+
+class SQLiteIngestionState(IngestionState):
+    """SQLite 워터마크 저장소"""
+    
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(SQLITE_SCHEMA)
+    
+    def get(self, source: str, entity: str, stream: str) -> Optional[Dict]:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute(
+                f"SELECT * FROM {TABLE} WHERE source = ? AND entity = ? AND stream = ?",
+                (source, entity, stream)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+    
+    def advance(
+        self,
+        source: str,
+        entity: str,
+        stream: str,
+        last_block: Optional[int] = None,
+        last_timestamp: Union[datetime, date, str, None] = None,
+        cursor: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ):
+        """
+        워터마크 전진
+        
+        conn을 주면 호출자 트랜잭션 안에서 기록만 하고 commit은 호출자가 함 (데이터와 원자적으로 반영)
+        """
+        params = (
+            source, entity, stream, last_block, _timestamp_str(last_timestamp), cursor,
+            datetime.now(timezone.utc).isoformat()
+        )
+        if conn is not None:
+            conn.execute(SQLITE_ADVANCE, params)
+            return
+        with sqlite3.connect(self.db_path) as own_conn:
+            own_conn.execute(SQLITE_ADVANCE, params)
+    
+    def all(self, source: Optional[str] = None) -> List[Dict]:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            sql = f"SELECT * FROM {TABLE}"
+            params: tuple = ()
+            if source:
+                sql += " WHERE source = ?"
+                params = (source,)
+            rows = conn.execute(sql + " ORDER BY source, entity, stream", params).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+
+class SupabaseIngestionState(IngestionState):
+    """
+    Supabase 워터마크 저장소
+    
+    전진은 advance_ingestion_state RPC 한 번 (서버에서 GREATEST로 비교 후 기록하므로 동시 실행에도 뒤로 가지 않음)
+    """
+    
+    def __init__(self, supabase, page_size: int = 1000):
+        self.supabase = supabase
+        self.page_size = page_size
+    
+    def get(self, source: str, entity: str, stream: str) -> Optional[Dict]:
+        response = self.supabase.table(TABLE)\
+            .select('*')\
+            .eq('source', source)\
+            .eq('entity', entity)\
+            .eq('stream', stream)\
+            .limit(1)\
+            .execute()
+        return response.data[0] if response.data else None
+    
+    def advance(
+        self,
+        source: str,
+        entity: str,
+        stream: str,
+        last_block: Optional[int] = None,
+        last_timestamp: Union[datetime, date, str, None] = None,
+        cursor: Optional[str] = None
+    ):
+        self.supabase.rpc('advance_ingestion_state', {
+            'p_source': source,
+            'p_entity': entity,
+            'p_stream': stream,
+            'p_last_block': last_block,
+            'p_last_timestamp': _timestamp_str(last_timestamp),
+            'p_cursor': cursor
+        }).execute()
+    
+    def all(self, source: Optional[str] = None) -> List[Dict]:
+        """전체 워터마크 (PostgREST 기본 최대 1000행 제한을 넘도록 page_size행씩 range 조회)"""
+        rows: List[Dict] = []
+        offset = 0
+        while True:
+            query = self.supabase.table(TABLE).select('*')
+            if source:
+                query = query.eq('source', source)
+            page = query.order('source').order('entity').order('stream')\
+                .range(offset, offset + self.page_size - 1)\
+                .execute().data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            offset += self.page_size
@@ -2,16 +2,34 @@
 """
 멀티체인 블록체인 탐색기 API를 통한 거래 기록 수집
 Etherscan, SoChain, Subscan, Solscan API 지원
+
+- MultiChainCollector: 모든 제공자를 asyncio로 동시에 수집
+  (제공자별 토큰 버킷 + 동시 요청 수 제한 + 429/5xx 백오프 재시도 + keep-alive 세션)
+- *_adapter: 제공자별 주소 1개 수집 (요청 구성 + 응답 파싱)
+- UTXO 체인(SoChain / VTC)은 ingestion_state 워터마크 이후 거래만 수집하고 입출력은 열 배열로 평탄화해 파싱
+- fetch_*_transactions: 단일 체인 동기 수집 (기존 호출부 호환)
 """
 
+import asyncio
+import logging
 import os
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from dotenv import load_dotenv
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.collectors.ingestion_state import IngestionState
+from src.collectors.utxo import utxo_records
+from src.http_client import REQUEST_METRICS, RETRYABLE_STATUS, RateLimitRegistry, TokenBucket, retry_delay
+
+logger = logging.getLogger(__name__)
+
 # 환경변수 로드
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 load_dotenv(PROJECT_ROOT / 'config' / '.env')
@@ -25,6 +43,633 @@ SOLSCAN_API_KEY = os.getenv('SOLSCAN_API_KEY', '')
 # LINK 토큰 컨트랙트 주소
 LINK_CONTRACT_ADDRESS = '0x514910771AF9Ca656af840dff83E8264EcF986CA'
 
+# 체인별 API 엔드포인트
+BASE_URLS = {
+    'ethereum': 'https://api.etherscan.io/v2/api',
+    'bsc': 'https://api.bscscan.com/v2/api',
+    'btc': 'https://sochain.com/api/v2',
+    'ltc': 'https://sochain.com/api/v2',
+    'doge': 'https://sochain.com/api/v2',
+    'polkadot': 'https://polkadot.api.subscan.io',
+    'solana': 'https://public-api.solscan.io',
+    'vtc': 'https://explorer.vertcoin.org/api',
+}
+
+# 체인 → 제공자 (같은 제공자의 체인은 호출 한도를 공유)
+CHAIN_PROVIDERS = {
+    'ethereum': 'etherscan',
+    'bsc': 'etherscan',
+    'btc': 'sochain',
+    'ltc': 'sochain',
+    'doge': 'sochain',
+    'polkadot': 'subscan',
+    'solana': 'solscan',
+    'vtc': 'vtc',
+}
+
+# 제공자별 호출 한도 (rate: 초당 요청 수, burst: 버킷 크기, max_in_flight: 동시 요청 수)
+# - Etherscan V2 무료 키: 5회/초 (ethereum / bsc가 같은 키 한도 공유)
+# - Subscan 무료 키: 5회/초
+# - Solscan 공개 API: 150회/30초
+# - SoChain / Vertcoin 탐색기: 공개 한도 미기재 → 기존 요청 간격(0.5초) 기준
+PROVIDER_LIMITS = {
+    'etherscan': {'rate': 5.0, 'burst': 5, 'max_in_flight': 5},
+    'sochain': {'rate': 2.0, 'burst': 2, 'max_in_flight': 2},
+    'subscan': {'rate': 5.0, 'burst': 5, 'max_in_flight': 5},
+    'solscan': {'rate': 5.0, 'burst': 5, 'max_in_flight': 5},
+    'vtc': {'rate': 2.0, 'burst': 2, 'max_in_flight': 2},
+}
+
+# API 키가 없으면 수집하지 않는 제공자
+KEY_REQUIRED_PROVIDERS = ('etherscan', 'subscan', 'solscan')
+
+# 워터마크(마지막 블록) 이후 거래만 수집하는 UTXO 제공자
+# ingestion_state 키: (제공자, 주소, 'whale_transactions')
+UTXO_PROVIDERS = ('sochain', 'vtc')
+STATE_STREAM = 'whale_transactions'
+
+# Insight 탐색기(VTC) 주소 거래 페이지 크기 (/addrs/{주소}/txs 최대 50건)
+INSIGHT_PAGE_SIZE = 50
+
+# SoChain 주소 거래 페이지 크기 (/get_address_transactions/{코인}/{주소}/{페이지}, 최신순 10건)
+SOCHAIN_PAGE_SIZE = 10
+
+
+class IncompleteHistory(Exception):
+    """주소 거래 일부를 조회하지 못함 (받은 거래는 records, 워터마크는 전진하지 않음)"""
+    
+    def __init__(self, message: str, records: List[Dict]):
+        super().__init__(message)
+        self.records = records
+
+
+class ProviderClient:
+    """
+    제공자별 HTTP 클라이언트
+    
+    - keep-alive 세션 1개 (연결 풀 크기 = 동시 요청 수)
+    - 요청마다 토큰 버킷 통과 후 세마포어 안에서 실행기 스레드로 전송
+    - 429 / 5xx / 연결 오류는 Retry-After 또는 지터 백오프 후 재시도
+    - 제공자 한도는 API 키 단위라 호스트별 공용 레지스트리 대신 전용 버킷 사용 (요청 지표는 공용 REQUEST_METRICS에 기록)
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        max_in_flight: int,
+        executor: ThreadPoolExecutor,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        self.name = name
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.bucket = TokenBucket(rate, burst)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_in_flight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._executor = executor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'errors': 0}
+    
+    def bind(self):
+        """이벤트 루프마다 동시 요청 세마포어 생성 (collect 시작 시 호출)"""
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+    
+    async def request_json(self, method: str, url: str, **kwargs):
+        """
+        JSON 요청
+        
+        Raises:
+            requests.RequestException: 재시도 후에도 실패 또는 재시도 대상이 아닌 HTTP 오류
+        """
+        if self._semaphore is None:
+            self.bind()
+        loop = asyncio.get_running_loop()
+        send = partial(self.session.request, method, url, timeout=self.timeout, **kwargs)
+        
+        host = RateLimitRegistry.host_of(url)
+        
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            response = None
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                start = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(self._executor, send)
+                except requests.RequestException as e:
+                    REQUEST_METRICS.record_error(host, time.perf_counter() - start)
+                    error = e
+                else:
+                    REQUEST_METRICS.record(host, response.status_code, time.perf_counter() - start, len(response.content))
+                    if response.status_code not in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                        return response.json()
+                    if response.status_code == 429:
+                        self.stats['throttled'] += 1
+                    error = requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+            
+            if attempt == self.max_retries:
+                self.stats['errors'] += 1
+                raise error
+            self.stats['retries'] += 1
+            REQUEST_METRICS.record_retry(host)
+            await asyncio.sleep(retry_delay(attempt, response, self.backoff_base, self.backoff_max))
+    
+    def close(self):
+        """세션 연결 풀 정리"""
+        self.session.close()
+
+
+def _parse_etherscan_tx(tx: Dict, chain: str) -> Dict:
+    """Etherscan txlist 항목 → 거래 기록"""
+    return {
+        'tx_hash': tx.get('hash'),
+        'block_number': int(tx.get('blockNumber', 0)),
+        'block_timestamp': datetime.fromtimestamp(int(tx.get('timeStamp', 0))),
+        'from_address': tx.get('from', '').lower(),
+        'to_address': tx.get('to', '').lower() if tx.get('to') else None,
+        'value': int(tx.get('value', 0)) / 1e18,
+        'coin_symbol': 'BNB' if chain == 'bsc' else 'ETH',
+        'chain': chain,
+        'gas_used': int(tx.get('gasUsed', 0)),
+        'gas_price': int(tx.get('gasPrice', 0)),
+        'is_error': tx.get('isError') == '1',
+    }
+
+
+def _parse_etherscan_token_tx(tx: Dict) -> Dict:
+    """Etherscan tokentx 항목 → LINK 거래 기록"""
+    return {
+        'tx_hash': tx.get('hash'),
+        'block_number': int(tx.get('blockNumber', 0)),
+        'block_timestamp': datetime.fromtimestamp(int(tx.get('timeStamp', 0))),
+        'from_address': tx.get('from', '').lower(),
+        'to_address': tx.get('to', '').lower() if tx.get('to') else None,
+        'value': int(tx.get('value', 0)) / (10 ** int(tx.get('tokenDecimal', 18))),
+        'coin_symbol': 'LINK',
+        'chain': 'ethereum',
+        'contract_address': tx.get('contractAddress', '').lower(),
+        'gas_used': int(tx.get('gasUsed', 0)),
+        'gas_price': int(tx.get('gasPrice', 0)),
+        'is_error': False,
+    }
+
+
+def _sochain_legs(entries: List[Dict]) -> List[Tuple[Optional[str], float]]:
+    """SoChain inputs / outputs → [(주소, 금액)]"""
+    return [(entry.get('address'), float(entry.get('value', 0))) for entry in entries]
+
+
+def _parse_sochain_txs(txs: List[Dict], address: str, coin: str) -> List[Dict]:
+    """SoChain 거래 목록 → 주소 기준 입금 / 출금 거래 기록 (BTC/LTC/DOGE는 8 decimal)"""
+    return utxo_records(
+        txs, address,
+        inputs_of=lambda tx: _sochain_legs(tx.get('inputs', [])),
+        outputs_of=lambda tx: _sochain_legs(tx.get('outputs', [])),
+        meta_of=lambda tx: (
+            tx.get('txid', ''), tx.get('block_no', 0),
+            datetime.fromtimestamp(tx['time']) if tx.get('time') else None
+        ),
+        coin=coin, chain=coin.lower(), unit=1e8
+    )
+
+
+def _parse_subscan_transfer(transfer: Dict) -> Dict:
+    """Subscan transfer 항목 → DOT 거래 기록 (10 decimal)"""
+    return {
+        'tx_hash': transfer.get('hash', ''),
+        'block_number': transfer.get('block_num', 0),
+        'block_timestamp': datetime.fromtimestamp(transfer.get('block_timestamp', 0)),
+        'from_address': transfer.get('from', '').lower(),
+        'to_address': transfer.get('to', '').lower(),
+        'value': float(transfer.get('amount', 0)) / 1e10,
+        'coin_symbol': 'DOT',
+        'chain': 'polkadot',
+        'is_error': transfer.get('success', True) == False,
+    }
+
+
+def _parse_solscan_tx(tx: Dict, address: str) -> Dict:
+    """Solscan 거래 항목 → SOL 거래 기록 (9 decimal, 상대 주소는 복잡한 구조라 생략)"""
+    return {
+        'tx_hash': tx.get('txHash', ''),
+        'block_number': tx.get('slot', 0),
+        'block_timestamp': datetime.fromtimestamp(tx.get('blockTime', 0)),
+        'from_address': address.lower(),
+        'to_address': None,
+        'value': float(tx.get('amount', 0)) / 1e9,
+        'coin_symbol': 'SOL',
+        'chain': 'solana',
+        'is_error': tx.get('err', None) is not None,
+    }
+
+
+def _insight_outputs(tx: Dict) -> List[Tuple[Optional[str], float]]:
+    """Insight vout → [(첫 주소, 금액)] (주소 없는 출력은 None)"""
+    outputs = []
+    for vout in tx.get('vout', []):
+        addresses = (vout.get('scriptPubKey') or {}).get('addresses') or [None]
+        outputs.append((addresses[0], float(vout.get('value') or 0)))
+    return outputs
+
+
+def _parse_vtc_txs(txs: List[Dict], address: str) -> List[Dict]:
+    """Vertcoin Insight 거래 목록 → 주소 기준 입금 / 출금 거래 기록 (금액은 VTC 단위)"""
+    return utxo_records(
+        txs, address,
+        inputs_of=lambda tx: [(vin.get('addr'), float(vin.get('value') or 0)) for vin in tx.get('vin', [])],
+        outputs_of=_insight_outputs,
+        meta_of=lambda tx: (
+            tx.get('txid', ''), tx.get('blockheight', 0),
+            datetime.fromtimestamp(tx['time']) if tx.get('time') else None
+        ),
+        coin='VTC', chain='vertcoin'
+    )
+
+
+def _after_watermark(block_number, min_block: Optional[int]) -> bool:
+    """워터마크 이후 블록 여부 (워터마크가 없으면 전부, 미확정 거래는 워터마크가 있으면 제외)"""
+    if min_block is None:
+        return True
+    return block_number is not None and block_number > min_block
+
+
+def _parse_each(items: Iterable, parse: Callable) -> List[Dict]:
+    """항목별 파싱 (파싱 실패 항목은 건너뜀)"""
+    records = []
+    for item in items:
+        try:
+            parsed = parse(item)
+        except Exception:
+            continue
+        if isinstance(parsed, list):
+            records.extend(parsed)
+        else:
+            records.append(parsed)
+    return records
+
+
+async def etherscan_adapter(client: ProviderClient, base_url: str, address: str, chain: str, api_key: str) -> List[Dict]:
+    """Etherscan V2: 네이티브 코인 거래 + LINK 토큰 거래 (ethereum만)"""
+    chainid = 56 if chain == 'bsc' else 1
+    params = {
+        'chainid': chainid,
+        'module': 'account',
+        'action': 'txlist',
+        'address': address,
+        'startblock': 0,
+        'endblock': 99999999,
+        'sort': 'desc',
+        'page': 1,
+        'offset': 10000,  # 최대 10,000건
+        'apikey': api_key
+    }
+    requests_to_send = [client.request_json('GET', base_url, params=params)]
+    if chain == 'ethereum':
+        token_params = {
+            'chainid': chainid,
+            'module': 'account',
+            'action': 'tokentx',
+            'contractaddress': LINK_CONTRACT_ADDRESS,
+            'address': address,
+            'sort': 'desc',
+            'page': 1,
+            'offset': 10000,
+            'apikey': api_key
+        }
+        requests_to_send.append(client.request_json('GET', base_url, params=token_params))
+    
+    responses = await asyncio.gather(*requests_to_send)
+    
+    records = []
+    data = responses[0]
+    if data.get('status') == '1' and isinstance(data.get('result'), list):
+        records.extend(_parse_each(data['result'], lambda tx: _parse_etherscan_tx(tx, chain)))
+    if len(responses) > 1:
+        token_data = responses[1]
+        if token_data.get('status') == '1' and isinstance(token_data.get('result'), list):
+            records.extend(_parse_each(token_data['result'], _parse_etherscan_token_tx))
+    return records
+
+
+async def sochain_adapter(
+    client: ProviderClient,
+    base_url: str,
+    address: str,
+    chain: str,
+    api_key: str,
+    min_block: Optional[int] = None
+) -> List[Dict]:
+    """
+    SoChain v2: BTC / LTC / DOGE 주소 거래 (입출력 포함, 최신순 페이지)
+    
+    min_block 이하 블록은 제외하고, 워터마크 이하 블록이 나오면 이후 페이지는 더 오래된 거래이므로 중단
+    """
+    coin = chain.upper()
+    headers = {'X-API-Key': api_key} if api_key else {}
+    txs = []
+    page = 1
+    while True:
+        data = await client.request_json(
+            'GET', f'{base_url}/get_address_transactions/{coin}/{address}/{page}', headers=headers
+        )
+        if data.get('status') != 'success' or not data.get('data'):
+            if page == 1:
+                return []
+            raise IncompleteHistory(f"SoChain {page}페이지 응답 오류", _parse_sochain_txs(txs, address, coin))
+        
+        items = data['data'].get('txs', [])
+        txs.extend(tx for tx in items if _after_watermark(tx.get('block_no'), min_block))
+        reached_watermark = min_block is not None and any(
+            tx.get('block_no') is not None and 0 <= tx['block_no'] <= min_block for tx in items
+        )
+        if len(items) < SOCHAIN_PAGE_SIZE or reached_watermark:
+            return _parse_sochain_txs(txs, address, coin)
+        page += 1
+
+
+async def subscan_adapter(client: ProviderClient, base_url: str, address: str, chain: str, api_key: str) -> List[Dict]:
+    """Subscan: Polkadot 전송 내역"""
+    headers = {'Content-Type': 'application/json', 'X-API-Key': api_key}
+    payload = {'address': address, 'page': 0, 'row': 100}
+    data = await client.request_json('POST', f'{base_url}/api/scan/transfers', json=payload, headers=headers)
+    
+    if data.get('code') != 0 or not data.get('data'):
+        return []
+    return _parse_each(data['data'].get('transfers', []), _parse_subscan_transfer)
+
+
+async def solscan_adapter(client: ProviderClient, base_url: str, address: str, chain: str, api_key: str) -> List[Dict]:
+    """Solscan: Solana 계정 거래"""
+    params = {'account': address, 'limit': 100}
+    data = await client.request_json('GET', f'{base_url}/account/transactions', params=params, headers={'token': api_key})
+    
+    if not isinstance(data, list):
+        return []
+    return _parse_each(data, lambda tx: _parse_solscan_tx(tx, address))
+
+
+async def _vtc_paged_txs(client: ProviderClient, base_url: str, address: str, min_block: Optional[int]) -> List[Dict]:
+    """
+    Insight /addrs/{주소}/txs를 최신순 페이지로 조회 (페이지당 거래 상세 50건)
+    
+    워터마크 이하 블록이 나오면 이후 페이지는 더 오래된 거래이므로 중단
+    """
+    txs = []
+    start = 0
+    while True:
+        page = await client.request_json(
+            'GET', f'{base_url}/addrs/{address}/txs', params={'from': start, 'to': start + INSIGHT_PAGE_SIZE}
+        )
+        items = page.get('items', [])
+        fresh = [tx for tx in items if _after_watermark(tx.get('blockheight'), min_block)]
+        txs.extend(fresh)
+        
+        start += len(items)
+        reached_watermark = min_block is not None and any(
+            tx.get('blockheight') is not None and 0 <= tx['blockheight'] <= min_block for tx in items
+        )
+        if not items or reached_watermark or start >= int(page.get('totalItems', 0)):
+            return txs
+
+
+async def vtc_adapter(
+    client: ProviderClient,
+    base_url: str,
+    address: str,
+    chain: str,
+    api_key: str,
+    min_block: Optional[int] = None
+) -> List[Dict]:
+    """
+    Vertcoin Insight 탐색기: 주소 거래를 상세 포함 페이지 단위로 조회
+    
+    페이지 조회를 지원하지 않는 탐색기(404)는 거래 ID 조회 후 거래 상세를 동시에 조회
+    (상세 조회가 하나라도 실패하면 받은 거래와 함께 IncompleteHistory → 워터마크 유지)
+    """
+    try:
+        txs = await _vtc_paged_txs(client, base_url, address, min_block)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        data = await client.request_json('GET', f'{base_url}/addr/{address}')
+        tx_ids = data.get('transactions', [])
+        details = await asyncio.gather(
+            *(client.request_json('GET', f'{base_url}/tx/{tx_id}') for tx_id in tx_ids),
+            return_exceptions=True
+        )
+        txs = [
+            dict(detail, txid=detail.get('txid', tx_id))
+            for tx_id, detail in zip(tx_ids, details)
+            if isinstance(detail, dict) and _after_watermark(detail.get('blockheight'), min_block)
+        ]
+        failed = [tx_id for tx_id, detail in zip(tx_ids, details) if isinstance(detail, Exception)]
+        if failed:
+            raise IncompleteHistory(
+                f"거래 상세 {len(failed)}건 조회 실패 ({', '.join(failed[:3])})", _parse_vtc_txs(txs, address)
+            )
+    return _parse_vtc_txs(txs, address)
+
+
+PROVIDER_ADAPTERS = {
+    'etherscan': etherscan_adapter,
+    'sochain': sochain_adapter,
+    'subscan': subscan_adapter,
+    'solscan': solscan_adapter,
+    'vtc': vtc_adapter,
+}
+
+
+class MultiChainCollector:
+    """
+    멀티체인 동시 수집기
+    
+    - 체인별 주소 수집을 모두 한 이벤트 루프에서 동시에 실행 (느린 제공자가 다른 체인을 막지 않음)
+    - 같은 제공자의 체인(ethereum / bsc, btc / ltc / doge)은 토큰 버킷과 동시 요청 수를 공유
+    - 주소 단위 실패는 로그만 남기고 건너뜀 (기존 수집 함수와 같은 동작)
+    - state가 있으면 UTXO 제공자는 주소별 워터마크 이후 거래만 수집, 저장 후 commit_watermarks()로 전진
+    """
+    
+    def __init__(
+        self,
+        api_keys: Optional[Dict[str, str]] = None,
+        base_urls: Optional[Dict[str, str]] = None,
+        limits: Optional[Dict[str, Dict]] = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        state: Optional[IngestionState] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            api_keys: 제공자별 API 키 (None이면 환경변수)
+            base_urls: 체인별 엔드포인트 덮어쓰기 (테스트 / 프록시)
+            limits: 제공자별 호출 한도 덮어쓰기 ({'etherscan': {'rate': 10}} 형식)
+            timeout: 요청 타임아웃 (초)
+            max_retries: 429 / 5xx / 연결 오류 재시도 횟수
+            backoff_base: 지수 백오프 기본 대기 시간 (초)
+            backoff_max: 재시도 최대 대기 시간 (초)
+            state: 수집 워터마크 저장소 (None이면 항상 전체 수집)
+        """
+        if api_keys is None:
+            api_keys = {
+                'etherscan': ETHERSCAN_API_KEY,
+                'sochain': SOCHAIN_API_KEY,
+                'subscan': SUBSCAN_API_KEY,
+                'solscan': SOLSCAN_API_KEY,
+            }
+        self.api_keys = dict(api_keys)
+        self.base_urls = dict(BASE_URLS, **(base_urls or {}))
+        
+        provider_limits = {
+            provider: dict(limit, **(limits or {}).get(provider, {}))
+            for provider, limit in PROVIDER_LIMITS.items()
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(limit['max_in_flight'] for limit in provider_limits.values()),
+            thread_name_prefix="multi-chain-io"
+        )
+        self.clients = {
+            provider: ProviderClient(
+                provider, limit['rate'], limit['burst'], limit['max_in_flight'], self._executor,
+                timeout=timeout, max_retries=max_retries, backoff_base=backoff_base, backoff_max=backoff_max
+            )
+            for provider, limit in provider_limits.items()
+        }
+        self.failed_addresses: Dict[str, List[str]] = {}
+        self.state = state
+        self.start_blocks: Dict[str, Dict[str, int]] = {}
+        self.pending_watermarks: Dict[Tuple[str, str], Dict] = {}
+    
+    def _load_watermarks(self, providers: Iterable[str]):
+        """UTXO 제공자별 주소 워터마크 일괄 조회 (제공자당 1회)"""
+        for provider in set(providers) & set(UTXO_PROVIDERS):
+            self.start_blocks[provider] = {
+                row['entity']: row['last_block']
+                for row in self.state.all(source=provider)
+                if row.get('stream') == STATE_STREAM and row.get('last_block') is not None
+            }
+    
+    def _mark_watermark(self, provider: str, address: str, records: List[Dict]):
+        """수집한 거래의 최대 블록을 전진 대기 워터마크로 기록 (미확정 거래 제외)"""
+        blocks = [tx['block_number'] for tx in records if isinstance(tx.get('block_number'), int) and tx['block_number'] >= 0]
+        if blocks:
+            self.pending_watermarks[(provider, address)] = {'last_block': max(blocks)}
+    
+    async def _collect_address(self, chain: str, address: str) -> List[Dict]:
+        """주소 1개 수집 (실패 시 빈 목록)"""
+        provider = CHAIN_PROVIDERS[chain]
+        adapter = PROVIDER_ADAPTERS[provider]
+        kwargs = {}
+        if provider in self.start_blocks:
+            kwargs['min_block'] = self.start_blocks[provider].get(address)
+        try:
+            records = await adapter(
+                self.clients[provider], self.base_urls[chain], address, chain, self.api_keys.get(provider, ''), **kwargs
+            )
+        except IncompleteHistory as e:
+            # 받은 거래는 저장하되 워터마크는 전진하지 않음 (다음 수집에서 빠진 거래까지 다시 조회)
+            logger.warning(f"[{chain}] {address} 일부 거래 조회 실패: {e}")
+            self.failed_addresses.setdefault(chain, []).append(address)
+            return e.records
+        except Exception as e:
+            logger.warning(f"[{chain}] {address} 수집 실패: {e}")
+            self.failed_addresses.setdefault(chain, []).append(address)
+            return []
+        if provider in self.start_blocks:
+            self._mark_watermark(provider, address, records)
+        return records
+    
+    async def collect_async(self, addresses_by_chain: Dict[str, Iterable[str]]) -> Dict[str, List[Dict]]:
+        """
+        체인별 주소 거래 기록 동시 수집
+        
+        Args:
+            addresses_by_chain: {체인: 주소 목록} (체인은 CHAIN_PROVIDERS 키)
+        
+        Returns:
+            {체인: 거래 기록 리스트} (API 키가 없거나 지원하지 않는 체인은 빈 리스트)
+        """
+        for client in self.clients.values():
+            client.bind()
+        
+        jobs = []
+        results: Dict[str, List[Dict]] = {}
+        for chain, addresses in addresses_by_chain.items():
+            results[chain] = []
+            provider = CHAIN_PROVIDERS.get(chain)
+            if provider is None:
+                logger.warning(f"지원하지 않는 체인: {chain}")
+                continue
+            if provider in KEY_REQUIRED_PROVIDERS and not self.api_keys.get(provider):
+                logger.warning(f"{provider} API 키가 없어 {chain} 수집을 건너뜁니다.")
+                continue
+            jobs.extend((chain, address) for address in addresses)
+        
+        if self.state is not None:
+            self._load_watermarks(CHAIN_PROVIDERS[chain] for chain, _ in jobs)
+        
+        collected = await asyncio.gather(*(self._collect_address(chain, address) for chain, address in jobs))
+        for (chain, _), records in zip(jobs, collected):
+            results[chain].extend(records)
+        return results
+    
+    def collect(self, addresses_by_chain: Dict[str, Iterable[str]]) -> Dict[str, List[Dict]]:
+        """collect_async 동기 실행 (이벤트 루프 밖에서 호출)"""
+        return asyncio.run(self.collect_async(addresses_by_chain))
+    
+    def commit_watermarks(self) -> int:
+        """
+        수집한 UTXO 주소 워터마크 전진 (거래 저장이 끝난 뒤 호출)
+        
+        Returns:
+            전진한 주소 수
+        """
+        if self.state is None:
+            return 0
+        for (provider, address), mark in self.pending_watermarks.items():
+            self.state.advance(provider, address, STATE_STREAM, **mark)
+        committed = len(self.pending_watermarks)
+        self.pending_watermarks = {}
+        return committed
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """제공자별 요청 / 재시도 / 429 / 실패 횟수"""
+        return {provider: dict(client.stats) for provider, client in self.clients.items()}
+    
+    def close(self):
+        """세션 / 실행기 정리"""
+        for client in self.clients.values():
+            client.close()
+        self._executor.shutdown(wait=False)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _collect_chain(chain: str, addresses: List[str], provider: str, api_key: str) -> List[Dict]:
+    """단일 체인 동기 수집"""
+    with MultiChainCollector(api_keys={provider: api_key}) as collector:
+        return collector.collect({chain: addresses})[chain]
+
 
 def fetch_etherscan_transactions(addresses: List[str], chain: str, api_key: str) -> List[Dict]:
     """
@@ -45,108 +690,8 @@ def fetch_etherscan_transactions(addresses: List[str], chain: str, api_key: str)
     """
     if not api_key:
         return []
-    
-    # API 엔드포인트 설정 (V2 API 사용)
-    if chain.lower() == 'bsc':
-        base_url = 'https://api.bscscan.com/v2/api'
-        chainid = 56  # BSC chainid
-    else:
-        base_url = 'https://api.etherscan.io/v2/api'
-        chainid = 1  # Ethereum mainnet chainid
-    
-    all_transactions = []
-    
-    for address in addresses:
-        try:
-            # 네이티브 코인 거래 조회 (V2 API)
-            params = {
-                'chainid': chainid,  # V2 API 필수 파라미터
-                'module': 'account',
-                'action': 'txlist',
-                'address': address,
-                'startblock': 0,
-                'endblock': 99999999,
-                'sort': 'desc',
-                'page': 1,
-                'offset': 10000,  # 최대 10,000건
-                'apikey': api_key
-            }
-            
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') == '1' and data.get('result'):
-                result = data['result']
-                if isinstance(result, list):
-                    for tx in result:
-                        try:
-                            value = int(tx.get('value', 0)) / 1e18
-                            coin_symbol = 'BNB' if chain.lower() == 'bsc' else 'ETH'
-                            
-                            all_transactions.append({
-                                'tx_hash': tx.get('hash'),
-                                'block_number': int(tx.get('blockNumber', 0)),
-                                'block_timestamp': datetime.fromtimestamp(int(tx.get('timeStamp', 0))),
-                                'from_address': tx.get('from', '').lower(),
-                                'to_address': tx.get('to', '').lower() if tx.get('to') else None,
-                                'value': value,
-                                'coin_symbol': coin_symbol,
-                                'chain': chain.lower(),
-                                'gas_used': int(tx.get('gasUsed', 0)),
-                                'gas_price': int(tx.get('gasPrice', 0)),
-                                'is_error': tx.get('isError') == '1',
-                            })
-                        except Exception as e:
-                            continue
-            
-            # LINK 토큰 거래 조회 (Ethereum만, V2 API)
-            if chain.lower() == 'ethereum':
-                token_params = {
-                    'chainid': chainid,  # V2 API 필수 파라미터
-                    'module': 'account',
-                    'action': 'tokentx',
-                    'contractaddress': LINK_CONTRACT_ADDRESS,
-                    'address': address,
-                    'sort': 'desc',
-                    'page': 1,
-                    'offset': 10000,
-                    'apikey': api_key
-                }
-                
-                token_response = requests.get(base_url, params=token_params, timeout=30)
-                token_response.raise_for_status()
-                token_data = token_response.json()
-                
-                if token_data.get('status') == '1' and token_data.get('result'):
-                    for tx in token_data['result']:
-                        try:
-                            value = int(tx.get('value', 0)) / (10 ** int(tx.get('tokenDecimal', 18)))
-                            
-                            all_transactions.append({
-                                'tx_hash': tx.get('hash'),
-                                'block_number': int(tx.get('blockNumber', 0)),
-                                'block_timestamp': datetime.fromtimestamp(int(tx.get('timeStamp', 0))),
-                                'from_address': tx.get('from', '').lower(),
-                                'to_address': tx.get('to', '').lower() if tx.get('to') else None,
-                                'value': value,
-                                'coin_symbol': 'LINK',
-                                'chain': 'ethereum',
-                                'contract_address': tx.get('contractAddress', '').lower(),
-                                'gas_used': int(tx.get('gasUsed', 0)),
-                                'gas_price': int(tx.get('gasPrice', 0)),
-                                'is_error': False,
-                            })
-                        except Exception as e:
-                            continue
-            
-            # Rate limit 방지
-            time.sleep(0.25)
-            
-        except Exception as e:
-            continue
-    
-    return all_transactions
+    chain = 'bsc' if chain.lower() == 'bsc' else 'ethereum'
+    return _collect_chain(chain, addresses, 'etherscan', api_key)
 
 
 def fetch_sochain_transactions(addresses: List[str], coin: str, api_key: str) -> List[Dict]:
@@ -166,98 +711,7 @@ def fetch_sochain_transactions(addresses: List[str], coin: str, api_key: str) ->
     --------
     List[Dict] : 거래 기록 리스트
     """
-    all_transactions = []
-    
-    # SoChain API 엔드포인트 (v2 사용, v3는 제한적)
-    base_url = f'https://sochain.com/api/v2/get_address_transactions/{coin}'
-    
-    for address in addresses:
-        try:
-            # 주소의 거래 기록 조회
-            url = f'{base_url}/{address}'
-            headers = {}
-            if api_key:
-                headers['X-API-Key'] = api_key
-            
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') == 'success' and data.get('data'):
-                transactions = data['data'].get('txs', [])
-                
-                for tx in transactions:
-                    try:
-                        # SoChain API 응답 구조에 따라 파싱
-                        tx_hash = tx.get('txid', '')
-                        block_height = tx.get('block_no', 0)
-                        time_ts = tx.get('time', 0)
-                        
-                        # 입력/출력에서 주소와 금액 추출
-                        inputs = tx.get('inputs', [])
-                        outputs = tx.get('outputs', [])
-                        
-                        # 입력에서 주소와 관련된 거래 (from_address)
-                        for inp in inputs:
-                            inp_address = inp.get('address', '')
-                            if inp_address and inp_address.lower() == address.lower():
-                                value = float(inp.get('value', 0)) / 1e8  # BTC/LTC/DOGE는 8 decimal
-                                
-                                # 출력 주소 찾기
-                                to_address = None
-                                for out in outputs:
-                                    out_address = out.get('address', '')
-                                    if out_address and out_address.lower() != address.lower():
-                                        to_address = out_address.lower()
-                                        break
-                                
-                                all_transactions.append({
-                                    'tx_hash': tx_hash,
-                                    'block_number': block_height,
-                                    'block_timestamp': datetime.fromtimestamp(time_ts) if time_ts else datetime.now(),
-                                    'from_address': address.lower(),
-                                    'to_address': to_address,
-                                    'value': value,
-                                    'coin_symbol': coin,
-                                    'chain': coin.lower(),
-                                    'is_error': False,
-                                })
-                        
-                        # 출력에서 주소와 관련된 거래 (to_address)
-                        for out in outputs:
-                            out_address = out.get('address', '')
-                            if out_address and out_address.lower() == address.lower():
-                                value = float(out.get('value', 0)) / 1e8  # BTC/LTC/DOGE는 8 decimal
-                                
-                                # 입력 주소 찾기
-                                from_address = None
-                                for inp in inputs:
-                                    inp_address = inp.get('address', '')
-                                    if inp_address and inp_address.lower() != address.lower():
-                                        from_address = inp_address.lower()
-                                        break
-                                
-                                all_transactions.append({
-                                    'tx_hash': tx_hash,
-                                    'block_number': block_height,
-                                    'block_timestamp': datetime.fromtimestamp(time_ts) if time_ts else datetime.now(),
-                                    'from_address': from_address,
-                                    'to_address': address.lower(),
-                                    'value': value,
-                                    'coin_symbol': coin,
-                                    'chain': coin.lower(),
-                                    'is_error': False,
-                                })
-                    except Exception as e:
-                        continue
-            
-            # Rate limit 방지
-            time.sleep(0.5)
-            
-        except Exception as e:
-            continue
-    
-    return all_transactions
+    return _collect_chain(coin.lower(), addresses, 'sochain', api_key)
 
 
 def fetch_subscan_transactions(addresses: List[str], api_key: str) -> List[Dict]:
@@ -277,57 +731,7 @@ def fetch_subscan_transactions(addresses: List[str], api_key: str) -> List[Dict]
     """
     if not api_key:
         return []
-    
-    all_transactions = []
-    
-    # Subscan Polkadot API 엔드포인트
-    base_url = 'https://polkadot.api.subscan.io/api/scan/transfers'
-    
-    for address in addresses:
-        try:
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-Key': api_key
-            }
-            
-            payload = {
-                'address': address,
-                'page': 0,
-                'row': 100
-            }
-            
-            response = requests.post(base_url, json=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('code') == 0 and data.get('data'):
-                transfers = data['data'].get('transfers', [])
-                
-                for transfer in transfers:
-                    try:
-                        amount = float(transfer.get('amount', 0)) / 1e10  # DOT는 10 decimal
-                        
-                        all_transactions.append({
-                            'tx_hash': transfer.get('hash', ''),
-                            'block_number': transfer.get('block_num', 0),
-                            'block_timestamp': datetime.fromtimestamp(transfer.get('block_timestamp', 0)),
-                            'from_address': transfer.get('from', '').lower(),
-                            'to_address': transfer.get('to', '').lower(),
-                            'value': amount,
-                            'coin_symbol': 'DOT',
-                            'chain': 'polkadot',
-                            'is_error': transfer.get('success', True) == False,
-                        })
-                    except Exception as e:
-                        continue
-            
-            # Rate limit 방지
-            time.sleep(0.5)
-            
-        except Exception as e:
-            continue
-    
-    return all_transactions
+    return _collect_chain('polkadot', addresses, 'subscan', api_key)
 
 
 def fetch_solscan_transactions(addresses: List[str], api_key: str) -> List[Dict]:
@@ -347,59 +751,7 @@ def fetch_solscan_transactions(addresses: List[str], api_key: str) -> List[Dict]
     """
     if not api_key:
         return []
-    
-    all_transactions = []
-    
-    # Solscan API 엔드포인트
-    base_url = 'https://public-api.solscan.io/account/transactions'
-    
-    for address in addresses:
-        try:
-            headers = {
-                'token': api_key
-            }
-            
-            params = {
-                'account': address,
-                'limit': 100
-            }
-            
-            response = requests.get(base_url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if isinstance(data, list):
-                for tx in data:
-                    try:
-                        # Solana 거래 파싱
-                        tx_hash = tx.get('txHash', '')
-                        block_time = tx.get('blockTime', 0)
-                        slot = tx.get('slot', 0)
-                        
-                        # 거래 금액 추출 (Solana는 복잡한 구조)
-                        amount = float(tx.get('amount', 0)) / 1e9  # SOL은 9 decimal
-                        
-                        all_transactions.append({
-                            'tx_hash': tx_hash,
-                            'block_number': slot,
-                            'block_timestamp': datetime.fromtimestamp(block_time),
-                            'from_address': address.lower(),
-                            'to_address': None,  # Solana는 복잡한 구조
-                            'value': amount,
-                            'coin_symbol': 'SOL',
-                            'chain': 'solana',
-                            'is_error': tx.get('err', None) is not None,
-                        })
-                    except Exception as e:
-                        continue
-            
-            # Rate limit 방지
-            time.sleep(0.5)
-            
-        except Exception as e:
-            continue
-    
-    return all_transactions
+    return _collect_chain('solana', addresses, 'solscan', api_key)
 
 
 def fetch_vtc_transactions(addresses: List[str]) -> List[Dict]:
@@ -415,59 +767,4 @@ def fetch_vtc_transactions(addresses: List[str]) -> List[Dict]:
     --------
     List[Dict] : 거래 기록 리스트
     """
-    all_transactions = []
-    
-    # Vertcoin Explorer API (공개 API)
-    # 참고: VTC는 공개 API가 제한적이므로 기본적인 구조만 제공
-    base_url = 'https://explorer.vertcoin.org/api'
-    
-    for address in addresses:
-        try:
-            # 주소 정보 조회
-            url = f'{base_url}/addr/{address}'
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            # 거래 기록 추출
-            transactions = data.get('transactions', [])
-            
-            for tx_id in transactions:
-                try:
-                    # 거래 상세 조회
-                    tx_url = f'{base_url}/tx/{tx_id}'
-                    tx_response = requests.get(tx_url, timeout=30)
-                    tx_response.raise_for_status()
-                    tx_data = tx_response.json()
-                    
-                    # 거래 파싱
-                    block_height = tx_data.get('blockheight', 0)
-                    time_ts = tx_data.get('time', 0)
-                    value = float(tx_data.get('valueOut', 0)) / 1e8  # VTC는 8 decimal
-                    
-                    all_transactions.append({
-                        'tx_hash': tx_id,
-                        'block_number': block_height,
-                        'block_timestamp': datetime.fromtimestamp(time_ts),
-                        'from_address': address.lower(),
-                        'to_address': None,
-                        'value': value,
-                        'coin_symbol': 'VTC',
-                        'chain': 'vertcoin',
-                        'is_error': False,
-                    })
-                    
-                    # Rate limit 방지
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    continue
-            
-            # Rate limit 방지
-            time.sleep(1)
-            
-        except Exception as e:
-            continue
-    
-    return all_transactions
-
+    return _collect_chain('vtc', addresses, 'vtc', '')
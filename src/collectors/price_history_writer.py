@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+price_history 저장
+K-line → price_history 행 변환 + (crypto_id, timestamp, data_source) 고유 제약 기준 대량 upsert
+(고유 제약: sql/add_price_history_unique_constraint.sql)
+"""
+
+from datetime import timezone
+from typing import Callable, Dict, List, Optional
+
+from src.collectors.bulk_upsert import BulkUpserter
+
+PRICE_HISTORY_TABLE = 'price_history'
+PRICE_HISTORY_CONFLICT = 'crypto_id,timestamp,data_source'
+
+
+def _optional_str(value) -> Optional[str]:
+    """거래소별로 제공되지 않는 필드(None)는 그대로 두고 나머지는 문자열로 변환"""
+    return str(value) if value is not None else None
+
+
+def _utc(value):
+    """타임존 없는 시각은 UTC로 간주"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def build_price_history_records(crypto_id: str, klines: List[Dict], data_source: str = 'binance') -> List[Dict]:
+    """
+    K-line → price_history 행
+    
+    같은 시각이 여러 번 있으면 마지막 값만 남김 (한 요청 안의 중복 키는 upsert 오류)
+    """
+    records = {}
+    for kline in klines:
+        open_time = _utc(kline['open_time'])
+        records[open_time.isoformat()] = {
+            'crypto_id': crypto_id,
+            'timestamp': open_time.isoformat(),  # ISO 형식으로 저장 (UTC)
+            'open_price': str(kline['open_price']),
+            'high_price': str(kline['high_price']),
+            'low_price': str(kline['low_price']),
+            'close_price': str(kline['close_price']),
+            'volume': str(kline['volume']),
+            'quote_volume': str(kline['quote_volume']),
+            'trade_count': kline.get('trade_count'),
+            'taker_buy_volume': _optional_str(kline.get('taker_buy_volume')),
+            'taker_buy_quote_volume': _optional_str(kline.get('taker_buy_quote_volume')),
+            'data_source': data_source,
+            'raw_data': {
+                'open_time': open_time.isoformat(),
+                'close_time': _utc(kline['close_time']).isoformat(),
+            }
+        }
+    return list(records.values())
+
+
+def upsert_price_history(
+    supabase,
+    crypto_id: str,
+    klines: List[Dict],
+    data_source: str = 'binance',
+    batch_size: int = 1000,
+    max_workers: int = 4,
+    progress_callback: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    price_history 대량 upsert
+    
+    Returns:
+        BulkUpserter.get_progress() 결과 (rows_written / rows_failed / rows_per_sec 등)
+    """
+    records = build_price_history_records(crypto_id, klines, data_source)
+    upserter = BulkUpserter(
+        supabase,
+        PRICE_HISTORY_TABLE,
+        PRICE_HISTORY_CONFLICT,
+        batch_size=batch_size,
+        max_workers=max_workers,
+        progress_callback=progress_callback
+    )
+    upserter.upsert(records)
+    return upserter.get_progress()
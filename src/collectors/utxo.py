@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+UTXO 체인 거래 평탄화
+거래의 입력 / 출력을 (거래 위치, 방향, 주소, 금액) 열 배열 하나로 펼친 뒤 배열 연산으로 주소 기준 입출금 기록 생성
+- SoChain (BTC / LTC / DOGE), Insight 탐색기 (VTC) 공용
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+INPUT = 0
+OUTPUT = 1
+
+# 거래 1건 → [(주소, 금액), ...]
+LegExtractor = Callable[[Dict], Iterable[Tuple[Optional[str], float]]]
+
+
+def flatten_legs(txs: List[Dict], inputs_of: LegExtractor, outputs_of: LegExtractor) -> Dict[str, np.ndarray]:
+    """
+    거래 목록의 입력 / 출력을 열 배열로 평탄화 (입력 → 출력, 거래 순서 유지)
+    
+    Returns:
+        {'tx': 거래 위치, 'side': INPUT/OUTPUT, 'address': 소문자 주소('' = 주소 없음), 'value': 금액}
+        (입출력 추출에 실패한 거래는 제외)
+    """
+    tx_index: List[int] = []
+    sides: List[int] = []
+    addresses: List[str] = []
+    values: List[float] = []
+    
+    for i, tx in enumerate(txs):
+        try:
+            legs = [(INPUT, leg) for leg in inputs_of(tx)] + [(OUTPUT, leg) for leg in outputs_of(tx)]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+        for side, (address, value) in legs:
+            tx_index.append(i)
+            sides.append(side)
+            addresses.append((address or '').lower())
+            values.append(value)
+    
+    return {
+        'tx': np.asarray(tx_index, dtype=np.int64),
+        'side': np.asarray(sides, dtype=np.int8),
+        'address': np.asarray(addresses, dtype=object),
+        'value': np.asarray(values, dtype=np.float64),
+    }
+
+
+def _first_other_address(legs: Dict[str, np.ndarray], mask: np.ndarray, n_txs: int) -> np.ndarray:
+    """거래별로 mask에 해당하는 첫 주소 (없으면 None)"""
+    table = np.full(n_txs, None, dtype=object)
+    positions = np.flatnonzero(mask)
+    if positions.size:
+        txs, first = np.unique(legs['tx'][positions], return_index=True)
+        table[txs] = legs['address'][positions[first]]
+    return table
+
+
+def address_legs(legs: Dict[str, np.ndarray], address: str, n_txs: int) -> Dict[str, np.ndarray]:
+    """
+    주소가 포함된 입력 / 출력만 골라 상대 주소를 붙임
+    
+    - 입력(출금): 상대 주소 = 같은 거래의 출력 중 첫 다른 주소
+    - 출력(입금): 상대 주소 = 같은 거래의 입력 중 첫 다른 주소
+    """
+    address = address.lower()
+    own = legs['address'] == address
+    other = ~own & (legs['address'] != '')
+    first_input = _first_other_address(legs, other & (legs['side'] == INPUT), n_txs)
+    first_output = _first_other_address(legs, other & (legs['side'] == OUTPUT), n_txs)
+    
+    tx = legs['tx'][own]
+    side = legs['side'][own]
+    return {
+        'tx': tx,
+        'side': side,
+        'value': legs['value'][own],
+        'counterparty': np.where(side == INPUT, first_output[tx], first_input[tx]),
+    }
+
+
+def utxo_records(
+    txs: List[Dict],
+    address: str,
+    inputs_of: LegExtractor,
+    outputs_of: LegExtractor,
+    meta_of: Callable[[Dict], Tuple[str, int, Optional[datetime]]],
+    coin: str,
+    chain: str,
+    unit: float = 1.0
+) -> List[Dict]:
+    """
+    주소 기준 입출금 거래 기록
+    
+    Args:
+        txs: 거래 목록 (제공자 응답 그대로)
+        address: 대상 주소
+        inputs_of / outputs_of: 거래 → [(주소, 금액), ...]
+        meta_of: 거래 → (tx_hash, block_number, block_timestamp)
+        coin: 코인 심볼
+        chain: 체인 이름
+        unit: 금액 단위 (1e8이면 사토시 → 코인)
+    
+    Returns:
+        거래 기록 리스트 (거래 순서, 거래 안에서는 출금 → 입금)
+    """
+    legs = flatten_legs(txs, inputs_of, outputs_of)
+    own = address_legs(legs, address, len(txs))
+    address = address.lower()
+    values = own['value'] / unit
+    
+    records = []
+    meta: Dict[int, Tuple] = {}
+    for tx_pos, side, value, counterparty in zip(own['tx'].tolist(), own['side'].tolist(), values.tolist(), own['counterparty']):
+        if tx_pos not in meta:
+            tx_hash, block_number, block_timestamp = meta_of(txs[tx_pos])
+            meta[tx_pos] = (tx_hash, block_number, block_timestamp or datetime.now())
+        tx_hash, block_number, block_timestamp = meta[tx_pos]
+        records.append({
+            'tx_hash': tx_hash,
+            'block_number': block_number,
+            'block_timestamp': block_timestamp,
+            'from_address': address if side == INPUT else counterparty,
+            'to_address': counterparty if side == INPUT else address,
+            'value': value,
+            'coin_symbol': coin,
+            'chain': chain,
+            'is_error': False,
+        })
+    return records
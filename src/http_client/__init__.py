@@ -0,0 +1,35 @@
+"""
+수집기 공용 HTTP 클라이언트 패키지
+"""
+
+from .client import (
+    HttpClient,
+    RATE_LIMITS,
+    REQUEST_METRICS,
+    RETRYABLE_STATUS,
+    get,
+    get_client,
+    post,
+    retry_delay,
+)
+from .metrics import RequestMetrics
+from .rate_limit import DEFAULT_HOST_LIMITS, RateLimitRegistry, TokenBucket
+from .replay import ReplayMiss, ResponseStore, is_storable
+
+__all__ = [
+    'HttpClient',
+    'RATE_LIMITS',
+    'REQUEST_METRICS',
+    'RETRYABLE_STATUS',
+    'get',
+    'get_client',
+    'post',
+    'retry_delay',
+    'RequestMetrics',
+    'DEFAULT_HOST_LIMITS',
+    'RateLimitRegistry',
+    'TokenBucket',
+    'ReplayMiss',
+    'ResponseStore',
+    'is_storable',
+]
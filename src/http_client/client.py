@@ -0,0 +1,209 @@
+"""
+공용 HTTP 클라이언트 모듈
+수집기 공용 keep-alive 세션 (호스트별 연결 풀, gzip, 지터 백오프 재시도, 호스트별 호출 한도, 요청 지표, 응답 기록 / 재생)
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .metrics import RequestMetrics
+from .rate_limit import RateLimitRegistry
+from .replay import CACHE, MODES, OFF, REPLAY, ReplayMiss, ResponseStore, store_from_env
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+# 프로세스 공용 호출 한도 / 요청 지표 (모든 수집기가 공유)
+RATE_LIMITS = RateLimitRegistry()
+REQUEST_METRICS = RequestMetrics()
+
+
+def retry_delay(attempt: int, response: Optional[requests.Response], base: float, cap: float) -> float:
+    """재시도 대기 시간 (Retry-After 초 단위 값 우선, 없으면 full jitter 지수 백오프)"""
+    if response is not None:
+        try:
+            return min(cap, max(0.0, float(response.headers.get('Retry-After'))))
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _wire_bytes(response: requests.Response, stream: bool) -> int:
+    """응답 본문 수신 바이트 (압축 해제 전 크기, 스트리밍 응답은 Content-Length)"""
+    if stream:
+        return int(response.headers.get('Content-Length') or 0)
+    content = response.content
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(content)
+
+
+class HttpClient:
+    """
+    공용 HTTP 클라이언트
+    
+    - 세션 1개에 호스트별 연결 풀 (pool_connections개 호스트, 호스트당 pool_maxsize개 연결 유지)
+    - 응답 압축(gzip / deflate, 설치된 경우 br / zstd)을 요청하고 자동 해제
+    - 요청마다 호스트 토큰 버킷 통과 후 전송, 429 / 5xx / 연결 오류는 지터 백오프 후 재시도
+    - 응답은 requests.Response 그대로 반환 (HTTP 오류 판단은 호출부의 raise_for_status)
+    - store가 있으면 replay_mode에 따라 응답 기록 / 재생 (재생은 호출 한도 대기 없이 디스크에서, stream 요청은 제외)
+    """
+    
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        pool_connections: int = 32,
+        pool_maxsize: int = 10,
+        rate_limits: Optional[RateLimitRegistry] = None,
+        metrics: Optional[RequestMetrics] = None,
+        headers: Optional[Dict[str, str]] = None,
+        store: Optional[ResponseStore] = None,
+        replay_mode: str = OFF
+    ):
+        """
+        초기화
+        
+        Args:
+            timeout: 기본 요청 타임아웃 (초)
+            max_retries: 기본 재시도 횟수
+            backoff_base: 지수 백오프 기본 대기 시간 (초)
+            backoff_max: 재시도 최대 대기 시간 (초)
+            pool_connections: 연결 풀을 유지할 호스트 수
+            pool_maxsize: 호스트당 유지 연결 수 (동시 요청 스레드 수 이상 권장)
+            rate_limits: 호스트별 호출 한도 (None이면 공용 RATE_LIMITS)
+            metrics: 요청 지표 (None이면 공용 REQUEST_METRICS)
+            headers: 기본 요청 헤더
+            store: 응답 저장소 (None이면 기록 / 재생 안 함)
+            replay_mode: off / record / cache / replay (replay.py 참고)
+        """
+        if replay_mode not in MODES:
+            raise ValueError(f"replay_mode={replay_mode}: {', '.join(MODES)} 중 하나여야 합니다")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limits = rate_limits if rate_limits is not None else RATE_LIMITS
+        self.metrics = metrics if metrics is not None else REQUEST_METRICS
+        self.store = store
+        self.replay_mode = replay_mode if store is not None else OFF
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if headers:
+            self.session.headers.update(headers)
+    
+    def request(
+        self,
+        method: str,
+        url: str,
+        max_retries: Optional[int] = None,
+        throttle: bool = True,
+        record: bool = True,
+        **kwargs
+    ) -> requests.Response:
+        """
+        요청 전송
+        
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            max_retries: 재시도 횟수 (None이면 기본값)
+            throttle: 호스트 호출 한도 적용 여부
+            record: record / cache 모드에서 응답 저장 여부 (저장소 validator도 통과해야 저장)
+            **kwargs: requests 요청 인자 (params / json / headers / timeout 등)
+        
+        Raises:
+            requests.RequestException: 연결 오류 / 타임아웃이 재시도 후에도 계속될 때
+            ReplayMiss: replay 모드에서 저장된 응답이 없을 때
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        retries = self.max_retries if max_retries is None else max_retries
+        host = RateLimitRegistry.host_of(url)
+        
+        replayable = self.replay_mode != OFF and not kwargs.get('stream')
+        if replayable:
+            request_args = (method, url, kwargs.get('params'), kwargs.get('data'), kwargs.get('json'))
+            if self.replay_mode in (CACHE, REPLAY):
+                response = self.store.load(*request_args, respect_ttl=self.replay_mode == CACHE)
+                if response is not None:
+                    self.metrics.record_replay(host)
+                    return response
+                if self.replay_mode == REPLAY:
+                    raise ReplayMiss(f"저장된 응답 없음: {method.upper()} {url}")
+        
+        for attempt in range(retries + 1):
+            if throttle:
+                self.metrics.record_throttle(host, self.rate_limits.wait(url))
+            
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.metrics.record_error(host, time.perf_counter() - start)
+                if attempt == retries:
+                    raise
+                response = None
+            else:
+                self.metrics.record(host, response.status_code, time.perf_counter() - start, _wire_bytes(response, kwargs.get('stream')))
+                if response.status_code not in RETRYABLE_STATUS or attempt == retries:
+                    if replayable and record and self.store.validator(response):
+                        self.store.save(method, url, response, *request_args[2:])
+                    return response
+            
+            self.metrics.record_retry(host)
+            time.sleep(retry_delay(attempt, response, self.backoff_base, self.backoff_max))
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET 요청"""
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST 요청"""
+        return self.request('POST', url, **kwargs)
+    
+    def close(self):
+        """연결 풀 정리"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """프로세스 공용 클라이언트 (최초 호출 시 생성, HTTP_REPLAY_MODE / HTTP_REPLAY_DIR 환경 변수로 기록 / 재생)"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            store, mode = store_from_env()
+            _default_client = HttpClient(store=store, replay_mode=mode)
+        return _default_client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """공용 클라이언트 GET (requests.get 대체)"""
+    return get_client().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """공용 클라이언트 POST (requests.post 대체)"""
+    return get_client().post(url, **kwargs)
@@ -0,0 +1,132 @@
+"""
+HTTP 요청 지표 모듈
+호스트별 요청 수 / 상태 코드 / 응답 크기 / 지연 시간 / 재시도 / 호출 한도 대기 / 저장본 재생 집계
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+# 호스트별 지연 시간 백분위 계산용 최근 표본 수
+LATENCY_SAMPLES = 1000
+
+
+class RequestMetrics:
+    """
+    요청 지표 (스레드 안전)
+    
+    - record(): 응답 1건 (상태 코드, 지연 시간, 응답 바이트)
+    - record_error(): 응답 없는 실패 (연결 오류 / 타임아웃)
+    - record_replay(): 네트워크 대신 저장본으로 처리한 요청 (requests에는 포함하지 않음)
+    - snapshot(): 호스트별 요약 (p50 / p95는 최근 LATENCY_SAMPLES건 기준)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict] = {}
+    
+    def _host(self, host: str) -> Dict:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = {
+                'requests': 0,
+                'errors': 0,
+                'retries': 0,
+                'replays': 0,
+                'bytes': 0,
+                'status_codes': {},
+                'latency_total': 0.0,
+                'latency_max': 0.0,
+                'throttle_wait': 0.0,
+                'samples': deque(maxlen=LATENCY_SAMPLES)
+            }
+        return stats
+    
+    def record(self, host: str, status: int, latency: float, nbytes: int):
+        """응답 1건 기록"""
+        with self._lock:
+            stats = self._host(host)
+            stats['requests'] += 1
+            stats['bytes'] += nbytes
+            stats['status_codes'][status] = stats['status_codes'].get(status, 0) + 1
+            stats['latency_total'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+            stats['samples'].append(latency)
+    
+    def record_error(self, host: str, latency: float):
+        """응답 없는 실패 1건 기록"""
+        with self._lock:
+            stats = self._host(host)
+            stats['requests'] += 1
+            stats['errors'] += 1
+            stats['latency_total'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+    
+    def record_retry(self, host: str):
+        """재시도 1회 기록"""
+        with self._lock:
+            self._host(host)['retries'] += 1
+    
+    def record_replay(self, host: str):
+        """저장본 재생 1건 기록"""
+        with self._lock:
+            self._host(host)['replays'] += 1
+    
+    def record_throttle(self, host: str, waited: float):
+        """호출 한도 대기 시간 기록"""
+        if waited <= 0:
+            return
+        with self._lock:
+            self._host(host)['throttle_wait'] += waited
+    
+    @staticmethod
+    def _percentile(samples, q: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def snapshot(self, host: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        호스트별 요약
+        
+        Returns:
+            {호스트: {'requests', 'errors', 'retries', 'replays', 'bytes', 'status_codes',
+                     'latency_avg', 'latency_p50', 'latency_p95', 'latency_max', 'throttle_wait'}}
+        """
+        with self._lock:
+            hosts = {host: self._hosts[host]} if host in self._hosts else ({} if host else self._hosts)
+            return {
+                name: {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'replays': stats['replays'],
+                    'bytes': stats['bytes'],
+                    'status_codes': dict(stats['status_codes']),
+                    'latency_avg': stats['latency_total'] / stats['requests'] if stats['requests'] else 0.0,
+                    'latency_p50': self._percentile(stats['samples'], 0.5),
+                    'latency_p95': self._percentile(stats['samples'], 0.95),
+                    'latency_max': stats['latency_max'],
+                    'throttle_wait': stats['throttle_wait']
+                }
+                for name, stats in hosts.items()
+            }
+    
+    def format_summary(self) -> str:
+        """호스트별 한 줄 요약 (수집 스크립트 종료 시 출력용)"""
+        lines = []
+        for host, stats in sorted(self.snapshot().items()):
+            codes = ", ".join(f"{code}×{count}" for code, count in sorted(stats['status_codes'].items()))
+            lines.append(
+                f"{host}: {stats['requests']}회 ({codes or '-'}), 오류 {stats['errors']}, 재시도 {stats['retries']}, "
+                f"{stats['bytes'] / 1024:.1f}KB, 평균 {stats['latency_avg'] * 1000:.0f}ms / "
+                f"p95 {stats['latency_p95'] * 1000:.0f}ms, 한도 대기 {stats['throttle_wait']:.1f}초"
+                + (f", 재생 {stats['replays']}" if stats['replays'] else "")
+            )
+        return "\n".join(lines)
+    
+    def reset(self):
+        """전체 초기화"""
+        with self._lock:
+            self._hosts.clear()
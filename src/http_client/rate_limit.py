@@ -0,0 +1,144 @@
+"""
+호스트별 호출 한도 모듈
+토큰 버킷과 호스트 → 버킷 레지스트리 (동기 / 비동기 수집기 공용)
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# 호스트별 기본 호출 한도 (초당 요청 수, 버킷 크기)
+# - Etherscan / BscScan 무료 키: 5회/초
+# - Binance: IP당 분당 가중치 한도 (현물 6000, 선물 2400) → 요청 가중치 여유를 두고 10회/초
+# - Bybit 공개 시세: IP당 5초 120회 → 여유를 두고 10회/초
+# - Upbit 시세 조회(캔들): IP당 초당 10회 → 여유를 두고 8회/초
+# - Bitget 공개 시세: IP당 초당 20회 → 여유를 두고 10회/초
+# - BlockCypher 무료: 시간당 200회
+# - CoinGecko 공개 API: 분당 30회
+# - BscScan / BitInfoCharts 웹 페이지: 공개 한도 없음 → 기존 스크래핑 간격(2초) 기준
+# - Wayback Machine: 공개 한도 없음 → 기존 스냅샷 간격(0.5초) 기준
+DEFAULT_HOST_LIMITS: Dict[str, Tuple[float, float]] = {
+    'api.etherscan.io': (5.0, 5),
+    'api.bscscan.com': (5.0, 5),
+    'api.binance.com': (10.0, 10),
+    'fapi.binance.com': (10.0, 10),
+    'api.bybit.com': (10.0, 10),
+    'api.upbit.com': (8.0, 8),
+    'api.bitget.com': (10.0, 10),
+    'api.blockcypher.com': (200 / 3600, 1),
+    'api.coingecko.com': (0.5, 1),
+    'bscscan.com': (0.5, 1),
+    'bitinfocharts.com': (0.5, 1),
+    'web.archive.org': (2.0, 1),
+}
+
+
+class TokenBucket:
+    """
+    토큰 버킷
+    
+    - 초당 rate개 충전, 최대 capacity개 보관
+    - reserve()로 토큰을 먼저 예약하고 부족분만큼만 대기 (호출 순서대로 간격 배분)
+    - wait()는 스레드에서, acquire()는 이벤트 루프에서 사용
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        초기화
+        
+        Args:
+            rate: 초당 충전 토큰 수
+            capacity: 버킷 크기 (None이면 max(1, rate))
+            clock: 단조 시계 (테스트용)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """토큰 1개 예약, 사용 가능할 때까지 기다려야 하는 시간(초) 반환"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def wait(self) -> float:
+        """토큰 1개 획득 (부족하면 현재 스레드 대기), 대기 시간 반환"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+    
+    async def acquire(self) -> float:
+        """토큰 1개 획득 (부족하면 코루틴 대기), 대기 시간 반환"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class RateLimitRegistry:
+    """
+    호스트별 토큰 버킷 레지스트리
+    
+    - 같은 호스트를 호출하는 모든 수집기가 버킷 하나를 공유
+    - 등록되지 않은 호스트는 default_rate (None이면 제한 없음)
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, default_rate: Optional[float] = None):
+        """
+        초기화
+        
+        Args:
+            limits: {호스트: (초당 요청 수, 버킷 크기)} (None이면 DEFAULT_HOST_LIMITS)
+            default_rate: 미등록 호스트의 초당 요청 수 (None이면 제한 없음)
+        """
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._limits: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        for host, (rate, burst) in (DEFAULT_HOST_LIMITS if limits is None else limits).items():
+            self.register(host, rate, burst)
+    
+    @staticmethod
+    def host_of(url: str) -> str:
+        """URL → 호스트 이름 (포트 제외, 소문자)"""
+        return (urlparse(url).hostname or url).lower()
+    
+    def register(self, host: str, rate: float, burst: Optional[float] = None):
+        """호스트 한도 등록 / 변경 (대기 중인 예약은 이전 버킷 기준)"""
+        host = host.lower()
+        with self._lock:
+            self._limits[host] = (rate, burst)
+            self._buckets[host] = TokenBucket(rate, burst)
+    
+    def bucket_for(self, host: str) -> Optional[TokenBucket]:
+        """호스트 버킷 (제한 없음이면 None)"""
+        host = host.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None and self.default_rate:
+                bucket = self._buckets[host] = TokenBucket(self.default_rate)
+            return bucket
+    
+    def wait(self, url: str) -> float:
+        """URL 호스트의 토큰 1개 획득 (스레드 대기), 대기 시간 반환"""
+        bucket = self.bucket_for(self.host_of(url))
+        return bucket.wait() if bucket else 0.0
+    
+    async def acquire(self, url: str) -> float:
+        """URL 호스트의 토큰 1개 획득 (코루틴 대기), 대기 시간 반환"""
+        bucket = self.bucket_for(self.host_of(url))
+        return await bucket.acquire() if bucket else 0.0
+    
+    def get_limits(self) -> Dict[str, Tuple[float, float]]:
+        """등록된 호스트 한도"""
+        with self._lock:
+            return dict(self._limits)
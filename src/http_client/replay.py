@@ -0,0 +1,240 @@
+"""
+HTTP 응답 기록 / 재생 모듈
+(메서드, URL, 쿼리, 본문)을 정규화한 해시를 키로 원본 응답을 gzip 파일에 저장하고, 같은 요청은 디스크에서 재생
+- record: 항상 네트워크 요청, 응답 저장 (저장소 갱신)
+- cache: 엔드포인트별 TTL 안의 저장본이 있으면 재생, 없으면 요청 후 저장
+- replay: 저장본만 사용 (TTL 무시, 없으면 ReplayMiss) → 파싱 로직 변경 후 과거 데이터 재처리 / 오프라인 테스트
+"""
+
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+OFF = 'off'
+RECORD = 'record'
+CACHE = 'cache'
+REPLAY = 'replay'
+MODES = (OFF, RECORD, CACHE, REPLAY)
+
+# 환경 변수로 공용 클라이언트(get_client)의 모드 / 저장 위치 지정 (수집 스크립트 수정 없이 재생 실행)
+MODE_ENV = 'HTTP_REPLAY_MODE'
+DIR_ENV = 'HTTP_REPLAY_DIR'
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[2] / 'temp' / 'http_replay'
+
+DAY = 86400
+
+# 엔드포인트별 TTL (cache 모드, 'host/path' glob, 먼저 맞는 규칙 적용, None = 만료 없음)
+# - Wayback 스냅샷 / Binance Vision 아카이브: 불변
+# - 실시간 시세 / 티커: 1분
+# - 그 밖의 과거 구간 조회: 1일 (진행 중인 구간은 다음 날 다시 받음)
+DEFAULT_TTL_RULES: Tuple[Tuple[str, Optional[float]], ...] = (
+    ('web.archive.org/web/*', None),
+    ('data.binance.vision/*', None),
+    ('*/ticker*', 60),
+    ('*/premiumIndex*', 60),
+    ('*/simple/price*', 60),
+)
+
+# 키 / 저장 URL에서 빼는 인증 파라미터 (저장소에 비밀 값이 남지 않도록)
+SECRET_PARAMS = frozenset({'apikey', 'api_key', 'key', 'token', 'access_token', 'signature'})
+
+# 저장하지 않는 응답 헤더 (본문은 압축 해제된 상태로 저장)
+DROP_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie', 'connection'})
+
+
+def is_storable(response: requests.Response) -> bool:
+    """
+    저장할 응답인지 (기본 검사)
+    
+    - HTTP 오류(4xx / 5xx)는 저장하지 않음
+    - Etherscan / BscScan 계열은 호출 한도 초과 / 잘못된 키 등 오류도 HTTP 200 + {"status": "0"}으로 응답하므로 저장하지 않음
+    """
+    if response.status_code >= 400:
+        return False
+    if response.content.lstrip()[:1] != b'{':
+        return True
+    try:
+        payload = response.json()
+    except ValueError:
+        return True
+    return not (isinstance(payload, dict) and payload.get('status') == '0')
+
+
+class ReplayMiss(requests.ConnectionError):
+    """replay 모드에서 저장본이 없는 요청 (수집기의 연결 오류 처리 경로로 전달)"""
+
+
+def _param_items(params) -> Iterable[Tuple[str, str]]:
+    if not params:
+        return []
+    items = params.items() if isinstance(params, dict) else params
+    for name, value in items:
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                yield str(name), str(item)
+
+
+def canonical_url(url: str, params=None) -> str:
+    """쿼리를 정렬하고 인증 파라미터를 뺀 URL (fragment 제외)"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True) + list(_param_items(params))
+    query = sorted((name, value) for name, value in query if name.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+
+def _body_digest(data=None, json_body=None) -> str:
+    if json_body is not None:
+        return json.dumps(json_body, sort_keys=True, separators=(',', ':'), default=str)
+    if data is None:
+        return ''
+    if isinstance(data, (dict, list, tuple)):
+        return urlencode(sorted(_param_items(data)))
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def request_key(method: str, url: str, params=None, data=None, json_body=None) -> Tuple[str, str]:
+    """
+    요청 키
+    
+    Returns:
+        (sha256 해시, 정규화 URL)
+    """
+    normalized = canonical_url(url, params)
+    digest = hashlib.sha256(
+        f"{method.upper()} {normalized}\n{_body_digest(data, json_body)}".encode('utf-8')
+    ).hexdigest()
+    return digest, normalized
+
+
+class ResponseStore:
+    """
+    요청 키 → 응답 저장소
+    
+    - 파일 1개 = 응답 1건: <root>/<키 앞 2자리>/<키>.gz (첫 줄 메타 JSON + 원본 본문, gzip)
+    - 임시 파일에 쓰고 교체하므로 여러 스레드 / 프로세스가 함께 써도 반쯤 쓴 파일을 읽지 않음
+    - TTL은 읽을 때 규칙으로 계산 (규칙을 바꾸면 기존 저장본에도 바로 적용)
+    - validator를 통과한 응답만 저장 (API 오류 응답을 재생 / 캐시하지 않도록)
+    """
+    
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_STORE_DIR,
+        ttl_rules: Iterable[Tuple[str, Optional[float]]] = DEFAULT_TTL_RULES,
+        default_ttl: Optional[float] = DAY,
+        validator: Callable[[requests.Response], bool] = is_storable,
+        clock=time.time
+    ):
+        """
+        초기화
+        
+        Args:
+            root: 저장 디렉토리
+            ttl_rules: ('host/path' glob, TTL 초 또는 None) 목록
+            default_ttl: 규칙에 없는 엔드포인트 TTL (None이면 만료 없음)
+            validator: 저장 여부 검사 (False를 돌려준 응답은 저장하지 않음, 기본 is_storable)
+            clock: 시계 (테스트용)
+        """
+        self.root = Path(root)
+        self.ttl_rules = tuple(ttl_rules)
+        self.default_ttl = default_ttl
+        self.validator = validator
+        self._clock = clock
+    
+    def ttl_for(self, url: str) -> Optional[float]:
+        """URL에 적용되는 TTL (초, None = 만료 없음)"""
+        parts = urlsplit(url)
+        target = f"{parts.netloc.lower()}{parts.path}"
+        for pattern, ttl in self.ttl_rules:
+            if fnmatch.fnmatchcase(target, pattern):
+                return ttl
+        return self.default_ttl
+    
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.gz"
+    
+    def load(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        data=None,
+        json_body=None,
+        respect_ttl: bool = True
+    ) -> Optional[requests.Response]:
+        """저장된 응답 (없거나 TTL이 지났으면 None)"""
+        key, normalized = request_key(method, url, params, data, json_body)
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError, EOFError):
+            return None
+        
+        if respect_ttl:
+            ttl = self.ttl_for(normalized)
+            if ttl is not None and self._clock() - meta['stored_at'] > ttl:
+                return None
+        
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta.get('reason')
+        response.headers = CaseInsensitiveDict(meta.get('headers') or {})
+        response.encoding = meta.get('encoding')
+        response.url = meta.get('url', normalized)
+        response._content = body
+        return response
+    
+    def save(self, method: str, url: str, response: requests.Response, params=None, data=None, json_body=None) -> str:
+        """응답 저장, 저장 키 반환"""
+        key, normalized = request_key(method, url, params, data, json_body)
+        meta = {
+            'method': method.upper(),
+            'url': normalized,
+            'status': response.status_code,
+            'reason': response.reason,
+            'encoding': response.encoding,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROP_HEADERS
+            },
+            'stored_at': self._clock(),
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(response)}.tmp")
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n')
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        return key
+
+
+def store_from_env() -> Tuple[Optional[ResponseStore], str]:
+    """
+    환경 변수 설정 (HTTP_REPLAY_MODE / HTTP_REPLAY_DIR)
+    
+    Returns:
+        (저장소 또는 None, 모드)
+    
+    Raises:
+        ValueError: 알 수 없는 모드
+    """
+    mode = (os.getenv(MODE_ENV) or OFF).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"{MODE_ENV}={mode}: {', '.join(MODES)} 중 하나여야 합니다")
+    if mode == OFF:
+        return None, OFF
+    return ResponseStore(os.getenv(DIR_ENV) or DEFAULT_STORE_DIR), mode
@@ -0,0 +1,23 @@
+"""
+수집 파이프라인 DAG 스케줄러 패키지
+"""
+
+from .collection import RESOURCE_LIMITS, STAGES, build_collection_graph
+from .scheduler import (
+    STATE_SOURCE,
+    Job,
+    JobGraph,
+    Scheduler,
+    format_progress,
+)
+
+__all__ = [
+    'RESOURCE_LIMITS',
+    'STAGES',
+    'build_collection_graph',
+    'STATE_SOURCE',
+    'Job',
+    'JobGraph',
+    'Scheduler',
+    'format_progress',
+]
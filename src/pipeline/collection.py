@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인 DAG 선언
+수집 → 라벨링 → 집계 → 피처 생성 → 동기화 순서를 의존 관계로 고정
+- 가격 수집이 끝나야 amount_usd 계산, 라벨 전파가 끝나야 고래 집계
+- 각 작업은 기존 스크립트를 하위 프로세스로 실행 (스크립트별 import 시점 설정 / 전역 상태 격리)
+"""
+
+import sys
+from typing import Dict, List, Optional
+
+from src.pipeline.scheduler import Job, JobGraph
+
+COLLECT = 'collect'
+LABEL = 'label'
+AGGREGATE = 'aggregate'
+FEATURE = 'feature'
+SYNC = 'sync'
+
+STAGES = (COLLECT, LABEL, AGGREGATE, FEATURE, SYNC)
+
+# 자원별 동시 실행 한도
+# - explorer: 블록 탐색기 / BscScan (같은 API 키를 나눠 씀)
+# - binance: Binance API / Binance Vision
+# - supabase: 대량 RPC / 업서트 (DB 부하 분산)
+# - sqlite: data/project.db 쓰기 (단일 writer)
+# - browser: 웹 스크래핑 (BscScan / BitInfoCharts 페이지)
+RESOURCE_LIMITS: Dict[str, int] = {
+    'explorer': 2,
+    'binance': 1,
+    'supabase': 2,
+    'sqlite': 1,
+    'browser': 1,
+}
+
+HOUR = 3600
+
+# Supabase로 올릴 SQLite 테이블 → 생성 작업
+SYNC_TABLES = (
+    ('binance_futures_metrics', 'futures_metrics'),
+    ('binance_futures_weekly', 'futures_weekly'),
+    ('whale_daily_stats', 'whale_stats'),
+    ('whale_weekly_stats', 'whale_stats'),
+    ('binance_spot_weekly', 'technical_indicators'),
+)
+
+
+def build_collection_graph(python: Optional[str] = None, min_bnb: float = 1000) -> JobGraph:
+    """
+    수집 파이프라인 DAG
+    
+    Args:
+        python: 스크립트 실행 인터프리터 (기본: 현재 인터프리터)
+        min_bnb: BSC 상세 페이지 스크래핑 기준 금액 (BNB)
+    
+    Returns:
+        JobGraph (작업 명령은 저장소 루트 기준 상대 경로)
+    """
+    python = python or sys.executable
+    
+    def script(path: str, *args) -> List[str]:
+        return [python, path, *args]
+    
+    return JobGraph([
+        # 수집
+        Job(
+            'price_history', script('scripts/collectors/collect_price_history_hourly.py', '--resume'),
+            resources={'binance': 1, 'supabase': 1}, retries=2, timeout=6 * HOUR, stage=COLLECT,
+            description='price_history 1시간봉 (워터마크 재개)'
+        ),
+        Job(
+            'btc_whale', script('scripts/collectors/collect_btc_whale_transactions.py', '--resume'),
+            resources={'explorer': 1}, retries=2, timeout=6 * HOUR, stage=COLLECT,
+            description='BTC 고래 거래 (워터마크 재개)'
+        ),
+        Job(
+            'bsc_whale', script('scripts/collectors/bsc_hybrid_collector.py', '--min-bnb', str(min_bnb)),
+            resources={'explorer': 1, 'browser': 1}, retries=2, timeout=6 * HOUR, stage=COLLECT,
+            description='BSC 고래 거래 (고액만 상세 페이지 스크래핑)'
+        ),
+        Job(
+            'futures_metrics', script('scripts/subprojects/risk_ai/download_binance_vision_metrics.py'),
+            resources={'binance': 1, 'sqlite': 1}, retries=2, timeout=2 * HOUR, stage=COLLECT,
+            description='Binance Vision 선물 지표 → binance_futures_metrics'
+        ),
+        Job(
+            'weekly_ohlcv', script('scripts/subprojects/risk_ai/fetch_weekly_ohlcv.py'),
+            resources={'binance': 1, 'sqlite': 1}, retries=2, timeout=HOUR, stage=COLLECT,
+            description='현물 주봉 → binance_spot_weekly'
+        ),
+        
+        # 라벨링 (run_label_update_all.py 단계를 분리, 라벨 소스 3개는 수집과 동시에)
+        Job(
+            'known_labels', script('scripts/update_known_labels.py'),
+            resources={'supabase': 1}, retries=1, timeout=HOUR, stage=LABEL,
+            description='정적 거래소 주소 라벨'
+        ),
+        Job(
+            'bitinfocharts_labels', script('scripts/collectors/bitinfocharts_crawler.py'),
+            resources={'browser': 1}, retries=1, timeout=3 * HOUR, stage=LABEL,
+            description='BitInfoCharts 주소 라벨 (BTC/LTC 등)'
+        ),
+        Job(
+            'explorer_labels', script('scripts/update_real_whale_labels.py'),
+            resources={'browser': 1}, retries=1, timeout=3 * HOUR, stage=LABEL,
+            description='Etherscan/BscScan 주소 라벨'
+        ),
+        Job(
+            'label_propagation', script('scripts/update_labels_stable.py'),
+            deps=['btc_whale', 'bsc_whale', 'known_labels', 'bitinfocharts_labels', 'explorer_labels'],
+            resources={'supabase': 1}, retries=2, timeout=3 * HOUR, stage=LABEL,
+            description='whale_address 라벨 → whale_transactions 전파'
+        ),
+        Job(
+            'amount_usd', script('scripts/run_usd_update.py'),
+            deps=['price_history', 'btc_whale', 'bsc_whale'],
+            resources={'supabase': 1}, retries=2, timeout=3 * HOUR, stage=LABEL,
+            description='price_history 매칭 amount_usd 계산'
+        ),
+        Job(
+            'direction', script('scripts/post_process_rpc_runner.py'),
+            deps=['label_propagation', 'amount_usd'],
+            resources={'supabase': 1}, retries=2, timeout=3 * HOUR, stage=LABEL,
+            description='거래 방향(BUY/SELL) 재계산'
+        ),
+        
+        # 집계
+        Job(
+            'whale_stats', script('scripts/subprojects/risk_ai/aggregate_whale_stats.py'),
+            deps=['direction'],
+            resources={'supabase': 1, 'sqlite': 1}, retries=1, timeout=2 * HOUR, stage=AGGREGATE,
+            description='whale_daily_stats / whale_weekly_stats'
+        ),
+        Job(
+            'futures_weekly', script('scripts/subprojects/risk_ai/aggregate_futures_weekly.py'),
+            deps=['futures_metrics'],
+            resources={'sqlite': 1}, retries=1, timeout=HOUR, stage=AGGREGATE,
+            description='선물 지표 주간 집계'
+        ),
+        
+        # 피처 생성
+        Job(
+            'technical_indicators', script('scripts/subprojects/risk_ai/calculate_technical_indicators.py'),
+            deps=['weekly_ohlcv'],
+            resources={'sqlite': 1}, retries=1, timeout=HOUR, stage=FEATURE,
+            description='주봉 기술 지표 (ATR / RSI / Volume Profile)'
+        ),
+    ] + [
+        # 동기화 (테이블별, 생성 작업이 끝나는 대로)
+        Job(
+            f'sync_{table}', script('scripts/sync_sqlite_to_supabase.py', '--table', table),
+            deps=[producer],
+            resources={'supabase': 1}, retries=2, timeout=2 * HOUR, stage=SYNC,
+            description=f'{table} SQLite → Supabase'
+        )
+        for table, producer in SYNC_TABLES
+    ])
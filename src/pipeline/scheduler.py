@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+작업 DAG 스케줄러
+선언된 의존 관계 순서로 작업을 실행하고, 서로 의존하지 않는 작업은 워커 풀에서 동시에 실행
+- 작업별 자원 한도(resources) / 재시도 / 타임아웃
+- 성공한 작업은 ingestion_state(source='pipeline', entity=작업, stream=run_id)에 기록 → 같은 run_id로 재실행하면 실패 지점부터 재개
+- 상태 전이마다 상태 스냅샷(JSON)을 기록 → 모니터링은 로그 대신 스냅샷을 읽음
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from src.collectors.ingestion_state import IngestionState
+
+STATE_SOURCE = 'pipeline'
+
+PENDING = 'pending'
+RUNNING = 'running'
+RETRY_WAIT = 'retry_wait'
+DONE = 'done'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+BLOCKED = 'blocked'
+CANCELLED = 'cancelled'
+
+# 더 이상 상태가 바뀌지 않는 상태 / 후속 작업을 풀어주는 상태
+FINISHED = (DONE, SKIPPED, FAILED, BLOCKED, CANCELLED)
+SATISFIED = (DONE, SKIPPED)
+
+STATUS_ICONS = {
+    PENDING: '⏳',
+    RUNNING: '🟢',
+    RETRY_WAIT: '🔁',
+    DONE: '✅',
+    SKIPPED: '⏭️',
+    FAILED: '❌',
+    BLOCKED: '⛔',
+    CANCELLED: '⚠️',
+}
+
+# 진행 표시에 읽을 로그 끝부분 크기 (바이트)
+LOG_TAIL_BYTES = 4096
+
+
+class Job:
+    """
+    DAG 작업 1개
+    
+    - command(하위 프로세스 명령) 또는 func(호출 가능 객체) 중 하나
+    - resources: {자원 이름: 사용량} (스케줄러의 자원 한도 안에서만 동시 실행)
+    - retries: 실패 시 추가 시도 횟수 (대기 시간은 retry_delay × 시도 횟수)
+    - timeout: 1회 시도 제한 시간(초), 초과하면 프로세스 종료 후 실패 처리
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        command: Optional[Sequence[str]] = None,
+        func: Optional[Callable[[], None]] = None,
+        deps: Iterable[str] = (),
+        resources: Optional[Dict[str, int]] = None,
+        retries: int = 0,
+        retry_delay: float = 30.0,
+        timeout: Optional[float] = None,
+        stage: str = '',
+        description: str = ''
+    ):
+        if (command is None) == (func is None):
+            raise ValueError(f"{name}: command와 func 중 하나만 지정해야 합니다")
+        self.name = name
+        self.command = list(command) if command is not None else None
+        self.func = func
+        self.deps = tuple(deps)
+        self.resources = dict(resources or {})
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.stage = stage
+        self.description = description
+    
+    def __repr__(self):
+        return f"Job({self.name!r}, deps={list(self.deps)})"
+
+
+class JobGraph:
+    """작업 DAG (선언 순서 유지)"""
+    
+    def __init__(self, jobs: Iterable[Job] = ()):
+        self.jobs: Dict[str, Job] = {}
+        for job in jobs:
+            self.add(job)
+    
+    def add(self, job: Job) -> Job:
+        if job.name in self.jobs:
+            raise ValueError(f"중복 작업: {job.name}")
+        self.jobs[job.name] = job
+        return job
+    
+    def order(self) -> List[str]:
+        """
+        위상 정렬 (같은 단계에서는 선언 순서)
+        
+        Raises:
+            ValueError: 없는 작업에 의존하거나 순환이 있을 때
+        """
+        for job in self.jobs.values():
+            missing = [dep for dep in job.deps if dep not in self.jobs]
+            if missing:
+                raise ValueError(f"{job.name}: 알 수 없는 의존 작업 {missing}")
+        
+        remaining = {name: set(job.deps) for name, job in self.jobs.items()}
+        ordered: List[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"순환 의존: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                ordered.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return ordered
+    
+    def subgraph(self, names: Iterable[str]) -> 'JobGraph':
+        """지정한 작업 + 선행 작업 전체만 남긴 그래프"""
+        keep = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self.jobs:
+                raise ValueError(f"알 수 없는 작업: {name}")
+            if name not in keep:
+                keep.add(name)
+                stack.extend(self.jobs[name].deps)
+        return JobGraph(job for name, job in self.jobs.items() if name in keep)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _tail_line(path: Optional[str]) -> Optional[str]:
+    """로그 파일의 마지막 비어 있지 않은 줄 (진행률 표시줄의 \\r 갱신 포함)"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(path) - LOG_TAIL_BYTES))
+            text = f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return None
+    lines = [line.strip() for line in text.replace('\r', '\n').split('\n') if line.strip()]
+    return lines[-1][:200] if lines else None
+
+
+class Scheduler:
+    """
+    DAG 실행기
+    
+    - 선행 작업이 모두 성공(또는 이전 실행에서 성공)한 작업을 워커 풀 / 자원 한도 안에서 시작
+    - 실패한 작업의 후속 작업은 blocked, 나머지 독립 작업은 계속 실행
+    - snapshot(): 작업별 상태 / 시도 횟수 / 경과 시간 / 실행 중 작업의 마지막 로그 줄
+    """
+    
+    def __init__(
+        self,
+        graph: JobGraph,
+        max_workers: int = 4,
+        resource_limits: Optional[Dict[str, int]] = None,
+        state: Optional[IngestionState] = None,
+        run_id: Optional[str] = None,
+        cwd: Union[str, Path, None] = None,
+        log_dir: Union[str, Path, None] = None,
+        status_path: Union[str, Path, None] = None,
+        progress_interval: float = 30.0,
+        on_change: Optional[Callable[[str, Dict], None]] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            graph: 작업 DAG
+            max_workers: 동시 실행 작업 수
+            resource_limits: {자원 이름: 동시 사용 한도} (없는 자원은 무제한)
+            state: 작업 완료 기록 저장소 (None이면 재개 없음)
+            run_id: 실행 ID (같은 ID로 재실행하면 성공한 작업을 건너뜀, 기본: 오늘 날짜 UTC)
+            cwd: 명령 작업 디렉토리
+            log_dir: 명령 작업 로그 디렉토리 (None이면 출력을 버림)
+            status_path: 상태 스냅샷 JSON 경로
+            progress_interval: on_progress 호출 / 스냅샷 갱신 주기(초)
+            on_change: 상태 전이 콜백 (작업 이름, 작업 상태)
+            on_progress: 주기적 진행 콜백 (스냅샷)
+        """
+        self.graph = graph
+        self.order = graph.order()
+        self.max_workers = max_workers
+        self.resource_limits = dict(resource_limits or {})
+        self.state = state
+        self.run_id = run_id or datetime.now(timezone.utc).date().isoformat()
+        self.cwd = str(cwd) if cwd else None
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.status_path = Path(status_path) if status_path else None
+        self.progress_interval = progress_interval
+        self.on_change = on_change
+        self.on_progress = on_progress
+        
+        for job in graph.jobs.values():
+            for resource, amount in job.resources.items():
+                limit = self.resource_limits.get(resource)
+                if limit is not None and amount > limit:
+                    raise ValueError(f"{job.name}: 자원 {resource} 사용량 {amount} > 한도 {limit}")
+        
+        self._jobs: Dict[str, Dict] = {
+            name: {
+                'name': name,
+                'stage': graph.jobs[name].stage,
+                'description': graph.jobs[name].description,
+                'deps': list(graph.jobs[name].deps),
+                'status': PENDING,
+                'attempts': 0,
+                'started_at': None,
+                'finished_at': None,
+                'elapsed': 0.0,
+                'error': None,
+                'log': None,
+                'not_before': 0.0,
+                '_started': None,
+            }
+            for name in self.order
+        }
+        self._in_use: Dict[str, int] = {}
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._procs_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._started = None
+        self._started_at = None
+    
+    def _set(self, name: str, status: str, **fields):
+        entry = self._jobs[name]
+        entry['status'] = status
+        entry.update(fields)
+        self.write_status()
+        if self.on_change:
+            self.on_change(name, self._public(entry))
+    
+    def _load_completed(self):
+        """같은 run_id에서 이미 성공한 작업은 skipped"""
+        if self.state is None:
+            return
+        for name in self.order:
+            row = self.state.get(STATE_SOURCE, name, self.run_id)
+            if row and row.get('cursor') == DONE:
+                self._set(name, SKIPPED, finished_at=row.get('last_timestamp'))
+    
+    def _block_failed_descendants(self):
+        for name in self.order:
+            entry = self._jobs[name]
+            if entry['status'] != PENDING:
+                continue
+            failed = [dep for dep in entry['deps'] if self._jobs[dep]['status'] in (FAILED, BLOCKED, CANCELLED)]
+            if failed:
+                self._set(name, BLOCKED, error=f"선행 작업 실패: {', '.join(failed)}")
+    
+    def _fits(self, job: Job) -> bool:
+        return all(
+            self._in_use.get(resource, 0) + amount <= self.resource_limits[resource]
+            for resource, amount in job.resources.items()
+            if resource in self.resource_limits
+        )
+    
+    def _ready(self, now: float) -> List[str]:
+        ready = []
+        for name in self.order:
+            entry = self._jobs[name]
+            if entry['status'] not in (PENDING, RETRY_WAIT) or entry['not_before'] > now:
+                continue
+            if all(self._jobs[dep]['status'] in SATISFIED for dep in entry['deps']):
+                ready.append(name)
+        return ready
+    
+    def _log_path(self, name: str) -> Optional[Path]:
+        if self.log_dir is None:
+            return None
+        return self.log_dir / f"{self.run_id}_{name}.log"
+    
+    def _execute(self, job: Job, attempt: int, log_path: Optional[Path]):
+        """작업 1회 시도 (워커 스레드), 실패하면 예외"""
+        if job.func is not None:
+            job.func()
+            return
+        
+        if log_path is not None:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            output = open(log_path, 'a', encoding='utf-8')
+            output.write(f"\n# {_now()} {job.name} 시도 {attempt}: {' '.join(job.command)}\n")
+            output.flush()
+        else:
+            output = open(os.devnull, 'w')
+        
+        try:
+            with self._procs_lock:
+                if self._cancelled.is_set():
+                    raise RuntimeError("취소됨")
+                proc = subprocess.Popen(job.command, cwd=self.cwd, stdout=output, stderr=subprocess.STDOUT)
+                self._procs[job.name] = proc
+            try:
+                code = proc.wait(timeout=job.timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise TimeoutError(f"제한 시간 {job.timeout:.0f}초 초과")
+            finally:
+                with self._procs_lock:
+                    self._procs.pop(job.name, None)
+            if code != 0:
+                raise RuntimeError(f"종료 코드 {code}")
+        finally:
+            output.close()
+    
+    def _submit(self, pool: ThreadPoolExecutor, name: str):
+        job = self.graph.jobs[name]
+        for resource, amount in job.resources.items():
+            self._in_use[resource] = self._in_use.get(resource, 0) + amount
+        
+        entry = self._jobs[name]
+        attempt = entry['attempts'] + 1
+        log_path = self._log_path(name)
+        entry['_started'] = time.monotonic()
+        self._set(
+            name, RUNNING,
+            attempts=attempt,
+            started_at=_now(),
+            finished_at=None,
+            log=str(log_path) if log_path else None
+        )
+        return pool.submit(self._execute, job, attempt, log_path)
+    
+    def _finish(self, name: str, error: Optional[BaseException]):
+        job = self.graph.jobs[name]
+        for resource, amount in job.resources.items():
+            self._in_use[resource] -= amount
+        
+        entry = self._jobs[name]
+        elapsed = entry['elapsed'] + (time.monotonic() - entry['_started'])
+        if error is None:
+            finished_at = _now()
+            if self.state is not None:
+                self.state.advance(STATE_SOURCE, name, self.run_id, last_timestamp=finished_at, cursor=DONE)
+            self._set(name, DONE, elapsed=elapsed, finished_at=finished_at, error=None)
+        elif self._cancelled.is_set():
+            self._set(name, CANCELLED, elapsed=elapsed, finished_at=_now(), error=str(error))
+        elif entry['attempts'] <= job.retries:
+            self._set(
+                name, RETRY_WAIT,
+                elapsed=elapsed,
+                error=str(error) or type(error).__name__,
+                not_before=time.monotonic() + job.retry_delay * entry['attempts']
+            )
+        else:
+            self._set(name, FAILED, elapsed=elapsed, finished_at=_now(), error=str(error) or type(error).__name__)
+    
+    def _next_wake(self, now: float) -> float:
+        """다음 재시도 시각까지 남은 시간 (진행 주기 이하)"""
+        waits = [
+            entry['not_before'] - now
+            for entry in self._jobs.values()
+            if entry['status'] == RETRY_WAIT
+        ]
+        return max(0.05, min([self.progress_interval] + waits))
+    
+    def run(self) -> Dict:
+        """
+        DAG 실행 (모든 작업이 끝날 때까지 블록)
+        
+        Returns:
+            최종 스냅샷 (snapshot()과 같은 형식)
+        """
+        self._started = time.monotonic()
+        self._started_at = _now()
+        self._load_completed()
+        last_progress = time.monotonic()
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline')
+        futures: Dict = {}
+        try:
+            while not self._cancelled.is_set():
+                self._block_failed_descendants()
+                now = time.monotonic()
+                for name in self._ready(now):
+                    if len(futures) >= self.max_workers:
+                        break
+                    if self._fits(self.graph.jobs[name]):
+                        futures[self._submit(pool, name)] = name
+                
+                if not futures and all(entry['status'] in FINISHED for entry in self._jobs.values()):
+                    break
+                
+                if futures:
+                    done, _ = wait(futures, timeout=self._next_wake(now), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._finish(futures.pop(future), future.exception())
+                else:
+                    self._cancelled.wait(self._next_wake(now))
+                
+                if time.monotonic() - last_progress >= self.progress_interval:
+                    last_progress = time.monotonic()
+                    snapshot = self.write_status()
+                    if self.on_progress:
+                        self.on_progress(snapshot)
+        except KeyboardInterrupt:
+            self.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            for future, name in futures.items():
+                self._finish(name, future.exception())
+            for name, entry in self._jobs.items():
+                if entry['status'] in (PENDING, RETRY_WAIT) and self._cancelled.is_set():
+                    self._set(name, CANCELLED)
+            self.write_status()
+        
+        return self.snapshot()
+    
+    def cancel(self):
+        """새 작업 시작 중단 + 실행 중인 하위 프로세스 종료 (취소된 작업은 다음 실행에서 다시 실행)"""
+        self._cancelled.set()
+        with self._procs_lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        deadline = time.monotonic() + 10
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0.1, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    
+    @staticmethod
+    def _public(entry: Dict) -> Dict:
+        return {key: value for key, value in entry.items() if not key.startswith('_') and key != 'not_before'}
+    
+    def snapshot(self) -> Dict:
+        """
+        현재 상태
+        
+        Returns:
+            {'run_id', 'started_at', 'updated_at', 'elapsed', 'counts': {상태: 개수},
+             'jobs': [{'name', 'stage', 'status', 'attempts', 'elapsed', 'error', 'log', 'last_line', ...}]}
+        """
+        now = time.monotonic()
+        jobs = []
+        counts: Dict[str, int] = {}
+        for name in self.order:
+            entry = self._jobs[name]
+            public = self._public(entry)
+            if entry['status'] == RUNNING and entry['_started'] is not None:
+                public['elapsed'] = entry['elapsed'] + (now - entry['_started'])
+                public['last_line'] = _tail_line(entry['log'])
+            jobs.append(public)
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return {
+            'run_id': self.run_id,
+            'started_at': self._started_at,
+            'updated_at': _now(),
+            'elapsed': now - self._started if self._started is not None else 0.0,
+            'counts': counts,
+            'jobs': jobs,
+        }
+    
+    def write_status(self) -> Dict:
+        """스냅샷을 status_path에 원자적으로 기록"""
+        snapshot = self.snapshot()
+        if self.status_path is not None:
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.status_path.with_suffix(self.status_path.suffix + '.tmp')
+            tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.status_path)
+        return snapshot
+
+
+def format_progress(snapshot: Dict) -> str:
+    """스냅샷 → 작업별 한 줄 진행 현황"""
+    elapsed = int(snapshot.get('elapsed') or 0)
+    counts = ", ".join(f"{status} {count}" for status, count in sorted(snapshot.get('counts', {}).items()))
+    lines = [f"⏱️  run {snapshot.get('run_id')} | 경과 {elapsed // 60}분 {elapsed % 60}초 | {counts}"]
+    for job in snapshot.get('jobs', []):
+        icon = STATUS_ICONS.get(job['status'], '•')
+        line = f"  {icon} [{job.get('stage') or '-'}] {job['name']:<22} {job['status']:<10}"
+        if job.get('attempts'):
+            line += f" 시도 {job['attempts']}, {job.get('elapsed', 0) / 60:.1f}분"
+        if job.get('error') and job['status'] != DONE:
+            line += f" - {job['error']}"
+        lines.append(line)
+        if job.get('last_line'):
+            lines.append(f"      └ {job['last_line']}")
+    return "\n".join(lines)
@@ -0,0 +1,49 @@
+"""
+차익거래 백테스트 테스트용 합성 가격 데이터
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_exchange_prices(n_bars=400, freq="D", seed=7, start="2024-01-01"):
+    """4개 거래소 가격 합성 (평균회귀하는 거래소별 프리미엄 포함)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_bars, freq=freq)
+    krw_usd = 1300 + np.cumsum(rng.normal(0, 1.0, n_bars))
+    usdt_price = 40_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+
+    def premium_path(scale):
+        # AR(1) + 간헐적 급등락 → Z-Score 진입/청산이 충분히 발생
+        p = np.zeros(n_bars)
+        shocks = rng.normal(0, scale, n_bars)
+        jumps = rng.random(n_bars) < 0.03
+        shocks[jumps] += rng.choice([-1, 1], jumps.sum()) * scale * 6
+        for i in range(1, n_bars):
+            p[i] = 0.8 * p[i - 1] + shocks[i]
+        return p
+
+    df = pd.DataFrame({
+        "date": dates,
+        "binance_price": usdt_price * (1 + premium_path(0.001)),
+        "bitget_price": usdt_price * (1 + premium_path(0.001)),
+        "bybit_price": usdt_price * (1 + premium_path(0.001)),
+        "krw_usd": krw_usd,
+    })
+    df["upbit_price"] = usdt_price * krw_usd * (1.02 + premium_path(0.004))
+    for exchange in ("binance", "bitget", "bybit"):
+        df[f"{exchange}_krw"] = df[f"{exchange}_price"] * df["krw_usd"]
+    return df
+
+
+def split_chunks(df, sizes):
+    """DataFrame을 주어진 크기 목록 순서대로 반복 분할"""
+    chunks = []
+    start = 0
+    i = 0
+    while start < len(df):
+        size = sizes[i % len(sizes)]
+        chunks.append(df.iloc[start:start + size].copy())
+        start += size
+        i += 1
+    return chunks
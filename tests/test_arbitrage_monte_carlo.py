@@ -0,0 +1,118 @@
+"""
+Monte Carlo 부트스트랩 테스트
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "subprojects" / "arbitrage"))
+
+import monte_carlo
+from monte_carlo import (
+    MonteCarloBootstrap,
+    block_bootstrap_returns,
+    bootstrap_trades,
+    confidence_intervals,
+)
+
+
+def _sample_trades(n=60, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'return': rng.normal(0.004, 0.02, n)})
+
+
+def _sample_capital(n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    capital = 100_000_000 * np.cumprod(1 + rng.normal(0.0005, 0.01, n))
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=n), 'capital': capital})
+
+
+class TestMonteCarloBootstrap(unittest.TestCase):
+    def test_seed_reproducible(self):
+        trades, capital = _sample_trades(), _sample_capital()
+        a = MonteCarloBootstrap(n_sims=2000, seed=11).run(trades, capital)
+        b = MonteCarloBootstrap(n_sims=2000, seed=11).run(trades, capital)
+        c = MonteCarloBootstrap(n_sims=2000, seed=12).run(trades, capital)
+
+        pd.testing.assert_frame_equal(a['trades'], b['trades'])
+        pd.testing.assert_frame_equal(a['daily'], b['daily'])
+        self.assertFalse(a['daily'].equals(c['daily']))
+
+    def test_trade_bootstrap_paths(self):
+        returns = _sample_trades()['return'].to_numpy()
+        samples = bootstrap_trades(returns, n_sims=500, rng=np.random.default_rng(0))
+
+        for values in samples.values():
+            self.assertEqual(values.shape, (500,))
+        self.assertTrue((samples['mdd'] <= 0).all())
+        # 부트스트랩 경로의 최종 수익률 = 리샘플된 거래 수익률의 복리 → 평균은 실제 복리 근처
+        observed = np.prod(1 + returns) - 1
+        self.assertAlmostEqual(np.median(samples['final_return']), observed, delta=0.15)
+
+    def test_constant_returns_degenerate(self):
+        # 모든 수익률이 같으면 리샘플 결과도 동일 (표준편차 0 → Sharpe 0)
+        samples = block_bootstrap_returns(np.full(50, 0.01), n_sims=100, block_size=4, rng=np.random.default_rng(1))
+        np.testing.assert_allclose(samples['final_return'], 1.01 ** 50 - 1)
+        np.testing.assert_allclose(samples['mdd'], 0.0)
+        np.testing.assert_allclose(samples['sharpe_ratio'], 0.0)
+
+    def test_interval_ordering(self):
+        result = MonteCarloBootstrap(n_sims=3000, confidence=0.9, seed=2).run(
+            _sample_trades(), _sample_capital(), {'final_return': 0.1, 'mdd': -0.05, 'sharpe_ratio': 1.0}
+        )
+        for table in (result['trades'], result['daily']):
+            self.assertTrue((table['lower'] <= table['median']).all())
+            self.assertTrue((table['median'] <= table['upper']).all())
+        self.assertEqual(result['daily'].loc['sharpe_ratio', 'observed'], 1.0)
+        # 거래 기준 Sharpe는 일별 Sharpe와 정의가 달라 비교하지 않음
+        self.assertTrue(np.isnan(result['trades'].loc['sharpe_ratio', 'observed']))
+        self.assertTrue(0.0 <= result['prob_loss'] <= 1.0)
+
+        table = confidence_intervals({'x': np.arange(101, dtype=float)}, confidence=0.9)
+        self.assertAlmostEqual(table.loc['x', 'lower'], 5.0)
+        self.assertAlmostEqual(table.loc['x', 'upper'], 95.0)
+
+    def test_empty_inputs(self):
+        result = MonteCarloBootstrap(n_sims=100, seed=0).run(pd.DataFrame(columns=['return']), None)
+        self.assertIsNone(result['trades'])
+        self.assertIsNone(result['daily'])
+        self.assertIsNone(result['prob_loss'])
+
+    def test_seeded_runs_reuse_cache(self):
+        trades, capital = _sample_trades(), _sample_capital()
+        fresh = MonteCarloBootstrap(n_sims=500, seed=21).run(trades, capital)
+        with mock.patch.object(MonteCarloBootstrap, '_simulate') as simulate:
+            cached = MonteCarloBootstrap(n_sims=500, seed=21).run(trades, capital)
+        simulate.assert_not_called()
+        pd.testing.assert_frame_equal(fresh['trades'], cached['trades'])
+        pd.testing.assert_frame_equal(fresh['daily'], cached['daily'])
+
+        # 반환값을 수정해도 캐시에는 영향 없음
+        cached['daily'].loc['mdd', 'median'] = 0.0
+        again = MonteCarloBootstrap(n_sims=500, seed=21).run(trades, capital)
+        pd.testing.assert_frame_equal(fresh['daily'], again['daily'])
+
+        # 입력 / 설정이 다르거나 시드가 없으면 다시 시뮬레이션
+        with mock.patch.object(monte_carlo, 'bootstrap_trades', wraps=bootstrap_trades) as sampler:
+            MonteCarloBootstrap(n_sims=501, seed=21).run(trades, capital)
+            MonteCarloBootstrap(n_sims=500, seed=21).run(_sample_trades(seed=4), capital)
+            MonteCarloBootstrap(n_sims=500).run(trades, capital)
+            MonteCarloBootstrap(n_sims=500).run(trades, capital)
+        self.assertEqual(sampler.call_count, 4)
+
+    def test_ten_thousand_sims_under_one_second(self):
+        trades = _sample_trades(n=100)
+        start = time.perf_counter()
+        MonteCarloBootstrap(n_sims=10_000, seed=0).run(trades)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+포트폴리오 모드 차익거래 백테스트 단위 테스트
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "subprojects" / "arbitrage"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from backtest_core import MaxHoldingExit
+from backtest_portfolio import PortfolioArbitrageBacktest
+from backtest_streaming import StreamingArbitrageBacktest
+from arbitrage_sample_data import make_exchange_prices
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    """쌍별 독립 포지션 / 자본 배분 테스트"""
+
+    def setUp(self):
+        self.df = make_exchange_prices(n_bars=600)
+
+    def _run(self, **kwargs):
+        backtest = PortfolioArbitrageBacktest(entry_z=2.0, exit_z=0.5, **kwargs)
+        trades, equity = backtest.run_backtest(backtest.calculate_indicators(self.df))
+        return backtest, trades, equity
+
+    def test_single_pair_matches_single_position_engine(self):
+        """쌍 1개 + 균등 배분은 기존 단일 포지션 엔진과 동일"""
+        for pair in ('upbit_bitget', 'binance_bybit'):
+            _, trades, equity = self._run(pairs=[pair])
+            single = StreamingArbitrageBacktest(entry_z=2.0, exit_z=0.5, pairs=[pair])
+            expected, _ = single.run([self.df])
+
+            self.assertEqual(len(trades), len(expected))
+            np.testing.assert_allclose(trades['return'], expected['return'])
+            np.testing.assert_allclose(trades['profit'], expected['profit'])
+            self.assertAlmostEqual(equity['capital'].iloc[-1], expected['capital'].iloc[-1], places=2)
+
+    def test_concurrent_positions_and_attribution(self):
+        """여러 쌍 동시 보유, 쌍별 손익 합 = 총 손익"""
+        for allocator in ('equal', 'zscore', 'capped'):
+            backtest, trades, equity = self._run(allocator=allocator)
+            self.assertGreater(equity['open_positions'].max(), 1)
+            self.assertTrue((equity['cash'] >= -1e-6).all())
+
+            attribution = backtest.pair_attribution(trades, equity)
+            self.assertEqual(attribution['total_trades'].sum(), len(trades))
+            self.assertAlmostEqual(
+                attribution['total_profit'].sum(),
+                equity['capital'].iloc[-1] - backtest.initial_capital,
+                places=2
+            )
+
+    def test_mark_to_market(self):
+        """보유 중 미실현 손익이 자본 곡선에 반영"""
+        _, _, equity = self._run()
+        unrealized = equity['capital'] - equity['cash'] - equity['invested']
+        flat = equity['open_positions'] == 0
+        np.testing.assert_allclose(unrealized[flat], 0.0, atol=1e-6)
+        self.assertGreater(unrealized[~flat].abs().max(), 0)
+
+    def test_capped_allocation_limit(self):
+        """capped: 진입 시 쌍별 배분 ≤ 총자본 × max_pair_weight"""
+        backtest, trades, equity = self._run(allocator='capped', max_pair_weight=0.3)
+        self.assertFalse(trades.empty)
+        # 진입은 현금 → 투자금 이동이라 진입 봉 자본 = 배분 시 사용한 시가평가 자본
+        entry_equity = equity.set_index('date')['capital'].reindex(trades['entry_date']).to_numpy()
+        cap = entry_equity * 0.3
+        allocation = trades['allocation'].to_numpy()
+        self.assertTrue((allocation <= cap + 1e-6).all())
+        self.assertTrue(np.isclose(allocation, cap).any())
+
+    def test_shared_exit_rules(self):
+        """청산 규칙은 backtest_core 컴포넌트: 교체하면 쌍별 청산에 그대로 적용"""
+        backtest = PortfolioArbitrageBacktest(entry_z=2.0, exit_z=0.5)
+        backtest.exits = [MaxHoldingExit(3)]
+        trades, _ = backtest.run_backtest(backtest.calculate_indicators(self.df))
+        self.assertFalse(trades.empty)
+        self.assertEqual(set(trades['exit_reason']), {'max_holding_days'})
+        self.assertTrue((trades['holding_days'] == 3).all())
+
+    def test_invalid_allocator(self):
+        with self.assertRaises(ValueError):
+            PortfolioArbitrageBacktest(allocator='kelly')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+스트리밍 차익거래 백테스트 엔진 단위 테스트
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "subprojects" / "arbitrage"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from backtest_streaming import StreamingArbitrageBacktest, periods_per_year
+from arbitrage_sample_data import make_exchange_prices, split_chunks
+
+
+class TestStreamingBacktest(unittest.TestCase):
+    """청크 경계 상태 유지 테스트"""
+
+    def setUp(self):
+        self.df = make_exchange_prices(n_bars=500)
+
+    def _run(self, chunks, **kwargs):
+        backtest = StreamingArbitrageBacktest(entry_z=2.0, exit_z=0.5, **kwargs)
+        trades, equity = backtest.run(chunks)
+        return backtest, trades, equity
+
+    def test_chunked_equals_single_pass(self):
+        """청크 분할 여부와 무관하게 동일한 거래 / 자본 곡선"""
+        _, trades_full, equity_full = self._run([self.df])
+        self.assertGreater(len(trades_full), 3)
+
+        for sizes in ([3], [7, 13], [45], [29, 31, 1]):
+            _, trades, equity = self._run(split_chunks(self.df, sizes))
+            pd.testing.assert_frame_equal(trades, trades_full)
+            self.assertEqual(len(equity), len(equity_full))
+            np.testing.assert_allclose(equity['capital'], equity_full['capital'])
+
+    def test_warmup_spans_chunks(self):
+        """rolling_window 워밍업이 작은 청크 여러 개에 걸쳐 적용"""
+        backtest = StreamingArbitrageBacktest(rolling_window=30)
+        _, equity = backtest.run(split_chunks(self.df, [10]))
+        self.assertEqual(len(equity), len(self.df) - 30)
+        self.assertEqual(equity['date'].iloc[0], self.df['date'].iloc[30])
+
+    def test_position_carried_across_chunks(self):
+        """청크 경계에서 열린 포지션이 다음 청크에서 청산"""
+        _, trades_full, _ = self._run([self.df])
+        crossing = None
+        for _, trade in trades_full.iterrows():
+            entry_idx = self.df.index[self.df['date'] == trade['entry_date']][0]
+            exit_idx = self.df.index[self.df['date'] == trade['exit_date']][0]
+            if exit_idx > entry_idx + 1:
+                crossing = entry_idx + 1
+                break
+        self.assertIsNotNone(crossing)
+
+        chunks = [self.df.iloc[:crossing], self.df.iloc[crossing:]]
+        _, trades, _ = self._run(chunks)
+        pd.testing.assert_frame_equal(trades, trades_full)
+
+    def test_hourly_bars(self):
+        """시간봉: 보유 기간 제한은 달력 시간 기준, Sharpe 연율화는 봉 주기 기준"""
+        hourly = make_exchange_prices(n_bars=24 * 40, freq="h")
+        backtest, trades, equity = self._run(
+            split_chunks(hourly, [24 * 7]), max_holding_days=1, bar_interval="1h"
+        )
+        self.assertFalse(trades.empty)
+        held = trades['exit_date'] - trades['entry_date']
+        self.assertTrue((held <= pd.Timedelta(days=1)).all())
+        self.assertTrue((trades['holding_bars'] <= 24).all())
+        self.assertAlmostEqual(periods_per_year("1h"), 365.25 * 24)
+
+        metrics = backtest.analyze_performance(trades, equity, backtest.calculate_benchmark())
+        self.assertEqual(metrics['total_trades'], len(trades))
+
+    def test_pair_subset(self):
+        """일부 거래소만 있는 데이터 (시간봉 업비트-바이낸스)"""
+        df = self.df[['date', 'upbit_price', 'binance_price', 'binance_krw', 'krw_usd']]
+        _, trades, equity = self._run([df], pairs=['upbit_binance'])
+        self.assertEqual(len(equity), len(df) - 30)
+        if not trades.empty:
+            self.assertEqual(set(trades['pair']), {'upbit_binance'})
+
+
+if __name__ == '__main__':
+    unittest.main()
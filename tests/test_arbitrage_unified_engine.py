@@ -0,0 +1,140 @@
+"""
+통합 백테스트 엔진 테스트
+- 골든 데이터: tests/fixtures/arbitrage_golden/ (통합 전 backtest_engine* 4종으로 생성한 거래 내역 / 자본 곡선)
+- 각 프리셋과 기존 엔진 클래스가 골든 결과를 그대로 재현하는지 확인
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "subprojects" / "arbitrage"))
+
+from backtest_core import RoundTripCost, StopLossExit, ZScoreExit, legacy_trades, make_backtest
+from backtest_engine import ArbitrageBacktest
+from backtest_engine_3exchanges import ArbitrageBacktest3Exchanges
+from backtest_engine_improved import ImprovedArbitrageBacktest
+from backtest_engine_optimized import OptimizedArbitrageBacktest
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "fixtures" / "arbitrage_golden"
+
+# (골든 파일명, 프리셋, 프리셋 덮어쓰기)
+GOLDEN_CASES = [
+    ("v1", "v1", {}),
+    ("3exchanges", "3exchanges", {}),
+    ("improved", "improved", {}),
+    ("improved_tight", "improved", {"stop_loss": -0.002, "max_holding_days": 5, "rolling_window": 20}),
+    ("optimized", "optimized", {}),
+    ("optimized_exclude", "optimized", {"exit_z": 0.5, "exclude_pairs": ("upbit_binance",), "max_holding_days": 10}),
+]
+
+
+def _read(name, dates):
+    return pd.read_csv(GOLDEN_DIR / name, float_precision="round_trip", parse_dates=dates)
+
+
+def _golden_trades(name):
+    return _read(f"{name}_trades.csv", ["entry_date", "exit_date"])
+
+
+def _golden_capital(name):
+    path = GOLDEN_DIR / f"{name}_capital.csv"
+    return _read(path.name, ["date"]) if path.exists() else None
+
+
+def _run(engine, raw, **signal_kwargs):
+    df = engine.calculate_indicators(engine.prepare(raw))
+    df = engine.generate_signals(df, **signal_kwargs)
+    return engine.run_backtest(df)
+
+
+class TestUnifiedEngineGolden(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.raw = _read("prices.csv", ["date"])
+
+    def assertFrameExact(self, actual, expected):
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True), expected, check_exact=True, check_dtype=False
+        )
+
+    def test_presets_reproduce_legacy_trades(self):
+        for name, preset, overrides in GOLDEN_CASES:
+            with self.subTest(case=name):
+                trades, capital = _run(make_backtest(preset, **overrides), self.raw)
+                self.assertFrameExact(legacy_trades(trades, preset), _golden_trades(name))
+                expected_capital = _golden_capital(name)
+                if expected_capital is not None:
+                    self.assertFrameExact(capital, expected_capital)
+
+    def test_legacy_classes_reproduce_legacy_trades(self):
+        signal_kwargs = {"entry_z": 2.0, "exit_z": 0.5}
+        self.assertFrameExact(_run(ArbitrageBacktest(), self.raw, **signal_kwargs), _golden_trades("v1"))
+        self.assertFrameExact(
+            _run(ArbitrageBacktest3Exchanges(), self.raw, **signal_kwargs), _golden_trades("3exchanges")
+        )
+
+        trades, capital = _run(
+            ImprovedArbitrageBacktest(stop_loss=-0.002, max_holding_days=5, rolling_window=20),
+            self.raw, **signal_kwargs
+        )
+        self.assertFrameExact(trades, _golden_trades("improved_tight"))
+        self.assertFrameExact(capital, _golden_capital("improved_tight"))
+
+        backtest = OptimizedArbitrageBacktest(exit_z=0.5, exclude_upbit_binance=True, max_holding_days=10)
+        trades, capital = _run(backtest, self.raw)
+        self.assertFrameExact(trades, _golden_trades("optimized_exclude"))
+        self.assertFrameExact(capital, _golden_capital("optimized_exclude"))
+
+    def test_v1_inner_join_and_signed_long_premium(self):
+        backtest = make_backtest("v1")
+        prepared = backtest.prepare(self.raw)
+        self.assertFalse(prepared["binance_price"].isna().any())
+        self.assertLess(len(prepared), len(self.raw))
+
+        # v1은 Long Premium 수익률 부호가 반대 → 3거래소 방식으로 계산하면 결과가 달라짐
+        trades, _ = _run(make_backtest("v1", signed_long_premium=False), self.raw)
+        golden = _golden_trades("v1")
+        long_rows = golden["position"] == "Long Premium"
+        self.assertTrue(long_rows.any())
+        mirrored = trades.loc[long_rows.to_numpy(), "return"].to_numpy()
+        self.assertFalse((mirrored == golden.loc[long_rows, "return"].to_numpy()).all())
+
+
+class TestUnifiedEngineComponents(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.raw = _read("prices.csv", ["date"])
+
+    def test_custom_cost_model(self):
+        base_trades, _ = _run(make_backtest("improved"), self.raw)
+        free_trades, _ = _run(make_backtest("improved", cost_model=RoundTripCost(0.0, 0.0)), self.raw)
+
+        # 비용만 다르면 진입 / 청산 시점은 같고 수익률은 왕복 비용만큼 차이
+        pd.testing.assert_series_equal(base_trades["exit_date"], free_trades["exit_date"])
+        diff = free_trades["return"] - base_trades["return"]
+        self.assertTrue(((diff - 2 * (0.0005 + 0.0002)).abs() < 1e-12).all())
+
+    def test_custom_exit_rules(self):
+        # 청산 규칙 순서 = 청산 사유 우선순위
+        backtest = make_backtest("improved", exits=[StopLossExit(-0.002), ZScoreExit(0.5)])
+        trades, _ = _run(backtest, self.raw)
+        self.assertFalse(trades.empty)
+        self.assertTrue(set(trades["exit_reason"]) <= {"stop_loss", "z_score_reversion"})
+        self.assertTrue((trades["holding_bars"] >= 1).all())
+
+    def test_set_thresholds_updates_components(self):
+        backtest = make_backtest("optimized")
+        backtest.set_thresholds(entry_z=3.0, exit_z=0.25)
+        self.assertEqual(backtest.signal.entry_z, 3.0)
+        self.assertEqual(backtest.exits[0].exit_z, 0.25)
+
+    def test_unknown_preset(self):
+        with self.assertRaises(ValueError):
+            make_backtest("v9")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+차익거래 Walk-Forward 최적화 단위 테스트
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "subprojects" / "arbitrage"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from walk_forward import WalkForwardOptimizer
+from arbitrage_sample_data import make_exchange_prices
+
+
+class TestWalkForward(unittest.TestCase):
+    """폴드 구성 / OOS 이어붙이기 / 병렬 실행 테스트"""
+
+    GRID = {'entry_z': [1.5, 2.0], 'exit_z': [0.0, 0.5], 'rolling_window': [20, 30]}
+
+    def setUp(self):
+        self.df = make_exchange_prices(n_bars=700)
+
+    def test_folds_do_not_overlap(self):
+        """검증 구간은 학습 구간 이후, 폴드 간 겹치지 않음"""
+        optimizer = WalkForwardOptimizer(self.GRID, train_days=200, test_days=60)
+        folds = optimizer.make_folds(self.df['date'])
+        self.assertGreater(len(folds), 3)
+        for (train_start, train_end, test_end), nxt in zip(folds, folds[1:] + [None]):
+            self.assertLess(train_start, train_end)
+            self.assertLess(train_end, test_end)
+            if nxt is not None:
+                self.assertEqual(nxt[1], test_end)
+
+    def test_oos_equity_is_stitched(self):
+        """OOS 자본 곡선은 검증 구간만 포함하고 폴드 간 자본이 이어짐"""
+        optimizer = WalkForwardOptimizer(self.GRID, train_days=200, test_days=60, n_jobs=1, min_trades=1)
+        result = optimizer.run(self.df)
+        equity = result['equity']
+        folds = result['folds']
+
+        self.assertTrue(equity['date'].is_monotonic_increasing)
+        self.assertGreaterEqual(equity['date'].min(), folds['train_end'].min())
+        self.assertFalse(equity['date'].duplicated().any())
+
+        final = equity['capital'].iloc[-1] / optimizer.initial_capital
+        self.assertAlmostEqual(final, np.prod(1 + folds['oos_return']), places=9)
+
+        for _, fold in folds.iterrows():
+            chosen = {k: fold[k] for k in ('entry_z', 'exit_z', 'rolling_window')}
+            for key, value in chosen.items():
+                self.assertIn(value, self.GRID[key])
+
+        metrics = optimizer.analyze_performance(result)
+        self.assertEqual(metrics['n_folds'], len(folds))
+        self.assertAlmostEqual(metrics['final_return'], final - 1)
+
+    def test_parallel_matches_serial(self):
+        """병렬 실행 결과 = 순차 실행 결과"""
+        serial = WalkForwardOptimizer(self.GRID, train_days=200, test_days=90, n_jobs=1).run(self.df)
+        parallel = WalkForwardOptimizer(self.GRID, train_days=200, test_days=90, n_jobs=2).run(self.df)
+        pd.testing.assert_frame_equal(serial['folds'], parallel['folds'])
+        pd.testing.assert_frame_equal(serial['equity'], parallel['equity'])
+
+    def test_parameter_stability(self):
+        """파라미터 안정성 리포트"""
+        optimizer = WalkForwardOptimizer(self.GRID, train_days=200, test_days=60, n_jobs=1)
+        result = optimizer.run(self.df)
+        stability = result['stability']
+        self.assertEqual(list(stability.index), ['entry_z', 'exit_z', 'rolling_window'])
+        self.assertTrue(((stability['mode_share'] > 0) & (stability['mode_share'] <= 1)).all())
+        self.assertTrue((stability['changes'] < len(result['folds'])).all())
+        self.assertEqual(len(result['search']), len(result['folds']) * 8)
+
+    def test_open_positions_closed_at_fold_end(self):
+        """검증 구간 종료 시 보유 포지션은 마지막 봉에서 청산해 손익 반영 (자본 변화 = 폴드 거래 손익 합)"""
+        grid = {'entry_z': [1.5], 'exit_z': [0.0], 'rolling_window': [20]}
+        optimizer = WalkForwardOptimizer(
+            grid, train_days=200, test_days=60, n_jobs=1, min_trades=0, max_holding_days=1000, stop_loss=-1.0
+        )
+        result = optimizer.run(self.df)
+        trades = result['trades']
+        equity = result['equity']
+        folds = result['folds']
+
+        forced = trades[trades['exit_reason'] == 'end_of_period']
+        self.assertGreater(len(forced), 0)
+        for _, fold in folds.iterrows():
+            fold_trades = trades[trades['fold'] == fold['fold']]
+            fold_equity = equity[equity['fold'] == fold['fold']]
+            self.assertGreaterEqual(fold_trades['entry_date'].min(), fold['train_end'])
+            self.assertLess(fold_trades['exit_date'].max(), fold['test_end'])
+            self.assertEqual((fold_trades['exit_reason'] == 'end_of_period').sum(), 1)
+            self.assertEqual(fold_trades['exit_date'].max(), fold_equity['date'].max())
+            start_capital = fold_equity['capital'].iloc[-1] - fold_trades['profit'].sum()
+            self.assertAlmostEqual(fold_equity['capital'].iloc[-1] / start_capital - 1, fold['oos_return'], places=9)
+            self.assertEqual(fold['oos_trades'], len(fold_trades))
+
+    def test_invalid_grid(self):
+        with self.assertRaises(ValueError):
+            WalkForwardOptimizer({'entry_z': [2.0]})
+
+
+if __name__ == '__main__':
+    unittest.main()
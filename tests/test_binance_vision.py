@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Binance Vision 아카이브 수집 테스트
+가짜 HTTP 클라이언트로 월별 우선 / 일별 대체 / 캐시 재사용 / 배치 저장 확인
+"""
+
+import io
+import tempfile
+import unittest
+import sys
+import zipfile
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.binance_vision import (
+    ArchiveCache,
+    archive_url,
+    csv_float,
+    ingest_archives,
+    plan_archives,
+    read_csv_columns,
+)
+
+
+def _zip_bytes(csv_text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('data.csv', csv_text)
+    return buffer.getvalue()
+
+
+class _FakeResponse:
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _FakeClient:
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        if url in self.files:
+            return _FakeResponse(200, self.files[url])
+        return _FakeResponse(404)
+
+
+def _day_csv(*rows):
+    return 'create_time,value\n' + ''.join(f"{created},{value}\n" for created, value in rows)
+
+
+class TestBinanceVision(unittest.TestCase):
+    """아카이브 계획 / 캐시 / 수집 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_plan_uses_monthly_for_finished_months(self):
+        """끝난 달은 월별 (일별은 fallback), 진행 중인 달은 일별만"""
+        archives = plan_archives('futures/um', 'metrics', 'BTCUSDT', date(2025, 1, 30), date(2025, 2, 2), today=date(2025, 2, 3))
+
+        self.assertEqual([a['period'] for a in archives], ['2025-01', '2025-02-01', '2025-02-02'])
+        self.assertEqual([a['period'] for a in archives[0]['fallback']], ['2025-01-30', '2025-01-31'])
+        self.assertEqual(
+            archives[0]['url'],
+            'https://data.binance.vision/data/futures/um/monthly/metrics/BTCUSDT/BTCUSDT-metrics-2025-01.zip'
+        )
+
+    def test_read_csv_columns_streams_selected_columns(self):
+        """요청한 컬럼만 변환해서 수집, 헤더에 없는 컬럼은 제외"""
+        path = self.cache_dir / 'a.zip'
+        path.write_bytes(_zip_bytes('create_time,value,other\n2025-01-01 00:00:00,1.5,x\n2025-01-01 00:05:00,,y\n'))
+
+        columns = read_csv_columns(path, {'create_time': str, 'value': csv_float, 'missing': str})
+        self.assertEqual(columns, {
+            'create_time': ['2025-01-01 00:00:00', '2025-01-01 00:05:00'],
+            'value': [1.5, None],
+        })
+
+    def test_ingest_falls_back_to_daily_and_reuses_cache(self):
+        """월별 404 → 일별 대체, 기간 밖 날짜 제외, 재실행은 캐시만 사용"""
+        client = _FakeClient({
+            archive_url('futures/um', 'metrics', 'BTCUSDT', '2025-01-31'): _zip_bytes(_day_csv(('2025-01-31 00:00:00', 1))),
+            archive_url('futures/um', 'metrics', 'BTCUSDT', '2025-02'): _zip_bytes(
+                _day_csv(('2025-02-01 00:00:00', 2), ('2025-02-02 00:00:00', 3), ('2025-02-20 00:00:00', 4))
+            ),
+        })
+        archives = plan_archives('futures/um', 'metrics', 'BTCUSDT', date(2025, 1, 31), date(2025, 2, 2), today=date(2025, 3, 10))
+
+        def parse(path, archive):
+            columns = read_csv_columns(path, {'create_time': str, 'value': csv_float})
+            return [
+                {'date': date.fromisoformat(created[:10]), 'value': value}
+                for created, value in zip(columns['create_time'], columns['value'])
+            ]
+
+        batches = []
+        result = ingest_archives(
+            ArchiveCache(self.cache_dir, client=client), archives, parse, batches.append,
+            start=date(2025, 1, 31), end=date(2025, 2, 2), max_workers=2, rows_per_commit=1
+        )
+
+        rows = sorted((row['date'], row['value']) for batch in batches for row in batch)
+        self.assertEqual(rows, [(date(2025, 1, 31), 1.0), (date(2025, 2, 1), 2.0), (date(2025, 2, 2), 3.0)])
+        self.assertEqual(result['archives'], 2)
+        self.assertEqual(result['missing'], 1)
+        self.assertEqual(result['downloads'], 2)
+        self.assertEqual(result['commits'], 2)
+        self.assertEqual(len(client.requests), 3)
+
+        # 재실행: 캐시(404 포함)로만 처리
+        rerun = ingest_archives(
+            ArchiveCache(self.cache_dir, client=client), archives, parse, lambda rows: None,
+            start=date(2025, 1, 31), end=date(2025, 2, 2)
+        )
+        self.assertEqual(len(client.requests), 3)
+        self.assertEqual(rerun['hits'], 2)
+        self.assertEqual(rerun['rows'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+BSCScan txlist 수집 테스트
+로컬 HTTP 서버로 오래된 순 페이지 조회 / 같은 블록 중복 제거 / 완결 블록까지만 워터마크 전진 확인 (외부 요청 없음)
+"""
+
+import json
+import threading
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.collectors import bsc_api_collector
+from scripts.collectors.bsc_api_collector import fetch_transaction_history
+from scripts.collectors.bsc_hybrid_collector import advance_watermarks
+
+ADDRESS = '0xwhale'
+
+
+def _tx(index, block):
+    return {
+        'hash': f'0x{index:04x}', 'blockNumber': str(block), 'timeStamp': str(1700000000 + block),
+        'from': ADDRESS, 'to': '0xexchange', 'value': str(10 ** 18), 'gasUsed': '21000', 'gasPrice': '1',
+        'isError': '0', 'input': '0x'
+    }
+
+
+# 블록 100~105, 블록마다 2건 (오래된 순)
+HISTORY = [_tx(i, 100 + i // 2) for i in range(12)]
+
+
+class _TxlistServer:
+    """txlist: startblock 이상 거래를 오래된 순으로 offset건, fail_from번째 요청부터 오류"""
+
+    def __init__(self):
+        self.queries = []
+        self.fail_from = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                server.queries.append(query)
+                if server.fail_from is not None and len(server.queries) >= server.fail_from:
+                    payload = {'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'}
+                else:
+                    rows = [tx for tx in HISTORY if int(tx['blockNumber']) >= int(query['startblock'])]
+                    rows = rows[:int(query['offset'])]
+                    payload = {'status': '1', 'message': 'OK', 'result': rows} if rows else \
+                        {'status': '0', 'message': 'No transactions found', 'result': []}
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/api"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _State:
+    def __init__(self):
+        self.marks = {}
+
+    def advance(self, source, entity, stream, **mark):
+        self.marks[entity] = mark
+
+
+class TestFetchTransactionHistory(unittest.TestCase):
+    """txlist 페이지 조회 테스트"""
+
+    def setUp(self):
+        self.server = _TxlistServer()
+        patches = [
+            mock.patch.object(bsc_api_collector, 'BSCSCAN_API_URL', self.server.url),
+            mock.patch.object(bsc_api_collector, 'TXLIST_PAGE_SIZE', 5),
+            mock.patch.object(bsc_api_collector, 'RATE_LIMIT_DELAY', 0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_pages_ascending_without_gaps(self):
+        """가득 찬 페이지는 마지막 블록부터 다시 조회, 중복 없이 전체 수집"""
+        transactions, covered = fetch_transaction_history(ADDRESS, 'key', start_block=100)
+
+        self.assertEqual([tx['tx_hash'] for tx in transactions], [tx['hash'] for tx in HISTORY])
+        self.assertEqual(covered, 105)
+        self.assertEqual([query['sort'] for query in self.server.queries], ['asc'] * 3)
+        self.assertEqual([query['startblock'] for query in self.server.queries], ['100', '102', '104'])
+
+    def test_failure_limits_watermark_to_covered_block(self):
+        """중간 페이지 실패 시 완결된 블록까지만 워터마크 전진"""
+        self.server.fail_from = 2
+        transactions, covered = fetch_transaction_history(ADDRESS, 'key', start_block=100)
+        self.assertEqual(len(transactions), 5)
+        self.assertEqual(covered, 101)
+
+        state = _State()
+        advance_watermarks(state, [ADDRESS], transactions, {ADDRESS: covered})
+        self.assertEqual(state.marks[ADDRESS]['last_block'], 101)
+
+        state = _State()
+        advance_watermarks(state, [ADDRESS], transactions, {})
+        self.assertEqual(state.marks, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+BscScan 상세 페이지 스크래퍼 테스트
+저장된 HTML fixture를 로컬 HTTP 서버로 제공해 파싱 / 동시 스크래핑 / tx_hash 캐시 확인 (외부 요청 없음)
+"""
+
+import tempfile
+import threading
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.collectors import bsc_web_scraper
+from scripts.collectors.bsc_web_scraper import (
+    TxDetailCache,
+    parse_transaction_page,
+    scrape_multiple_transactions,
+)
+from src.http_client import HttpClient, RateLimitRegistry, RequestMetrics
+
+FIXTURES = ROOT / 'tests' / 'fixtures' / 'bscscan'
+PAGES = {
+    '0xaaa1': 'tx_transfer.html',
+    '0xbbb2': 'tx_swap.html',
+}
+# 200이지만 거래 정보가 없는 페이지 (차단 / 점검 안내)
+BUSY_PAGE = b'<html><body><p>Sorry, our servers are currently busy.</p></body></html>'
+
+
+class _FixtureServer:
+    """/tx/<hash> 경로에 fixture HTML 응답 (0xbusy는 빈 안내 페이지, 없는 해시는 404)"""
+
+    def __init__(self):
+        self.paths = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.paths.append(self.path)
+                tx_hash = self.path.rsplit('/', 1)[-1]
+                name = PAGES.get(tx_hash)
+                if tx_hash == '0xbusy':
+                    body, status = BUSY_PAGE, 200
+                else:
+                    body, status = ((FIXTURES / name).read_bytes(), 200) if name else (b'not found', 404)
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestParseTransactionPage(unittest.TestCase):
+    """상세 페이지 파싱 테스트"""
+
+    def test_transfer_page(self):
+        """Method / 라벨(주소 형태 제외) / 방향 / 금액"""
+        details = parse_transaction_page(
+            (FIXTURES / 'tx_transfer.html').read_bytes(),
+            target_address='0xF977814e90dA44bFA03b6295A0616a897441aceC'
+        )
+        self.assertEqual(details['input_data'], 'Transfer')
+        self.assertEqual(details['from_label'], 'Binance: Hot Wallet 6')
+        self.assertIsNone(details['to_label'])
+        self.assertEqual(details['from_address'], '0x8894e0a0c962cb723c1976a4421c95949be2d4e3')
+        self.assertEqual(details['direction'], 'IN')
+        self.assertEqual(details['amount_text'], '1,250 BNB')
+        self.assertEqual(details['amount_usd'], '781312.50')
+
+    def test_swap_page_uses_function_signature(self):
+        """u-label이 없으면 input data의 Function 서명"""
+        details = parse_transaction_page(
+            (FIXTURES / 'tx_swap.html').read_text(encoding='utf-8'),
+            target_address='0x5a52e96bacdabb82fd05763e25335261b270efcb'
+        )
+        self.assertTrue(details['input_data'].startswith('swapExactETHForTokens('))
+        self.assertEqual(details['to_label'], 'PancakeSwap: Router v2')
+        self.assertEqual(details['direction'], 'OUT')
+        self.assertEqual(details['amount_text'], '300 BNB')
+        self.assertIsNone(details['amount_usd'])
+
+
+class TestScrapeMultipleTransactions(unittest.TestCase):
+    """동시 스크래핑 + 캐시 테스트"""
+
+    def setUp(self):
+        self.server = _FixtureServer()
+        self.client = HttpClient(max_retries=0, rate_limits=RateLimitRegistry(limits={}), metrics=RequestMetrics())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TxDetailCache(Path(self.tmp.name) / 'cache.db')
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.tmp.cleanup()
+
+    def scrape(self, transactions):
+        return scrape_multiple_transactions(
+            transactions, delay=0, max_workers=3, cache=self.cache, client=self.client, base_url=self.server.url
+        )
+
+    def test_enriches_in_order_and_never_rescrapes(self):
+        """입력 순서 유지, 실패(404)는 원본 유지 + 캐시 안 함, 재실행은 캐시로 처리"""
+        transactions = [
+            {'tx_hash': '0xbbb2', 'from_address': '0x5a52e96bacdabb82fd05763e25335261b270efcb'},
+            {'tx_hash': '0xmissing'},
+            {'tx_hash': '0xaaa1', 'to_address': '0xf977814e90da44bfa03b6295a0616a897441acec', 'amount_usd': 1.0},
+            {'from_address': '0xnohash'},
+        ]
+
+        enriched = self.scrape(transactions)
+
+        self.assertEqual([tx.get('tx_hash') for tx in enriched], ['0xbbb2', '0xmissing', '0xaaa1', None])
+        self.assertEqual(enriched[0]['to_label'], 'PancakeSwap: Router v2')
+        self.assertEqual(enriched[1], transactions[1])
+        self.assertEqual(enriched[2]['input_data'], 'Transfer')
+        self.assertEqual(enriched[2]['amount_usd'], 781312.5)
+        self.assertEqual(len(self.server.paths), 3)
+
+        rerun = self.scrape(transactions)
+
+        self.assertEqual(rerun, enriched)
+        self.assertEqual(sorted(self.server.paths[3:]), ['/tx/0xmissing'])
+
+    def test_page_without_details_is_not_cached(self):
+        """파싱된 필드가 없는 200 응답은 캐시하지 않고 다음 실행에서 다시 요청"""
+        transactions = [{'tx_hash': '0xbusy'}, {'tx_hash': '0xaaa1'}]
+
+        self.scrape(transactions)
+        self.assertEqual(set(self.cache.get_many(['0xbusy', '0xaaa1'])), {'0xaaa1'})
+
+        self.scrape(transactions)
+        self.assertEqual(sorted(self.server.paths), ['/tx/0xaaa1', '/tx/0xbusy', '/tx/0xbusy'])
+
+    def test_interrupt_keeps_input_order_and_length(self):
+        """중단되면 처리한 거래는 병합, 나머지는 원본 그대로 입력 순서대로 반환"""
+        transactions = [{'tx_hash': '0xmissing'}, {'tx_hash': '0xaaa1'}, {'tx_hash': '0xbbb2'}]
+
+        def interrupted(futures):
+            first = next(future for future, i in futures.items() if i == 1)
+            first.result()
+            yield first
+            raise KeyboardInterrupt
+
+        with mock.patch.object(bsc_web_scraper, 'as_completed', interrupted):
+            enriched = self.scrape(transactions)
+
+        self.assertEqual([tx['tx_hash'] for tx in enriched], ['0xmissing', '0xaaa1', '0xbbb2'])
+        self.assertEqual(enriched[0], transactions[0])
+        self.assertEqual(enriched[1]['input_data'], 'Transfer')
+        self.assertEqual(enriched[2], transactions[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
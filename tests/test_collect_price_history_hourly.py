@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+1시간봉 수집기 재개 테스트
+임시 SQLite 워터마크로 마감된 봉까지만 수집 / data_source별 워터마크 / 업비트 수집기 재개 확인 (외부 API 호출 없음)
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts' / 'collectors'))
+
+import collect_price_history_hourly as hourly
+import collect_upbit_price_history_hourly as upbit_hourly
+from src.collectors.ingestion_state import SQLiteIngestionState
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _candles(start, hours):
+    return [{'open_time': start + timedelta(hours=i), 'close_price': 100.0 + i} for i in range(hours)]
+
+
+def _upbit_candle(open_time):
+    return {
+        'candle_date_time_utc': open_time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'opening_price': 100.0, 'high_price': 101.0, 'low_price': 99.0, 'trade_price': 100.5,
+        'candle_acc_trade_volume': 1.0, 'candle_acc_trade_price': 100.5,
+        'timestamp': int((open_time + timedelta(hours=1)).timestamp() * 1000),
+    }
+
+
+class _FakeUpbitClient:
+    """업비트 분봉 API처럼 'to' 이전(미포함) 캔들을 최신순으로 반환하는 가짜 공용 클라이언트"""
+
+    def __init__(self, first, last):
+        self.first = first
+        self.last = last
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        self.calls.append(params)
+        cursor = datetime.strptime(params['to'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        candles = []
+        open_time = min(cursor - timedelta(hours=1), self.last)
+        while open_time >= self.first and len(candles) < params['count']:
+            candles.append(_upbit_candle(open_time))
+            open_time -= timedelta(hours=1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(candles).encode()
+        return response
+
+
+def _upsert(supabase, crypto_id, klines, data_source='binance', progress_callback=None):
+    return {'rows_written': len(klines), 'rows_failed': 0}
+
+
+class TestResumeWindow(unittest.TestCase):
+    """수집 구간 계산 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = SQLiteIngestionState(Path(self.tmp.name) / 'state.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_last_closed_hour_excludes_open_candle(self):
+        """진행 중인 봉은 제외하고 직전에 마감된 봉의 open_time"""
+        now = datetime(2025, 3, 1, 10, 37, 12, tzinfo=timezone.utc)
+        self.assertEqual(hourly.last_closed_hour(now), datetime(2025, 3, 1, 9, tzinfo=timezone.utc))
+        self.assertEqual(hourly.last_closed_hour(now.replace(minute=0, second=0)), datetime(2025, 3, 1, 9, tzinfo=timezone.utc))
+
+    def test_resume_start_reads_data_source_watermark(self):
+        """저장할 때와 같은 data_source의 워터마크에서 재개"""
+        self.state.advance('upbit', 'BTC', hourly.STATE_STREAM, last_timestamp=datetime(2025, 1, 2, 5, tzinfo=timezone.utc))
+
+        self.assertEqual(hourly.resume_start(self.state, 'BTC', START, 'upbit'), datetime(2025, 1, 2, 6, tzinfo=timezone.utc))
+        self.assertEqual(hourly.resume_start(self.state, 'BTC', START, 'binance'), START)
+        self.assertEqual(hourly.resume_start(None, 'BTC', START, 'upbit'), START)
+
+
+class TestFetchUpbitCandles(unittest.TestCase):
+    """업비트 1시간봉 조회 테스트"""
+
+    def test_pages_through_client_and_includes_end_candle(self):
+        """공용 클라이언트로 역순 페이지 조회, 종료 시각에 시작하는 봉까지 포함"""
+        end = START + timedelta(hours=299)
+        client = _FakeUpbitClient(START - timedelta(days=1), end + timedelta(hours=5))
+
+        candles = upbit_hourly.fetch_upbit_candles_by_date_range('KRW-BTC', START, end, client=client)
+
+        self.assertEqual(len(candles), 300)
+        self.assertEqual(candles[0]['open_time'], START)
+        self.assertEqual(candles[-1]['open_time'], end)
+        self.assertEqual(len(client.calls), 2)
+        self.assertTrue(all(call['market'] == 'KRW-BTC' for call in client.calls))
+
+
+class TestUpbitHourlyResume(unittest.TestCase):
+    """업비트 1시간봉 수집기 워터마크 재개 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = SQLiteIngestionState(Path(self.tmp.name) / 'state.db')
+        self.requests = []
+        patches = [
+            mock.patch.dict(upbit_hourly.COINS_TO_COLLECT, {'BTC': 'KRW-BTC'}, clear=True),
+            mock.patch.object(upbit_hourly, 'get_crypto_id_by_symbol', lambda supabase, symbol: 'btc-id'),
+            mock.patch.object(upbit_hourly, 'fetch_upbit_candles_by_date_range', self._fetch),
+            mock.patch.object(hourly, 'upsert_price_history', _upsert),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fetch(self, market, start_time, end_time, unit=60):
+        self.requests.append((start_time, end_time))
+        hours = int((end_time - start_time) / timedelta(hours=1)) + 1
+        return _candles(start_time, hours)
+
+    def test_second_run_resumes_after_upbit_watermark(self):
+        """첫 실행이 upbit 워터마크를 전진시키고 다음 실행은 그 다음 봉부터 수집"""
+        first_end = START + timedelta(hours=23)
+        upbit_hourly.collect_upbit_price_history_for_coins(None, START, first_end, state=self.state)
+        self.assertEqual(self.state.last_timestamp('upbit', 'BTC', hourly.STATE_STREAM), first_end.isoformat())
+        self.assertIsNone(self.state.get('binance', 'BTC', hourly.STATE_STREAM))
+
+        second_end = first_end + timedelta(hours=3)
+        _, results = upbit_hourly.collect_upbit_price_history_for_coins(None, START, second_end, state=self.state)
+        self.assertEqual(self.requests[-1], (first_end + timedelta(hours=1), second_end))
+        self.assertEqual(results['BTC']['saved'], 3)
+
+        # 이미 최신이면 조회하지 않음, --full이면 시작일부터 다시 수집
+        upbit_hourly.collect_upbit_price_history_for_coins(None, START, second_end, state=self.state)
+        self.assertEqual(len(self.requests), 2)
+        upbit_hourly.collect_upbit_price_history_for_coins(None, START, second_end, state=self.state, resume=False)
+        self.assertEqual(self.requests[-1], (START, second_end))
+
+
+if __name__ == '__main__':
+    unittest.main()
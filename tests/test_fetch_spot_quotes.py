@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+현물 일봉 동시 수집 테스트
+가짜 거래소 클라이언트로 날짜 구간 분할 요청, 단일 writer 배치 저장, 워터마크 전진 / 유지 확인 (외부 API 호출 없음)
+"""
+
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+import sys
+from datetime import date
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.subprojects.arbitrage.fetch_spot_quotes import (
+    BINANCE_BASE, BYBIT_BASE, DAY_MS, STREAM, SpotWriter, date_partitions, ensure_db, run_backfill
+)
+
+BINANCE_TABLE = """
+CREATE TABLE binance_spot_daily (
+    symbol TEXT NOT NULL, date TEXT NOT NULL, open REAL, high REAL, low REAL, close REAL,
+    volume REAL, quote_volume REAL, UNIQUE(date, symbol)
+)
+"""
+
+
+def _response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+class _FakeExchange:
+    """startTime / start ~ endTime / end 범위의 일봉을 만들어 주는 Binance / Bybit 대역 (요청 기록, 지정 구간 실패)"""
+
+    def __init__(self, fail_binance_start=None):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.fail_binance_start = fail_binance_start
+
+    @staticmethod
+    def _days(start, end):
+        first = -(-start // DAY_MS) * DAY_MS
+        return list(range(first, end + 1, DAY_MS))
+
+    def get(self, url, params=None, **kwargs):
+        with self.lock:
+            self.calls.append((url, dict(params)))
+        if url == BINANCE_BASE:
+            if params['startTime'] == self.fail_binance_start:
+                raise requests.ConnectionError('연결 끊김')
+            days = self._days(params['startTime'], params['endTime'])[:params['limit']]
+            return _response([[ts, '1', '2', '0.5', '1.5', '10', ts + DAY_MS - 1, '15'] for ts in days])
+        if url == BYBIT_BASE:
+            days = self._days(params['start'], params['end'])[-params['limit']:]
+            candles = [[str(ts), '1', '2', '0.5', '1.5', '10', '15'] for ts in reversed(days)]
+            return _response({'retCode': 0, 'result': {'list': candles}})
+        raise AssertionError(url)
+
+
+class TestFetchSpotQuotes(unittest.TestCase):
+    """동시 수집 / 단일 writer 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / 'project.db'
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(BINANCE_TABLE)
+        self.state = ensure_db(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def count(self, table, symbol):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT date), MIN(date), MAX(date) FROM {table} WHERE symbol = ?", (symbol,)
+            ).fetchone()
+
+    def test_date_partitions(self):
+        """구간은 빈틈 / 겹침 없이 days일 단위"""
+        parts = date_partitions(date(2023, 1, 1), date(2023, 1, 11), 4)
+        self.assertEqual([(s.day, e.day) for s, e in parts], [(1, 5), (5, 9), (9, 11)])
+        self.assertEqual(date_partitions(date(2023, 1, 1), date(2023, 1, 1), 4), [])
+
+    def test_backfill_partitions_and_advances_watermark(self):
+        """긴 구간은 날짜 구간별 요청 1회, 거래소별 행은 한 번씩 저장, 모두 저장된 뒤 워터마크 전진 (end-date 클램프)"""
+        client = _FakeExchange()
+        tasks = [
+            {'source': 'binance', 'symbol': 'BTCUSDT', 'start': date(2021, 1, 1), 'end_exclusive': date(2024, 6, 1)},
+            {'source': 'bybit', 'symbol': 'ETHUSDT', 'start': date(2024, 1, 1), 'end_exclusive': date(2024, 6, 1)},
+        ]
+        writer = SpotWriter(self.db_path, self.state, batch_rows=100000, flush_interval=0.2)
+        run_backfill(tasks, writer, client=client, workers=4, clamp='2024-05-15')
+        writer.close()
+
+        binance_days = (date(2024, 6, 1) - date(2021, 1, 1)).days
+        self.assertEqual(self.count('binance_spot_daily', 'BTCUSDT'), (binance_days, binance_days, '2021-01-01', '2024-05-31'))
+        self.assertEqual(self.count('bybit_spot_daily', 'ETHUSDT'), (152, 152, '2024-01-01', '2024-05-31'))
+        self.assertEqual(len(client.calls), 3)
+        self.assertLess(writer.transactions, 4)
+        self.assertEqual(writer.rows, binance_days + 152)
+
+        self.assertEqual(self.state.last_timestamp('binance', 'BTCUSDT', STREAM), '2024-05-15')
+        self.assertEqual(self.state.last_timestamp('bybit', 'ETHUSDT', STREAM), '2024-05-15')
+
+    def test_failed_partition_keeps_watermark(self):
+        """구간 하나가 실패하면 받은 구간은 저장하되 워터마크는 그대로 (다음 실행에서 같은 시작일부터)"""
+        self.state.advance('binance', 'BTCUSDT', STREAM, last_timestamp='2020-12-31')
+        start = date(2021, 1, 1)
+        second = date_partitions(start, date(2024, 1, 1), 1000)[1][0]
+        client = _FakeExchange(fail_binance_start=int(
+            (second - date(1970, 1, 1)).total_seconds() * 1000
+        ))
+        tasks = [{'source': 'binance', 'symbol': 'BTCUSDT', 'start': start, 'end_exclusive': date(2024, 1, 1)}]
+
+        writer = SpotWriter(self.db_path, self.state)
+        run_backfill(tasks, writer, client=client, workers=2)
+        writer.close()
+
+        self.assertIn('연결 끊김', tasks[0]['error'])
+        self.assertEqual(self.count('binance_spot_daily', 'BTCUSDT')[0], 1000)
+        self.assertEqual(self.state.last_timestamp('binance', 'BTCUSDT', STREAM), '2020-12-31')
+
+    def test_writer_batches_pages_into_transactions(self):
+        """여러 페이지를 트랜잭션 하나로, 저장 오류는 close()에서 다시 발생"""
+        writer = SpotWriter(self.db_path, self.state, batch_rows=1000, flush_interval=1.0)
+        for page in range(5):
+            rows = [('BTCUSDT', f"2024-{page + 1:02d}-{day:02d}", 1, 2, 0.5, 1.5, 10, 15) for day in range(1, 21)]
+            writer.submit('bybit_spot_daily', ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 'quote_volume'], rows)
+        writer.mark('bybit', 'BTCUSDT', '2024-05-20')
+        writer.close()
+        self.assertEqual((writer.rows, writer.transactions), (100, 1))
+        self.assertEqual(self.state.last_timestamp('bybit', 'BTCUSDT', STREAM), '2024-05-20')
+
+        broken = SpotWriter(self.db_path, self.state)
+        broken.submit('missing_table', ['symbol'], [('BTCUSDT',)])
+        with self.assertRaises(sqlite3.OperationalError):
+            broken.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+공용 HTTP 클라이언트 테스트
+로컬 HTTP 서버로 연결 재사용 / gzip / 재시도 / 호스트별 호출 한도 / 요청 지표 확인 (외부 API 호출 없음)
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.http_client import HttpClient, RateLimitRegistry, RequestMetrics, TokenBucket
+
+
+class _Server:
+    """경로별 응답 + 클라이언트 연결(포트) 기록"""
+
+    def __init__(self):
+        self.failures = 0
+        self.ports = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                    server.ports.add(self.client_address[1])
+                    failing = server.failures > 0
+                    server.failures -= 1 if failing else 0
+
+                if failing:
+                    status, body, headers = 503, b'busy', {'Retry-After': '0'}
+                else:
+                    status, headers = 200, {}
+                    body = json.dumps({'path': self.path, 'rows': list(range(200))}).encode()
+                    if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                        body = gzip.compress(body)
+                        headers['Content-Encoding'] = 'gzip'
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestHttpClient(unittest.TestCase):
+    """공용 HTTP 클라이언트 테스트"""
+
+    def setUp(self):
+        self.server = _Server()
+        self.metrics = RequestMetrics()
+        self.limits = RateLimitRegistry(limits={})
+        self.client = HttpClient(max_retries=2, backoff_base=0.0, rate_limits=self.limits, metrics=self.metrics)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def test_keep_alive_and_gzip(self):
+        """연속 요청은 연결 1개를 재사용, gzip 응답은 자동 해제 + 압축 크기로 집계"""
+        for i in range(5):
+            response = self.client.get(f"{self.server.url}/page/{i}")
+            self.assertEqual(response.json()['path'], f"/page/{i}")
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+        self.assertEqual(len(self.server.ports), 1)
+        stats = self.metrics.snapshot()['127.0.0.1']
+        self.assertEqual((stats['requests'], stats['status_codes']), (5, {200: 5}))
+        self.assertGreater(stats['bytes'], 0)
+        self.assertLess(stats['bytes'], 5 * len(json.dumps({'path': '/page/0', 'rows': list(range(200))})))
+
+    def test_retries_server_errors(self):
+        """5xx는 재시도 후 성공 응답 반환, 재시도 초과 시 마지막 응답 반환"""
+        self.server.failures = 2
+        response = self.client.get(f"{self.server.url}/flaky")
+        self.assertEqual(response.status_code, 200)
+
+        self.server.failures = 5
+        response = self.client.get(f"{self.server.url}/down")
+        self.assertEqual(response.status_code, 503)
+
+        stats = self.metrics.snapshot()['127.0.0.1']
+        self.assertEqual(stats['retries'], 4)
+        self.assertEqual(stats['status_codes'], {200: 1, 503: 5})
+
+    def test_connection_error_raises_after_retries(self):
+        """연결 실패는 재시도 후 예외, 오류 횟수 집계"""
+        port = self.server.httpd.server_address[1]
+        self.server.close()
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get(f"http://127.0.0.1:{port}/gone", timeout=1)
+        self.assertEqual(self.metrics.snapshot()['127.0.0.1']['errors'], 3)
+        self.server = _Server()
+
+    def test_host_rate_limit(self):
+        """호스트 한도 등록 시 요청 간격 보장, 다른 호스트는 영향 없음"""
+        self.limits.register('127.0.0.1', rate=20.0, burst=1)
+        start = time.perf_counter()
+        for _ in range(5):
+            self.client.get(f"{self.server.url}/limited")
+        elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 0.18)
+        self.assertGreater(self.metrics.snapshot()['127.0.0.1']['throttle_wait'], 0.15)
+        self.assertIsNone(self.limits.bucket_for('localhost'))
+
+
+class TestTokenBucket(unittest.TestCase):
+    """토큰 버킷 테스트"""
+
+    def test_reservations_are_spaced_by_rate(self):
+        """버스트 소진 후 예약은 1/rate 간격"""
+        now = [0.0]
+        bucket = TokenBucket(rate=4.0, capacity=2, clock=lambda: now[0])
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.25, 0.5])
+
+        now[0] = 2.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_acquire_limits_throughput(self):
+        """초당 20회 한도로 6회 획득 시 약 0.25초"""
+        bucket = TokenBucket(rate=20.0, capacity=1)
+
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(run())
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
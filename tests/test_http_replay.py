@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+HTTP 응답 기록 / 재생 테스트
+로컬 HTTP 서버 응답을 기록한 뒤 서버 없이 재생, TTL / 인증 파라미터 제외 / API 오류 응답 제외 / 재생 누락 확인 (외부 API 호출 없음)
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.http_client import HttpClient, RateLimitRegistry, ReplayMiss, RequestMetrics, ResponseStore
+from src.http_client.replay import request_key, store_from_env
+
+
+class _Server:
+    """경로 / 쿼리를 JSON으로 돌려주는 서버 (gzip 응답, 요청 수 기록, /etherscan은 API 오류 응답)"""
+
+    def __init__(self):
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _reply(self, payload):
+                server.requests += 1
+                body = gzip.compress(json.dumps(payload).encode())
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith('/etherscan'):
+                    # Etherscan / BscScan 계열 오류: HTTP 200 + status '0'
+                    self._reply({'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'})
+                    return
+                self._reply({'path': self.path, 'n': server.requests})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self._reply({'body': json.loads(self.rfile.read(length)), 'n': server.requests})
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestHttpReplay(unittest.TestCase):
+    """기록 / 재생 테스트"""
+
+    def setUp(self):
+        self.server = _Server()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = [1_000_000.0]
+        self.store = ResponseStore(
+            self.tmp.name, ttl_rules=[('*/live*', 60), ('*/archive/*', None)], default_ttl=3600,
+            clock=lambda: self.now[0]
+        )
+        self.metrics = RequestMetrics()
+
+    def tearDown(self):
+        self.server.close()
+        self.tmp.cleanup()
+
+    def client(self, mode):
+        return HttpClient(
+            max_retries=0, rate_limits=RateLimitRegistry(limits={}), metrics=self.metrics,
+            store=self.store, replay_mode=mode
+        )
+
+    def test_record_then_replay_without_network(self):
+        """기록한 응답(GET 쿼리 순서 무관 / POST JSON 본문)을 서버 종료 후 그대로 재생"""
+        url = f"{self.server.url}/archive/stats"
+        with self.client('record') as client:
+            recorded = client.get(url, params={'symbol': 'BTC', 'from': '2024-01-01'}).json()
+            posted = client.post(f"{self.server.url}/rpc", json={'method': 'tx', 'params': [1, 2]}).json()
+        self.server.close()
+
+        with self.client('replay') as client:
+            replayed = client.get(f"{url}?from=2024-01-01", params={'symbol': 'BTC'})
+            self.assertEqual(replayed.status_code, 200)
+            self.assertEqual(replayed.json(), recorded)
+            self.assertEqual(client.post(f"{self.server.url}/rpc", json={'params': [1, 2], 'method': 'tx'}).json(), posted)
+            with self.assertRaises(ReplayMiss):
+                client.get(url, params={'symbol': 'ETH'})
+
+        self.assertEqual(self.metrics.snapshot()['127.0.0.1']['replays'], 2)
+
+    def test_cache_mode_respects_endpoint_ttl(self):
+        """cache 모드: TTL 안은 재생, 지나면 다시 요청 (replay 모드는 TTL 무시)"""
+        live, archive = f"{self.server.url}/live/ticker", f"{self.server.url}/archive/day"
+        with self.client('cache') as client:
+            client.get(live)
+            client.get(archive)
+            client.get(live)
+            self.assertEqual(self.server.requests, 2)
+
+            self.now[0] += 120
+            self.assertEqual(client.get(live).json()['n'], 2)
+            client.get(archive)
+            self.assertEqual(self.server.requests, 3)
+
+        self.now[0] += 10 ** 6
+        with self.client('replay') as client:
+            self.assertEqual(client.get(live).json()['n'], 2)
+
+    def test_secret_params_are_not_part_of_key_or_store(self):
+        """API 키는 키 / 저장 메타에서 제외 (키를 바꿔도 같은 저장본)"""
+        url = f"{self.server.url}/api"
+        with self.client('record') as client:
+            client.get(url, params={'module': 'account', 'apikey': 'SECRET-1'})
+        with self.client('replay') as client:
+            self.assertEqual(client.get(url, params={'module': 'account', 'apikey': 'OTHER'}).status_code, 200)
+
+        key, normalized = request_key('GET', url, params={'module': 'account', 'apikey': 'SECRET-1'})
+        self.assertNotIn('SECRET', normalized)
+        meta = gzip.decompress((Path(self.tmp.name) / key[:2] / f"{key}.gz").read_bytes()).split(b'\n', 1)[0]
+        self.assertNotIn(b'SECRET', meta)
+
+    def test_api_error_responses_are_not_stored(self):
+        """HTTP 200 + status '0' 응답 / record=False 요청 / validator가 거부한 응답은 저장하지 않음"""
+        error_url = f"{self.server.url}/etherscan/api"
+        with self.client('cache') as client:
+            self.assertEqual(client.get(error_url, params={'module': 'account'}).json()['status'], '0')
+            client.get(error_url, params={'module': 'account'})
+            self.assertEqual(self.server.requests, 2)
+
+            client.get(f"{self.server.url}/archive/live", record=False)
+            client.get(f"{self.server.url}/archive/live")
+            self.assertEqual(self.server.requests, 4)
+
+        self.store.validator = lambda response: response.json()['n'] > 100
+        with self.client('record') as client:
+            client.get(f"{self.server.url}/archive/rejected")
+
+        with self.client('replay') as client:
+            with self.assertRaises(ReplayMiss):
+                client.get(error_url, params={'module': 'account'})
+            with self.assertRaises(ReplayMiss):
+                client.get(f"{self.server.url}/archive/rejected")
+            self.assertEqual(client.get(f"{self.server.url}/archive/live").json()['n'], 3)
+
+    def test_store_from_env(self):
+        """HTTP_REPLAY_MODE / HTTP_REPLAY_DIR 환경 변수"""
+        with mock.patch.dict(os.environ, {'HTTP_REPLAY_MODE': 'replay', 'HTTP_REPLAY_DIR': self.tmp.name}):
+            store, mode = store_from_env()
+        self.assertEqual((mode, str(store.root)), ('replay', self.tmp.name))
+        with mock.patch.dict(os.environ, {'HTTP_REPLAY_MODE': 'off'}):
+            self.assertEqual(store_from_env(), (None, 'off'))
+        with mock.patch.dict(os.environ, {'HTTP_REPLAY_MODE': 'bogus'}):
+            with self.assertRaises(ValueError):
+                store_from_env()
+
+
+if __name__ == '__main__':
+    unittest.main()
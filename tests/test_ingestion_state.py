@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+수집 워터마크(ingestion_state) 테스트
+임시 SQLite DB로 전진 / 역행 방지 / 데이터와 같은 트랜잭션 반영 / 저장 실패 시 유지 확인
+"""
+
+import sqlite3
+import tempfile
+import unittest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.ingestion_state import IngestionState, SQLiteIngestionState, SupabaseIngestionState
+
+KEY = ('bscscan', '0xwhale', 'whale_transactions')
+
+
+class TestSQLiteIngestionState(unittest.TestCase):
+    """SQLite 워터마크 저장소 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / 'state.db'
+        self.state = SQLiteIngestionState(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_advance_never_moves_backwards(self):
+        """블록 / 타임스탬프는 더 큰 값으로만 갱신, None은 기존 값 유지"""
+        self.assertIsNone(self.state.get(*KEY))
+
+        self.state.advance(*KEY, last_block=100, last_timestamp=datetime(2025, 5, 1, 9, 0), cursor='a')
+        self.state.advance(*KEY, last_block=90, last_timestamp='2025-04-01T00:00:00+00:00')
+        self.state.advance(*KEY, cursor='b')
+
+        row = self.state.get(*KEY)
+        self.assertEqual(row['last_block'], 100)
+        self.assertEqual(row['last_timestamp'], '2025-05-01T09:00:00+00:00')
+        self.assertEqual(row['cursor'], 'b')
+
+        self.state.advance(*KEY, last_block=150, last_timestamp=datetime(2025, 5, 2, tzinfo=timezone.utc))
+        self.assertEqual(self.state.last_block(*KEY), 150)
+        self.assertEqual(self.state.last_timestamp(*KEY), '2025-05-02T00:00:00+00:00')
+
+    def test_advance_commits_with_caller_transaction(self):
+        """conn을 주면 데이터와 같은 트랜잭션 (롤백 시 워터마크도 그대로)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE rows (date TEXT PRIMARY KEY)")
+        conn.commit()
+
+        conn.execute("INSERT INTO rows VALUES ('2025-01-01')")
+        self.state.advance('binance', 'BTCUSDT', 'spot_daily', last_timestamp='2025-01-01', conn=conn)
+        conn.rollback()
+        self.assertIsNone(self.state.get('binance', 'BTCUSDT', 'spot_daily'))
+
+        conn.execute("INSERT INTO rows VALUES ('2025-01-02')")
+        self.state.advance('binance', 'BTCUSDT', 'spot_daily', last_timestamp='2025-01-02', conn=conn)
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.state.last_timestamp('binance', 'BTCUSDT', 'spot_daily'), '2025-01-02')
+
+    def test_advancing_skips_on_failure(self):
+        """advancing 블록에서 예외가 나면 전진하지 않음, 값을 채우지 않으면 기록하지 않음"""
+        with self.assertRaises(RuntimeError):
+            with self.state.advancing(*KEY) as mark:
+                mark['last_block'] = 10
+                raise RuntimeError('upsert failed')
+        self.assertIsNone(self.state.get(*KEY))
+
+        with self.state.advancing(*KEY):
+            pass
+        self.assertIsNone(self.state.get(*KEY))
+
+        with self.state.advancing(*KEY) as mark:
+            mark['last_block'] = 10
+        self.assertEqual(self.state.last_block(*KEY), 10)
+
+    def test_all_filters_by_source(self):
+        """source별 조회"""
+        self.state.advance(*KEY, last_block=1)
+        self.state.advance('binance', 'BTC', 'price_history_1h', last_timestamp='2025-01-01T00:00:00+00:00')
+        self.assertEqual([row['entity'] for row in self.state.all()], ['BTC', '0xwhale'])
+        self.assertEqual([row['entity'] for row in self.state.all(source='bscscan')], ['0xwhale'])
+
+
+
+class _FakeQuery:
+    """supabase-py 조회 체인 대역 (PostgREST처럼 요청당 최대 max_rows행)"""
+
+    def __init__(self, rows, calls, max_rows=1000):
+        self.rows = rows
+        self.calls = calls
+        self.max_rows = max_rows
+        self.bounds = (0, len(rows) - 1)
+
+    def select(self, *args):
+        return self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row[column] == value]
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        start, end = self.bounds
+        self.calls.append(self.bounds)
+        return type('Response', (), {'data': self.rows[start:min(end + 1, start + self.max_rows)]})()
+
+
+class TestIngestionStateInterface(unittest.TestCase):
+    """워터마크 저장소 인터페이스 테스트"""
+
+    def test_incomplete_backend_fails_on_instantiation(self):
+        """get / advance / all 중 하나라도 빠진 저장소는 생성 시 TypeError"""
+        class _NoAll(IngestionState):
+            def get(self, source, entity, stream):
+                return None
+
+            def advance(self, source, entity, stream, last_block=None, last_timestamp=None, cursor=None):
+                pass
+
+        with self.assertRaises(TypeError):
+            IngestionState()
+        with self.assertRaises(TypeError):
+            _NoAll()
+
+
+class TestSupabaseIngestionState(unittest.TestCase):
+    """Supabase 워터마크 저장소 테스트"""
+
+    def test_all_pages_past_row_limit(self):
+        """1000행 넘는 워터마크도 range 페이지로 모두 조회"""
+        rows = [{'source': 'bscscan', 'entity': f'0x{i:04d}', 'stream': 'whale_transactions'} for i in range(2500)]
+        rows.append({'source': 'binance', 'entity': 'BTC', 'stream': 'price_history_1h'})
+        calls = []
+        supabase = type('Client', (), {'table': lambda self, name: _FakeQuery(rows, calls)})()
+
+        state = SupabaseIngestionState(supabase)
+        self.assertEqual(len(state.all(source='bscscan')), 2500)
+        self.assertEqual(calls, [(0, 999), (1000, 1999), (2000, 2999)])
+
+
+if __name__ == '__main__':
+    unittest.main()
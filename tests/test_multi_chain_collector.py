@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+멀티체인 동시 수집기 테스트
+로컬 모의 HTTP 서버로 제공자별 파싱 / 동시 실행 / 동시 요청 수 제한 / 429 재시도 확인 (외부 API 호출 없음)
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors import multi_chain_collector
+from src.collectors.ingestion_state import SQLiteIngestionState
+from src.collectors.multi_chain_collector import MultiChainCollector, fetch_etherscan_transactions
+from src.collectors.utxo import utxo_records
+
+ETH_ADDRESS = '0xWhale'
+NO_LIMIT = {'rate': 1000.0, 'burst': 1000, 'max_in_flight': 8}
+
+
+def _insight_tx(txid, height, vin, vout):
+    return {
+        'txid': txid, 'blockheight': height, 'time': 1700000000,
+        'vin': [{'addr': addr, 'value': value} for addr, value in vin],
+        'vout': [{'value': str(value), 'scriptPubKey': {'addresses': [addr]}} for addr, value in vout],
+    }
+
+
+# 최신순 (Insight 응답 순서)
+VTC_TXS = [
+    _insight_tx('vtc-3', 9, [('vtc-other', 5.0)], [('vtc-whale', 4.9)]),
+    _insight_tx('vtc-2', 8, [('vtc-whale', 2.0)], [('vtc-other', 1.5), ('vtc-whale', 0.49)]),
+    _insight_tx('vtc-1', 7, [('vtc-other', 1.0)], [('vtc-whale', 1.0)]),
+]
+
+
+class _MockExplorer:
+    """경로별 응답 / 지연 / 동시 요청 수 기록"""
+
+    def __init__(self):
+        self.delays = {}
+        self.failures = {}
+        self.hits = {}
+        self.active = {}
+        self.peak = {}
+        self.insight_paging = True
+        self.sochain_history = {}
+        self.lock = threading.Lock()
+
+    def route(self, method, path, query, body):
+        if path == '/eth':
+            if query['action'][0] == 'txlist':
+                return 200, {'status': '1', 'result': [{
+                    'hash': '0xabc', 'blockNumber': '100', 'timeStamp': '1700000000',
+                    'from': ETH_ADDRESS, 'to': '0xExchange', 'value': str(2 * 10 ** 18),
+                    'gasUsed': '21000', 'gasPrice': '1', 'isError': '0'
+                }]}
+            return 200, {'status': '1', 'result': [{
+                'hash': '0xlink', 'blockNumber': '101', 'timeStamp': '1700000100',
+                'from': '0xOther', 'to': ETH_ADDRESS, 'value': str(5 * 10 ** 18), 'tokenDecimal': '18',
+                'contractAddress': '0xLINK', 'gasUsed': '50000', 'gasPrice': '1'
+            }]}
+        if path.startswith('/sochain/get_address_transactions/BTC/'):
+            address, page = path.split('/')[-2:]
+            if address in self.sochain_history:
+                start = (int(page) - 1) * multi_chain_collector.SOCHAIN_PAGE_SIZE
+                txs = self.sochain_history[address][start:start + multi_chain_collector.SOCHAIN_PAGE_SIZE]
+                return 200, {'status': 'success', 'data': {'txs': txs}}
+            return 200, {'status': 'success', 'data': {'txs': [{
+                'txid': 'btc-tx', 'block_no': 800000, 'time': 1700000000,
+                'inputs': [{'address': address, 'value': 150000000}],
+                'outputs': [{'address': 'bc1other', 'value': 149990000}]
+            }]}}
+        if path == '/subscan/api/scan/transfers':
+            return 200, {'code': 0, 'data': {'transfers': [{
+                'hash': 'dot-tx', 'block_num': 5, 'block_timestamp': 1700000000,
+                'from': body['address'], 'to': 'dot-other', 'amount': '30000000000', 'success': True
+            }]}}
+        if path == '/solscan/account/transactions':
+            return 200, [{'txHash': 'sol-tx', 'slot': 9, 'blockTime': 1700000000, 'amount': 3 * 10 ** 9}]
+        if path.startswith('/vtc/addrs/') and self.insight_paging:
+            start, end = int(query['from'][0]), int(query['to'][0])
+            return 200, {'totalItems': len(VTC_TXS), 'from': start, 'to': end, 'items': VTC_TXS[start:end]}
+        if path.startswith('/vtc/addr/'):
+            return 200, {'transactions': ['vtc-1', 'vtc-2', 'vtc-bad']}
+        if path.startswith('/vtc/tx/'):
+            details = {tx['txid']: tx for tx in VTC_TXS}
+            if path.rsplit('/', 1)[1] not in details:
+                return 404, {'error': 'not found'}
+            return 200, details[path.rsplit('/', 1)[1]]
+        return 404, {'error': 'unknown'}
+
+    def handle(self, handler, method):
+        parsed = urlparse(handler.path)
+        prefix = '/' + parsed.path.strip('/').split('/')[0]
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+
+        with self.lock:
+            self.hits[prefix] = self.hits.get(prefix, 0) + 1
+            self.active[prefix] = self.active.get(prefix, 0) + 1
+            self.peak[prefix] = max(self.peak.get(prefix, 0), self.active[prefix])
+            failures = self.failures.get(prefix, 0)
+            if failures:
+                self.failures[prefix] = failures - 1
+        try:
+            time.sleep(self.delays.get(prefix, 0.0))
+            if failures:
+                status, payload, headers = 429, {'message': 'rate limited'}, {'Retry-After': '0'}
+            else:
+                status, payload = self.route(method, parsed.path, parse_qs(parsed.query), body)
+                headers = {}
+            data = json.dumps(payload).encode()
+            handler.send_response(status)
+            handler.send_header('Content-Type', 'application/json')
+            handler.send_header('Content-Length', str(len(data)))
+            for key, value in headers.items():
+                handler.send_header(key, value)
+            handler.end_headers()
+            handler.wfile.write(data)
+        finally:
+            with self.lock:
+                self.active[prefix] -= 1
+
+
+def _make_handler(explorer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            explorer.handle(self, 'GET')
+
+        def do_POST(self):
+            explorer.handle(self, 'POST')
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class TestMultiChainCollector(unittest.TestCase):
+    """멀티체인 동시 수집기 테스트"""
+
+    def setUp(self):
+        self.explorer = _MockExplorer()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(self.explorer))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.base_urls = {
+            'ethereum': f'{base}/eth', 'bsc': f'{base}/eth', 'btc': f'{base}/sochain',
+            'polkadot': f'{base}/subscan', 'solana': f'{base}/solscan', 'vtc': f'{base}/vtc'
+        }
+        self.api_keys = {'etherscan': 'key', 'sochain': '', 'subscan': 'key', 'solscan': 'key'}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _collector(self, limits=None, **kwargs):
+        limits = limits or {provider: NO_LIMIT for provider in ('etherscan', 'sochain', 'subscan', 'solscan', 'vtc')}
+        return MultiChainCollector(api_keys=self.api_keys, base_urls=self.base_urls, limits=limits, **kwargs)
+
+    def test_collects_all_providers(self):
+        """제공자별 응답 파싱 (VTC는 주소 거래 페이지의 입출력 기준)"""
+        with self._collector() as collector:
+            results = collector.collect({
+                'ethereum': [ETH_ADDRESS], 'btc': ['bc1whale'], 'polkadot': ['dot-whale'],
+                'solana': ['sol-whale'], 'vtc': ['vtc-whale']
+            })
+
+        self.assertEqual([tx['coin_symbol'] for tx in results['ethereum']], ['ETH', 'LINK'])
+        self.assertEqual(results['ethereum'][0]['value'], 2.0)
+        self.assertEqual(results['ethereum'][1]['to_address'], ETH_ADDRESS.lower())
+        self.assertEqual(results['btc'][0]['from_address'], 'bc1whale')
+        self.assertEqual(results['btc'][0]['to_address'], 'bc1other')
+        self.assertEqual(results['btc'][0]['value'], 1.5)
+        self.assertEqual(results['polkadot'][0]['value'], 3.0)
+        self.assertEqual(results['solana'][0]['value'], 3.0)
+        self.assertEqual([tx['tx_hash'] for tx in results['vtc']], ['vtc-3', 'vtc-2', 'vtc-2', 'vtc-1'])
+        self.assertEqual(results['vtc'][1]['from_address'], 'vtc-whale')
+        self.assertEqual(results['vtc'][1]['to_address'], 'vtc-other')
+        self.assertEqual(results['vtc'][1]['value'], 2.0)
+
+    def test_vtc_falls_back_to_tx_details(self):
+        """주소 거래 페이지를 지원하지 않으면(404) 거래 ID 조회 후 상세 조회, 상세 조회 실패가 있으면 워터마크 유지"""
+        self.explorer.insight_paging = False
+        with tempfile.TemporaryDirectory() as tmp:
+            state = SQLiteIngestionState(Path(tmp) / 'state.db')
+            with self._collector(state=state) as collector:
+                results = collector.collect({'vtc': ['vtc-whale']})
+                self.assertEqual(collector.failed_addresses, {'vtc': ['vtc-whale']})
+                self.assertEqual(collector.commit_watermarks(), 0)
+            self.assertIsNone(state.last_block('vtc', 'vtc-whale', 'whale_transactions'))
+        self.assertEqual(sorted(tx['tx_hash'] for tx in results['vtc']), ['vtc-1', 'vtc-2', 'vtc-2'])
+
+    def test_sochain_pages_until_watermark(self):
+        """SoChain 주소 거래는 최신순 페이지로 조회, 워터마크 이하 블록이 나온 페이지에서 중단"""
+        self.explorer.sochain_history['bc1busy'] = [
+            {
+                'txid': f'btc-{height}', 'block_no': height, 'time': 1700000000,
+                'inputs': [{'address': 'bc1other', 'value': 100000000}],
+                'outputs': [{'address': 'bc1busy', 'value': 100000000}]
+            }
+            for height in range(800010, 799990, -1)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            state = SQLiteIngestionState(Path(tmp) / 'state.db')
+            state.advance('sochain', 'bc1busy', 'whale_transactions', last_block=799995)
+            with mock.patch.object(multi_chain_collector, 'SOCHAIN_PAGE_SIZE', 4):
+                with self._collector(state=state) as collector:
+                    results = collector.collect({'btc': ['bc1busy']})
+                    collector.commit_watermarks()
+
+            self.assertEqual(len(results['btc']), 15)
+            self.assertEqual(self.explorer.hits['/sochain'], 4)
+            self.assertEqual(state.last_block('sochain', 'bc1busy', 'whale_transactions'), 800010)
+
+    def test_utxo_watermark_skips_stored_transactions(self):
+        """워터마크 이하 블록은 수집하지 않고 페이지 조회도 중단, 워터마크는 commit_watermarks()에서만 전진"""
+        with tempfile.TemporaryDirectory() as tmp:
+            state = SQLiteIngestionState(Path(tmp) / 'state.db')
+            state.advance('vtc', 'vtc-whale', 'whale_transactions', last_block=7)
+            state.advance('sochain', 'bc1whale', 'whale_transactions', last_block=800000)
+
+            with mock.patch.object(multi_chain_collector, 'INSIGHT_PAGE_SIZE', 1):
+                with self._collector(state=state) as collector:
+                    results = collector.collect({'vtc': ['vtc-whale'], 'btc': ['bc1whale', 'bc1new']})
+
+                    self.assertEqual(sorted({tx['tx_hash'] for tx in results['vtc']}), ['vtc-2', 'vtc-3'])
+                    self.assertEqual([tx['from_address'] for tx in results['btc']], ['bc1new'])
+                    self.assertEqual(self.explorer.hits['/vtc'], 3)
+                    self.assertEqual(state.last_block('vtc', 'vtc-whale', 'whale_transactions'), 7)
+
+                    self.assertEqual(collector.commit_watermarks(), 2)
+
+            self.assertEqual(state.last_block('vtc', 'vtc-whale', 'whale_transactions'), 9)
+            self.assertEqual(state.last_block('sochain', 'bc1new', 'whale_transactions'), 800000)
+
+    def test_providers_run_concurrently_within_in_flight_limit(self):
+        """느린 제공자가 다른 체인을 막지 않고, 제공자별 동시 요청 수는 한도 이내"""
+        self.explorer.delays = {'/sochain': 0.2, '/subscan': 0.2}
+        limits = {
+            'sochain': {'rate': 1000.0, 'burst': 1000, 'max_in_flight': 2},
+            'subscan': {'rate': 1000.0, 'burst': 1000, 'max_in_flight': 4},
+        }
+        with self._collector(limits=limits) as collector:
+            start = time.perf_counter()
+            results = collector.collect({
+                'btc': [f'bc1-{i}' for i in range(4)],
+                'polkadot': [f'dot-{i}' for i in range(4)]
+            })
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual((len(results['btc']), len(results['polkadot'])), (4, 4))
+        self.assertEqual(self.explorer.peak['/sochain'], 2)
+        self.assertLessEqual(self.explorer.peak['/subscan'], 4)
+        # 순차 실행이면 8 × 0.2초, 동시 실행이면 sochain 2회분(0.4초) 근처
+        self.assertLess(elapsed, 0.9)
+
+    def test_retries_throttled_requests(self):
+        """429는 Retry-After 후 재시도, 재시도 초과 주소는 건너뜀"""
+        self.explorer.failures = {'/solscan': 2}
+        with self._collector(max_retries=2, backoff_base=0.0) as collector:
+            results = collector.collect({'solana': ['sol-whale']})
+            stats = collector.get_stats()['solscan']
+        self.assertEqual(len(results['solana']), 1)
+        self.assertEqual((stats['requests'], stats['retries'], stats['throttled']), (3, 2, 2))
+
+        self.explorer.failures = {'/solscan': 5}
+        with self._collector(max_retries=1, backoff_base=0.0) as collector:
+            results = collector.collect({'solana': ['sol-whale']})
+            self.assertEqual(results['solana'], [])
+            self.assertEqual(collector.failed_addresses, {'solana': ['sol-whale']})
+
+    def test_missing_key_skips_provider(self):
+        """API 키가 필요한 제공자는 키가 없으면 요청하지 않음"""
+        self.api_keys['subscan'] = ''
+        with self._collector() as collector:
+            results = collector.collect({'polkadot': ['dot-whale']})
+        self.assertEqual(results, {'polkadot': []})
+        self.assertNotIn('/subscan', self.explorer.hits)
+        self.assertEqual(fetch_etherscan_transactions([ETH_ADDRESS], 'ethereum', ''), [])
+
+
+class TestUtxoRecords(unittest.TestCase):
+    """UTXO 입출력 평탄화 테스트"""
+
+    def test_flattens_inputs_and_outputs(self):
+        """출금은 첫 다른 출력, 입금은 첫 다른 입력이 상대 주소 (주소 없는 출력 / 파싱 실패 거래 제외)"""
+        txs = [
+            {'id': 'a', 'in': [('W', 300), ('X', 100)], 'out': [(None, 0), ('Y', 250), ('w', 140)]},
+            {'id': 'b', 'in': None, 'out': [('W', 1)]},
+            {'id': 'c', 'in': [('Z', 50)], 'out': [('W', 50)]},
+        ]
+        records = utxo_records(
+            txs, 'W',
+            inputs_of=lambda tx: list(tx['in']),
+            outputs_of=lambda tx: tx['out'],
+            meta_of=lambda tx: (tx['id'], 1, None),
+            coin='BTC', chain='btc', unit=100
+        )
+
+        self.assertEqual(
+            [(r['tx_hash'], r['from_address'], r['to_address'], r['value']) for r in records],
+            [('a', 'w', 'y', 3.0), ('a', 'x', 'w', 1.4), ('c', 'z', 'w', 0.5)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
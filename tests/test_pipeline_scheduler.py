@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인 DAG 스케줄러 테스트
+호출 가능 객체 / 짧은 하위 프로세스 작업으로 의존 순서, 동시 실행 / 자원 한도, 재시도, 실패 전파, 재개 확인
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.ingestion_state import SQLiteIngestionState
+from src.pipeline import Job, JobGraph, Scheduler, build_collection_graph
+
+
+class _Recorder:
+    """작업 시작 / 종료 순서와 최대 동시 실행 수 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.running = 0
+        self.max_running = 0
+
+    def job(self, name, duration=0.05, fail_times=0):
+        calls = {'count': 0}
+
+        def run():
+            with self.lock:
+                calls['count'] += 1
+                attempt = calls['count']
+                self.events.append(('start', name))
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            time.sleep(duration)
+            with self.lock:
+                self.running -= 1
+                self.events.append(('end', name))
+            if attempt <= fail_times:
+                raise RuntimeError(f"{name} 실패 {attempt}")
+
+        return run
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+def _statuses(snapshot):
+    return {job['name']: job['status'] for job in snapshot['jobs']}
+
+
+class TestJobGraph(unittest.TestCase):
+    """DAG 검증 테스트"""
+
+    def test_order_and_validation(self):
+        """위상 정렬은 선언 순서 유지, 없는 의존 / 순환은 오류"""
+        noop = lambda: None
+        graph = JobGraph([
+            Job('b', func=noop, deps=['a']),
+            Job('a', func=noop),
+            Job('c', func=noop),
+        ])
+        self.assertEqual(graph.order(), ['a', 'c', 'b'])
+        self.assertEqual(sorted(graph.subgraph(['b']).jobs), ['a', 'b'])
+
+        with self.assertRaises(ValueError):
+            JobGraph([Job('a', func=noop, deps=['missing'])]).order()
+        with self.assertRaises(ValueError):
+            JobGraph([Job('a', func=noop, deps=['b']), Job('b', func=noop, deps=['a'])]).order()
+
+    def test_collection_graph_is_valid(self):
+        """수집 DAG: 가격 수집 → amount_usd, 라벨 전파 → 고래 집계"""
+        graph = build_collection_graph(python='python3')
+        order = graph.order()
+        self.assertLess(order.index('price_history'), order.index('amount_usd'))
+        self.assertLess(order.index('label_propagation'), order.index('whale_stats'))
+        for job in graph.jobs.values():
+            self.assertTrue((ROOT / job.command[1]).exists(), job.command[1])
+
+
+class TestScheduler(unittest.TestCase):
+    """실행 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp.name)
+        self.recorder = _Recorder()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_runs_independent_jobs_concurrently_after_deps(self):
+        """독립 작업은 동시에, 후속 작업은 선행 작업이 모두 끝난 뒤, 자원 한도 준수"""
+        rec = self.recorder
+        graph = JobGraph([
+            Job('price', func=rec.job('price'), resources={'db': 1}),
+            Job('btc', func=rec.job('btc')),
+            Job('bsc', func=rec.job('bsc')),
+            Job('usd', func=rec.job('usd'), deps=['price', 'btc', 'bsc'], resources={'db': 1}),
+        ])
+        snapshot = Scheduler(
+            graph, max_workers=3, resource_limits={'db': 1}, status_path=self.tmp_path / 'status.json'
+        ).run()
+
+        self.assertEqual(set(_statuses(snapshot).values()), {'done'})
+        self.assertEqual(rec.max_running, 3)
+        for dep in ('price', 'btc', 'bsc'):
+            self.assertLess(rec.index('end', dep), rec.index('start', 'usd'))
+        status = json.loads((self.tmp_path / 'status.json').read_text(encoding='utf-8'))
+        self.assertEqual(status['counts'], {'done': 4})
+
+    def test_resource_limit_serializes_jobs(self):
+        """같은 자원을 쓰는 작업은 한도만큼만 동시 실행"""
+        rec = self.recorder
+        graph = JobGraph([Job(f"sqlite_{i}", func=rec.job(f"sqlite_{i}"), resources={'sqlite': 1}) for i in range(3)])
+        Scheduler(graph, max_workers=3, resource_limits={'sqlite': 1}).run()
+        self.assertEqual(rec.max_running, 1)
+
+    def test_retry_then_block_descendants_only(self):
+        """재시도 후 성공 / 최종 실패는 후속 작업만 blocked, 독립 작업은 계속"""
+        rec = self.recorder
+        graph = JobGraph([
+            Job('flaky', func=rec.job('flaky', fail_times=1), retries=1, retry_delay=0.01),
+            Job('broken', func=rec.job('broken', fail_times=5), retries=1, retry_delay=0.01),
+            Job('label', func=rec.job('label'), deps=['broken']),
+            Job('aggregate', func=rec.job('aggregate'), deps=['label']),
+            Job('sync', func=rec.job('sync'), deps=['flaky']),
+        ])
+        snapshot = Scheduler(graph, max_workers=2).run()
+        statuses = _statuses(snapshot)
+
+        self.assertEqual(statuses, {
+            'flaky': 'done', 'broken': 'failed', 'label': 'blocked', 'aggregate': 'blocked', 'sync': 'done'
+        })
+        attempts = {job['name']: job['attempts'] for job in snapshot['jobs']}
+        self.assertEqual(attempts['flaky'], 2)
+        self.assertEqual(attempts['broken'], 2)
+
+    def test_resume_skips_jobs_done_in_same_run(self):
+        """같은 run_id 재실행은 실패한 작업부터, 다른 run_id는 처음부터"""
+        state = SQLiteIngestionState(self.tmp_path / 'state.db')
+        outcome = {'fail': True}
+        calls = []
+
+        def collect():
+            calls.append('collect')
+
+        def aggregate():
+            calls.append('aggregate')
+            if outcome['fail']:
+                raise RuntimeError('집계 실패')
+
+        graph = JobGraph([
+            Job('collect', func=collect),
+            Job('aggregate', func=aggregate, deps=['collect']),
+        ])
+
+        first = Scheduler(graph, state=state, run_id='run-1').run()
+        self.assertEqual(_statuses(first), {'collect': 'done', 'aggregate': 'failed'})
+
+        outcome['fail'] = False
+        second = Scheduler(graph, state=state, run_id='run-1').run()
+        self.assertEqual(_statuses(second), {'collect': 'skipped', 'aggregate': 'done'})
+        self.assertEqual(calls, ['collect', 'aggregate', 'aggregate'])
+
+        Scheduler(graph, state=state, run_id='run-2').run()
+        self.assertEqual(calls.count('collect'), 2)
+
+    def test_command_job_logs_and_timeout(self):
+        """하위 프로세스 작업: 출력은 작업 로그로, 제한 시간 초과는 종료 후 실패"""
+        graph = JobGraph([
+            Job('echo', command=[sys.executable, '-c', "print('수집 100/100')"]),
+            Job('slow', command=[sys.executable, '-c', 'import time; time.sleep(30)'], timeout=0.5),
+        ])
+        started = time.monotonic()
+        snapshot = Scheduler(graph, run_id='cmd', log_dir=self.tmp_path / 'logs').run()
+
+        self.assertLess(time.monotonic() - started, 20)
+        jobs = {job['name']: job for job in snapshot['jobs']}
+        self.assertEqual(jobs['echo']['status'], 'done')
+        self.assertIn('수집 100/100', Path(jobs['echo']['log']).read_text(encoding='utf-8'))
+        self.assertEqual(jobs['slow']['status'], 'failed')
+        self.assertIn('제한 시간', jobs['slow']['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
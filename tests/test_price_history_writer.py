@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+price_history 대량 upsert 테스트
+가짜 Supabase 테이블로 충돌 기준 / 동시 전송 / 실패 조각만 재전송 / 진행 카운터 확인 (DB 연결 없음)
+"""
+
+import threading
+import time
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from postgrest.exceptions import APIError
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.bulk_upsert import BulkUpserter
+from src.collectors.price_history_writer import (
+    PRICE_HISTORY_CONFLICT,
+    build_price_history_records,
+    upsert_price_history
+)
+
+
+class _FakeSupabase:
+    """upsert 요청 기록 + 조건에 맞는 요청 실패 (error()로 만든 예외) + 동시 요청 수 기록"""
+
+    def __init__(self, fail_if=None, delay=0.0, error=None):
+        self.fail_if = fail_if or (lambda rows, attempt: False)
+        self.error = error or (lambda: RuntimeError('upsert failed'))
+        self.delay = delay
+        self.calls = []
+        self.rows = {}
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _FakeTable(self, name)
+
+
+class _FakeTable:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self.rows = rows
+        self.on_conflict = on_conflict
+        return self
+
+    def execute(self):
+        db = self.db
+        with db.lock:
+            attempt = sum(1 for call in db.calls if call[1] == len(self.rows) and call[2] == self.rows[0])
+            db.calls.append((self.on_conflict, len(self.rows), self.rows[0]))
+            db.active += 1
+            db.peak = max(db.peak, db.active)
+        try:
+            time.sleep(db.delay)
+            if db.fail_if(self.rows, attempt):
+                raise db.error()
+            with db.lock:
+                for row in self.rows:
+                    key = tuple(row.get(column) for column in self.on_conflict.split(','))
+                    db.rows[key] = row
+        finally:
+            with db.lock:
+                db.active -= 1
+
+
+def _api_error(code, message):
+    return APIError({'code': code, 'message': message, 'details': None, 'hint': None})
+
+
+def _rows(count):
+    return [{'crypto_id': 'btc', 'timestamp': str(i), 'data_source': 'binance'} for i in range(count)]
+
+
+class TestBulkUpserter(unittest.TestCase):
+    """대량 upsert 테스트"""
+
+    def test_batches_run_concurrently_within_worker_limit(self):
+        """배치는 on_conflict 기준으로 동시에 전송, 동시 요청 수는 max_workers 이내"""
+        db = _FakeSupabase(delay=0.05)
+        upserter = BulkUpserter(db, 'price_history', PRICE_HISTORY_CONFLICT, batch_size=100, max_workers=3)
+        written = upserter.upsert(_rows(1000))
+
+        self.assertEqual(written, 1000)
+        self.assertEqual(len(db.rows), 1000)
+        self.assertEqual(len(db.calls), 10)
+        self.assertEqual({call[0] for call in db.calls}, {PRICE_HISTORY_CONFLICT})
+        self.assertEqual(db.peak, 3)
+
+        progress = upserter.get_progress()
+        self.assertEqual((progress['rows_written'], progress['batches_done'], progress['batches_total']), (1000, 10, 10))
+        self.assertGreater(progress['rows_per_sec'], 0)
+
+    def test_transient_failure_is_retried(self):
+        """일시 실패는 같은 배치를 재시도"""
+        db = _FakeSupabase(fail_if=lambda rows, attempt: attempt == 0 and rows[0]['timestamp'] == '0')
+        upserter = BulkUpserter(db, 'price_history', PRICE_HISTORY_CONFLICT, batch_size=10, backoff_base=0.0)
+        self.assertEqual(upserter.upsert(_rows(30)), 30)
+
+        progress = upserter.get_progress()
+        self.assertEqual((progress['requests'], progress['retries'], progress['splits']), (4, 1, 0))
+
+    def test_only_failed_slices_are_resent(self):
+        """행 제약 오류로 실패하는 배치는 반씩 나눠 문제 행만 격리, 나머지 배치는 다시 보내지 않음"""
+        db = _FakeSupabase(
+            fail_if=lambda rows, attempt: any(row['timestamp'] == '5' for row in rows),
+            error=lambda: _api_error('23502', 'null value in column "close" violates not-null constraint')
+        )
+        progress_calls = []
+        upserter = BulkUpserter(
+            db, 'price_history', PRICE_HISTORY_CONFLICT, batch_size=8, max_retries=1,
+            backoff_base=0.0, progress_callback=progress_calls.append
+        )
+        written = upserter.upsert(_rows(16))
+
+        self.assertEqual(written, 15)
+        self.assertEqual(upserter.failed_rows, [_rows(16)[5]])
+        self.assertNotIn(('btc', '5', 'binance'), db.rows)
+        # 정상 배치 1회 + 실패 배치 1회(행 오류는 재시도 없음) + 조각 (4, 4, 2, 2, 1, 1)
+        self.assertEqual(len(db.calls), 8)
+        self.assertEqual(len(progress_calls), 2)
+
+        progress = upserter.get_progress()
+        self.assertEqual((progress['rows_failed'], progress['retries'], progress['splits']), (1, 0, 3))
+
+    def test_non_row_errors_are_raised_without_splitting(self):
+        """권한 / 스키마 오류는 바로, 네트워크 오류는 재시도 후 예외 발생 (배치를 나누지 않음)"""
+        for code in ('42501', 'PGRST204'):
+            db = _FakeSupabase(fail_if=lambda rows, attempt: True, error=lambda: _api_error(code, 'rejected'))
+            upserter = BulkUpserter(db, 'price_history', PRICE_HISTORY_CONFLICT, batch_size=8, backoff_base=0.0)
+            with self.assertRaises(APIError):
+                upserter.upsert(_rows(8))
+            progress = upserter.get_progress()
+            self.assertEqual((progress['requests'], progress['retries'], progress['splits']), (1, 0, 0))
+            self.assertEqual(db.rows, {})
+
+        db = _FakeSupabase(fail_if=lambda rows, attempt: True, error=lambda: ConnectionError('connection reset'))
+        upserter = BulkUpserter(db, 'price_history', PRICE_HISTORY_CONFLICT, batch_size=8, max_retries=2, backoff_base=0.0)
+        with self.assertRaises(ConnectionError):
+            upserter.upsert(_rows(8))
+        progress = upserter.get_progress()
+        self.assertEqual((progress['requests'], progress['retries'], progress['splits']), (3, 2, 0))
+        self.assertEqual(upserter.failed_rows, [])
+
+
+class TestPriceHistoryRecords(unittest.TestCase):
+    """price_history 행 변환 테스트"""
+
+    def _kline(self, hour, close):
+        open_time = datetime(2025, 5, 1, hour)
+        return {
+            'open_time': open_time, 'close_time': open_time + timedelta(minutes=59),
+            'open_price': 1.0, 'high_price': 2.0, 'low_price': 0.5, 'close_price': close,
+            'volume': 10.0, 'quote_volume': 20.0, 'trade_count': 3,
+            'taker_buy_volume': None, 'taker_buy_quote_volume': 4.0
+        }
+
+    def test_records_are_utc_and_deduplicated(self):
+        """타임존 없는 시각은 UTC, 같은 시각은 마지막 값만"""
+        records = build_price_history_records('btc', [self._kline(0, 1.0), self._kline(1, 1.5), self._kline(0, 1.2)], 'upbit')
+
+        self.assertEqual([record['timestamp'] for record in records], ['2025-05-01T00:00:00+00:00', '2025-05-01T01:00:00+00:00'])
+        self.assertEqual(records[0]['close_price'], '1.2')
+        self.assertIsNone(records[0]['taker_buy_volume'])
+        self.assertEqual(records[0]['taker_buy_quote_volume'], '4.0')
+        self.assertEqual(records[0]['raw_data']['close_time'], '2025-05-01T00:59:00+00:00')
+        self.assertEqual(records[0]['data_source'], 'upbit')
+
+    def test_upsert_price_history(self):
+        """K-line을 price_history 충돌 기준으로 저장하고 진행 카운터 반환"""
+        db = _FakeSupabase()
+        klines = [self._kline(hour, 1.0) for hour in range(24)]
+        klines[0]['open_time'] = klines[0]['open_time'].replace(tzinfo=timezone.utc)
+
+        progress = upsert_price_history(db, 'btc', klines, batch_size=10)
+        self.assertEqual((progress['rows_total'], progress['rows_written'], progress['batches_done']), (24, 24, 3))
+        self.assertIn(('btc', '2025-05-01T23:00:00+00:00', 'binance'), db.rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
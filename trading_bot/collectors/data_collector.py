@@ -5,7 +5,7 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 import pandas as pd
@@ -15,8 +15,16 @@ ROOT = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(ROOT / "app" / "utils"))
 sys.path.insert(0, str(ROOT))
 
+from trading_bot.utils.metrics import METRICS
+
 logger = logging.getLogger(__name__)
 
+# 일봉 / 리스크 데이터와 리스크 모델이 있는 코인 (DataLoader 지원 범위)
+MODEL_COINS = ("BTC", "ETH")
+
+# 리스크 데이터 조회 구간 (RiskPredictor.predict_risk와 동일)
+RISK_LOOKBACK_DAYS = 60
+
 
 class DataCollector:
     """
@@ -36,6 +44,9 @@ class DataCollector:
         self._risk_predictor = None
         self._feature_engineer = None
         
+        # 실시간 시세 저장소 (PriceStore, 봇 엔진이 연결, 없으면 일봉 데이터 사용)
+        self.price_store = None
+        
         # 지연 초기화 (필요할 때만 로드)
         self._initialized = False
     
@@ -82,6 +93,7 @@ class DataCollector:
             except ImportError as e:
                 logger.warning(f"FeatureEngineer 로드 실패: {e} (선택적 모듈)")
     
+    @METRICS.timed("model_inference")
     def get_risk_prediction(self, coin: str = "BTC", date: Optional[str] = None) -> Dict:
         """
         리스크 예측 결과 조회
@@ -105,32 +117,24 @@ class DataCollector:
                 date = datetime.now().strftime("%Y-%m-%d")
             
             prediction = self._risk_predictor.predict_risk(date, coin)
-            
-            if prediction.get('success'):
-                data = prediction.get('data', {})
-                return {
-                    'high_volatility_prob': data.get('high_volatility_prob', 0.5),
-                    'risk_score': data.get('risk_score', 50),
-                    'indicators': data.get('indicators', {}),
-                    'success': True
-                }
-            else:
-                logger.warning(f"리스크 예측 실패: {prediction.get('error')}")
-                return {
-                    'high_volatility_prob': 0.5,
-                    'risk_score': 50,
-                    'indicators': {},
-                    'success': False
-                }
-                
+            return self._to_risk(prediction)
+        
         except Exception as e:
             logger.error(f"리스크 예측 조회 실패: {e}")
+            return self._get_default_risk()
+    
+    def _to_risk(self, prediction: Dict) -> Dict:
+        """RiskPredictor 예측 결과 → get_risk_prediction 형식"""
+        if prediction.get('success'):
+            data = prediction.get('data', {})
             return {
-                'high_volatility_prob': 0.5,
-                'risk_score': 50,
-                'indicators': {},
-                'success': False
+                'high_volatility_prob': data.get('high_volatility_prob', 0.5),
+                'risk_score': data.get('risk_score', 50),
+                'indicators': data.get('indicators', {}),
+                'success': True
             }
+        logger.warning(f"리스크 예측 실패: {prediction.get('error')}")
+        return self._get_default_risk()
     
     def get_feature_values(self, coin: str = "BTC") -> Dict:
         """
@@ -143,73 +147,154 @@ class DataCollector:
             특성 값 딕셔너리
         """
         try:
-            self._init_data_loader()
-            self._init_feature_engineer()
-            
-            # 최근 데이터 로드
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-            
-            df = self._data_loader.load_risk_data(start_date, end_date, coin)
+            df, feature_cols = self._build_feature_frame(coin, days=30)
             
             if len(df) == 0:
                 logger.warning(f"{coin} 데이터가 없습니다.")
                 return {}
             
-            # 특성 생성
-            if self._feature_engineer:
-                df, feature_cols = self._feature_engineer.create_features(df, include_dynamic=True)
-            else:
-                # FeatureEngineer가 없으면 기본 특성만 사용
-                feature_cols = df.columns.tolist()
-            
-            # 최신 데이터의 특성 값들
-            if len(df) > 0:
-                latest = df.iloc[-1]
-                feature_values = {}
-                for col in feature_cols:
-                    if col in latest.index and col != 'date':
-                        value = latest[col]
-                        if pd.notna(value):
-                            try:
-                                feature_values[col] = float(value)
-                            except (ValueError, TypeError):
-                                pass
-                
-                return feature_values
-            
-            return {}
-            
+            return self._latest_feature_values(df, feature_cols)
+        
         except Exception as e:
             logger.error(f"특성 값 조회 실패: {e}")
             return {}
     
-    def get_current_price(self, coin: str = "BTC") -> float:
+    def get_risk_and_features(self, coin: str = "BTC") -> Dict:
         """
-        현재가 조회
+        리스크 예측 + 현재 특성 값 (리스크 데이터 로드 / 특성 생성 1회를 공유)
         
         Args:
             coin: 코인 심볼
         
         Returns:
-            현재가 (원)
+            {'risk': get_risk_prediction 형식, 'features': get_feature_values 형식}
+        """
+        try:
+            self._init_risk_predictor()
+            self._init_data_loader()
+            self._init_feature_engineer()
+        except Exception as e:
+            logger.error(f"리스크 / 특성 조회 준비 실패: {e}")
+            return {'risk': self._get_default_risk(), 'features': self.get_feature_values(coin)}
+        
+        if self._feature_engineer is None:
+            # 특성 생성기가 없으면 공유할 특성 프레임이 없음 → 각각 조회
+            return {'risk': self.get_risk_prediction(coin), 'features': self.get_feature_values(coin)}
+        
+        try:
+            df, feature_cols = self._build_feature_frame(coin, days=RISK_LOOKBACK_DAYS)
+        except Exception as e:
+            logger.error(f"리스크 / 특성 조회 실패: {e}")
+            return {'risk': self._get_default_risk(), 'features': {}}
+        
+        if len(df) == 0:
+            logger.warning(f"{coin} 데이터가 없습니다.")
+            return {'risk': self._get_default_risk(), 'features': {}}
+        
+        return {
+            'risk': self._predict_from_frame(df, feature_cols),
+            'features': self._latest_feature_values(df, feature_cols)
+        }
+    
+    @METRICS.timed("feature_generation")
+    def _build_feature_frame(self, coin: str, days: int):
+        """
+        최근 days일 리스크 데이터 로드 + 특성 생성 (동적 변수 포함)
+        
+        Returns:
+            (특성 데이터, 특성 컬럼 목록)
+        """
+        self._init_data_loader()
+        self._init_feature_engineer()
+        
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        
+        df = self._data_loader.load_risk_data(start_date, end_date, coin)
+        
+        if len(df) == 0:
+            return df, []
+        
+        if self._feature_engineer:
+            return self._feature_engineer.create_features(df, include_dynamic=True)
+        # FeatureEngineer가 없으면 기본 특성만 사용
+        return df, df.columns.tolist()
+    
+    @METRICS.timed("model_inference")
+    def _predict_from_frame(self, df: pd.DataFrame, feature_cols: List[str]) -> Dict:
+        """특성 생성이 끝난 데이터로 오늘 리스크 예측 (get_risk_prediction 형식)"""
+        try:
+            date = datetime.now().strftime("%Y-%m-%d")
+            return self._to_risk(self._risk_predictor.predict_from_features(df, date, feature_cols))
+        except Exception as e:
+            logger.error(f"리스크 예측 조회 실패: {e}")
+            return self._get_default_risk()
+    
+    def _latest_feature_values(self, df: pd.DataFrame, feature_cols: List[str]) -> Dict:
+        """최신 행의 특성 값 (숫자로 변환 가능한 값만)"""
+        latest = df.iloc[-1]
+        feature_values = {}
+        for col in feature_cols:
+            if col in latest.index and col != 'date':
+                value = latest[col]
+                if pd.notna(value):
+                    try:
+                        feature_values[col] = float(value)
+                    except (ValueError, TypeError):
+                        pass
+        return feature_values
+    
+    def _get_live_price(self, market: str) -> float:
+        """실시간 시세 조회 (저장소가 없거나 지연 상태면 0.0)"""
+        if self.price_store is None:
+            return 0.0
+        return self.price_store.get_price(market)
+    
+    @METRICS.timed("data_loading")
+    def load_exchange_frame(self, coin: str = "BTC") -> pd.DataFrame:
+        """
+        최근 거래소 데이터 조회 (현재가 / 김치 프리미엄 공용)
+        
+        Args:
+            coin: 코인 심볼
+        
+        Returns:
+            최근 1일 거래소 데이터 (실패 시 빈 DataFrame)
         """
         try:
             self._init_data_loader()
             
-            if coin == "BTC":
-                market = "KRW-BTC"
-            elif coin == "ETH":
-                market = "KRW-ETH"
-            else:
-                logger.warning(f"지원하지 않는 코인: {coin}")
-                return 0.0
-            
-            # 최신 일봉 데이터 조회
             end_date = datetime.now().strftime("%Y-%m-%d")
             start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
             
-            df = self._data_loader.load_exchange_data(start_date, end_date, coin)
+            return self._data_loader.load_exchange_data(start_date, end_date, coin)
+        
+        except Exception as e:
+            logger.error(f"거래소 데이터 조회 실패: {e}")
+            return pd.DataFrame()
+    
+    def get_current_price(self, coin: str = "BTC", exchange_df: Optional[pd.DataFrame] = None) -> float:
+        """
+        현재가 조회 (실시간 시세 우선, 없으면 최신 일봉 종가)
+        
+        Args:
+            coin: 코인 심볼
+            exchange_df: 이미 조회한 거래소 데이터 (None이면 새로 조회)
+        
+        Returns:
+            현재가 (원)
+        """
+        try:
+            live_price = self._get_live_price(f"KRW-{coin}")
+            if live_price > 0:
+                return live_price
+            
+            if coin not in MODEL_COINS:
+                logger.warning(f"실시간 시세가 없고 일봉 데이터를 지원하지 않는 코인: {coin}")
+                return 0.0
+            
+            # 최신 일봉 데이터 조회
+            df = exchange_df if exchange_df is not None else self.load_exchange_frame(coin)
             
             if len(df) > 0:
                 latest = df.iloc[-1]
@@ -217,17 +302,18 @@ class DataCollector:
                 return price
             
             return 0.0
-            
+        
         except Exception as e:
             logger.error(f"현재가 조회 실패: {e}")
             return 0.0
     
-    def get_premium_data(self, coin: str = "BTC") -> Dict:
+    def get_premium_data(self, coin: str = "BTC", exchange_df: Optional[pd.DataFrame] = None) -> Dict:
         """
-        김치 프리미엄 데이터 조회
+        김치 프리미엄 데이터 조회 (업비트 / 바이낸스 가격은 실시간 시세 우선)
         
         Args:
             coin: 코인 심볼
+            exchange_df: 이미 조회한 거래소 데이터 (None이면 새로 조회)
         
         Returns:
             {
@@ -239,27 +325,23 @@ class DataCollector:
             }
         """
         try:
-            self._init_data_loader()
-            
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            
-            df = self._data_loader.load_exchange_data(start_date, end_date, coin)
+            df = exchange_df if exchange_df is not None else self.load_exchange_frame(coin)
             
             if len(df) == 0:
                 return self._get_default_premium()
             
             latest = df.iloc[-1]
             
-            upbit_price = float(latest['upbit_price'])
-            binance_price_usd = float(latest['binance_price'])
+            # 일봉 데이터가 없는 코인은 환율만 공유 (가격은 실시간 시세)
+            upbit_price = self._get_live_price(f"KRW-{coin}") or float(latest.get('upbit_price', 0.0))
+            binance_price_usd = self._get_live_price(f"{coin}USDT") or float(latest.get('binance_price', 0.0))
             krw_usd = float(latest['krw_usd'])
             binance_price_krw = binance_price_usd * krw_usd
             
-            if binance_price_krw > 0:
-                premium = (upbit_price - binance_price_krw) / binance_price_krw
-            else:
-                premium = 0.0
+            if upbit_price <= 0 or binance_price_krw <= 0:
+                return self._get_default_premium()
+            
+            premium = (upbit_price - binance_price_krw) / binance_price_krw
             
             negative_threshold = self.settings.get('strategy', {}).get('negative_premium_threshold', -0.01)
             low_threshold = self.settings.get('strategy', {}).get('low_premium_threshold', 0.02)
@@ -272,11 +354,12 @@ class DataCollector:
                 'is_negative_premium': premium <= negative_threshold,
                 'is_low_premium': premium <= low_threshold
             }
-            
+        
         except Exception as e:
             logger.error(f"김치 프리미엄 조회 실패: {e}")
             return self._get_default_premium()
     
+    @METRICS.timed("whale_query")
     def get_whale_data(self, coin: str = "BTC") -> Dict:
         """
         고래 데이터 조회
@@ -330,7 +413,7 @@ class DataCollector:
                 'exchange_inflow_usd': 0.0,
                 'exchange_outflow_usd': 0.0
             }
-            
+        
         except Exception as e:
             logger.error(f"고래 데이터 조회 실패: {e}")
             return {
@@ -339,6 +422,115 @@ class DataCollector:
                 'exchange_outflow_usd': 0.0
             }
     
+    @METRICS.timed("whale_query")
+    def get_whale_data_batch(self, coins: List[str]) -> Dict[str, Dict]:
+        """
+        여러 코인의 최신 고래 데이터 조회 (쿼리 1회)
+        
+        Args:
+            coins: 코인 심볼 목록
+        
+        Returns:
+            {코인: get_whale_data와 같은 형식}
+        """
+        default = {
+            'net_flow_usd': 0.0,
+            'exchange_inflow_usd': 0.0,
+            'exchange_outflow_usd': 0.0
+        }
+        result = {coin: dict(default) for coin in coins}
+        
+        try:
+            import sqlite3
+            db_path = ROOT / "data" / "project.db"
+            
+            if not coins or not db_path.exists():
+                return result
+            
+            placeholders = ", ".join("?" for _ in coins)
+            query = f"""
+            SELECT 
+                w.coin_symbol,
+                w.net_flow_usd,
+                w.exchange_inflow_usd,
+                w.exchange_outflow_usd
+            FROM whale_daily_stats w
+            JOIN (
+                SELECT coin_symbol, MAX(date) AS date
+                FROM whale_daily_stats
+                WHERE coin_symbol IN ({placeholders})
+                GROUP BY coin_symbol
+            ) latest ON w.coin_symbol = latest.coin_symbol AND w.date = latest.date
+            """
+            conn = sqlite3.connect(str(db_path), timeout=10.0)
+            try:
+                df = pd.read_sql(query, conn, params=list(coins))
+            finally:
+                conn.close()
+            
+            for _, row in df.iterrows():
+                result[row['coin_symbol']] = {
+                    key: float(row[key]) if pd.notna(row[key]) else 0.0
+                    for key in default
+                }
+            
+            return result
+        
+        except Exception as e:
+            logger.error(f"고래 데이터 일괄 조회 실패: {e}")
+            return result
+    
+    @METRICS.timed("market_refresh")
+    def get_market_batch(self, coins: List[str]) -> Dict[str, Dict]:
+        """
+        여러 코인의 주기 갱신 데이터 일괄 조회 (TickSnapshot values 형식)
+        
+        - 거래소 일봉: 모델 지원 코인만 코인별 조회, 나머지 코인은 환율(krw_usd)만 공유
+        - 리스크 예측 / 특성: 모델 지원 코인만 코인별 데이터 로드 / 특성 생성 1회로 함께 계산 (나머지는 중립값, 호출 없음)
+        - 고래 데이터: 전체 코인 쿼리 1회
+        
+        Args:
+            coins: 코인 심볼 목록
+        
+        Returns:
+            {코인: {'exchange_data', 'risk', 'features', 'whale'}}
+        """
+        model_coins = [coin for coin in coins if coin in MODEL_COINS]
+        frames = {coin: self.load_exchange_frame(coin) for coin in model_coins}
+        
+        # 환율 공유용 기준 데이터 (모델 지원 코인이 없으면 BTC 1회 조회)
+        reference = next((df for df in frames.values() if len(df) > 0), None)
+        if reference is None and len(frames) < len(coins):
+            reference = self.load_exchange_frame(MODEL_COINS[0])
+        rate_frame = reference[['krw_usd']] if reference is not None and len(reference) > 0 else pd.DataFrame()
+        
+        whales = self.get_whale_data_batch(list(coins))
+        
+        batch = {}
+        for coin in coins:
+            if coin in MODEL_COINS:
+                values = self.get_risk_and_features(coin)
+            else:
+                values = {'risk': self._get_default_risk(), 'features': {}}
+            
+            batch[coin] = {
+                'exchange_data': frames.get(coin, rate_frame),
+                'risk': values['risk'],
+                'features': values['features'],
+                'whale': whales[coin]
+            }
+        
+        return batch
+    
+    def _get_default_risk(self) -> Dict:
+        """기본 리스크 예측 (모델 없음 / 실패 시)"""
+        return {
+            'high_volatility_prob': 0.5,
+            'risk_score': 50,
+            'indicators': {},
+            'success': False
+        }
+    
     def _get_default_premium(self) -> Dict:
         """기본 프리미엄 값"""
         return {
@@ -1,6 +1,6 @@
 """
 시장 데이터 수집 모듈
-업비트 API를 통한 실시간 가격 및 잔고 조회
+업비트 API를 통한 실시간 가격 및 잔고 조회 (웹소켓 시세 저장소가 있으면 우선 사용)
 """
 
 import pyupbit
@@ -14,16 +14,18 @@ logger = logging.getLogger(__name__)
 class MarketDataCollector:
     """시장 데이터 수집 클래스"""
     
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(self, access_key: str, secret_key: str, price_store=None):
         """
         초기화
         
         Args:
             access_key: 업비트 Access Key
             secret_key: 업비트 Secret Key
+            price_store: 실시간 시세 저장소 (PriceStore, 없으면 REST 조회)
         """
         self.access_key = access_key
         self.secret_key = secret_key
+        self.price_store = price_store
         self._upbit = None
         
         if access_key and secret_key:
@@ -35,7 +37,7 @@ class MarketDataCollector:
     
     def get_current_price(self, market: str = "KRW-BTC") -> float:
         """
-        현재가 조회 (공개 API)
+        현재가 조회 (실시간 시세 저장소 → 공개 API 순)
         
         Args:
             market: 마켓 코드 (예: KRW-BTC)
@@ -43,6 +45,11 @@ class MarketDataCollector:
         Returns:
             현재가 (원)
         """
+        if self.price_store is not None:
+            live_price = self.price_store.get_price(market)
+            if live_price > 0:
+                return live_price
+        
         try:
             price = pyupbit.get_current_price(market)
             if price:
@@ -0,0 +1,422 @@
+"""
+실시간 가격 피드 모듈
+업비트 / 바이낸스 웹소켓 체결·호가를 메모리 상태(PriceStore)로 유지
+- 연결 끊김 / 수신 지연 시 자동 재연결 (지수 백오프)
+- 전략은 PriceStore에서 O(1) 조회 (REST / DB 조회 없음)
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+
+
+class MarketState:
+    """마켓별 최신 체결 / 호가 상태"""
+
+    __slots__ = (
+        'market', 'price', 'volume', 'bid', 'ask', 'bid_size', 'ask_size',
+        'exchange_ts', 'updated_at'
+    )
+
+    def __init__(self, market: str):
+        self.market = market
+        self.price = 0.0
+        self.volume = 0.0
+        self.bid = 0.0
+        self.ask = 0.0
+        self.bid_size = 0.0
+        self.ask_size = 0.0
+        self.exchange_ts = None  # 거래소 타임스탬프 (ms)
+        self.updated_at = 0.0  # 수신 시각 (time.monotonic)
+
+    def to_dict(self) -> Dict:
+        return {
+            'market': self.market,
+            'price': self.price,
+            'volume': self.volume,
+            'bid': self.bid,
+            'ask': self.ask,
+            'bid_size': self.bid_size,
+            'ask_size': self.ask_size,
+            'exchange_ts': self.exchange_ts,
+            'age': time.monotonic() - self.updated_at
+        }
+
+
+class PriceStore:
+    """
+    마켓별 최신 시세 저장소 (스레드 안전)
+
+    쓰기는 웹소켓 수신 스레드, 읽기는 전략 / 봇 엔진.
+    마켓 코드는 거래소 표기를 그대로 사용 (업비트: KRW-BTC, 바이낸스: BTCUSDT)
+    """
+
+    def __init__(self, stale_after: float = 10.0):
+        """
+        초기화
+
+        Args:
+            stale_after: 이 시간(초) 이상 갱신이 없으면 지연(stale) 상태로 간주
+        """
+        self.stale_after = stale_after
+        self._states: Dict[str, MarketState] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        갱신 알림 등록 (수신 스레드에서 callback(market) 호출 → 가볍게 유지할 것)
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, market: str):
+        for callback in self._listeners:
+            try:
+                callback(market)
+            except Exception as e:
+                logger.debug(f"시세 갱신 알림 실패: {e}")
+
+    def _state(self, market: str) -> MarketState:
+        state = self._states.get(market)
+        if state is None:
+            state = self._states[market] = MarketState(market)
+        return state
+
+    def update_trade(self, market: str, price: float, volume: float = 0.0, exchange_ts=None):
+        """체결 갱신"""
+        with self._lock:
+            state = self._state(market)
+            state.price = price
+            state.volume = volume
+            state.exchange_ts = exchange_ts
+            state.updated_at = time.monotonic()
+        self._notify(market)
+
+    def update_orderbook(self, market: str, bid: float, ask: float,
+                         bid_size: float = 0.0, ask_size: float = 0.0, exchange_ts=None):
+        """최우선 호가 갱신"""
+        with self._lock:
+            state = self._state(market)
+            state.bid = bid
+            state.ask = ask
+            state.bid_size = bid_size
+            state.ask_size = ask_size
+            state.exchange_ts = exchange_ts
+            state.updated_at = time.monotonic()
+        self._notify(market)
+
+    def apply(self, events: Iterable[Dict]):
+        """파서 이벤트 목록 반영"""
+        for event in events:
+            if event['type'] == 'trade':
+                self.update_trade(event['market'], event['price'], event['volume'], event['ts'])
+            elif event['type'] == 'orderbook':
+                self.update_orderbook(
+                    event['market'], event['bid'], event['ask'],
+                    event['bid_size'], event['ask_size'], event['ts']
+                )
+
+    def get(self, market: str) -> Optional[Dict]:
+        """마켓 상태 조회 (없으면 None)"""
+        with self._lock:
+            state = self._states.get(market)
+            return state.to_dict() if state else None
+
+    def age(self, market: str) -> float:
+        """마지막 갱신 후 경과 시간 (초, 없으면 inf)"""
+        state = self._states.get(market)
+        if state is None:
+            return float('inf')
+        return time.monotonic() - state.updated_at
+
+    def is_stale(self, market: str, max_age: Optional[float] = None) -> bool:
+        """지연 상태 여부"""
+        return self.age(market) > (self.stale_after if max_age is None else max_age)
+
+    def get_price(self, market: str, max_age: Optional[float] = None) -> float:
+        """
+        최신 체결가 조회
+
+        Returns:
+            체결가 (없거나 지연 상태면 0.0)
+        """
+        state = self._states.get(market)
+        if state is None or self.is_stale(market, max_age):
+            return 0.0
+        return state.price
+
+    def markets(self) -> List[str]:
+        return list(self._states)
+
+
+def parse_upbit_message(raw) -> List[Dict]:
+    """
+    업비트 웹소켓 메시지 파싱 (DEFAULT 포맷)
+
+    Returns:
+        이벤트 목록 ({'type': 'trade' | 'orderbook', 'market': ..., ...})
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    msg = json.loads(raw)
+
+    kind = msg.get('type')
+    market = msg.get('code')
+
+    if kind in ('trade', 'ticker'):
+        return [{
+            'type': 'trade',
+            'market': market,
+            'price': float(msg['trade_price']),
+            'volume': float(msg.get('trade_volume', 0.0)),
+            'ts': msg.get('trade_timestamp') or msg.get('timestamp')
+        }]
+
+    if kind == 'orderbook':
+        units = msg.get('orderbook_units') or []
+        if not units:
+            return []
+        top = units[0]
+        return [{
+            'type': 'orderbook',
+            'market': market,
+            'bid': float(top['bid_price']),
+            'ask': float(top['ask_price']),
+            'bid_size': float(top.get('bid_size', 0.0)),
+            'ask_size': float(top.get('ask_size', 0.0)),
+            'ts': msg.get('timestamp')
+        }]
+
+    # {"status": "UP"} 등 상태 메시지
+    return []
+
+
+def parse_binance_message(raw) -> List[Dict]:
+    """
+    바이낸스 웹소켓 메시지 파싱 (combined stream: trade / aggTrade / bookTicker)
+
+    Returns:
+        이벤트 목록
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    msg = json.loads(raw)
+    data = msg.get('data', msg)
+
+    if data.get('e') in ('trade', 'aggTrade'):
+        return [{
+            'type': 'trade',
+            'market': data['s'],
+            'price': float(data['p']),
+            'volume': float(data['q']),
+            'ts': data.get('T')
+        }]
+
+    if 'b' in data and 'a' in data and 's' in data:
+        return [{
+            'type': 'orderbook',
+            'market': data['s'],
+            'bid': float(data['b']),
+            'ask': float(data['a']),
+            'bid_size': float(data.get('B', 0.0)),
+            'ask_size': float(data.get('A', 0.0)),
+            'ts': data.get('E')
+        }]
+
+    return []
+
+
+class WebSocketPriceFeed:
+    """
+    웹소켓 시세 피드 (공통)
+
+    - 연결 → 구독 메시지 전송 → 수신 메시지 파싱 → PriceStore 갱신
+    - 연결 끊김 또는 stale_after초 동안 무수신이면 재연결 (reconnect_delay부터 2배씩, 최대 max_reconnect_delay)
+    - start()/stop(): 별도 스레드의 이벤트 루프에서 실행 / run(): 기존 이벤트 루프에서 직접 실행
+    """
+
+    name = 'websocket'
+
+    def __init__(self, url: str, store: PriceStore, parser: Callable[[object], List[Dict]],
+                 subscribe_message=None, stale_after: Optional[float] = None,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        """
+        초기화
+
+        Args:
+            url: 웹소켓 주소
+            store: 시세 저장소
+            parser: 원본 메시지 → 이벤트 목록 변환 함수
+            subscribe_message: 연결 직후 전송할 구독 메시지 (None이면 전송 안 함)
+            stale_after: 무수신 허용 시간 (초, None이면 store.stale_after)
+            reconnect_delay: 첫 재연결 대기 시간 (초)
+            max_reconnect_delay: 최대 재연결 대기 시간 (초)
+        """
+        self.url = url
+        self.store = store
+        self.parser = parser
+        self.subscribe_message = subscribe_message
+        self.stale_after = stale_after if stale_after is not None else store.stale_after
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.connected = threading.Event()
+        self.stats = {
+            'messages': 0,
+            'parse_errors': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'stale_disconnects': 0,
+            'last_error': None
+        }
+
+        self._stop_requested = False
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    async def run(self):
+        """피드 실행 (stop() 또는 태스크 취소까지 재연결 반복)"""
+        delay = self.reconnect_delay
+
+        while not self._stop_requested:
+            try:
+                async with websockets.connect(self.url, open_timeout=10, max_size=2 ** 22) as ws:
+                    self.stats['connects'] += 1
+                    if self.subscribe_message is not None:
+                        await ws.send(json.dumps(self.subscribe_message))
+                    self.connected.set()
+                    delay = self.reconnect_delay
+                    logger.info(f"{self.name} 웹소켓 연결: {self.url}")
+                    await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                logger.warning(f"{self.name} 웹소켓 연결 끊김: {e}")
+            finally:
+                self.connected.clear()
+
+            if self._stop_requested:
+                break
+
+            self.stats['reconnects'] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _consume(self, ws):
+        """메시지 수신 루프 (지연 감지 시 반환 → 재연결)"""
+        while not self._stop_requested:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=self.stale_after)
+            except asyncio.TimeoutError:
+                self.stats['stale_disconnects'] += 1
+                logger.warning(f"{self.name} 시세 수신 지연 ({self.stale_after}초) → 재연결")
+                return
+
+            self.stats['messages'] += 1
+            try:
+                self.store.apply(self.parser(raw))
+            except Exception as e:
+                self.stats['parse_errors'] += 1
+                logger.debug(f"{self.name} 메시지 파싱 실패: {e}")
+
+    def start(self) -> bool:
+        """
+        백그라운드 스레드에서 피드 시작
+
+        Returns:
+            시작 여부 (이미 실행 중이면 False)
+        """
+        if self._thread and self._thread.is_alive():
+            return False
+
+        self._stop_requested = False
+        self._thread = threading.Thread(target=self._thread_main, daemon=True, name=f"{self.name}-price-feed")
+        self._thread.start()
+        return True
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self.run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._task = None
+
+    def stop(self, timeout: float = 5.0):
+        """피드 중지"""
+        self._stop_requested = True
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # 루프가 이미 종료됨
+                pass
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+class UpbitPriceFeed(WebSocketPriceFeed):
+    """업비트 체결 / 호가 피드"""
+
+    name = 'upbit'
+
+    def __init__(self, markets: Iterable[str], store: PriceStore, url: str = UPBIT_WS_URL,
+                 orderbook: bool = True, **kwargs):
+        """
+        Args:
+            markets: 마켓 코드 목록 (예: ['KRW-BTC'])
+            orderbook: 호가 구독 여부
+        """
+        codes = list(markets)
+        subscribe = [
+            {'ticket': f"whale-arbitrage-{uuid.uuid4().hex[:8]}"},
+            {'type': 'trade', 'codes': codes}
+        ]
+        if orderbook:
+            subscribe.append({'type': 'orderbook', 'codes': codes})
+        subscribe.append({'format': 'DEFAULT'})
+
+        super().__init__(url, store, parse_upbit_message, subscribe, **kwargs)
+
+
+class BinancePriceFeed(WebSocketPriceFeed):
+    """바이낸스 체결 / 최우선 호가 피드"""
+
+    name = 'binance'
+
+    def __init__(self, symbols: Iterable[str], store: PriceStore, url: str = BINANCE_WS_URL,
+                 orderbook: bool = True, **kwargs):
+        """
+        Args:
+            symbols: 심볼 목록 (예: ['BTCUSDT'])
+            orderbook: bookTicker 구독 여부
+        """
+        streams = []
+        for symbol in symbols:
+            streams.append(f"{symbol.lower()}@trade")
+            if orderbook:
+                streams.append(f"{symbol.lower()}@bookTicker")
+
+        super().__init__(f"{url}?streams={'/'.join(streams)}", store, parse_binance_message, None, **kwargs)
@@ -0,0 +1,237 @@
+"""
+리플레이 데이터 수집 모듈
+리플레이 기간 전체의 거래소 일봉 / 리스크 예측 / 특성 / 고래 데이터를 한 번에 계산해 두고 모의 시계 기준으로 조회
+"""
+
+import bisect
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from trading_bot.collectors.data_collector import DataCollector, MODEL_COINS, ROOT
+
+logger = logging.getLogger(__name__)
+
+# 특성 생성 롤링 윈도우용 추가 조회 기간 (RiskPredictor.predict_batch와 같은 값)
+FEATURE_WARMUP_DAYS = 60
+
+
+class _AsOf:
+    """날짜순 값 목록에서 기준일 이하 최신 값 조회"""
+    
+    def __init__(self, items: List[Tuple[date, object]]):
+        items = sorted(items, key=lambda item: item[0])
+        self.dates = [item[0] for item in items]
+        self.values = [item[1] for item in items]
+    
+    def get(self, day: date, default=None):
+        index = bisect.bisect_right(self.dates, day)
+        return self.values[index - 1] if index else default
+
+
+class ReplayDataCollector(DataCollector):
+    """
+    리플레이용 데이터 수집기
+    
+    - preload(): 기간 전체를 코인별 조회 1회 + 배치 예측 1회 + 특성 생성 1회 + 고래 쿼리 1회로 계산
+    - 이후 조회 메서드는 모의 시계의 날짜 기준 값을 메모리에서 반환 (DB / 모델 호출 없음)
+    - 거래소 데이터는 실시간과 같이 전일 ~ 당일 일봉 (현재가 = 당일 종가)
+    """
+    
+    def __init__(self, settings: Dict, clock: Callable[[], datetime]):
+        """
+        초기화
+        
+        Args:
+            settings: 설정 딕셔너리
+            clock: 모의 시계 (현재 시각 반환)
+        """
+        super().__init__(settings)
+        self.clock = clock
+        self.coins: List[str] = []
+        
+        self._exchange: Dict[str, pd.DataFrame] = {}
+        self._exchange_dates: Dict[str, List[date]] = {}
+        self._risk: Dict[str, _AsOf] = {}
+        self._features: Dict[str, _AsOf] = {}
+        self._whale: Dict[str, _AsOf] = {}
+    
+    def preload(self, coins: List[str], start_date: str, end_date: str) -> List[date]:
+        """
+        리플레이 기간 데이터 일괄 계산
+        
+        Args:
+            coins: 코인 심볼 목록 (일봉 데이터가 있는 코인만 사용)
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD)
+        
+        Returns:
+            리플레이 틱 날짜 목록 (기간 내 일봉이 있는 날짜)
+        """
+        unsupported = [coin for coin in coins if coin not in MODEL_COINS]
+        if unsupported:
+            logger.warning(f"일봉 데이터가 없는 코인은 리플레이에서 제외: {', '.join(unsupported)}")
+        self.coins = [coin for coin in coins if coin in MODEL_COINS]
+        
+        self._init_data_loader()
+        self._init_feature_engineer()
+        try:
+            self._init_risk_predictor()
+        except ImportError:
+            logger.warning("리스크 모델 없이 리플레이합니다 (리스크 예측은 중립값).")
+        
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        exchange_start = (start - timedelta(days=1)).isoformat()
+        feature_start = (start - timedelta(days=FEATURE_WARMUP_DAYS)).isoformat()
+        
+        tick_dates = set()
+        for coin in self.coins:
+            frame = self._data_loader.load_exchange_data(exchange_start, end_date, coin)
+            frame = frame.sort_values('date').reset_index(drop=True) if len(frame) else frame
+            self._exchange[coin] = frame
+            self._exchange_dates[coin] = [ts.date() for ts in pd.to_datetime(frame['date'])] if len(frame) else []
+            tick_dates.update(day for day in self._exchange_dates[coin] if start <= day <= end)
+            
+            self._risk[coin] = self._load_risk(coin, start_date, end_date)
+            self._features[coin] = self._load_features(coin, feature_start, end_date, start)
+        
+        self._whale = self._load_whales(self.coins, feature_start, end_date)
+        
+        logger.info(f"리플레이 데이터 준비 완료: {len(self.coins)}개 코인, {len(tick_dates)}일")
+        return sorted(tick_dates)
+    
+    def _load_risk(self, coin: str, start_date: str, end_date: str) -> _AsOf:
+        """기간 전체 리스크 배치 예측 ({날짜: get_risk_prediction 형식})"""
+        if self._risk_predictor is None:
+            return _AsOf([])
+        try:
+            df = self._risk_predictor.predict_batch(start_date, end_date, coin)
+        except Exception as e:
+            logger.error(f"{coin} 리스크 배치 예측 실패: {e}")
+            df = pd.DataFrame()
+        
+        items = []
+        for row in df.to_dict('records'):
+            items.append((pd.Timestamp(row['date']).date(), {
+                'high_volatility_prob': float(row['high_volatility_prob']),
+                'risk_score': float(row['risk_score']),
+                'indicators': {'liquidation_risk': float(row.get('liquidation_risk') or 0.0)},
+                'success': True
+            }))
+        return _AsOf(items)
+    
+    def _load_features(self, coin: str, load_start: str, end_date: str, start: date) -> _AsOf:
+        """기간 전체 특성 생성 1회 ({날짜: get_feature_values 형식})"""
+        try:
+            df = self._data_loader.load_risk_data(load_start, end_date, coin)
+            if len(df) == 0:
+                return _AsOf([])
+            if self._feature_engineer:
+                df, feature_cols = self._feature_engineer.create_features(df, include_dynamic=True)
+            else:
+                feature_cols = df.columns.tolist()
+        except Exception as e:
+            logger.error(f"{coin} 특성 생성 실패: {e}")
+            return _AsOf([])
+        
+        feature_cols = [col for col in feature_cols if col != 'date' and col in df.columns]
+        numeric = df[feature_cols].apply(pd.to_numeric, errors='coerce')
+        
+        items = []
+        for day, (_, row) in zip(pd.to_datetime(df['date']), numeric.iterrows()):
+            if day.date() < start - timedelta(days=1):
+                continue
+            items.append((day.date(), {col: float(value) for col, value in row.items() if pd.notna(value)}))
+        return _AsOf(items)
+    
+    def _load_whales(self, coins: List[str], start_date: str, end_date: str) -> Dict[str, _AsOf]:
+        """기간 전체 고래 일별 통계 (쿼리 1회)"""
+        keys = ('net_flow_usd', 'exchange_inflow_usd', 'exchange_outflow_usd')
+        result = {coin: _AsOf([]) for coin in coins}
+        db_path = ROOT / "data" / "project.db"
+        if not coins or not db_path.exists():
+            return result
+        
+        placeholders = ", ".join("?" for _ in coins)
+        query = f"""
+        SELECT date, coin_symbol, net_flow_usd, exchange_inflow_usd, exchange_outflow_usd
+        FROM whale_daily_stats
+        WHERE coin_symbol IN ({placeholders}) AND date BETWEEN ? AND ?
+        """
+        try:
+            conn = sqlite3.connect(str(db_path), timeout=10.0)
+            try:
+                df = pd.read_sql(query, conn, params=list(coins) + [start_date, end_date])
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"고래 데이터 일괄 조회 실패: {e}")
+            return result
+        
+        for coin, group in df.groupby('coin_symbol'):
+            result[coin] = _AsOf([
+                (pd.Timestamp(row['date']).date(), {key: float(row[key]) if pd.notna(row[key]) else 0.0 for key in keys})
+                for row in group.to_dict('records')
+            ])
+        return result
+    
+    @property
+    def today(self) -> date:
+        """모의 시계 날짜"""
+        return self.clock().date()
+    
+    def load_exchange_frame(self, coin: str = "BTC") -> pd.DataFrame:
+        """모의 시계 기준 전일 ~ 당일 거래소 일봉"""
+        frame = self._exchange.get(coin)
+        if frame is None or len(frame) == 0:
+            return pd.DataFrame()
+        dates = self._exchange_dates[coin]
+        today = self.today
+        lo = bisect.bisect_left(dates, today - timedelta(days=1))
+        hi = bisect.bisect_right(dates, today)
+        return frame.iloc[lo:hi]
+    
+    def get_risk_prediction(self, coin: str = "BTC", date: Optional[str] = None) -> Dict:
+        """모의 시계 기준 리스크 예측 (배치 예측 결과)"""
+        day = datetime.strptime(date, "%Y-%m-%d").date() if date else self.today
+        risk = self._risk[coin].get(day) if coin in self._risk else None
+        return dict(risk) if risk else self._get_default_risk()
+    
+    def get_feature_values(self, coin: str = "BTC") -> Dict:
+        """모의 시계 기준 최신 특성 값"""
+        features = self._features[coin].get(self.today) if coin in self._features else None
+        return dict(features or {})
+    
+    def get_risk_and_features(self, coin: str = "BTC") -> Dict:
+        """모의 시계 기준 리스크 예측 + 특성 값 (미리 계산한 값 조회)"""
+        return {'risk': self.get_risk_prediction(coin), 'features': self.get_feature_values(coin)}
+    
+    def get_whale_data(self, coin: str = "BTC") -> Dict:
+        """모의 시계 기준 최신 고래 데이터"""
+        return self.get_whale_data_batch([coin])[coin]
+    
+    def get_whale_data_batch(self, coins: List[str]) -> Dict[str, Dict]:
+        """모의 시계 기준 코인별 최신 고래 데이터"""
+        default = {'net_flow_usd': 0.0, 'exchange_inflow_usd': 0.0, 'exchange_outflow_usd': 0.0}
+        today = self.today
+        return {
+            coin: dict(self._whale[coin].get(today) or default) if coin in self._whale else dict(default)
+            for coin in coins
+        }
+    
+    def get_market_batch(self, coins: List[str]) -> Dict[str, Dict]:
+        """모의 시계 기준 TickSnapshot values (메모리 조회만 수행)"""
+        whales = self.get_whale_data_batch(list(coins))
+        return {
+            coin: {
+                'exchange_data': self.load_exchange_frame(coin),
+                'risk': self.get_risk_prediction(coin),
+                'features': self.get_feature_values(coin),
+                'whale': whales[coin]
+            }
+            for coin in coins
+        }
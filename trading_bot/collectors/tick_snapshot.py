@@ -0,0 +1,140 @@
+"""
+틱 스냅샷 모듈
+메인 루프 1회(_check_and_execute)에 필요한 시장 데이터를 한 번만 조회하여 모든 컴포넌트가 공유
+"""
+
+import time
+from typing import Callable, Dict, Optional
+from datetime import datetime
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class TickSnapshot:
+    """
+    틱 단위 데이터 스냅샷
+
+    - 각 필드는 처음 접근할 때 한 번만 조회하고 이후에는 캐시된 값 반환
+    - 현재가 / 김치 프리미엄은 같은 거래소 데이터(1회 로드)에서 계산
+    - 리스크 예측 / 특성 값은 같은 특성 생성 결과(1회 계산)에서 함께 조회
+    - 필드별 조회 시간(초)을 timings에 기록
+    """
+
+    FIELDS = ('exchange_data', 'premium', 'current_price', 'risk', 'features', 'whale')
+    # 주기 갱신 필드 (실시간 시세와 무관 → 다음 틱에서 재사용 가능)
+    SLOW_FIELDS = ('exchange_data', 'risk', 'features', 'whale')
+
+    def __init__(self, data_collector, coin: str = "BTC", values: Optional[Dict] = None):
+        """
+        초기화
+
+        Args:
+            data_collector: 데이터 수집기 인스턴스
+            coin: 코인 심볼
+            values: 미리 조회한 필드 값 (예: 주기적으로 갱신한 리스크 / 특성, 조회 생략)
+        """
+        self.data_collector = data_collector
+        self.coin = coin
+        self.created_at = datetime.now()
+        self.timings: Dict[str, float] = {}
+        self._values: Dict = dict(values or {})
+
+    def _fetch(self, field: str, loader: Callable):
+        """필드 조회 (최초 1회만 실행, 소요 시간 기록)"""
+        if field not in self._values:
+            start = time.perf_counter()
+            try:
+                self._values[field] = loader()
+            finally:
+                self.timings[field] = time.perf_counter() - start
+        return self._values[field]
+
+    @property
+    def exchange_data(self) -> pd.DataFrame:
+        """최근 거래소 데이터 (현재가 / 프리미엄 공용)"""
+        return self._fetch('exchange_data', lambda: self.data_collector.load_exchange_frame(self.coin))
+
+    @property
+    def premium(self) -> Dict:
+        """김치 프리미엄 데이터"""
+        if 'premium' not in self._values:
+            # 거래소 데이터 로드 시간은 exchange_data에 별도 기록
+            frame = self.exchange_data
+            self._fetch('premium', lambda: self.data_collector.get_premium_data(self.coin, frame))
+        return self._values['premium']
+
+    @property
+    def current_price(self) -> float:
+        """현재가 (원)"""
+        if 'current_price' not in self._values:
+            frame = self.exchange_data
+            self._fetch('current_price', lambda: self.data_collector.get_current_price(self.coin, frame))
+        return self._values['current_price']
+
+    def _fetch_risk_features(self):
+        """리스크 예측 / 특성 값 함께 조회 (소요 시간은 비어 있던 첫 필드에 기록, 나머지는 0)"""
+        missing = [field for field in ('risk', 'features') if field not in self._values]
+        if not missing:
+            return
+        start = time.perf_counter()
+        try:
+            values = self.data_collector.get_risk_and_features(self.coin)
+        finally:
+            self.timings[missing[0]] = time.perf_counter() - start
+        for field in missing:
+            self._values[field] = values[field]
+            self.timings.setdefault(field, 0.0)
+
+    @property
+    def risk(self) -> Dict:
+        """리스크 예측 결과"""
+        self._fetch_risk_features()
+        return self._values['risk']
+
+    @property
+    def features(self) -> Dict:
+        """최신 특성 값"""
+        self._fetch_risk_features()
+        return self._values['features']
+
+    @property
+    def whale(self) -> Dict:
+        """고래 거래 데이터"""
+        return self._fetch('whale', lambda: self.data_collector.get_whale_data(self.coin))
+
+    def prefetch(self, *fields: str) -> "TickSnapshot":
+        """
+        필드 미리 조회 (인자가 없으면 전체)
+
+        Returns:
+            self
+        """
+        for field in fields or self.FIELDS:
+            if field not in self.FIELDS:
+                raise ValueError(f"알 수 없는 스냅샷 필드: {field}")
+            getattr(self, field)
+        return self
+
+    def export(self, *fields: str) -> Dict:
+        """
+        조회된 필드 값 (다른 스냅샷의 values로 재사용)
+
+        Args:
+            fields: 내보낼 필드 (없으면 조회된 전체)
+        """
+        names = fields or tuple(self._values)
+        return {field: self._values[field] for field in names if field in self._values}
+
+    def get_timings(self) -> Dict[str, float]:
+        """
+        필드별 조회 시간
+
+        Returns:
+            {필드: 초, ..., 'total': 합계}
+        """
+        timings = dict(self.timings)
+        timings['total'] = sum(self.timings.values())
+        return timings
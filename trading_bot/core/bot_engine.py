@@ -1,22 +1,38 @@
 """
 자동매매 봇 엔진 코어
-메인 루프 실행 및 시그널 생성/주문 실행 통합
+asyncio 이벤트 기반 실행 및 시그널 생성/주문 실행 통합 (여러 KRW 마켓 동시 운용)
+
+봇 스레드 1개에서 이벤트 루프를 돌리고 아래 태스크를 큐로 연결:
+- 시세 피드: 전체 마켓을 웹소켓 연결 1개(거래소별)로 구독 → PriceStore → 시그널 이벤트
+- 리스크 갱신: check_interval마다 전체 코인의 리스크 예측 / 특성 / 고래 / 거래소 데이터 일괄 갱신 → 시그널 이벤트
+- 시그널 평가: 이벤트가 온 마켓만 동시 평가 (연속 이벤트는 1회로 합침, 최소 간격 min_signal_interval),
+  매수 금액은 전역 리스크 한도(RiskBudget)에서 예약
+- 체결 추적: 미체결 주문 전체를 주기마다 동시 조회 (FillTracker), 주문 → 접수 / 체결 지연 시간 기록
+- 알림: TelegramNotifier 자체 큐 / 전송 스레드 (호출은 즉시 반환)
+블로킹 I/O(DB / REST / 주문 재시도 / 텔레그램)는 스레드 풀에서 실행
 """
 
+import asyncio
 import threading
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 import logging
 
 from trading_bot.collectors.data_collector import DataCollector
 from trading_bot.collectors.market_data import MarketDataCollector
+from trading_bot.collectors.tick_snapshot import TickSnapshot
+from trading_bot.collectors.price_feed import PriceStore, UpbitPriceFeed, BinancePriceFeed
 from trading_bot.strategies.data_driven_strategy import DataDrivenStrategy
 from trading_bot.strategies.premium_filter import PremiumFilter
 from trading_bot.execution.order_executor import OrderExecutor
+from trading_bot.execution.fill_tracker import FillTracker
 from trading_bot.execution.balance_manager import BalanceManager
 from trading_bot.core.position_manager import PositionManager
+from trading_bot.core.risk_budget import RiskBudget
 from trading_bot.utils.notifier import TelegramNotifier
+from trading_bot.utils.metrics import METRICS, MetricsServer
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +50,6 @@ class TradingBotEngine:
         self.settings = settings
         self.is_running = False
         self._thread = None
-        self._stop_event = threading.Event()
         
         # 모듈 초기화
         self.data_collector = DataCollector(settings)
@@ -46,9 +61,15 @@ class TradingBotEngine:
         self.premium_filter = PremiumFilter(settings, self.data_collector)
         self.order_executor = OrderExecutor(
             settings.get('api', {}).get('upbit_access_key', ''),
-            settings.get('api', {}).get('upbit_secret_key', '')
+            settings.get('api', {}).get('upbit_secret_key', ''),
+            max_retries=settings.get('risk_management', {}).get('max_retries', 3),
+            retry_base_delay=settings.get('risk_management', {}).get('retry_base_delay', 0.5),
+            retry_delay=settings.get('risk_management', {}).get('retry_delay', 5.0)
+        )
+        self.balance_manager = BalanceManager(
+            self.market_data,
+            ttl=settings.get('risk_management', {}).get('balance_cache_ttl', 5.0)
         )
-        self.balance_manager = BalanceManager(self.market_data)
         self.position_manager = PositionManager()
         
         # 알림 설정
@@ -56,25 +77,113 @@ class TradingBotEngine:
         if telegram_settings.get('bot_token') and telegram_settings.get('chat_id'):
             self.notifier = TelegramNotifier(
                 telegram_settings['bot_token'],
-                telegram_settings['chat_id']
+                telegram_settings['chat_id'],
+                max_queue=telegram_settings.get('max_queue', 100),
+                rate_limit=telegram_settings.get('rate_limit', 1.0)
             )
         else:
             self.notifier = None
             logger.warning("텔레그램 알림이 설정되지 않았습니다.")
         
-        # 거래 설정
+        # 거래 설정 (target_coins가 없으면 target_coin 1개)
         trading_settings = settings.get('trading', {})
-        self.target_coin = trading_settings.get('target_coin', 'BTC')
+        self.target_coins = list(trading_settings.get('target_coins') or [trading_settings.get('target_coin', 'BTC')])
+        self.target_coin = self.target_coins[0]
         self.market = f"KRW-{self.target_coin}"
+        self.markets = {coin: f"KRW-{coin}" for coin in self.target_coins}
         self.initial_capital = trading_settings.get('initial_capital', 1000000)
         self.max_position_size = trading_settings.get('max_position_size', 0.3)
         
-        # 체크 간격
+        # 전역 리스크 한도 (모든 마켓 공유)
+        self.risk_budget = RiskBudget(
+            max_total_exposure=trading_settings.get('max_total_exposure', 0.9),
+            max_open_positions=trading_settings.get('max_open_positions', len(self.target_coins))
+        )
+        
+        # 체크 간격 (리스크 / 특성 갱신 주기, 시세 이벤트가 없을 때의 시그널 평가 주기)
         risk_settings = settings.get('risk_management', {})
         self.check_interval = risk_settings.get('check_interval', 60)
+        self.min_signal_interval = risk_settings.get('min_signal_interval', 1.0)
+        self.order_poll_interval = risk_settings.get('order_poll_interval', 2.0)
+        self.order_poll_timeout = risk_settings.get('order_poll_timeout', 60.0)
+        self.max_workers = risk_settings.get('max_workers', 8)
+        
+        # 실시간 시세 피드 (start()에서 연결)
+        feed_settings = settings.get('price_feed', {})
+        self.price_store = PriceStore(stale_after=feed_settings.get('stale_after', 10.0))
+        self.price_feeds = []
+        if feed_settings.get('enabled', True):
+            self.price_feeds = [
+                UpbitPriceFeed(list(self.markets.values()), self.price_store),
+                BinancePriceFeed([f"{coin}USDT" for coin in self.target_coins], self.price_store)
+            ]
+        self.data_collector.price_store = self.price_store
+        self.market_data.price_store = self.price_store
+        self.price_store.add_listener(self._on_price_update)
+        
+        # 시세 마켓 코드 → 코인 (업비트 KRW-BTC / 바이낸스 BTCUSDT)
+        self._signal_markets = {}
+        for coin, market in self.markets.items():
+            self._signal_markets[market] = coin
+            self._signal_markets[f"{coin}USDT"] = coin
+        
+        # 마지막 틱 스냅샷 (조회 시간 모니터링용)
+        self.last_snapshot: Optional[TickSnapshot] = None
+        self.last_snapshots: Dict[str, TickSnapshot] = {}
+        
+        # 주기적으로 갱신하는 데이터 ({코인: 리스크 / 특성 / 고래 / 거래소 일봉})
+        self._market_cache: Dict[str, Dict] = {}
+        
+        # 이벤트 루프 상태 (start()에서 생성)
+        self._loop = None
+        self._started = threading.Event()
+        self._shutdown = None
+        self._signal_events = None
+        self._executor = None
+        self._price_event_pending = False
+        self._dirty_coins = set()
+        self._dirty_lock = threading.Lock()
+        self._last_signal_at = 0.0
+        self.fill_tracker: Optional[FillTracker] = None
+        
+        # 매도 주문 체결 확인 대기 마켓 (확인 전까지 포지션을 유지하고 다시 매도하지 않음)
+        self._pending_exits = set()
+        # 매수 주문 체결 확인 대기 마켓 (확인 전 포지션은 추정 수량 → 매도 검토하지 않음)
+        self._pending_entries = set()
+        self._exit_lock = threading.Lock()
+        
+        # 운영 지표 (metrics.enabled가 False면 측정하지 않음)
+        # 공용 레지스트리 측정은 실행 중에만 켜고 stop()에서 원래 값으로 복원
+        metrics_settings = settings.get('metrics', {})
+        self.metrics = METRICS
+        self.metrics_enabled = bool(metrics_settings.get('enabled', False))
+        self._metrics_restore: Optional[bool] = None
+        self.metrics.register_histogram("order_ack_seconds", self.order_executor.ack_latency)
+        self.metrics.register_histogram("order_fill_seconds", self.order_executor.fill_latency)
+        self.metrics_server: Optional[MetricsServer] = None
+        metrics_port = metrics_settings.get('port', 9108)
+        if self.metrics_enabled and metrics_port is not None:
+            # port 0은 임의 포트
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                host=metrics_settings.get('host', '127.0.0.1'),
+                port=metrics_port
+            )
+        
+        self.event_stats = {
+            'price_events': 0,
+            'signal_evaluations': 0,
+            'risk_refreshes': 0,
+            'orders_tracked': 0
+        }
         
         logger.info("봇 엔진 초기화 완료")
     
+    @property
+    def pending_orders(self) -> Dict[str, Dict]:
+        """체결 확인 대기 주문 ({uuid: 주문})"""
+        return self.fill_tracker.open_orders if self.fill_tracker else {}
+    
     def start(self) -> bool:
         """
         봇 시작
@@ -93,22 +202,31 @@ class TradingBotEngine:
                 return False
             
             self.is_running = True
-            self._stop_event.clear()
+            self._started.clear()
+            self._enable_metrics()
             
-            # 백그라운드 스레드 시작
-            self._thread = threading.Thread(target=self._main_loop, daemon=True)
+            # 백그라운드 스레드에서 이벤트 루프 시작
+            self._thread = threading.Thread(target=self._thread_main, daemon=True, name="trading-bot-loop")
             self._thread.start()
+            self._started.wait(timeout=5)
+            
+            if self.metrics_server is not None:
+                try:
+                    self.metrics_server.start()
+                    logger.info(f"지표 엔드포인트: {self.metrics_server.url}")
+                except OSError as e:
+                    logger.error(f"지표 엔드포인트 시작 실패: {e}")
             
             logger.info("봇 시작 완료")
             
-            if self.notifier:
-                self.notifier.notify_status("봇이 시작되었습니다.")
+            self._notify('notify_status', "봇이 시작되었습니다.")
             
             return True
-            
+        
         except Exception as e:
             logger.error(f"봇 시작 실패: {e}")
             self.is_running = False
+            self._restore_metrics()
             return False
     
     def stop(self) -> bool:
@@ -124,78 +242,366 @@ class TradingBotEngine:
         
         try:
             self.is_running = False
-            self._stop_event.set()
+            
+            loop = self._loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self._shutdown.set)
             
             if self._thread:
-                self._thread.join(timeout=5)
+                self._thread.join(timeout=10)
+            
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+            self._restore_metrics()
             
             logger.info("봇 중지 완료")
             
-            if self.notifier:
-                self.notifier.notify_status("봇이 중지되었습니다.")
+            self._notify('notify_status', "봇이 중지되었습니다.")
             
-            return True
+            # 남은 알림 전송 대기
+            if self.notifier and not self.notifier.flush(timeout=5):
+                logger.warning("미전송 알림이 남아 있습니다.")
             
+            return True
+        
         except Exception as e:
             logger.error(f"봇 중지 실패: {e}")
             return False
     
-    def _main_loop(self):
-        """메인 루프"""
+    def _enable_metrics(self):
+        """설정으로 켠 경우 공용 레지스트리 측정 시작 (이전 값 보관)"""
+        if self.metrics_enabled and self._metrics_restore is None:
+            self._metrics_restore = self.metrics.enabled
+            self.metrics.enabled = True
+    
+    def _restore_metrics(self):
+        """공용 레지스트리 측정 여부를 시작 전 값으로 복원"""
+        if self._metrics_restore is not None:
+            self.metrics.enabled = self._metrics_restore
+            self._metrics_restore = None
+    
+    def _thread_main(self):
+        """봇 스레드 진입점"""
         logger.info("=" * 80)
-        logger.info("자동매매 봇 메인 루프 시작")
-        logger.info(f"대상 코인: {self.target_coin}")
-        logger.info(f"체크 간격: {self.check_interval}초")
+        logger.info("자동매매 봇 이벤트 루프 시작")
+        logger.info(f"대상 코인: {', '.join(self.target_coins)}")
+        logger.info(f"리스크 갱신 간격: {self.check_interval}초")
         logger.info("=" * 80)
         
-        while self.is_running and not self._stop_event.is_set():
-            try:
-                self._check_and_execute()
-                
-                # 대기 (체크 간격)
-                self._stop_event.wait(self.check_interval)
-                
-            except Exception as e:
-                logger.error(f"메인 루프 오류: {e}")
-                if self.notifier:
-                    self.notifier.notify_error(f"메인 루프 오류: {e}")
-                time.sleep(self.check_interval)
+        try:
+            asyncio.run(self._run())
+        except Exception as e:
+            logger.error(f"이벤트 루프 오류: {e}")
+        finally:
+            self._loop = None
+            self.is_running = False
+            self._started.set()
         
-        logger.info("메인 루프 종료")
+        logger.info("이벤트 루프 종료")
     
-    def _check_and_execute(self):
-        """시그널 확인 및 주문 실행"""
+    async def _run(self):
+        """태스크 실행 및 종료 처리"""
+        self._loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        self._signal_events = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="trading-bot-io")
+        self._price_event_pending = False
+        self.fill_tracker = FillTracker(
+            self.order_executor,
+            poll_interval=self.order_poll_interval,
+            timeout=self.order_poll_timeout,
+            executor=self._executor,
+            on_final=self._on_order_final
+        )
+        
+        tasks = [
+            asyncio.create_task(self._signal_loop(), name="signal"),
+            asyncio.create_task(self._refresh_loop(), name="risk-refresh"),
+            asyncio.create_task(self.fill_tracker.run(), name="fill-tracker"),
+        ]
+        for feed in self.price_feeds:
+            tasks.append(asyncio.create_task(feed.run(), name=f"{feed.name}-price-feed"))
+        
+        self._started.set()
+        
         try:
-            # 현재 포지션 확인
-            current_position = self.position_manager.get_current_position()
+            await self._shutdown.wait()
+        finally:
+            for feed in self.price_feeds:
+                feed.stop()
             
-            if current_position is None:
-                # 포지션이 없으면 매수 검토
-                self._check_buy_signal()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.position_manager.flush()
+            self._loop = None
+    
+    def _call_in_loop(self, callback, *args) -> bool:
+        """
+        이벤트 루프 스레드에서 callback 실행 예약 (다른 스레드에서 호출 가능)
+        
+        Returns:
+            예약 여부 (루프가 실행 중이 아니면 False)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+            return True
+        except RuntimeError:
+            # 루프 종료 중
+            return False
+    
+    def _enqueue(self, queue_name: str, item) -> bool:
+        """
+        이벤트 루프 큐에 추가 (다른 스레드에서 호출 가능)
+        
+        Returns:
+            추가 여부 (루프가 실행 중이 아니면 False)
+        """
+        queue = getattr(self, queue_name)
+        return queue is not None and self._call_in_loop(queue.put_nowait, item)
+    
+    def _on_price_update(self, market: str):
+        """PriceStore 갱신 알림 (수신 스레드) → 갱신 코인 기록 + 시그널 이벤트 (평가 전까지 1건만 유지)"""
+        coin = self._signal_markets.get(market)
+        if coin is None:
+            return
+        
+        with self._dirty_lock:
+            self._dirty_coins.add(coin)
+            if self._price_event_pending:
+                return
+            self._price_event_pending = True
+        
+        if self._enqueue('_signal_events', 'price'):
+            self.event_stats['price_events'] += 1
+            self.metrics.inc("price_events")
+        else:
+            with self._dirty_lock:
+                self._price_event_pending = False
+    
+    def _notify(self, method: str, *args, **kwargs):
+        """텔레그램 알림 (notifier가 큐에 넣고 바로 반환)"""
+        if not self.notifier:
+            return
+        try:
+            getattr(self.notifier, method)(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"알림 전송 실패: {e}")
+    
+    def _track_order(self, order_result: Dict, side: str, market: str) -> bool:
+        """
+        체결 추적 대상 등록
+        
+        Returns:
+            등록 여부 (주문 UUID가 없거나 이벤트 루프가 실행 중이 아니면 False)
+        """
+        if order_result.get('uuid') and self.fill_tracker is not None:
+            order = {
+                'uuid': order_result['uuid'],
+                'client_order_id': order_result.get('client_order_id'),
+                'side': side,
+                'market': market,
+                'submitted_at': datetime.now().isoformat()
+            }
+            if order_result.get('submit_time') is not None:
+                order['submit_time'] = order_result['submit_time']
+            if self._call_in_loop(self.fill_tracker.track, order):
+                self.event_stats['orders_tracked'] += 1
+                return True
+        return False
+    
+    def _on_order_final(self, order: Dict, status: Dict):
+        """
+        체결 추적 종료 (거래소 최종 상태 기준, 시간 초과 주문은 취소 후 최종 상태에서 호출)
+        
+        - 매수 체결: 체결 수량 / 평균가로 포지션 보정
+        - 매수 취소 / 시간 초과 (체결 수량 0): 주문 시 등록한 포지션 제거
+        - 매도 체결: 체결 수량 / 평균가로 포지션 청산 (부분 체결이면 부분 청산)
+        - 매도 취소 / 시간 초과: 포지션을 그대로 두어 다음 시그널에서 다시 매도
+        """
+        self.metrics.inc("orders", side=order['side'], status=order['result'])
+        self.balance_manager.invalidate()
+        market = order['market']
+        with self._exit_lock:
+            if order['side'] == 'ask':
+                self._pending_exits.discard(market)
+            else:
+                self._pending_entries.discard(market)
+        
+        executed_volume = status.get('executed_volume', 0)
+        if order['side'] == 'bid':
+            if executed_volume > 0:
+                self.position_manager.record_fill(market, executed_volume, status.get('avg_price') or None)
+            elif order['result'] != 'filled':
+                self.position_manager.cancel_position(market)
+            self._update_gauges()
+        elif order['result'] == 'filled' and executed_volume > 0:
+            exit_price = status.get('avg_price') or status.get('price') or self.price_store.get_price(market)
+            self.position_manager.close_position(market, exit_price=exit_price or None, quantity=executed_volume)
+            self._update_gauges()
+        
+        if order['result'] == 'cancelled':
+            self._notify('notify_error', f"주문이 체결되지 않고 취소되었습니다: {order['uuid']}")
+        elif order['result'] == 'timed_out':
+            self._notify('notify_error', f"주문 체결 확인 시간 초과로 취소했습니다: {order['uuid']} (상태: {order.get('state')})")
+    
+    async def _signal_loop(self):
+        """시그널 이벤트 → 대상 마켓 동시 평가 (평가 라운드는 한 번에 하나씩)"""
+        while True:
+            events = {await self._signal_events.get()}
+            
+            # 최소 간격 유지 (그 사이 들어온 이벤트는 합쳐서 1회 평가)
+            wait = self.min_signal_interval - (time.monotonic() - self._last_signal_at)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            while not self._signal_events.empty():
+                events.add(self._signal_events.get_nowait())
+            
+            with self._dirty_lock:
+                dirty, self._dirty_coins = self._dirty_coins, set()
+                self._price_event_pending = False
+            
+            # 주기 갱신이면 전체 마켓, 시세 이벤트면 시세가 바뀐 마켓만
+            if 'refresh' in events:
+                coins = list(self.target_coins)
             else:
-                # 포지션이 있으면 매도 검토
-                self._check_sell_signal(current_position)
+                coins = [coin for coin in self.target_coins if coin in dirty]
+            if not coins:
+                continue
+            
+            self._last_signal_at = time.monotonic()
+            try:
+                await self._evaluate_markets(coins)
+                self.event_stats['signal_evaluations'] += 1
+            except Exception as e:
+                logger.error(f"시그널 평가 오류: {e}")
+                self._notify('notify_error', f"시그널 평가 오류: {e}")
+    
+    async def _evaluate_markets(self, coins: List[str]):
+        """마켓별 시그널 평가를 스레드 풀에서 동시 실행"""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._evaluate_market, coin) for coin in coins),
+            return_exceptions=True
+        )
+        for coin, result in zip(coins, results):
+            if isinstance(result, Exception):
+                logger.error(f"{coin} 시그널 평가 오류: {result}")
+    
+    async def _refresh_loop(self):
+        """check_interval마다 느린 데이터 갱신 (시작 시각 기준 고정 주기, 지연 누적 없음)"""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        
+        while True:
+            try:
+                await loop.run_in_executor(self._executor, self._refresh_market_cache)
+                self.event_stats['risk_refreshes'] += 1
+            except Exception as e:
+                logger.error(f"리스크 데이터 갱신 실패: {e}")
+            
+            # 실시간 시세가 없어도 주기마다 시그널 평가
+            self._signal_events.put_nowait('refresh')
+            
+            next_run += self.check_interval
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+    
+    def _refresh_market_cache(self):
+        """전체 코인의 리스크 예측 / 특성 / 고래 / 거래소 데이터 일괄 조회 (스레드 풀)"""
+        start = time.perf_counter()
+        self._market_cache = self.data_collector.get_market_batch(self.target_coins)
+        self._update_gauges(with_balance=True)
+        logger.debug(f"리스크 데이터 갱신: {len(self.target_coins)}개 코인, {time.perf_counter() - start:.2f}초")
+    
+    def _check_and_execute(self, coins: Optional[List[str]] = None):
+        """
+        시그널 확인 및 주문 실행 (현재 스레드에서 순차 실행)
+        
+        Args:
+            coins: 평가할 코인 목록 (None이면 전체)
+        """
+        for coin in coins or self.target_coins:
+            self._evaluate_market(coin)
+    
+    def _evaluate_market(self, coin: str):
+        """마켓 1개 시그널 확인 및 주문 실행"""
+        # 틱당 1회 조회한 데이터를 모든 컴포넌트가 공유 (주기적으로 갱신한 데이터는 재사용)
+        cache = self._market_cache
+        snapshot = TickSnapshot(self.data_collector, coin, values=cache.get(coin))
+        self.last_snapshot = snapshot
+        self.last_snapshots[coin] = snapshot
+        
+        try:
+            with self.metrics.stage("signal_evaluation"):
+                # 현재 포지션 확인
+                current_position = self.position_manager.get_current_position(self.markets[coin])
                 
+                if current_position is None:
+                    # 포지션이 없으면 매수 검토
+                    self._check_buy_signal(snapshot)
+                elif self.markets[coin] in self._pending_exits:
+                    logger.debug(f"매도 체결 확인 대기 중: {self.markets[coin]}")
+                elif self.markets[coin] in self._pending_entries:
+                    logger.debug(f"매수 체결 확인 대기 중: {self.markets[coin]}")
+                else:
+                    # 포지션이 있으면 매도 검토
+                    self._check_sell_signal(current_position, snapshot)
+        
         except Exception as e:
             logger.error(f"시그널 확인 실패: {e}")
+        finally:
+            # 갱신 전(또는 갱신 실패) 틱에서 새로 조회한 주기 데이터는 다음 갱신까지 재사용
+            cached = cache.setdefault(coin, {})
+            for field, value in snapshot.export(*TickSnapshot.SLOW_FIELDS).items():
+                cached.setdefault(field, value)
+            logger.debug(f"{coin} 틱 데이터 조회 시간: {snapshot.get_timings()}")
+    
+    def _update_gauges(self, with_balance: bool = False):
+        """포지션 / 잔고 게이지 갱신 (with_balance면 원화 잔고 조회 포함)"""
+        if not self.metrics.enabled:
+            return
+        self.metrics.set_gauge("open_positions", len(self.position_manager.get_positions()))
+        self.metrics.set_gauge("total_exposure_krw", self.position_manager.get_total_exposure())
+        if with_balance:
+            self.metrics.set_gauge("krw_balance", self.balance_manager.get_balance("KRW"))
     
-    def _check_buy_signal(self):
-        """매수 시그널 확인 및 실행"""
+    def _get_account(self):
+        """리스크 한도 계산용 (원화 잔고, 보유 포지션 진입 금액 합계, 보유 포지션 수)"""
+        return (
+            self.balance_manager.get_balance("KRW"),
+            self.position_manager.get_total_exposure(),
+            len(self.position_manager.get_positions())
+        )
+    
+    def _check_buy_signal(self, snapshot: Optional[TickSnapshot] = None):
+        """매수 시그널 확인 및 실행 (snapshot.coin 마켓)"""
+        if snapshot is None:
+            snapshot = TickSnapshot(self.data_collector, self.target_coin)
+        coin = snapshot.coin
+        market = self.markets.get(coin, f"KRW-{coin}")
+        
         try:
             # 1. 프리미엄 필터 확인
-            if not self.premium_filter.should_allow_buy(self.target_coin):
+            if not self.premium_filter.should_allow_buy(coin, snapshot):
                 logger.debug("매수 차단: 김치 프리미엄 필터")
+                self.metrics.inc("signals", side="bid", result="premium_blocked")
                 return
             
             # 2. 데이터 기반 매수 시그널 확인
-            buy_signal = self.strategy.calculate_buy_signal_score(self.target_coin)
+            buy_signal = self.strategy.calculate_buy_signal_score(coin, snapshot)
             
             if not buy_signal['buy_signal']:
                 logger.debug(f"매수 차단: {buy_signal['reason']}")
+                self.metrics.inc("signals", side="bid", result="no_signal")
                 return
+            self.metrics.inc("signals", side="bid", result="signal")
             
             # 3. 현재가 조회
-            current_price = self.data_collector.get_current_price(self.target_coin)
+            current_price = snapshot.current_price
             if current_price <= 0:
                 logger.warning("현재가 조회 실패")
                 return
@@ -206,7 +612,7 @@ class TradingBotEngine:
                 logger.warning("원화 잔고가 없습니다.")
                 return
             
-            multiplier = self.premium_filter.get_position_size_multiplier(self.target_coin)
+            multiplier = self.premium_filter.get_position_size_multiplier(coin, snapshot)
             position_size = self.balance_manager.calculate_position_size(
                 krw_balance,
                 self.max_position_size,
@@ -214,35 +620,59 @@ class TradingBotEngine:
                 multiplier
             )
             
-            quantity = self.balance_manager.calculate_quantity(position_size, current_price)
-            
-            if quantity <= 0:
-                logger.warning("주문 수량이 0입니다.")
+            # 5. 전역 리스크 한도에서 금액 예약 (동시에 매수를 검토하는 다른 마켓과 공유)
+            position_size = self.risk_budget.reserve(market, position_size, self._get_account)
+            if position_size <= 0:
+                logger.debug(f"매수 보류: 전역 리스크 한도 ({market})")
+                self.metrics.inc("signals", side="bid", result="risk_blocked")
                 return
             
-            # 5. 매수 주문 실행
-            logger.info(f"매수 시그널 발생: {buy_signal['reason']} (점수: {buy_signal['signal_score']:.1f})")
-            order_result = self.order_executor.place_buy_order(
-                self.market,
-                quantity=quantity,
-                order_type="market"
-            )
+            try:
+                quantity = self.balance_manager.calculate_quantity(position_size, current_price)
+                
+                if quantity <= 0:
+                    logger.warning("주문 수량이 0입니다.")
+                    return
+                
+                # 6. 매수 주문 실행
+                logger.info(f"매수 시그널 발생 ({market}): {buy_signal['reason']} (점수: {buy_signal['signal_score']:.1f})")
+                order_result = self.order_executor.place_buy_order(
+                    market,
+                    order_type="market",
+                    amount=position_size
+                )
+                self.metrics.inc("orders", side="bid", status="submitted" if order_result['success'] else "rejected")
+                
+                if order_result['success']:
+                    self.balance_manager.invalidate()
+                    
+                    # 포지션 기록 (추정 수량 / 주문 전 가격) → 체결 확인 시 실제 체결 수량 / 평균가로 보정,
+                    # 체결 없이 끝나면 제거. 추적보다 먼저 등록해야 빠른 체결도 반영됨
+                    self.position_manager.open_position(
+                        coin,
+                        quantity,
+                        current_price,
+                        market
+                    )
+                    with self._exit_lock:
+                        self._pending_entries.add(market)
+                    if not self._track_order(order_result, 'bid', market):
+                        # 체결을 추적할 수 없으면 (이벤트 루프 밖 호출) 주문 접수 기준 포지션 유지
+                        with self._exit_lock:
+                            self._pending_entries.discard(market)
+            finally:
+                self.risk_budget.release(market)
+                self._update_gauges()
             
             if order_result['success']:
-                # 포지션 기록
-                self.position_manager.open_position(
-                    self.target_coin,
-                    quantity,
-                    current_price,
-                    self.market
-                )
                 
                 # 알림 전송
                 if self.notifier:
-                    premium_data = self.premium_filter.get_premium_info(self.target_coin)
-                    whale_data = self.data_collector.get_whale_data(self.target_coin)
-                    self.notifier.notify_buy_executed(
-                        coin=self.target_coin,
+                    premium_data = self.premium_filter.get_premium_info(coin, snapshot)
+                    whale_data = snapshot.whale
+                    self._notify(
+                        'notify_buy_executed',
+                        coin=coin,
                         price=current_price,
                         quantity=quantity,
                         total_amount=position_size,
@@ -251,36 +681,42 @@ class TradingBotEngine:
                         k_value=0.5  # TODO: 동적 K값 계산 추가
                     )
                 
-                logger.info(f"매수 체결: {self.target_coin} {quantity:.6f} @ {current_price:,.0f}원")
+                logger.info(f"매수 체결: {coin} {quantity:.6f} @ {current_price:,.0f}원")
             else:
                 logger.error(f"매수 주문 실패: {order_result.get('error')}")
-                if self.notifier:
-                    self.notifier.notify_error(f"매수 주문 실패: {order_result.get('error')}")
-                
+                self._notify('notify_error', f"매수 주문 실패: {order_result.get('error')}")
+        
         except Exception as e:
             logger.error(f"매수 시그널 확인 실패: {e}")
-            if self.notifier:
-                self.notifier.notify_error(f"매수 시그널 확인 실패: {e}")
+            self._notify('notify_error', f"매수 시그널 확인 실패: {e}")
     
-    def _check_sell_signal(self, position: Dict):
-        """매도 시그널 확인 및 실행"""
+    def _check_sell_signal(self, position: Dict, snapshot: Optional[TickSnapshot] = None):
+        """매도 시그널 확인 및 실행 (position['market'] 마켓)"""
+        if snapshot is None:
+            snapshot = TickSnapshot(self.data_collector, position.get('coin', self.target_coin))
+        coin = snapshot.coin
+        market = position.get('market', self.markets.get(coin, f"KRW-{coin}"))
+        
         try:
             entry_price = position['entry_price']
             
             # 매도 시그널 확인
             sell_signal = self.strategy.calculate_sell_signal_score(
-                self.target_coin,
-                entry_price
+                coin,
+                entry_price,
+                snapshot
             )
             
             if not sell_signal['sell_signal']:
                 logger.debug(f"매도 차단: {sell_signal['reason']}")
+                self.metrics.inc("signals", side="ask", result="no_signal")
                 return
+            self.metrics.inc("signals", side="ask", result="signal")
             
             # 현재가 조회
             current_price = sell_signal.get('current_price', 0)
             if current_price <= 0:
-                current_price = self.data_collector.get_current_price(self.target_coin)
+                current_price = snapshot.current_price
             
             if current_price <= 0:
                 logger.warning("현재가 조회 실패")
@@ -291,14 +727,24 @@ class TradingBotEngine:
             logger.info(f"매도 시그널 발생: {sell_signal['reason']} (점수: {sell_signal['signal_score']:.1f})")
             
             order_result = self.order_executor.place_sell_order(
-                self.market,
+                market,
                 quantity=quantity,
                 order_type="market"
             )
+            self.metrics.inc("orders", side="ask", status="submitted" if order_result['success'] else "rejected")
             
             if order_result['success']:
-                # 포지션 청산
-                closed_position = self.position_manager.close_position()
+                self.balance_manager.invalidate()
+                
+                # 포지션은 체결 확인 후 청산 (_on_order_final), 그 전까지 같은 포지션을 다시 매도하지 않음
+                with self._exit_lock:
+                    self._pending_exits.add(market)
+                if not self._track_order(order_result, 'ask', market):
+                    # 체결을 추적할 수 없으면 (이벤트 루프 밖 호출) 주문 접수 기준으로 청산
+                    with self._exit_lock:
+                        self._pending_exits.discard(market)
+                    self.position_manager.close_position(market, exit_price=current_price)
+                    self._update_gauges()
                 
                 # 수익 계산
                 profit_pct = sell_signal.get('profit_pct', 0) * 100
@@ -306,9 +752,10 @@ class TradingBotEngine:
                 
                 # 알림 전송
                 if self.notifier:
-                    premium_data = self.premium_filter.get_premium_info(self.target_coin)
-                    self.notifier.notify_sell_executed(
-                        coin=self.target_coin,
+                    premium_data = self.premium_filter.get_premium_info(coin, snapshot)
+                    self._notify(
+                        'notify_sell_executed',
+                        coin=coin,
                         price=current_price,
                         quantity=quantity,
                         total_amount=current_price * quantity,
@@ -317,16 +764,14 @@ class TradingBotEngine:
                         premium=premium_data['premium']
                     )
                 
-                logger.info(f"매도 체결: {self.target_coin} {quantity:.6f} @ {current_price:,.0f}원 (수익: {profit_pct:.2f}%)")
+                logger.info(f"매도 주문 접수: {coin} {quantity:.6f} @ {current_price:,.0f}원 (예상 수익: {profit_pct:.2f}%)")
             else:
                 logger.error(f"매도 주문 실패: {order_result.get('error')}")
-                if self.notifier:
-                    self.notifier.notify_error(f"매도 주문 실패: {order_result.get('error')}")
-                
+                self._notify('notify_error', f"매도 주문 실패: {order_result.get('error')}")
+        
         except Exception as e:
             logger.error(f"매도 시그널 확인 실패: {e}")
-            if self.notifier:
-                self.notifier.notify_error(f"매도 시그널 확인 실패: {e}")
+            self._notify('notify_error', f"매도 시그널 확인 실패: {e}")
     
     def get_status(self) -> Dict:
         """
@@ -335,9 +780,20 @@ class TradingBotEngine:
         Returns:
             {
                 'is_running': bool,
-                'current_position': Dict,
+                'current_position': Dict,  # 첫 번째 보유 포지션 (단일 마켓 호환)
+                'positions': Dict,  # {마켓: 포지션}
+                'markets': List[str],
                 'balance': Dict,
-                'last_check': str
+                'balance_cache': Dict,  # 잔고 캐시 API 호출 / 절약 횟수, 캐시 경과 시간 (초)
+                'last_check': str,
+                'tick_timings': Dict,  # 코인별 마지막 틱 필드별 조회 시간 (초)
+                'risk_budget': Dict,  # 전역 리스크 한도 / 예약 금액
+                'price_feed': Dict,  # 마켓별 실시간 시세 경과 시간 (초) / 피드 연결 상태
+                'pending_orders': List[Dict],  # 체결 확인 대기 주문
+                'order_latency': Dict,  # 주문 → 접수 / 체결 지연 시간 요약 (초)
+                'event_stats': Dict,  # 이벤트 / 시그널 평가 / 주문 추적 횟수
+                'notifications': Dict,  # 알림 큐 / 전송 / 버림 횟수, 전송 지연 시간
+                'metrics': Dict  # 단계별 소요 시간 / 카운터 / 게이지 (metrics.enabled일 때)
             }
         """
         position = self.position_manager.get_current_position()
@@ -346,7 +802,25 @@ class TradingBotEngine:
         return {
             'is_running': self.is_running,
             'current_position': position,
+            'positions': self.position_manager.get_positions(),
+            'markets': list(self.markets.values()),
             'balance': balances,
-            'last_check': datetime.now().isoformat()
+            'balance_cache': self.balance_manager.get_cache_stats(),
+            'last_check': datetime.now().isoformat(),
+            'tick_timings': {coin: snapshot.get_timings() for coin, snapshot in self.last_snapshots.items()},
+            'risk_budget': {
+                'max_total_exposure': self.risk_budget.max_total_exposure,
+                'max_open_positions': self.risk_budget.max_open_positions,
+                'reserved': self.risk_budget.get_reserved()
+            },
+            'price_feed': {
+                'ages': {market: self.price_store.age(market) for market in self.price_store.markets()},
+                'connected': {feed.name: feed.connected.is_set() for feed in self.price_feeds}
+            },
+            'pending_orders': list(self.pending_orders.values()),
+            'order_latency': self.order_executor.get_latency_stats(),
+            'event_stats': dict(self.event_stats),
+            'notifications': self.notifier.get_stats() if self.notifier else {},
+            'metrics': self.metrics.snapshot() if self.metrics_enabled else {}
         }
 
@@ -0,0 +1,192 @@
+"""
+포지션 저널 모듈
+포지션 이벤트(진입 / 체결 / 청산) 추가 전용 로그(JSONL) + 원자적 스냅샷 압축
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PositionJournal:
+    """
+    포지션 이벤트 저널
+    
+    - append(): 이벤트 1줄 추가 후 즉시 flush (프로세스 종료에도 유지)
+    - fsync는 fsync_batch건 또는 fsync_interval초마다 묶어서 실행 (0이면 매번)
+    - write_snapshot(): 전체 상태를 임시 파일 → fsync → rename으로 교체 후 저널 비움
+    - load(): 스냅샷 + 스냅샷 이후 저널 이벤트 (중간에 잘린 마지막 줄은 버림)
+    """
+    
+    def __init__(
+        self,
+        data_dir: Path,
+        name: str = "positions",
+        fsync_interval: float = 1.0,
+        fsync_batch: int = 32
+    ):
+        """
+        초기화
+        
+        Args:
+            data_dir: 저장 디렉토리
+            name: 파일 이름 ({name}.json 스냅샷, {name}.journal.jsonl 저널)
+            fsync_interval: fsync 최대 지연 (초, 0이면 이벤트마다 fsync)
+            fsync_batch: 이 건수만큼 쌓이면 바로 fsync
+        """
+        self.data_dir = Path(data_dir)
+        self.snapshot_file = self.data_dir / f"{name}.json"
+        self.journal_file = self.data_dir / f"{name}.journal.jsonl"
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.stats = {'appends': 0, 'fsyncs': 0, 'snapshots': 0}
+        
+        self._file = None
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+    
+    def load(self) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        저장된 상태 로드
+        
+        Returns:
+            (스냅샷 또는 None, 스냅샷 이후 이벤트 목록)
+        """
+        snapshot = None
+        if self.snapshot_file.exists():
+            try:
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"포지션 스냅샷 로드 실패: {e}")
+        
+        snapshot_seq = (snapshot or {}).get('seq', 0)
+        events = []
+        valid_bytes = 0
+        
+        if self.journal_file.exists():
+            with open(self.journal_file, 'rb') as f:
+                for raw in f:
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        # 기록 중 종료로 잘린 줄 → 이후 내용 버림
+                        logger.warning(f"저널 손상 줄 이후 {self.journal_file.stat().st_size - valid_bytes}바이트 무시")
+                        break
+                    valid_bytes += len(raw)
+                    if event.get('seq', 0) > snapshot_seq:
+                        events.append(event)
+            
+            if valid_bytes < self.journal_file.stat().st_size:
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(valid_bytes)
+        
+        self.seq = max([snapshot_seq] + [event['seq'] for event in events])
+        self.events_since_snapshot = len(events)
+        return snapshot, events
+    
+    def _open(self):
+        if self._file is None:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_file, 'a', encoding='utf-8')
+        return self._file
+    
+    def append(self, event: Dict) -> Dict:
+        """
+        이벤트 추가
+        
+        Args:
+            event: {'type': str, ...}
+        
+        Returns:
+            seq / ts가 채워진 이벤트
+        """
+        with self._lock:
+            self.seq += 1
+            event = dict(event, seq=self.seq, ts=event.get('ts') or datetime.now().isoformat())
+            
+            f = self._open()
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            
+            self.events_since_snapshot += 1
+            self.stats['appends'] += 1
+            self._pending += 1
+            
+            if (
+                self.fsync_interval <= 0
+                or self._pending >= self.fsync_batch
+                or time.monotonic() - self._last_fsync >= self.fsync_interval
+            ):
+                self._fsync()
+            elif self._timer is None:
+                # 이후 이벤트가 없어도 fsync_interval 안에 디스크 반영
+                self._timer = threading.Timer(self.fsync_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            
+            return event
+    
+    def _fsync(self):
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+            self.stats['fsyncs'] += 1
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def flush(self):
+        """대기 중인 이벤트 즉시 fsync"""
+        with self._lock:
+            self._fsync()
+    
+    def write_snapshot(self, state: Dict):
+        """
+        전체 상태 스냅샷 저장 후 저널 비움 (압축)
+        
+        Args:
+            state: 저장할 상태 (seq / last_updated는 자동 추가)
+        """
+        with self._lock:
+            self._fsync()
+            data = dict(state, seq=self.seq, last_updated=datetime.now().isoformat())
+            
+            tmp_file = self.snapshot_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.snapshot_file)
+            
+            # 스냅샷이 반영된 뒤에만 저널을 비움 (중간에 종료되어도 seq로 중복 적용 방지)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.journal_file, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self.events_since_snapshot = 0
+            self.stats['snapshots'] += 1
+    
+    def close(self):
+        """fsync 후 파일 닫기"""
+        with self._lock:
+            self._fsync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
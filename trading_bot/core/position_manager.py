@@ -1,26 +1,45 @@
 """
 포지션 관리 모듈
-현재 포지션 상태 추적 및 수익률 계산
+마켓별 포지션 상태 추적 및 수익률 계산 (이벤트 저널 기반, 거래 내역 포함)
 """
 
-import json
-from pathlib import Path
-from typing import Dict, Optional
+import threading
 from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
 import logging
 
+from trading_bot.core.position_journal import PositionJournal
+
 logger = logging.getLogger(__name__)
 
 
 class PositionManager:
-    """포지션 관리 클래스"""
+    """
+    포지션 관리 클래스
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    포지션은 마켓 코드(KRW-BTC 등)별로 1개씩 보관.
+    market 인자를 생략하면 보유 포지션이 1개일 때 그 포지션을 대상으로 함 (단일 마켓 호환)
+    
+    변경은 모두 저널 이벤트(open / fill / close / cancel)로 기록하고 메모리 상태에 적용.
+    시작 시 스냅샷 + 저널을 재생하여 복원하며, compact_every건마다 스냅샷으로 압축
+    """
+    
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        fsync_interval: float = 1.0,
+        compact_every: int = 500,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
         """
         초기화
         
         Args:
             data_dir: 데이터 저장 디렉토리 (None이면 기본 경로)
+            fsync_interval: 저널 fsync 최대 지연 (초, 0이면 이벤트마다)
+            compact_every: 스냅샷 압축 주기 (저널 이벤트 수)
+            clock: 이벤트 시각 (None이면 현재 시각, 리플레이 시 모의 시계)
         """
         if data_dir is None:
             base_dir = Path(__file__).resolve().parent.parent
@@ -28,41 +47,160 @@ class PositionManager:
         
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
+        self._clock = clock
         
-        self.positions_file = self.data_dir / "positions.json"
-        self.current_position = None
+        self._journal = PositionJournal(self.data_dir, "positions", fsync_interval=fsync_interval)
+        self.positions_file = self._journal.snapshot_file
+        self.positions: Dict[str, Dict] = {}
+        self.trades: List[Dict] = []
+        self._exposure = 0.0
+        self._summary = {'trades': 0, 'wins': 0, 'total_profit': 0.0}
+        self._lock = threading.RLock()
         
         # 기존 포지션 로드
         self._load_positions()
     
+    @property
+    def current_position(self) -> Optional[Dict]:
+        """첫 번째 보유 포지션 (단일 마켓 호환)"""
+        with self._lock:
+            return next(iter(self.positions.values()), None)
+    
     def _load_positions(self):
-        """포지션 데이터 로드"""
+        """스냅샷 + 저널 재생 (단일 포지션 형식 current_position 스냅샷도 읽음)"""
         try:
-            if self.positions_file.exists():
-                with open(self.positions_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.current_position = data.get('current_position')
-                    logger.info("포지션 데이터 로드 완료")
+            snapshot, events = self._journal.load()
         except Exception as e:
             logger.warning(f"포지션 데이터 로드 실패: {e}")
-            self.current_position = None
+            return
+        
+        if snapshot:
+            positions = snapshot.get('positions')
+            if positions is None and snapshot.get('current_position'):
+                legacy = snapshot['current_position']
+                positions = {legacy['market']: legacy}
+            self.positions = positions or {}
+            self._exposure = sum(p['entry_price'] * p['quantity'] for p in self.positions.values())
+            for trade in snapshot.get('trades', []):
+                self._add_trade(trade)
+        
+        for event in events:
+            self._apply(event)
+        
+        logger.info(f"포지션 데이터 로드 완료 ({len(self.positions)}개, 저널 {len(events)}건 재생)")
     
-    def _save_positions(self):
-        """포지션 데이터 저장"""
-        try:
-            data = {
-                'current_position': self.current_position,
-                'last_updated': datetime.now().isoformat()
+    def _apply(self, event: Dict):
+        """저널 이벤트를 메모리 상태에 적용"""
+        market = event['market']
+        
+        if event['type'] == 'open':
+            position = {
+                'coin': event['coin'],
+                'quantity': event['quantity'],
+                'entry_price': event['entry_price'],
+                'entry_time': event['ts'],
+                'market': market
             }
-            with open(self.positions_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"포지션 데이터 저장 실패: {e}")
+            self.positions[market] = position
+            self._exposure += position['entry_price'] * position['quantity']
+        
+        elif event['type'] == 'fill':
+            # 실제 체결 수량 / 평균 단가로 보정
+            position = self.positions[market]
+            self._exposure -= position['entry_price'] * position['quantity']
+            position['quantity'] = event['quantity']
+            if event.get('entry_price'):
+                position['entry_price'] = event['entry_price']
+            self._exposure += position['entry_price'] * position['quantity']
+        
+        elif event['type'] == 'close':
+            position = self.positions[market]
+            quantity = min(event.get('quantity') or position['quantity'], position['quantity'])
+            exit_price = event.get('exit_price')
+            
+            trade = {
+                'market': market,
+                'coin': position['coin'],
+                'quantity': quantity,
+                'entry_price': position['entry_price'],
+                'entry_time': position['entry_time'],
+                'exit_price': exit_price,
+                'exit_time': event['ts'],
+                'profit_pct': (exit_price - position['entry_price']) / position['entry_price'] if exit_price else None,
+                'profit_amount': (exit_price - position['entry_price']) * quantity if exit_price else None
+            }
+            self._add_trade(trade)
+            
+            remaining = position['quantity'] - quantity
+            if remaining > 1e-12:
+                # 부분 청산
+                position['quantity'] = remaining
+                self._exposure -= position['entry_price'] * quantity
+            else:
+                del self.positions[market]
+                self._exposure -= position['entry_price'] * position['quantity']
+        
+        elif event['type'] == 'cancel':
+            # 체결되지 않은 진입 주문 → 거래 내역 없이 포지션 제거
+            position = self.positions.pop(market, None)
+            if position is not None:
+                self._exposure -= position['entry_price'] * position['quantity']
+        
+        if not self.positions:
+            self._exposure = 0.0
+    
+    def _add_trade(self, trade: Dict):
+        """거래 내역 추가 및 요약 갱신"""
+        self.trades.append(trade)
+        self._summary['trades'] += 1
+        if trade.get('profit_amount') is not None:
+            self._summary['total_profit'] += trade['profit_amount']
+            if trade['profit_amount'] > 0:
+                self._summary['wins'] += 1
+    
+    def _record(self, event: Dict) -> Dict:
+        """이벤트 저널 기록 → 상태 적용 (필요 시 압축)"""
+        if self._clock is not None:
+            event = dict(event, ts=self._clock().isoformat())
+        event = self._journal.append(event)
+        self._apply(event)
+        if self._journal.events_since_snapshot >= self.compact_every:
+            self.compact()
+        return event
+    
+    def compact(self):
+        """현재 상태를 스냅샷으로 저장하고 저널 비움"""
+        with self._lock:
+            try:
+                self._journal.write_snapshot({
+                    'positions': self.positions,
+                    'current_position': self.current_position,
+                    'trades': self.trades
+                })
+            except Exception as e:
+                logger.error(f"포지션 스냅샷 저장 실패: {e}")
+    
+    def flush(self):
+        """대기 중인 저널 이벤트 디스크 반영 (봇 중지 시)"""
+        self._journal.flush()
+    
+    def close(self):
+        """저널 fsync 후 파일 닫기"""
+        self._journal.close()
+    
+    def _resolve_market(self, market: Optional[str]) -> Optional[str]:
+        """market 생략 시 유일한 보유 포지션의 마켓"""
+        if market is not None:
+            return market
+        if len(self.positions) == 1:
+            return next(iter(self.positions))
+        return None
     
     def open_position(
-        self, 
-        coin: str, 
-        quantity: float, 
+        self,
+        coin: str,
+        quantity: float,
         entry_price: float,
         market: str
     ) -> bool:
@@ -79,61 +217,183 @@ class PositionManager:
             성공 여부
         """
         try:
-            if self.current_position is not None:
-                logger.warning("이미 포지션이 있습니다. 기존 포지션을 먼저 청산하세요.")
-                return False
+            with self._lock:
+                if market in self.positions:
+                    logger.warning(f"{market} 포지션이 이미 있습니다. 기존 포지션을 먼저 청산하세요.")
+                    return False
+                
+                self._record({
+                    'type': 'open',
+                    'market': market,
+                    'coin': coin,
+                    'quantity': quantity,
+                    'entry_price': entry_price
+                })
             
-            self.current_position = {
-                'coin': coin,
-                'quantity': quantity,
-                'entry_price': entry_price,
-                'entry_time': datetime.now().isoformat(),
-                'market': market
-            }
-            
-            self._save_positions()
             logger.info(f"포지션 진입: {coin} {quantity:.6f} @ {entry_price:,.0f}원")
             return True
-            
+        
         except Exception as e:
             logger.error(f"포지션 진입 실패: {e}")
             return False
     
-    def close_position(self) -> Optional[Dict]:
+    def record_fill(
+        self,
+        market: str,
+        quantity: float,
+        entry_price: Optional[float] = None
+    ) -> bool:
         """
-        포지션 청산
+        체결 결과 반영 (주문 수량과 실제 체결 수량이 다를 때)
+        
+        Args:
+            market: 마켓 코드
+            quantity: 체결 수량
+            entry_price: 평균 체결 가격 (None이면 유지)
         
         Returns:
-            포지션 정보 (없으면 None)
+            반영 여부
         """
         try:
-            if self.current_position is None:
-                return None
+            with self._lock:
+                position = self.positions.get(market)
+                if position is None or quantity <= 0:
+                    return False
+                if quantity == position['quantity'] and entry_price in (None, position['entry_price']):
+                    return False
+                
+                self._record({
+                    'type': 'fill',
+                    'market': market,
+                    'quantity': quantity,
+                    'entry_price': entry_price
+                })
             
-            position = self.current_position.copy()
-            self.current_position = None
-            self._save_positions()
+            logger.info(f"체결 수량 반영: {market} {quantity:.6f}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"체결 반영 실패: {e}")
+            return False
+    
+    def cancel_position(self, market: str) -> bool:
+        """
+        미체결 진입 포지션 제거 (매수 주문이 체결 없이 취소된 경우, 거래 내역에 남기지 않음)
+        
+        Args:
+            market: 마켓 코드
+        
+        Returns:
+            제거 여부
+        """
+        try:
+            with self._lock:
+                if market not in self.positions:
+                    return False
+                self._record({'type': 'cancel', 'market': market})
+            
+            logger.info(f"미체결 포지션 제거: {market}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"포지션 제거 실패: {e}")
+            return False
+    
+    def close_position(
+        self,
+        market: Optional[str] = None,
+        exit_price: Optional[float] = None,
+        quantity: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        포지션 청산
+        
+        Args:
+            market: 마켓 코드 (None이면 유일한 보유 포지션)
+            exit_price: 청산 가격 (거래 내역 수익 계산용)
+            quantity: 청산 수량 (None이면 전량, 일부면 부분 청산)
+        
+        Returns:
+            청산 전 포지션 정보 (없으면 None)
+        """
+        try:
+            with self._lock:
+                market = self._resolve_market(market)
+                if market is None or market not in self.positions:
+                    return None
+                
+                position = dict(self.positions[market])
+                self._record({
+                    'type': 'close',
+                    'market': market,
+                    'exit_price': exit_price,
+                    'quantity': quantity
+                })
             
             logger.info(f"포지션 청산: {position['coin']}")
             return position
-            
+        
         except Exception as e:
             logger.error(f"포지션 청산 실패: {e}")
             return None
     
-    def get_current_position(self) -> Optional[Dict]:
-        """현재 포지션 조회"""
-        return self.current_position
+    def get_current_position(self, market: Optional[str] = None) -> Optional[Dict]:
+        """
+        포지션 조회
+        
+        Args:
+            market: 마켓 코드 (None이면 첫 번째 보유 포지션)
+        """
+        with self._lock:
+            if market is None:
+                return self.current_position
+            return self.positions.get(market)
+    
+    def get_positions(self) -> Dict[str, Dict]:
+        """전체 포지션 조회 ({마켓: 포지션})"""
+        with self._lock:
+            return {market: dict(position) for market, position in self.positions.items()}
+    
+    def get_total_exposure(self) -> float:
+        """보유 포지션 진입 금액 합계 (원)"""
+        return self._exposure
+    
+    def get_trade_history(self, limit: Optional[int] = None, market: Optional[str] = None) -> List[Dict]:
+        """
+        청산된 거래 내역 (최신순)
+        
+        Args:
+            limit: 최대 건수
+            market: 마켓 코드 (None이면 전체)
+        """
+        with self._lock:
+            trades = self.trades if market is None else [t for t in self.trades if t['market'] == market]
+            trades = trades[::-1]
+            return [dict(t) for t in (trades[:limit] if limit else trades)]
+    
+    def get_trade_summary(self) -> Dict:
+        """
+        거래 요약
+        
+        Returns:
+            {'trades': int, 'wins': int, 'win_rate': float, 'total_profit': float}
+        """
+        with self._lock:
+            summary = dict(self._summary)
+        summary['win_rate'] = summary['wins'] / summary['trades'] if summary['trades'] else 0.0
+        return summary
     
     def calculate_profit(
-        self, 
-        current_price: float
+        self,
+        current_price: float,
+        market: Optional[str] = None
     ) -> Optional[Dict]:
         """
         수익률 계산
         
         Args:
             current_price: 현재가
+            market: 마켓 코드 (None이면 유일한 보유 포지션)
         
         Returns:
             {
@@ -144,12 +404,15 @@ class PositionManager:
                 'quantity': float
             }
         """
-        if self.current_position is None:
+        with self._lock:
+            position = self.positions.get(self._resolve_market(market))
+        
+        if position is None:
             return None
         
         try:
-            entry_price = self.current_position['entry_price']
-            quantity = self.current_position['quantity']
+            entry_price = position['entry_price']
+            quantity = position['quantity']
             
             profit_pct = (current_price - entry_price) / entry_price
             profit_amount = (current_price - entry_price) * quantity
@@ -161,12 +424,14 @@ class PositionManager:
                 'current_price': current_price,
                 'quantity': quantity
             }
-            
+        
         except Exception as e:
             logger.error(f"수익률 계산 실패: {e}")
             return None
     
-    def has_position(self) -> bool:
-        """포지션 보유 여부"""
-        return self.current_position is not None
-
+    def has_position(self, market: Optional[str] = None) -> bool:
+        """포지션 보유 여부 (market이 None이면 하나라도 보유 시 True)"""
+        with self._lock:
+            if market is None:
+                return bool(self.positions)
+            return market in self.positions
@@ -0,0 +1,190 @@
+"""
+과거 데이터 리플레이 모듈
+실제 봇 엔진 구성요소(전략 / 프리미엄 필터 / 리스크 한도 / 주문 실행기 / 포지션 관리)를 모의 시계와 모의 거래소로 구동
+"""
+
+import copy
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+from trading_bot.collectors.replay_data import ReplayDataCollector
+from trading_bot.core.bot_engine import TradingBotEngine
+from trading_bot.core.position_manager import PositionManager
+from trading_bot.execution.balance_manager import BalanceManager
+from trading_bot.execution.simulated_exchange import SimulatedExchange
+
+logger = logging.getLogger(__name__)
+
+# 틱 시각 = 일봉 마감 (당일 종가 / 당일 일별 데이터는 마감 시점에야 알 수 있음)
+BAR_CLOSE = datetime.max.time().replace(microsecond=0)
+
+
+class ReplayClock:
+    """모의 시계 (리플레이가 틱마다 시각을 옮김)"""
+    
+    def __init__(self, start: Optional[datetime] = None):
+        self.current = start or datetime.now()
+    
+    def now(self) -> datetime:
+        """현재 모의 시각"""
+        return self.current
+    
+    def set(self, when: datetime):
+        """모의 시각 이동"""
+        self.current = when
+
+
+class ReplaySimulator:
+    """
+    과거 데이터 리플레이
+    
+    - 리플레이 기간의 예측 / 특성 / 고래 데이터는 시작 전에 한 번에 계산 (ReplayDataCollector)
+    - 틱마다 모의 시계를 일봉 마감 시각으로 옮기고 실시간 봇과 같은 경로(주기 갱신 → 마켓별 시그널 평가 → 주문 → 체결 반영)로 실행
+    - 주문은 실제 OrderExecutor가 모의 거래소(SimulatedExchange)로 전송, 잔고도 모의 거래소 원장에서 조회
+    - 거래 내역은 실시간과 같은 PositionManager 형식 (get_trade_history)
+    """
+    
+    def __init__(
+        self,
+        settings: Dict,
+        start_date: str,
+        end_date: str,
+        initial_krw: Optional[float] = None,
+        fee_rate: float = 0.0005,
+        spread: float = 0.0,
+        data_dir: Optional[Path] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            settings: 봇 설정 (실시간 봇과 같은 형식)
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD)
+            initial_krw: 초기 원화 잔고 (None이면 trading.initial_capital)
+            fee_rate: 거래 수수료율
+            spread: 모의 호가 간격 (기준가 대비 비율)
+            data_dir: 포지션 저널 저장 디렉토리 (None이면 임시 디렉토리)
+        """
+        self.settings = copy.deepcopy(settings)
+        self.start_date = start_date
+        self.end_date = end_date
+        
+        # 실시간 시세 / 알림 / 지표 엔드포인트 없이 실행
+        self.settings['price_feed'] = dict(self.settings.get('price_feed', {}), enabled=False)
+        self.settings['telegram'] = {}
+        self.settings['metrics'] = {'enabled': False}
+        
+        trading_settings = self.settings.get('trading', {})
+        if initial_krw is None:
+            initial_krw = trading_settings.get('initial_capital', 1000000)
+        self.initial_krw = initial_krw
+        
+        self._tmp_dir = None
+        if data_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="trading-bot-replay-")
+            data_dir = Path(self._tmp_dir.name)
+        
+        self.clock = ReplayClock(datetime.strptime(start_date, "%Y-%m-%d"))
+        self.exchange = SimulatedExchange(initial_krw, fee_rate=fee_rate, spread=spread, clock=self.clock.now)
+        self.data_collector = ReplayDataCollector(self.settings, self.clock.now)
+        self.engine = self._build_engine(Path(data_dir))
+        
+        self.equity_curve: List[Dict] = []
+    
+    def _build_engine(self, data_dir: Path) -> TradingBotEngine:
+        """실제 엔진 생성 후 데이터 / 거래소 / 잔고 / 포지션 저장소만 모의 구성요소로 교체"""
+        engine = TradingBotEngine(self.settings)
+        
+        engine.data_collector = self.data_collector
+        engine.strategy.data_collector = self.data_collector
+        engine.premium_filter.data_collector = self.data_collector
+        
+        engine.order_executor.client = self.exchange
+        engine.order_executor.retry_base_delay = 0.0
+        engine.market_data = self.exchange
+        engine.balance_manager = BalanceManager(self.exchange, ttl=0)
+        engine.position_manager = PositionManager(data_dir=data_dir, fsync_interval=60.0, clock=self.clock.now)
+        
+        return engine
+    
+    def _step(self, day: date):
+        """틱 1회: 시계를 일봉 마감으로 이동 → 호가 갱신 → 주기 갱신 → 시그널 평가 / 주문 → 체결 반영"""
+        self.clock.set(datetime.combine(day, BAR_CLOSE))
+        
+        for coin in self.data_collector.coins:
+            frame = self.data_collector.load_exchange_frame(coin)
+            if len(frame) > 0 and frame.iloc[-1]['date'].date() == day:
+                self.exchange.set_price(self.engine.markets[coin], float(frame.iloc[-1]['upbit_price']))
+        
+        self.engine._refresh_market_cache()
+        self.engine._check_and_execute(self.data_collector.coins)
+        
+        # 실시간 봇의 체결 추적(FillTracker)과 같은 콜백으로 체결 수량 반영
+        for order in self.exchange.pop_filled():
+            status = self.engine.order_executor.get_order_status(order['uuid'])
+            self.engine._on_order_final(
+                {'uuid': order['uuid'], 'side': order['side'], 'market': order['market'], 'result': 'filled'},
+                status
+            )
+        
+        self.equity_curve.append({
+            'date': day.isoformat(),
+            'equity': self.exchange.get_equity(),
+            'krw': self.exchange.get_balance("KRW"),
+            'open_positions': len(self.engine.position_manager.get_positions())
+        })
+    
+    def run(self) -> Dict:
+        """
+        리플레이 실행
+        
+        Returns:
+            {
+                'trades': List[Dict],  # 청산 거래 내역 (PositionManager.get_trade_history 형식, 최신순)
+                'summary': Dict,  # 거래 요약 (get_trade_summary)
+                'open_positions': Dict,  # 종료 시점 보유 포지션
+                'equity_curve': List[Dict],  # 일별 평가 금액
+                'final_equity': float,
+                'return_pct': float,
+                'exchange': Dict,  # 모의 거래소 주문 / 체결 / 거절 횟수, 수수료
+                'ticks': int,
+                'timings': Dict  # 준비 / 실행 시간 (초)
+            }
+        """
+        start = time.perf_counter()
+        days = self.data_collector.preload(self.engine.target_coins, self.start_date, self.end_date)
+        preload_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.equity_curve = []
+        for day in days:
+            self._step(day)
+        replay_time = time.perf_counter() - start
+        
+        self.engine.position_manager.flush()
+        final_equity = self.exchange.get_equity()
+        logger.info(f"리플레이 완료: {len(days)}틱, 준비 {preload_time:.2f}초, 실행 {replay_time:.2f}초")
+        
+        return {
+            'trades': self.engine.position_manager.get_trade_history(),
+            'summary': self.engine.position_manager.get_trade_summary(),
+            'open_positions': self.engine.position_manager.get_positions(),
+            'equity_curve': self.equity_curve,
+            'final_equity': final_equity,
+            'return_pct': (final_equity - self.initial_krw) / self.initial_krw if self.initial_krw else 0.0,
+            'exchange': dict(self.exchange.stats),
+            'ticks': len(days),
+            'timings': {'preload': preload_time, 'replay': replay_time}
+        }
+    
+    def close(self):
+        """포지션 저널을 닫고 임시 저장 디렉토리 정리"""
+        self.engine.position_manager.close()
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
@@ -0,0 +1,83 @@
+"""
+전역 자본 / 리스크 한도 모듈
+여러 마켓이 동시에 매수를 검토할 때 총 노출 금액과 동시 보유 포지션 수를 함께 제한
+"""
+
+import threading
+from typing import Callable, Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RiskBudget:
+    """
+    전역 리스크 한도
+    
+    매수 전 reserve()로 금액을 예약하고 포지션 기록(또는 주문 실패) 후 release()로 해제.
+    예약 금액은 다른 마켓의 한도 계산에 포함되고, 잔고 / 보유 포지션은 락 안에서 조회하여
+    동시 매수로 한도를 넘지 않음
+    """
+    
+    def __init__(self, max_total_exposure: float = 0.9, max_open_positions: int = 5):
+        """
+        초기화
+        
+        Args:
+            max_total_exposure: 총 자본(원화 잔고 + 보유 포지션 진입 금액) 대비 최대 노출 비율 (0-1)
+            max_open_positions: 최대 동시 보유 포지션 수 (예약 포함)
+        """
+        self.max_total_exposure = max_total_exposure
+        self.max_open_positions = max_open_positions
+        self._reserved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def reserve(
+        self,
+        market: str,
+        requested: float,
+        get_account: Callable[[], Tuple[float, float, int]]
+    ) -> float:
+        """
+        매수 금액 예약
+        
+        Args:
+            market: 마켓 코드
+            requested: 요청 금액 (원)
+            get_account: (원화 잔고, 보유 포지션 진입 금액 합계, 보유 포지션 수) 조회 함수
+        
+        Returns:
+            예약된 금액 (한도 초과 / 중복 예약이면 0.0)
+        """
+        with self._lock:
+            if market in self._reserved:
+                return 0.0
+            
+            krw_balance, open_exposure, open_positions = get_account()
+            
+            if open_positions + len(self._reserved) >= self.max_open_positions:
+                logger.debug(f"{market} 매수 보류: 최대 동시 포지션 {self.max_open_positions}개")
+                return 0.0
+            
+            reserved_total = sum(self._reserved.values())
+            total_capital = krw_balance + open_exposure
+            exposure_room = total_capital * self.max_total_exposure - open_exposure - reserved_total
+            cash_room = krw_balance - reserved_total
+            
+            amount = min(requested, exposure_room, cash_room)
+            if amount <= 0:
+                logger.debug(f"{market} 매수 보류: 전역 노출 한도 소진")
+                return 0.0
+            
+            self._reserved[market] = amount
+            return amount
+    
+    def release(self, market: str):
+        """예약 해제"""
+        with self._lock:
+            self._reserved.pop(market, None)
+    
+    def get_reserved(self) -> Dict[str, float]:
+        """마켓별 예약 금액"""
+        with self._lock:
+            return dict(self._reserved)
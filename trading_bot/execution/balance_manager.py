@@ -1,24 +1,130 @@
 """
 잔고 관리 모듈
+업비트 잔고 조회 결과를 TTL 캐시로 공유 (체결 시 무효화 + 백그라운드 재조회)
 """
 
-from typing import Dict
+import threading
+import time
+from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class BalanceManager:
-    """잔고 관리 클래스"""
+    """
+    잔고 관리 클래스
     
-    def __init__(self, market_data_collector):
+    - 전체 잔고를 한 번에 조회(get_all_balances)해 스냅샷으로 보관, 통화별 조회도 같은 스냅샷 사용
+    - 스냅샷은 ttl초 동안 재사용, 만료 시 동시에 조회한 스레드 중 하나만 API 호출 (나머지는 결과 대기)
+    - 주문 / 체결 시 invalidate()로 무효화하고 백그라운드에서 재조회
+    - 조회 중 무효화되면 그 결과는 만료 상태로 저장 (주문 전 잔고를 새 값으로 쓰지 않음)
+    - 무효화 후 재조회가 실패하면 이전 스냅샷 대신 빈 잔고 반환
+    - 스냅샷은 교체만 하고 수정하지 않으므로 UI / 엔진이 동시에 읽어도 항상 한 시점의 잔고
+    """
+    
+    def __init__(self, market_data_collector, ttl: float = 5.0):
         """
         초기화
         
         Args:
-            market_data_collector: MarketDataCollector 인스턴스
+            market_data_collector: MarketDataCollector 인스턴스 (get_balance / get_all_balances)
+            ttl: 잔고 캐시 유지 시간 (초, 0이면 캐시 없이 매번 조회)
         """
         self.market_data = market_data_collector
+        self.ttl = ttl
+        
+        self._snapshot: Optional[Dict[str, float]] = None
+        self._fetched_at = 0.0
+        self._generation = 0
+        self._fresh_generation = -1
+        self._refresh_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self.stats = {'api_calls': 0, 'cache_hits': 0, 'invalidations': 0, 'background_refreshes': 0, 'errors': 0}
+    
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and self._fresh_generation == self._generation
+            and time.monotonic() - self._fetched_at < self.ttl
+        )
+    
+    def _fetch(self) -> Dict[str, float]:
+        """전체 잔고 API 조회 → 스냅샷 교체 (조회 중 무효화되었으면 만료 상태로 저장)"""
+        with self._state_lock:
+            generation = self._generation
+        
+        balances = self.market_data.get_all_balances()
+        
+        with self._state_lock:
+            self.stats['api_calls'] += 1
+            if not balances:
+                # 조회 실패(빈 결과)는 캐시하지 않음, 이전 스냅샷은 무효화되지 않았을 때(TTL만 지남)만 사용
+                # 무효화된 스냅샷은 주문 / 체결 전 잔고이므로 빈 잔고 반환
+                self.stats['errors'] += 1
+                if self._snapshot is not None and self._fresh_generation == self._generation:
+                    return self._snapshot
+                return {}
+            self._snapshot = dict(balances)
+            self._fetched_at = time.monotonic()
+            self._fresh_generation = generation
+            return self._snapshot
+    
+    def get_snapshot(self) -> Dict[str, float]:
+        """
+        잔고 스냅샷 (캐시가 유효하면 API 호출 없음)
+        
+        Returns:
+            {통화코드: 잔고} (호출자가 수정하지 말 것)
+        """
+        if self.ttl <= 0:
+            with self._state_lock:
+                self.stats['api_calls'] += 1
+            return dict(self.market_data.get_all_balances())
+        
+        if self._is_fresh():
+            with self._state_lock:
+                self.stats['cache_hits'] += 1
+            return self._snapshot
+        
+        with self._refresh_lock:
+            # 기다리는 동안 다른 스레드가 갱신했으면 그 결과 사용
+            if self._is_fresh():
+                with self._state_lock:
+                    self.stats['cache_hits'] += 1
+                return self._snapshot
+            return self._fetch()
+    
+    def invalidate(self, refresh: bool = True):
+        """
+        잔고 캐시 무효화 (주문 접수 / 체결 / 취소 시)
+        
+        Args:
+            refresh: 백그라운드 스레드에서 바로 재조회할지 여부
+        """
+        with self._state_lock:
+            self._generation += 1
+            self.stats['invalidations'] += 1
+            if not refresh or self.ttl <= 0 or self._refreshing:
+                return
+            self._refreshing = True
+        
+        threading.Thread(target=self._background_refresh, daemon=True, name="balance-refresh").start()
+    
+    def _background_refresh(self):
+        """무효화 후 재조회 (그 사이 읽은 스레드가 이미 갱신했으면 생략)"""
+        try:
+            with self._refresh_lock:
+                if not self._is_fresh():
+                    self._fetch()
+                    with self._state_lock:
+                        self.stats['background_refreshes'] += 1
+        except Exception as e:
+            logger.error(f"잔고 백그라운드 조회 실패: {e}")
+        finally:
+            with self._state_lock:
+                self._refreshing = False
     
     def get_balance(self, currency: str = "KRW") -> float:
         """
@@ -30,7 +136,7 @@ class BalanceManager:
         Returns:
             잔고
         """
-        return self.market_data.get_balance(currency)
+        return float(self.get_snapshot().get(currency, 0.0))
     
     def get_all_balances(self) -> Dict[str, float]:
         """
@@ -39,7 +145,22 @@ class BalanceManager:
         Returns:
             {통화코드: 잔고} 딕셔너리
         """
-        return self.market_data.get_all_balances()
+        return dict(self.get_snapshot())
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        잔고 캐시 통계
+        
+        Returns:
+            {'api_calls', 'cache_hits', 'saved_calls', 'invalidations', 'background_refreshes', 'errors', 'age', 'ttl'}
+        """
+        with self._state_lock:
+            stats = dict(self.stats)
+            age = time.monotonic() - self._fetched_at if self._snapshot is not None else None
+        stats['saved_calls'] = stats['cache_hits']
+        stats['age'] = age
+        stats['ttl'] = self.ttl
+        return stats
     
     def calculate_position_size(
         self, 
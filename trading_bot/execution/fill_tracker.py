@@ -0,0 +1,134 @@
+"""
+체결 추적 모듈
+미체결 주문 상태를 주기적으로 동시 조회하여 체결 / 취소 / 시간 초과 판정 (asyncio)
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FillTracker:
+    """
+    주문 체결 추적
+    
+    - track()으로 등록한 주문을 poll_interval마다 한 번에 모두 조회 (주문별 조회는 스레드 풀에서 동시 실행)
+    - 체결 시 주문 → 체결 지연 시간을 order_executor.fill_latency에 기록
+    - timeout까지 최종 상태가 아니면 주문 취소 요청 후 최종 상태(체결 / 취소)가 될 때까지 계속 조회
+    - 최종 상태가 되면 on_final(order, status) 호출 (result: filled / cancelled / timed_out)
+    """
+    
+    def __init__(
+        self,
+        order_executor,
+        poll_interval: float = 2.0,
+        timeout: float = 60.0,
+        executor: Optional[Executor] = None,
+        on_final: Optional[Callable[[Dict, Dict], None]] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            order_executor: 주문 실행기 (get_order_status / cancel_order / fill_latency 사용)
+            poll_interval: 조회 간격 (초)
+            timeout: 주문별 최대 대기 시간 (초, 초과 시 취소 요청, 취소되지 않으면 timeout마다 재요청)
+            executor: 조회를 실행할 스레드 풀 (None이면 루프 기본 풀)
+            on_final: 최종 상태 콜백 (이벤트 루프 스레드에서 호출)
+        """
+        self.order_executor = order_executor
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.executor = executor
+        self.on_final = on_final
+        
+        self.open_orders: Dict[str, Dict] = {}
+        self.stats = {'tracked': 0, 'filled': 0, 'cancelled': 0, 'timed_out': 0, 'polls': 0, 'cancel_requests': 0}
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    def track(self, order: Dict):
+        """
+        추적 주문 등록 (이벤트 루프 스레드에서 호출)
+        
+        Args:
+            order: {'uuid': str, 'submit_time': float(time.monotonic), ...}
+        """
+        order.setdefault('submit_time', time.monotonic())
+        order['state'] = 'wait'
+        self.open_orders[order['uuid']] = order
+        self.stats['tracked'] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def run(self):
+        """추적 루프 (취소될 때까지)"""
+        self._wakeup = asyncio.Event()
+        
+        while True:
+            if not self.open_orders:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+            
+            orders = list(self.open_orders.values())
+            await asyncio.gather(*(self._poll(order) for order in orders))
+            
+            if self.open_orders:
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _poll(self, order: Dict):
+        """주문 1건 조회 및 최종 상태 판정"""
+        loop = asyncio.get_running_loop()
+        uuid = order['uuid']
+        
+        try:
+            status = await loop.run_in_executor(self.executor, self.order_executor.get_order_status, uuid)
+        except Exception as e:
+            logger.warning(f"주문 상태 조회 실패: {uuid} ({e})")
+            status = {'state': 'error', 'error': str(e)}
+        self.stats['polls'] += 1
+        order['state'] = status.get('state')
+        
+        if order['state'] == 'done':
+            self._finish(order, status, 'filled')
+        elif order['state'] == 'cancel':
+            # 시장가 매수는 잔량 취소로 끝나는 경우가 있음 → 체결 수량으로 판단
+            if status.get('executed_volume', 0) > 0:
+                self._finish(order, status, 'filled')
+            elif 'cancel_requested_at' in order:
+                self._finish(order, status, 'timed_out')
+            else:
+                self._finish(order, status, 'cancelled')
+        elif time.monotonic() - order.get('cancel_requested_at', order['submit_time']) >= self.timeout:
+            # 거래소에 살아있는 주문을 두고 추적을 끝내지 않음 → 취소 요청 후 최종 상태까지 계속 조회
+            order['cancel_requested_at'] = time.monotonic()
+            self.stats['cancel_requests'] += 1
+            logger.warning(f"주문 체결 대기 시간 초과, 취소 요청: {uuid} (상태: {order['state']})")
+            try:
+                await loop.run_in_executor(self.executor, self.order_executor.cancel_order, uuid)
+            except Exception as e:
+                logger.warning(f"주문 취소 요청 실패: {uuid} ({e})")
+    
+    def _finish(self, order: Dict, status: Dict, result: str):
+        """추적 종료 (체결이면 지연 시간 기록)"""
+        self.open_orders.pop(order['uuid'], None)
+        self.stats[result] += 1
+        order['result'] = result
+        
+        if result == 'filled':
+            order['fill_latency'] = time.monotonic() - order['submit_time']
+            self.order_executor.fill_latency.observe(order['fill_latency'])
+            logger.info(f"주문 체결 확인: {order['uuid']} ({order['fill_latency']:.2f}초)")
+        elif result == 'cancelled':
+            logger.warning(f"주문 취소됨: {order['uuid']}")
+        else:
+            logger.warning(f"시간 초과로 취소된 주문: {order['uuid']}")
+        
+        if self.on_final:
+            try:
+                self.on_final(order, status)
+            except Exception as e:
+                logger.error(f"체결 콜백 실패: {e}")
@@ -3,66 +3,196 @@
 업비트 API를 통한 매수/매도 주문 실행
 """
 
-import pyupbit
+import random
 import time
-from typing import Dict, Optional
+import uuid
+from typing import Callable, Dict, Optional
 import logging
 
+from trading_bot.execution.upbit_rest import UPBIT_API_URL, UpbitAPIError, UpbitRestClient
+from trading_bot.utils.metrics import LatencyHistogram, METRICS
+
 logger = logging.getLogger(__name__)
 
 
 class OrderExecutor:
-    """주문 실행 클래스"""
+    """
+    주문 실행 클래스
+    
+    - 주문마다 클라이언트 주문 ID(identifier)를 붙여 재시도해도 같은 주문으로 처리
+    - 통신 오류 / 429 / 5xx만 지수 백오프 + 지터로 재시도
+    - 주문 → 접수(ack) 지연 시간을 기록 (체결까지의 시간은 FillTracker가 기록)
+    """
     
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_delay: float = 5.0,
+        base_url: str = UPBIT_API_URL
+    ):
         """
         초기화
         
         Args:
             access_key: 업비트 Access Key
             secret_key: 업비트 Secret Key
+            max_retries: 최대 시도 횟수
+            retry_base_delay: 첫 재시도 대기 상한 (초, 시도마다 2배)
+            retry_delay: 재시도 대기 최대값 (초)
+            base_url: API 기본 URL (테스트 시 로컬 서버)
         """
         self.access_key = access_key
         self.secret_key = secret_key
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_delay = retry_delay
+        
+        # 주문 → 접수 / 주문 → 체결 지연 시간 (초)
+        self.ack_latency = LatencyHistogram()
+        self.fill_latency = LatencyHistogram()
+        self.stats = {'orders_submitted': 0, 'retries': 0, 'recovered_by_identifier': 0}
         
         if access_key and secret_key:
             try:
-                self.upbit = pyupbit.Upbit(access_key, secret_key)
+                self.client = UpbitRestClient(access_key, secret_key, base_url=base_url)
                 logger.info("업비트 API 연결 성공")
             except Exception as e:
                 logger.error(f"업비트 API 연결 실패: {e}")
-                self.upbit = None
+                self.client = None
         else:
-            self.upbit = None
+            self.client = None
             logger.warning("업비트 API 키가 설정되지 않았습니다.")
     
-    def _retry_on_error(self, func, max_retries: int = 3, delay: int = 5):
+    @staticmethod
+    def new_client_order_id() -> str:
+        """클라이언트 주문 ID 생성"""
+        return f"wa-{uuid.uuid4().hex}"
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """재시도 대기 시간 (지수 백오프 + full jitter)"""
+        cap = min(self.retry_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+    
+    def _retry_on_error(self, func: Callable, max_retries: Optional[int] = None):
         """
-        에러 발생 시 재시도 데코레이터
+        재시도 가능한 오류(통신 오류 / 429 / 5xx) 발생 시 재시도
         
         Args:
             func: 실행할 함수
-            max_retries: 최대 재시도 횟수
-            delay: 재시도 간격 (초)
+            max_retries: 최대 시도 횟수 (None이면 설정값)
         
         Returns:
             함수 실행 결과
         """
+        max_retries = max_retries or self.max_retries
         for attempt in range(max_retries):
             try:
                 return func()
-            except Exception as e:
-                if attempt == max_retries - 1:
+            except UpbitAPIError as e:
+                if not e.retryable or attempt == max_retries - 1:
                     raise
-                logger.warning(f"{func.__name__} 실패 (시도 {attempt+1}/{max_retries}): {e}. {delay}초 후 재시도...")
+                delay = self._backoff_delay(attempt)
+                self.stats['retries'] += 1
+                logger.warning(f"API 요청 실패 (시도 {attempt+1}/{max_retries}): {e}. {delay:.2f}초 후 재시도...")
                 time.sleep(delay)
     
+    def _find_order(self, identifier: str) -> Optional[Dict]:
+        """클라이언트 주문 ID로 주문 조회 (없거나 조회 실패 시 None)"""
+        try:
+            return self.client.get_order(identifier=identifier)
+        except UpbitAPIError as e:
+            logger.debug(f"주문 조회 실패 ({identifier}): {e}")
+            return None
+    
+    @METRICS.timed("order_submit")
+    def _submit_order(
+        self,
+        market: str,
+        side: str,
+        ord_type: str,
+        volume: Optional[float] = None,
+        price: Optional[float] = None,
+        client_order_id: Optional[str] = None
+    ) -> Dict:
+        """
+        주문 전송 (재시도해도 같은 identifier 사용)
+        
+        응답을 받지 못한 시도는 실제로 접수되었을 수 있으므로, 재전송 전에 identifier로 먼저 조회
+        
+        Returns:
+            {
+                'success': bool,
+                'uuid': str,
+                'client_order_id': str,
+                'submit_time': float,  # time.monotonic() 기준 전송 시각
+                'ack_latency': float,  # 주문 → 접수 (초)
+                'error': str  # 에러 메시지 (실패 시)
+            }
+        """
+        identifier = client_order_id or self.new_client_order_id()
+        submit_time = time.monotonic()
+        ambiguous = False
+        result = None
+        error = None
+        
+        for attempt in range(self.max_retries):
+            if ambiguous:
+                result = self._find_order(identifier)
+                if result:
+                    self.stats['recovered_by_identifier'] += 1
+                    logger.info(f"이전 시도에서 접수된 주문 확인: {identifier}")
+                    break
+            
+            try:
+                result = self.client.place_order(
+                    market, side, ord_type, volume=volume, price=price, identifier=identifier
+                )
+                break
+            except UpbitAPIError as e:
+                error = e
+                if not e.retryable:
+                    # 이전 시도가 접수되어 identifier 중복으로 거절된 경우
+                    result = self._find_order(identifier) if ambiguous else None
+                    break
+                ambiguous = True
+                if attempt < self.max_retries - 1:
+                    delay = self._backoff_delay(attempt)
+                    self.stats['retries'] += 1
+                    logger.warning(f"주문 전송 실패 (시도 {attempt+1}/{self.max_retries}): {e}. {delay:.2f}초 후 재시도...")
+                    time.sleep(delay)
+        else:
+            # 마지막 시도도 응답이 없으면 접수 여부 한 번 더 확인
+            result = self._find_order(identifier)
+        
+        if result and 'uuid' in result:
+            ack_latency = time.monotonic() - submit_time
+            self.ack_latency.observe(ack_latency)
+            self.stats['orders_submitted'] += 1
+            return {
+                'success': True,
+                'uuid': result['uuid'],
+                'client_order_id': identifier,
+                'submit_time': submit_time,
+                'ack_latency': ack_latency
+            }
+        
+        return {
+            'success': False,
+            'client_order_id': identifier,
+            'error': str(error) if error else '알 수 없는 오류'
+        }
+    
     def place_buy_order(
-        self, 
-        market: str, 
-        price: Optional[float] = None, 
+        self,
+        market: str,
+        price: Optional[float] = None,
         quantity: Optional[float] = None,
-        order_type: str = "market"
+        order_type: str = "market",
+        amount: Optional[float] = None,
+        client_order_id: Optional[str] = None
     ) -> Dict:
         """
         매수 주문 실행
@@ -70,17 +200,22 @@ class OrderExecutor:
         Args:
             market: 마켓 코드 (예: KRW-BTC)
             price: 주문 가격 (지정가 주문 시)
-            quantity: 주문 수량
+            quantity: 주문 수량 (지정가 주문 시)
             order_type: 주문 유형 ("market" 또는 "limit")
+            amount: 주문 금액 (원, 시장가 주문 시 / None이면 원화 잔고 전액)
+            client_order_id: 클라이언트 주문 ID (None이면 생성)
         
         Returns:
             {
                 'success': bool,
                 'uuid': str,  # 주문 UUID
+                'client_order_id': str,
+                'submit_time': float,
+                'ack_latency': float,  # 주문 → 접수 (초)
                 'error': str  # 에러 메시지 (실패 시)
             }
         """
-        if not self.upbit:
+        if not self.client:
             return {
                 'success': False,
                 'error': '업비트 API가 초기화되지 않았습니다.'
@@ -88,22 +223,16 @@ class OrderExecutor:
         
         try:
             if order_type == "market":
-                # 시장가 매수
-                if quantity:
-                    result = self._retry_on_error(
-                        lambda: self.upbit.buy_market_order(market, quantity)
-                    )
-                else:
+                # 시장가 매수 (주문 금액 지정)
+                if not amount:
                     # 원화 잔고로 최대한 매수
-                    krw_balance = self.upbit.get_balance("KRW")
-                    if krw_balance <= 0:
+                    amount = self._get_balance("KRW")
+                    if amount <= 0:
                         return {
                             'success': False,
                             'error': '원화 잔고가 부족합니다.'
                         }
-                    result = self._retry_on_error(
-                        lambda: self.upbit.buy_market_order(market, krw_balance)
-                    )
+                result = self._submit_order(market, 'bid', 'price', price=amount, client_order_id=client_order_id)
             else:
                 # 지정가 매수
                 if not price or not quantity:
@@ -111,24 +240,16 @@ class OrderExecutor:
                         'success': False,
                         'error': '지정가 주문은 가격과 수량이 필요합니다.'
                     }
-                result = self._retry_on_error(
-                    lambda: self.upbit.buy_limit_order(market, price, quantity)
+                result = self._submit_order(
+                    market, 'bid', 'limit', volume=quantity, price=price, client_order_id=client_order_id
                 )
             
-            if result and 'uuid' in result:
-                logger.info(f"매수 주문 성공: {market}, UUID: {result['uuid']}")
-                return {
-                    'success': True,
-                    'uuid': result['uuid']
-                }
+            if result['success']:
+                logger.info(f"매수 주문 성공: {market}, UUID: {result['uuid']} (접수 {result['ack_latency']*1000:.0f}ms)")
             else:
-                error_msg = result.get('error', {}).get('message', '알 수 없는 오류')
-                logger.error(f"매수 주문 실패: {error_msg}")
-                return {
-                    'success': False,
-                    'error': error_msg
-                }
-                
+                logger.error(f"매수 주문 실패: {result['error']}")
+            return result
+        
         except Exception as e:
             logger.error(f"매수 주문 실행 실패: {e}")
             return {
@@ -137,11 +258,12 @@ class OrderExecutor:
             }
     
     def place_sell_order(
-        self, 
-        market: str, 
-        price: Optional[float] = None, 
+        self,
+        market: str,
+        price: Optional[float] = None,
         quantity: Optional[float] = None,
-        order_type: str = "market"
+        order_type: str = "market",
+        client_order_id: Optional[str] = None
     ) -> Dict:
         """
         매도 주문 실행
@@ -149,17 +271,14 @@ class OrderExecutor:
         Args:
             market: 마켓 코드 (예: KRW-BTC)
             price: 주문 가격 (지정가 주문 시)
-            quantity: 주문 수량
+            quantity: 주문 수량 (None이면 보유 수량 전량, 시장가 주문 시)
             order_type: 주문 유형 ("market" 또는 "limit")
+            client_order_id: 클라이언트 주문 ID (None이면 생성)
         
         Returns:
-            {
-                'success': bool,
-                'uuid': str,  # 주문 UUID
-                'error': str  # 에러 메시지 (실패 시)
-            }
+            place_buy_order와 같은 형식
         """
-        if not self.upbit:
+        if not self.client:
             return {
                 'success': False,
                 'error': '업비트 API가 초기화되지 않았습니다.'
@@ -171,21 +290,15 @@ class OrderExecutor:
             
             if order_type == "market":
                 # 시장가 매도
-                if quantity:
-                    result = self._retry_on_error(
-                        lambda: self.upbit.sell_market_order(market, quantity)
-                    )
-                else:
+                if not quantity:
                     # 보유 수량 전량 매도
-                    balance = self.upbit.get_balance(coin_symbol)
-                    if balance <= 0:
+                    quantity = self._get_balance(coin_symbol)
+                    if quantity <= 0:
                         return {
                             'success': False,
                             'error': f'{coin_symbol} 잔고가 없습니다.'
                         }
-                    result = self._retry_on_error(
-                        lambda: self.upbit.sell_market_order(market, balance)
-                    )
+                result = self._submit_order(market, 'ask', 'market', volume=quantity, client_order_id=client_order_id)
             else:
                 # 지정가 매도
                 if not price or not quantity:
@@ -193,24 +306,16 @@ class OrderExecutor:
                         'success': False,
                         'error': '지정가 주문은 가격과 수량이 필요합니다.'
                     }
-                result = self._retry_on_error(
-                    lambda: self.upbit.sell_limit_order(market, price, quantity)
+                result = self._submit_order(
+                    market, 'ask', 'limit', volume=quantity, price=price, client_order_id=client_order_id
                 )
             
-            if result and 'uuid' in result:
-                logger.info(f"매도 주문 성공: {market}, UUID: {result['uuid']}")
-                return {
-                    'success': True,
-                    'uuid': result['uuid']
-                }
+            if result['success']:
+                logger.info(f"매도 주문 성공: {market}, UUID: {result['uuid']} (접수 {result['ack_latency']*1000:.0f}ms)")
             else:
-                error_msg = result.get('error', {}).get('message', '알 수 없는 오류')
-                logger.error(f"매도 주문 실패: {error_msg}")
-                return {
-                    'success': False,
-                    'error': error_msg
-                }
-                
+                logger.error(f"매도 주문 실패: {result['error']}")
+            return result
+        
         except Exception as e:
             logger.error(f"매도 주문 실행 실패: {e}")
             return {
@@ -218,6 +323,23 @@ class OrderExecutor:
                 'error': str(e)
             }
     
+    def _get_balance(self, currency: str) -> float:
+        """주문 가능 잔고 조회"""
+        accounts = self._retry_on_error(self.client.get_accounts)
+        for account in accounts:
+            if account.get('currency') == currency:
+                return float(account.get('balance', 0))
+        return 0.0
+    
+    @staticmethod
+    def _average_fill_price(order: Dict) -> float:
+        """체결 내역(trades)의 체결 금액 / 수량 (시장가 매도는 price가 비어 있어 체결 내역으로 계산)"""
+        volume = sum(float(trade.get('volume') or 0) for trade in order.get('trades') or [])
+        if volume <= 0:
+            return 0.0
+        funds = sum(float(trade.get('funds') or 0) for trade in order.get('trades') or [])
+        return funds / volume
+    
     def get_order_status(self, uuid: str) -> Dict:
         """
         주문 상태 조회
@@ -231,10 +353,11 @@ class OrderExecutor:
                 'side': str,  # 'bid' (매수), 'ask' (매도)
                 'price': float,
                 'volume': float,
-                'executed_volume': float
+                'executed_volume': float,
+                'avg_price': float  # 체결 평균가 (체결 내역 기준, 없으면 0)
             }
         """
-        if not self.upbit:
+        if not self.client:
             return {
                 'state': 'error',
                 'error': '업비트 API가 초기화되지 않았습니다.'
@@ -242,23 +365,24 @@ class OrderExecutor:
         
         try:
             result = self._retry_on_error(
-                lambda: self.upbit.get_order(uuid)
+                lambda: self.client.get_order(uuid=uuid)
             )
             
             if result:
                 return {
                     'state': result.get('state', 'unknown'),
                     'side': result.get('side', 'unknown'),
-                    'price': float(result.get('price', 0)),
-                    'volume': float(result.get('volume', 0)),
-                    'executed_volume': float(result.get('executed_volume', 0))
+                    'price': float(result.get('price') or 0),
+                    'volume': float(result.get('volume') or 0),
+                    'executed_volume': float(result.get('executed_volume') or 0),
+                    'avg_price': self._average_fill_price(result)
                 }
             else:
                 return {
                     'state': 'error',
                     'error': '주문 정보를 찾을 수 없습니다.'
                 }
-                
+        
         except Exception as e:
             logger.error(f"주문 상태 조회 실패: {e}")
             return {
@@ -276,13 +400,13 @@ class OrderExecutor:
         Returns:
             취소 성공 여부
         """
-        if not self.upbit:
+        if not self.client:
             logger.warning("업비트 API가 초기화되지 않았습니다.")
             return False
         
         try:
             result = self._retry_on_error(
-                lambda: self.upbit.cancel_order(uuid)
+                lambda: self.client.cancel_order(uuid)
             )
             
             if result and 'uuid' in result:
@@ -291,12 +415,23 @@ class OrderExecutor:
             else:
                 logger.error(f"주문 취소 실패: {result}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"주문 취소 실행 실패: {e}")
             return False
     
+    def get_latency_stats(self) -> Dict:
+        """
+        주문 지연 시간 요약
+        
+        Returns:
+            {'submit_to_ack': Dict, 'submit_to_fill': Dict}  # LatencyHistogram.snapshot() 형식 (초)
+        """
+        return {
+            'submit_to_ack': self.ack_latency.snapshot(),
+            'submit_to_fill': self.fill_latency.snapshot()
+        }
+    
     def is_connected(self) -> bool:
         """API 연결 상태 확인"""
-        return self.upbit is not None
-
+        return self.client is not None
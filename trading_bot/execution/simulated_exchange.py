@@ -0,0 +1,267 @@
+"""
+모의 거래소 모듈
+리플레이 / 모의투자용 호가 + 잔고 원장 (UpbitRestClient / MarketDataCollector와 같은 인터페이스)
+"""
+
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import logging
+
+from trading_bot.execution.upbit_rest import UpbitAPIError
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedExchange:
+    """
+    모의 거래소
+    
+    - 마켓별 기준가(set_price) 양쪽에 spread만큼 벌어진 최우선 호가를 두고 시장가 주문은 즉시 체결
+    - 지정가 주문은 호가와 교차하면 즉시, 아니면 대기 후 기준가가 갱신될 때 체결
+    - 수수료는 업비트와 같이 매수는 주문 금액에 더해 차감, 매도는 체결 금액에서 차감
+    - OrderExecutor.client 자리에 넣으면 실제 주문 실행기를 그대로 사용 (get_accounts / place_order / get_order / cancel_order)
+    - BalanceManager의 시장 데이터 수집기 자리에 넣으면 잔고 조회도 원장에서 처리
+    """
+    
+    def __init__(
+        self,
+        initial_krw: float = 1000000,
+        fee_rate: float = 0.0005,
+        spread: float = 0.0,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
+        """
+        초기화
+        
+        Args:
+            initial_krw: 초기 원화 잔고
+            fee_rate: 거래 수수료율 (업비트 원화 마켓 0.05%)
+            spread: 최우선 매수 / 매도 호가 간격 (기준가 대비 비율)
+            clock: 주문 시각 (None이면 현재 시각, 리플레이 시 모의 시계)
+        """
+        self.fee_rate = fee_rate
+        self.spread = spread
+        self._clock = clock or datetime.now
+        
+        self.balances: Dict[str, float] = {'KRW': float(initial_krw)}
+        self.locked: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.orders: Dict[str, Dict] = {}
+        self.stats = {'orders': 0, 'fills': 0, 'rejected': 0, 'fees': 0.0}
+        
+        self._identifiers: Dict[str, str] = {}
+        self._resting: List[str] = []
+        self._filled: List[str] = []
+        self._lock = threading.RLock()
+    
+    def set_price(self, market: str, price: float):
+        """기준가 갱신 (대기 중인 지정가 주문 체결 확인)"""
+        with self._lock:
+            self.prices[market] = float(price)
+            for order_uuid in list(self._resting):
+                order = self.orders[order_uuid]
+                if order['market'] == market:
+                    self._match_limit(order)
+    
+    def get_quote(self, market: str) -> Dict[str, float]:
+        """최우선 호가 ({'bid': 매수 호가, 'ask': 매도 호가})"""
+        price = self.prices.get(market, 0.0)
+        half = self.spread / 2
+        return {'bid': price * (1 - half), 'ask': price * (1 + half)}
+    
+    def get_current_price(self, market: str = "KRW-BTC") -> float:
+        """현재가 (기준가)"""
+        return self.prices.get(market, 0.0)
+    
+    def get_balance(self, currency: str = "KRW") -> float:
+        """주문 가능 잔고"""
+        with self._lock:
+            return self.balances.get(currency, 0.0)
+    
+    def get_all_balances(self) -> Dict[str, float]:
+        """{통화코드: 잔고} (0 제외)"""
+        with self._lock:
+            return {currency: amount for currency, amount in self.balances.items() if amount > 0}
+    
+    def get_equity(self) -> float:
+        """평가 금액 (원화 + 보유 코인 기준가 환산)"""
+        with self._lock:
+            equity = self.balances.get('KRW', 0.0)
+            for currency, amount in self.balances.items():
+                if currency != 'KRW':
+                    equity += amount * self.prices.get(f"KRW-{currency}", 0.0)
+            return equity
+    
+    def get_accounts(self) -> List[Dict]:
+        """전체 계좌 조회 (업비트 응답 형식)"""
+        with self._lock:
+            return [
+                {
+                    'currency': currency,
+                    'balance': f"{amount:.8f}",
+                    'locked': f"{self.locked.get(currency, 0.0):.8f}",
+                    'unit_currency': 'KRW'
+                }
+                for currency, amount in self.balances.items()
+            ]
+    
+    def place_order(
+        self,
+        market: str,
+        side: str,
+        ord_type: str,
+        volume: Optional[float] = None,
+        price: Optional[float] = None,
+        identifier: Optional[str] = None
+    ) -> Dict:
+        """
+        주문 (업비트 주문 응답 형식)
+        
+        Raises:
+            UpbitAPIError: 시세 없음 / 잔고 부족 / identifier 중복 (재시도 대상 아님)
+        """
+        with self._lock:
+            if identifier and identifier in self._identifiers:
+                raise UpbitAPIError("identifier가 이미 사용되었습니다.", status=400, name="duplicate_identifier")
+            if self.prices.get(market, 0.0) <= 0:
+                self.stats['rejected'] += 1
+                raise UpbitAPIError(f"{market} 시세가 없습니다.", status=400, name="market_unavailable")
+            
+            volume = float(volume) if volume is not None else None
+            price = float(price) if price is not None else None
+            self._check_funds(market, side, ord_type, volume, price)
+            
+            order = {
+                'uuid': str(uuid.uuid4()),
+                'identifier': identifier,
+                'market': market,
+                'side': side,
+                'ord_type': ord_type,
+                'price': price,
+                'volume': volume,
+                'state': 'wait',
+                'executed_volume': 0.0,
+                'paid_fee': 0.0,
+                'trades': [],
+                'created_at': self._clock().isoformat()
+            }
+            self.orders[order['uuid']] = order
+            if identifier:
+                self._identifiers[identifier] = order['uuid']
+            self.stats['orders'] += 1
+            
+            if ord_type == 'limit':
+                self._resting.append(order['uuid'])
+                self._hold(order, 1)
+                self._match_limit(order)
+            else:
+                quote = self.get_quote(market)
+                self._fill(order, quote['ask'] if side == 'bid' else quote['bid'])
+            
+            return self._public(order)
+    
+    def get_order(self, uuid: Optional[str] = None, identifier: Optional[str] = None) -> Dict:
+        """주문 조회 (uuid 또는 identifier)"""
+        with self._lock:
+            order_uuid = uuid or self._identifiers.get(identifier)
+            order = self.orders.get(order_uuid)
+            if order is None:
+                raise UpbitAPIError("주문을 찾지 못했습니다.", status=404, name="order_not_found")
+            return self._public(order)
+    
+    def cancel_order(self, uuid: str) -> Dict:
+        """대기 주문 취소"""
+        with self._lock:
+            order = self.orders.get(uuid)
+            if order is None or order['state'] != 'wait':
+                raise UpbitAPIError("취소할 수 없는 주문입니다.", status=400, name="order_not_cancellable")
+            order['state'] = 'cancel'
+            self._resting.remove(uuid)
+            self._hold(order, -1)
+            return self._public(order)
+    
+    def pop_filled(self) -> List[Dict]:
+        """마지막 호출 이후 체결 완료된 주문 (리플레이에서 체결 추적 대신 사용)"""
+        with self._lock:
+            filled, self._filled = self._filled, []
+            return [self._public(self.orders[order_uuid]) for order_uuid in filled]
+    
+    def _check_funds(self, market: str, side: str, ord_type: str, volume: Optional[float], price: Optional[float]):
+        """주문 가능 잔고 확인"""
+        currency = market.split('-')[1]
+        if side == 'bid':
+            cost = price if ord_type == 'price' else (price or 0.0) * (volume or 0.0)
+            if not cost or cost <= 0:
+                raise UpbitAPIError("주문 금액이 없습니다.", status=400, name="invalid_price")
+            if cost * (1 + self.fee_rate) > self.balances.get('KRW', 0.0) + 1e-6:
+                self.stats['rejected'] += 1
+                raise UpbitAPIError("주문 가능 금액이 부족합니다.", status=400, name="insufficient_funds_bid")
+        else:
+            if not volume or volume <= 0:
+                raise UpbitAPIError("주문 수량이 없습니다.", status=400, name="invalid_volume")
+            if volume > self.balances.get(currency, 0.0) + 1e-12:
+                self.stats['rejected'] += 1
+                raise UpbitAPIError("주문 가능 수량이 부족합니다.", status=400, name="insufficient_funds_ask")
+    
+    def _hold(self, order: Dict, sign: int):
+        """대기 지정가 주문 금액 / 수량 묶기(sign=1) 또는 풀기(sign=-1)"""
+        if order['side'] == 'bid':
+            currency, amount = 'KRW', order['price'] * order['volume'] * (1 + self.fee_rate)
+        else:
+            currency, amount = order['market'].split('-')[1], order['volume']
+        self.balances[currency] = self.balances.get(currency, 0.0) - sign * amount
+        self.locked[currency] = self.locked.get(currency, 0.0) + sign * amount
+    
+    def _match_limit(self, order: Dict):
+        """지정가 주문이 최우선 호가와 교차하면 주문 가격으로 체결"""
+        quote = self.get_quote(order['market'])
+        if order['side'] == 'bid' and 0 < quote['ask'] <= order['price']:
+            self._fill(order, order['price'])
+        elif order['side'] == 'ask' and quote['bid'] >= order['price']:
+            self._fill(order, order['price'])
+    
+    def _fill(self, order: Dict, fill_price: float):
+        """전량 체결 및 원장 반영"""
+        currency = order['market'].split('-')[1]
+        if order['uuid'] in self._resting:
+            self._resting.remove(order['uuid'])
+            self._hold(order, -1)
+        
+        if order['side'] == 'bid':
+            funds = order['price'] if order['ord_type'] == 'price' else order['price'] * order['volume']
+            volume = order['volume'] if order['ord_type'] == 'limit' else funds / fill_price
+            funds = volume * fill_price
+            fee = funds * self.fee_rate
+            self.balances['KRW'] = self.balances.get('KRW', 0.0) - funds - fee
+            self.balances[currency] = self.balances.get(currency, 0.0) + volume
+        else:
+            volume = order['volume']
+            funds = volume * fill_price
+            fee = funds * self.fee_rate
+            self.balances[currency] = self.balances.get(currency, 0.0) - volume
+            self.balances['KRW'] = self.balances.get('KRW', 0.0) + funds - fee
+            if self.balances[currency] <= 1e-12:
+                del self.balances[currency]
+        
+        order['state'] = 'done'
+        order['executed_volume'] = volume
+        order['paid_fee'] = fee
+        order['trades'].append({
+            'price': fill_price,
+            'volume': volume,
+            'funds': funds,
+            'created_at': self._clock().isoformat()
+        })
+        self._filled.append(order['uuid'])
+        
+        self.stats['fills'] += 1
+        self.stats['fees'] += fee
+    
+    @staticmethod
+    def _public(order: Dict) -> Dict:
+        """주문 응답 (업비트 형식, 내부 상태 복사)"""
+        response = dict(order, trades=[dict(trade) for trade in order['trades']])
+        response['trades_count'] = len(order['trades'])
+        return response
@@ -0,0 +1,153 @@
+"""
+업비트 REST API 클라이언트
+주문 / 주문 조회 / 취소 / 잔고 조회 (JWT 인증, 기본 URL 변경 가능)
+"""
+
+import hashlib
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlencode
+import logging
+
+import jwt
+import requests
+
+logger = logging.getLogger(__name__)
+
+UPBIT_API_URL = "https://api.upbit.com"
+
+
+class UpbitAPIError(Exception):
+    """업비트 API 오류 응답 / 통신 오류"""
+    
+    def __init__(self, message: str, status: Optional[int] = None, name: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.name = name
+    
+    @property
+    def retryable(self) -> bool:
+        """재시도 가능 여부 (통신 오류 / 429 / 5xx)"""
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class UpbitRestClient:
+    """
+    업비트 REST API 클라이언트
+    
+    pyupbit과 달리 주문 식별자(identifier)를 지정할 수 있어 재시도 시 중복 주문을 막을 수 있음
+    """
+    
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        base_url: str = UPBIT_API_URL,
+        timeout: float = 5.0
+    ):
+        """
+        초기화
+        
+        Args:
+            access_key: 업비트 Access Key
+            secret_key: 업비트 Secret Key
+            base_url: API 기본 URL (테스트 시 로컬 서버)
+            timeout: 요청 타임아웃 (초)
+        """
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+    
+    def _headers(self, params: Optional[Dict]) -> Dict:
+        """JWT 인증 헤더 (파라미터가 있으면 query_hash 포함)"""
+        payload = {
+            'access_key': self.access_key,
+            'nonce': str(uuid.uuid4())
+        }
+        if params:
+            query_hash = hashlib.sha512(unquote(urlencode(params)).encode()).hexdigest()
+            payload['query_hash'] = query_hash
+            payload['query_hash_alg'] = 'SHA512'
+        
+        token = jwt.encode(payload, self.secret_key, algorithm='HS256')
+        return {'Authorization': f"Bearer {token}"}
+    
+    def _request(self, method: str, path: str, params: Optional[Dict] = None):
+        """
+        API 요청
+        
+        Raises:
+            UpbitAPIError: 통신 오류 (status None) 또는 오류 응답
+        """
+        url = f"{self.base_url}{path}"
+        headers = self._headers(params)
+        
+        try:
+            if method == 'POST':
+                response = self.session.post(url, json=params, headers=headers, timeout=self.timeout)
+            else:
+                response = self.session.request(method, url, params=params, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise UpbitAPIError(f"{method} {path} 통신 오류: {e}") from e
+        
+        if response.status_code >= 400:
+            try:
+                error = response.json().get('error', {})
+            except ValueError:
+                error = {}
+            raise UpbitAPIError(
+                error.get('message', f"HTTP {response.status_code}"),
+                status=response.status_code,
+                name=error.get('name', '')
+            )
+        
+        return response.json()
+    
+    def get_accounts(self) -> List[Dict]:
+        """전체 계좌 조회"""
+        return self._request('GET', '/v1/accounts')
+    
+    def place_order(
+        self,
+        market: str,
+        side: str,
+        ord_type: str,
+        volume: Optional[float] = None,
+        price: Optional[float] = None,
+        identifier: Optional[str] = None
+    ) -> Dict:
+        """
+        주문
+        
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            side: 'bid' (매수) / 'ask' (매도)
+            ord_type: 'limit' (지정가) / 'price' (시장가 매수, price=주문 금액) / 'market' (시장가 매도)
+            volume: 주문 수량
+            price: 주문 가격 또는 주문 금액
+            identifier: 클라이언트 주문 ID (계정 내 유일)
+        """
+        params = {'market': market, 'side': side, 'ord_type': ord_type}
+        if volume is not None:
+            params['volume'] = _format_number(volume)
+        if price is not None:
+            params['price'] = _format_number(price)
+        if identifier:
+            params['identifier'] = identifier
+        return self._request('POST', '/v1/orders', params)
+    
+    def get_order(self, uuid: Optional[str] = None, identifier: Optional[str] = None) -> Dict:
+        """주문 조회 (uuid 또는 identifier)"""
+        params = {'uuid': uuid} if uuid else {'identifier': identifier}
+        return self._request('GET', '/v1/order', params)
+    
+    def cancel_order(self, uuid: str) -> Dict:
+        """주문 취소"""
+        return self._request('DELETE', '/v1/order', {'uuid': uuid})
+
+
+def _format_number(value: float) -> str:
+    """주문 수량 / 가격 문자열 (지수 표기 없이)"""
+    return f"{value:.8f}".rstrip('0').rstrip('.')
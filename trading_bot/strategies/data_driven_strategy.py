@@ -14,6 +14,7 @@ ROOT = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(ROOT))
 
 from trading_bot.collectors.data_collector import DataCollector
+from trading_bot.utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,8 @@ class DataDrivenStrategy:
             logger.warning(f"특성 중요도 로드 실패: {e}")
             return {}
     
-    def calculate_buy_signal_score(self, coin: str = "BTC") -> Dict:
+    @METRICS.timed("strategy_buy")
+    def calculate_buy_signal_score(self, coin: str = "BTC", snapshot=None) -> Dict:
         """
         매수 시그널 점수 계산
         
@@ -80,6 +82,10 @@ class DataDrivenStrategy:
         3. 동적 변수들의 긍정적 변화 감지
         4. 상관관계 분석 결과 반영
         
+        Args:
+            coin: 코인 심볼
+            snapshot: 틱 스냅샷 (TickSnapshot, 있으면 재조회 없이 사용)
+        
         Returns:
             {
                 'buy_signal': bool,
@@ -91,7 +97,7 @@ class DataDrivenStrategy:
         """
         try:
             # 1. 리스크 예측 조회
-            risk_pred = self.data_collector.get_risk_prediction(coin)
+            risk_pred = snapshot.risk if snapshot is not None else self.data_collector.get_risk_prediction(coin)
             high_vol_prob = risk_pred['high_volatility_prob']
             
             # 고변동성 확률이 낮을수록 매수 (안정적인 시장)
@@ -100,7 +106,7 @@ class DataDrivenStrategy:
             
             # 2. 특성 중요도 기반 점수 계산
             feature_score = 0.0
-            feature_values = self.data_collector.get_feature_values(coin)
+            feature_values = snapshot.features if snapshot is not None else self.data_collector.get_feature_values(coin)
             total_importance = 0.0
             
             for feature, importance in self.feature_importance.items():
@@ -251,7 +257,8 @@ class DataDrivenStrategy:
         
         return score
     
-    def calculate_sell_signal_score(self, coin: str = "BTC", entry_price: float = None) -> Dict:
+    @METRICS.timed("strategy_sell")
+    def calculate_sell_signal_score(self, coin: str = "BTC", entry_price: float = None, snapshot=None) -> Dict:
         """
         매도 시그널 점수 계산
         
@@ -260,6 +267,11 @@ class DataDrivenStrategy:
         2. 수익률 기반 익절/손절
         3. 특성 변화 감지
         
+        Args:
+            coin: 코인 심볼
+            entry_price: 진입가
+            snapshot: 틱 스냅샷 (TickSnapshot, 있으면 재조회 없이 사용)
+        
         Returns:
             {
                 'sell_signal': bool,
@@ -272,14 +284,14 @@ class DataDrivenStrategy:
         """
         try:
             # 1. 리스크 예측 조회
-            risk_pred = self.data_collector.get_risk_prediction(coin)
+            risk_pred = snapshot.risk if snapshot is not None else self.data_collector.get_risk_prediction(coin)
             high_vol_prob = risk_pred['high_volatility_prob']
             
             # 고변동성 확률이 높을수록 매도 (0.5 이상이면 매도 고려)
             volatility_score = max(0, (high_vol_prob - 0.3) * 200)  # 0-100 점수
             
             # 2. 현재가 조회 (수익률 계산용)
-            current_price = self.data_collector.get_current_price(coin)
+            current_price = snapshot.current_price if snapshot is not None else self.data_collector.get_current_price(coin)
             
             profit_score = 0.0
             profit_pct = None
@@ -6,6 +6,8 @@
 from typing import Dict
 import logging
 
+from trading_bot.utils.metrics import METRICS
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,35 +25,44 @@ class PremiumFilter:
         self.settings = settings
         self.data_collector = data_collector
     
-    def should_allow_buy(self, coin: str = "BTC") -> bool:
+    def _get_premium(self, coin: str, snapshot=None) -> Dict:
+        """틱 스냅샷이 있으면 스냅샷 프리미엄, 없으면 직접 조회"""
+        if snapshot is not None:
+            return snapshot.premium
+        return self.data_collector.get_premium_data(coin)
+    
+    @METRICS.timed("premium_filter")
+    def should_allow_buy(self, coin: str = "BTC", snapshot=None) -> bool:
         """
         전역 매수 필터: 역프 또는 낮은 김프일 때만 매수 허용
         
         Args:
             coin: 코인 심볼
+            snapshot: 틱 스냅샷 (TickSnapshot, 있으면 재조회 없이 사용)
         
         Returns:
             매수 허용 여부
         """
         try:
-            premium_data = self.data_collector.get_premium_data(coin)
+            premium_data = self._get_premium(coin, snapshot)
             return premium_data['is_negative_premium'] or premium_data['is_low_premium']
         except Exception as e:
             logger.error(f"프리미엄 필터 확인 실패: {e}")
             return False
     
-    def get_position_size_multiplier(self, coin: str = "BTC") -> float:
+    def get_position_size_multiplier(self, coin: str = "BTC", snapshot=None) -> float:
         """
         역프 상태일 때 포지션 크기 배수 반환
         
         Args:
             coin: 코인 심볼
+            snapshot: 틱 스냅샷 (TickSnapshot, 있으면 재조회 없이 사용)
         
         Returns:
             포지션 크기 배수 (기본 1.0, 역프일 때 2.0)
         """
         try:
-            premium_data = self.data_collector.get_premium_data(coin)
+            premium_data = self._get_premium(coin, snapshot)
             if premium_data['is_negative_premium']:
                 return 2.0  # 역프일 때 2배
             return 1.0
@@ -59,18 +70,19 @@ class PremiumFilter:
             logger.error(f"포지션 크기 배수 계산 실패: {e}")
             return 1.0
     
-    def get_premium_info(self, coin: str = "BTC") -> Dict:
+    def get_premium_info(self, coin: str = "BTC", snapshot=None) -> Dict:
         """
         프리미엄 정보 조회
         
         Args:
             coin: 코인 심볼
+            snapshot: 틱 스냅샷 (TickSnapshot, 있으면 재조회 없이 사용)
         
         Returns:
             프리미엄 정보 딕셔너리
         """
         try:
-            return self.data_collector.get_premium_data(coin)
+            return self._get_premium(coin, snapshot)
         except Exception as e:
             logger.error(f"프리미엄 정보 조회 실패: {e}")
             return {
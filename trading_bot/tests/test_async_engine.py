@@ -0,0 +1,246 @@
+"""
+이벤트 기반 봇 엔진 테스트
+시세 이벤트 → 시그널 평가 / 주문 상태 조회 / 알림 큐 동작 확인 (실제 API / 웹소켓 호출 없음)
+"""
+
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.core.bot_engine import TradingBotEngine
+from trading_bot.core.position_manager import PositionManager
+from trading_bot.utils.metrics import METRICS
+from trading_bot.utils.notifier import TelegramNotifier
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """이벤트 기반 봇 엔진 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sent = []
+        self.engine = self._make_engine()
+
+    @patch('trading_bot.execution.order_executor.UpbitRestClient')
+    def _make_engine(self, mock_upbit, metrics=None):
+        settings = {
+            'trading': {'target_coin': 'BTC'},
+            'risk_management': {
+                'check_interval': 3600,
+                'min_signal_interval': 0.0,
+                'order_poll_interval': 0.01
+            },
+            'price_feed': {'enabled': False},
+            'metrics': metrics or {'enabled': False}
+        }
+        engine = TradingBotEngine(settings)
+
+        # 느린 데이터 조회 / 주문 / 알림을 가짜로 대체
+        engine.data_collector = Mock()
+        engine.data_collector.get_market_batch.return_value = {
+            'BTC': {
+                'exchange_data': None,
+                'risk': {'high_volatility_prob': 0.1},
+                'features': {},
+                'whale': {'net_flow_usd': 0.0}
+            }
+        }
+        engine.data_collector.get_premium_data.return_value = {
+            'premium': -0.02, 'is_negative_premium': True, 'is_low_premium': True
+        }
+        engine.data_collector.get_current_price.side_effect = (
+            lambda coin, frame=None: engine.price_store.get_price("KRW-BTC")
+        )
+        engine.premium_filter.data_collector = engine.data_collector
+
+        engine.strategy = Mock()
+        engine.strategy.calculate_buy_signal_score.return_value = {
+            'buy_signal': True, 'signal_score': 80.0, 'reason': 'test'
+        }
+        engine.strategy.calculate_sell_signal_score.return_value = {
+            'sell_signal': False, 'signal_score': 0.0, 'reason': 'hold'
+        }
+        engine.position_manager = PositionManager(data_dir=Path(self.tmp.name))
+        engine.balance_manager = Mock()
+        engine.balance_manager.get_balance.return_value = 1_000_000
+        engine.balance_manager.calculate_position_size.return_value = 300_000
+        engine.balance_manager.calculate_quantity.return_value = 0.003
+        engine.order_executor = Mock()
+        engine.order_executor.is_connected.return_value = True
+        engine.order_executor.place_buy_order.return_value = {'success': True, 'uuid': 'order-1'}
+        engine.order_executor.get_order_status.side_effect = [{'state': 'wait'}, {'state': 'done'}]
+
+        # 텔레그램 전송이 느려도 시그널 평가를 막지 않아야 함
+        def slow_post(url, json=None, timeout=None):
+            time.sleep(0.3)
+            self.sent.append(json['text'])
+            return Mock(status_code=200)
+
+        engine.notifier = TelegramNotifier("token", "chat", rate_limit=0)
+        engine.notifier.session.post = Mock(side_effect=slow_post)
+        return engine
+
+    def tearDown(self):
+        if self.engine.is_running:
+            self.engine.stop()
+        self.tmp.cleanup()
+
+    def test_price_event_triggers_signal_and_order_tracking(self):
+        """시세 갱신 → 시그널 평가 → 매수 → 주문 상태 조회 / 알림"""
+        engine = self.engine
+        self.assertTrue(engine.start())
+
+        # 시작 직후 리스크 갱신 이벤트로 1회 평가 (현재가 없음 → 주문 없음)
+        self.assertTrue(_wait_until(lambda: engine.event_stats['signal_evaluations'] >= 1))
+        engine.order_executor.place_buy_order.assert_not_called()
+        self.assertEqual(engine.data_collector.get_market_batch.call_count, 1)
+
+        engine.price_store.update_trade("KRW-BTC", 131_000_000.0)
+        self.assertTrue(_wait_until(lambda: engine.order_executor.place_buy_order.called))
+        self.assertTrue(_wait_until(lambda: engine.event_stats['orders_tracked'] == 1))
+        self.assertTrue(_wait_until(lambda: not engine.pending_orders))
+        self.assertEqual(engine.order_executor.get_order_status.call_count, 2)
+
+        # 리스크 예측은 시세 이벤트마다 다시 계산하지 않음
+        self.assertEqual(engine.data_collector.get_market_batch.call_count, 1)
+        self.assertTrue(engine.position_manager.has_position("KRW-BTC"))
+
+        status = engine.get_status()
+        self.assertTrue(status['is_running'])
+        self.assertGreaterEqual(status['event_stats']['price_events'], 1)
+
+        self.assertTrue(engine.stop())
+        self.assertFalse(engine._thread.is_alive())
+
+        # 중지 전에 큐에 남은 매수 알림까지 전송
+        self.assertEqual(sum('매수 체결' in text for text in self.sent), 1)
+        self.assertIn("봇이 중지되었습니다.", self.sent[-1])
+        self.assertEqual(engine.notifier.get_stats()['dropped'], 0)
+
+    def test_price_events_are_coalesced(self):
+        """평가 전까지 쌓인 시세 갱신은 한 번의 평가로 처리"""
+        engine = self.engine
+        engine.strategy.calculate_buy_signal_score.return_value = {
+            'buy_signal': False, 'signal_score': 0.0, 'reason': 'test'
+        }
+        engine.min_signal_interval = 0.2
+        self.assertTrue(engine.start())
+        self.assertTrue(_wait_until(lambda: engine.event_stats['signal_evaluations'] >= 1))
+
+        for i in range(200):
+            engine.price_store.update_trade("KRW-BTC", 131_000_000.0 + i)
+        time.sleep(0.5)
+
+        self.assertLessEqual(engine.event_stats['price_events'], 2)
+        self.assertLessEqual(engine.event_stats['signal_evaluations'], 3)
+
+        # 대상이 아닌 마켓은 이벤트를 만들지 않음
+        before = engine.event_stats['price_events']
+        engine.price_store.update_trade("KRW-ETH", 4_000_000.0)
+        time.sleep(0.05)
+        self.assertEqual(engine.event_stats['price_events'], before)
+
+    def test_position_closed_only_after_ask_fill(self):
+        """매도 주문 접수만으로는 청산하지 않음: 취소되면 포지션 유지, 체결되면 체결 수량 / 평균가로 청산"""
+        engine = self.engine
+        engine.fill_tracker = Mock()
+        engine._call_in_loop = lambda callback, *args: True
+        engine.strategy.calculate_sell_signal_score.return_value = {
+            'sell_signal': True, 'signal_score': 90.0, 'reason': 'take profit', 'current_price': 140_000_000.0
+        }
+        engine.order_executor.place_sell_order.return_value = {'success': True, 'uuid': 'ask-1'}
+        engine.position_manager.open_position('BTC', 0.003, 130_000_000.0, 'KRW-BTC')
+        engine.price_store.update_trade("KRW-BTC", 140_000_000.0)
+
+        engine._evaluate_market('BTC')
+        self.assertEqual(engine.order_executor.place_sell_order.call_count, 1)
+        self.assertTrue(engine.position_manager.has_position("KRW-BTC"))
+
+        # 체결 확인 전에는 같은 포지션을 다시 매도하지 않음
+        engine._evaluate_market('BTC')
+        self.assertEqual(engine.order_executor.place_sell_order.call_count, 1)
+
+        ask = {'uuid': 'ask-1', 'side': 'ask', 'market': 'KRW-BTC', 'result': 'cancelled', 'state': 'cancel'}
+        engine._on_order_final(ask, {'state': 'cancel', 'executed_volume': 0.0})
+        self.assertEqual(engine.position_manager.get_current_position("KRW-BTC")['quantity'], 0.003)
+
+        # 취소 후 다음 시그널에서 다시 매도 → 체결되면 청산
+        engine._evaluate_market('BTC')
+        self.assertEqual(engine.order_executor.place_sell_order.call_count, 2)
+        ask = dict(ask, result='filled', state='done')
+        engine._on_order_final(ask, {'state': 'done', 'executed_volume': 0.003, 'avg_price': 139_500_000.0})
+        self.assertFalse(engine.position_manager.has_position("KRW-BTC"))
+        self.assertEqual(engine.position_manager.trades[-1]['exit_price'], 139_500_000.0)
+
+    def test_bid_position_follows_fill(self):
+        """매수 포지션은 추적 전에 등록, 체결되면 체결 수량 / 평균가로 보정, 체결 없이 끝나면 제거"""
+        engine = self.engine
+        engine.fill_tracker = Mock()
+        engine.price_store.update_trade("KRW-BTC", 131_000_000.0)
+        fill = {'state': 'done', 'executed_volume': 0.0029, 'avg_price': 131_500_000.0}
+
+        # 추적 등록 즉시 체결이 끝나도 (빠른 체결) 체결 수량 / 평균가 반영
+        engine._call_in_loop = lambda callback, order: engine._on_order_final(
+            dict(order, result='filled', state='done'), fill
+        ) is None
+        engine._evaluate_market('BTC')
+        position = engine.position_manager.get_current_position("KRW-BTC")
+        self.assertEqual(position['quantity'], 0.0029)
+        self.assertEqual(position['entry_price'], 131_500_000.0)
+        self.assertFalse(engine._pending_entries)
+
+        # 체결 확인 전에는 추정 포지션을 매도하지 않음
+        engine.position_manager.cancel_position("KRW-BTC")
+        finals = []
+        engine._call_in_loop = lambda callback, order: finals.append(order) or True
+        engine.strategy.calculate_sell_signal_score.return_value = {
+            'sell_signal': True, 'signal_score': 90.0, 'reason': 'take profit', 'current_price': 140_000_000.0
+        }
+        engine._evaluate_market('BTC')
+        engine._evaluate_market('BTC')
+        engine.order_executor.place_sell_order.assert_not_called()
+        self.assertEqual(engine.position_manager.get_current_position("KRW-BTC")['quantity'], 0.003)
+
+        # 체결 없이 취소 / 시간 초과로 끝난 매수는 포지션을 남기지 않음
+        for result in ('cancelled', 'timed_out'):
+            if not engine.position_manager.has_position("KRW-BTC"):
+                engine._evaluate_market('BTC')
+            self.assertTrue(engine.position_manager.has_position("KRW-BTC"))
+            bid = dict(finals[-1], result=result, state='cancel')
+            engine._on_order_final(bid, {'state': 'cancel', 'executed_volume': 0.0})
+            self.assertFalse(engine.position_manager.has_position("KRW-BTC"))
+        self.assertEqual(engine.position_manager.trades, [])
+        self.assertFalse(engine._pending_entries)
+
+    def test_metrics_enabled_only_while_running(self):
+        """지표 설정은 실행 중에만 공용 레지스트리를 켜고 중지 시 복원, port 0은 임의 포트로 엔드포인트 시작"""
+        self.assertFalse(METRICS.enabled)
+        engine = self._make_engine(metrics={'enabled': True, 'port': 0})
+        self.assertIsNotNone(engine.metrics_server)
+        self.assertFalse(METRICS.enabled)
+
+        self.assertTrue(engine.start())
+        try:
+            self.assertTrue(METRICS.enabled)
+            self.assertNotEqual(engine.metrics_server.port, 0)
+        finally:
+            self.assertTrue(engine.stop())
+        self.assertFalse(METRICS.enabled)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+잔고 캐시 테스트
+TTL 재사용 / 동시 조회 시 API 1회 / 체결 무효화 + 백그라운드 재조회 / 조회 중 무효화 / 무효화 후 조회 실패 확인 (실제 API 호출 없음)
+"""
+
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.execution.balance_manager import BalanceManager
+
+
+class _FakeMarketData:
+    """get_all_balances 대체 (호출 횟수 기록, delay만큼 지연)"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.balances = {'KRW': 1_000_000.0, 'BTC': 0.01}
+        self.started = threading.Event()
+
+    def get_all_balances(self):
+        self.calls += 1
+        snapshot = dict(self.balances)
+        self.started.set()
+        time.sleep(self.delay)
+        return snapshot
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestBalanceCache(unittest.TestCase):
+    """잔고 캐시 테스트"""
+
+    def test_ttl_reuses_snapshot(self):
+        """TTL 안에서는 통화별 / 전체 조회 모두 API 호출 1회"""
+        market_data = _FakeMarketData()
+        manager = BalanceManager(market_data, ttl=0.2)
+
+        self.assertEqual(manager.get_balance("KRW"), 1_000_000.0)
+        self.assertEqual(manager.get_balance("BTC"), 0.01)
+        self.assertEqual(manager.get_balance("ETH"), 0.0)
+        self.assertEqual(manager.get_all_balances(), market_data.balances)
+        self.assertEqual(market_data.calls, 1)
+
+        time.sleep(0.25)
+        manager.get_balance("KRW")
+        self.assertEqual(market_data.calls, 2)
+
+        stats = manager.get_cache_stats()
+        self.assertEqual((stats['api_calls'], stats['saved_calls']), (2, 3))
+
+    def test_concurrent_readers_share_one_call(self):
+        """만료 시 동시에 읽은 스레드들은 API 1회 결과를 함께 사용"""
+        market_data = _FakeMarketData(delay=0.1)
+        manager = BalanceManager(market_data, ttl=5.0)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(manager.get_all_balances())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(market_data.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == market_data.balances for result in results))
+
+    def test_invalidate_refreshes_in_background(self):
+        """체결 무효화 후 백그라운드 재조회, 다음 조회는 새 잔고를 API 호출 없이 반환"""
+        market_data = _FakeMarketData()
+        manager = BalanceManager(market_data, ttl=60.0)
+        manager.get_balance("KRW")
+
+        market_data.balances = {'KRW': 700_000.0, 'BTC': 0.013}
+        manager.invalidate()
+        self.assertTrue(_wait_for(lambda: manager.get_cache_stats()['background_refreshes'] == 1))
+
+        self.assertEqual(manager.get_balance("KRW"), 700_000.0)
+        self.assertEqual(market_data.calls, 2)
+
+    def test_invalidate_during_fetch_forces_refetch(self):
+        """조회 중 무효화되면 그 결과는 만료 처리 (주문 전 잔고를 재사용하지 않음)"""
+        market_data = _FakeMarketData(delay=0.1)
+        manager = BalanceManager(market_data, ttl=60.0)
+
+        reader = threading.Thread(target=manager.get_all_balances)
+        reader.start()
+        self.assertTrue(market_data.started.wait(1.0))
+        market_data.balances = {'KRW': 500_000.0}
+        manager.invalidate(refresh=False)
+        reader.join()
+
+        self.assertEqual(manager.get_balance("KRW"), 500_000.0)
+        self.assertEqual(market_data.calls, 2)
+
+    def test_failed_fetch_after_invalidate_returns_empty(self):
+        """무효화 후 조회가 실패하면 무효화된 스냅샷 대신 빈 잔고, 무효화 전 실패는 이전 스냅샷 유지"""
+        market_data = _FakeMarketData()
+        manager = BalanceManager(market_data, ttl=0.05)
+        manager.get_balance("KRW")
+
+        market_data.balances = {}
+        time.sleep(0.1)
+        self.assertEqual(manager.get_balance("KRW"), 1_000_000.0)
+
+        manager.invalidate(refresh=False)
+        self.assertEqual(manager.get_all_balances(), {})
+        self.assertEqual(manager.get_balance("KRW"), 0.0)
+        self.assertEqual(manager.get_cache_stats()['errors'], 3)
+
+        market_data.balances = {'KRW': 400_000.0}
+        self.assertEqual(manager.get_balance("KRW"), 400_000.0)
+
+    def test_zero_ttl_disables_cache(self):
+        """ttl=0이면 매번 조회"""
+        market_data = _FakeMarketData()
+        manager = BalanceManager(market_data, ttl=0)
+        manager.get_balance("KRW")
+        manager.get_balance("KRW")
+        self.assertEqual(market_data.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
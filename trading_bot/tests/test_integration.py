@@ -48,7 +48,7 @@ class TestIntegration(unittest.TestCase):
             }
         }
     
-    @patch('trading_bot.execution.order_executor.pyupbit.Upbit')
+    @patch('trading_bot.execution.order_executor.UpbitRestClient')
     def test_bot_engine_initialization(self, mock_upbit):
         """봇 엔진 초기화 테스트"""
         mock_upbit.return_value = Mock()
@@ -0,0 +1,117 @@
+"""
+운영 지표 테스트
+비활성 시 측정 생략 / 단계별 타이머 / Prometheus 텍스트 형식 / HTTP 엔드포인트 확인
+"""
+
+import time
+import unittest
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.utils.metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """운영 지표 레지스트리 테스트"""
+
+    def test_disabled_registry_records_nothing(self):
+        """비활성 상태에서는 타이머 / 카운터 / 게이지 모두 기록하지 않음"""
+        registry = MetricsRegistry(enabled=False)
+
+        @registry.timed("work")
+        def work(x):
+            return x * 2
+
+        self.assertEqual(work(21), 42)
+        with registry.stage("other"):
+            pass
+        registry.inc("orders", side="bid")
+        registry.set_gauge("open_positions", 3)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot, {'histograms': {}, 'counters': {}, 'gauges': {}})
+
+    def test_stage_timing(self):
+        """단계별 소요 시간이 stage 라벨별 히스토그램에 기록"""
+        registry = MetricsRegistry(enabled=True)
+
+        @registry.timed("slow")
+        def slow():
+            time.sleep(0.02)
+
+        slow()
+        slow()
+        with registry.stage("fast"):
+            pass
+
+        histograms = registry.snapshot()['histograms']
+        slow_stats = histograms['stage_seconds{stage="slow"}']
+        self.assertEqual(slow_stats['count'], 2)
+        self.assertGreaterEqual(slow_stats['min'], 0.02)
+        self.assertEqual(histograms['stage_seconds{stage="fast"}']['count'], 1)
+
+    def test_prometheus_text(self):
+        """카운터 / 게이지 / 누적 버킷 히스토그램을 Prometheus 형식으로 출력"""
+        registry = MetricsRegistry(enabled=True)
+        registry.inc("orders", side="bid", status="filled")
+        registry.inc("orders", 2, side="bid", status="filled")
+        registry.set_gauge("open_positions", 2)
+
+        latency = LatencyHistogram()
+        for value in (0.003, 0.04, 0.2, 7.0):
+            latency.observe(value)
+        registry.register_histogram("order_ack_seconds", latency)
+
+        lines = registry.render_prometheus().splitlines()
+        self.assertIn("# TYPE trading_bot_orders_total counter", lines)
+        self.assertIn('trading_bot_orders_total{side="bid",status="filled"} 3', lines)
+        self.assertIn("trading_bot_open_positions 2", lines)
+        self.assertIn("# TYPE trading_bot_order_ack_seconds histogram", lines)
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="0.001"} 0', lines)
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="0.05"} 2', lines)
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("trading_bot_order_ack_seconds_count 4", lines)
+
+    def test_count_le_between_bucket_edges(self):
+        """경계가 로그 버킷 사이에 있어도 경계 이하 값을 빠뜨리지 않음"""
+        latency = LatencyHistogram()
+        for value in (0.00099, 0.001, 0.00101, 0.0024, 0.0026):
+            latency.observe(value)
+
+        # 0.001 / 0.0025는 로그 버킷 경계가 아님 (같은 버킷에 경계 양쪽 값이 섞임)
+        self.assertEqual(latency._index(0.00099), latency._index(0.00101))
+        self.assertEqual(latency.count_le(0.001), 2)
+        self.assertEqual(latency.count_le(0.0025), 4)
+        self.assertEqual(latency.count_le(0.0005), 0)
+
+        # 내보내기 경계가 아닌 값은 경계가 속한 버킷까지 포함 (적게 세지 않음)
+        self.assertEqual(latency.count_le(0.0009995), 3)
+
+        registry = MetricsRegistry(enabled=True)
+        registry.register_histogram("order_ack_seconds", latency)
+        lines = registry.render_prometheus().splitlines()
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="0.001"} 2', lines)
+        self.assertIn('trading_bot_order_ack_seconds_bucket{le="0.0025"} 4', lines)
+
+    def test_http_endpoint(self):
+        """/metrics 엔드포인트에서 현재 지표를 조회"""
+        registry = MetricsRegistry(enabled=True)
+        registry.inc("price_events")
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                self.assertTrue(response.headers['Content-Type'].startswith("text/plain; version=0.0.4"))
+                body = response.read().decode('utf-8')
+            self.assertIn("trading_bot_price_events_total 1", body)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
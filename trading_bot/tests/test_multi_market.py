@@ -0,0 +1,242 @@
+"""
+멀티 마켓 테스트
+전역 리스크 한도 / 마켓별 포지션 / 마켓 일괄 조회 / 동시 평가 확인 (실제 API / DB 호출 없음)
+"""
+
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.collectors import data_collector as data_collector_module
+from trading_bot.collectors.data_collector import DataCollector
+from trading_bot.core.bot_engine import TradingBotEngine
+from trading_bot.core.position_manager import PositionManager
+from trading_bot.core.risk_budget import RiskBudget
+
+
+class TestRiskBudget(unittest.TestCase):
+    """전역 리스크 한도 테스트"""
+
+    def test_reservations_share_exposure_limit(self):
+        """동시 예약 금액이 총 노출 한도를 넘지 않음"""
+        budget = RiskBudget(max_total_exposure=0.5, max_open_positions=5)
+
+        self.assertEqual(budget.reserve("KRW-BTC", 300_000, lambda: (1_000_000, 0.0, 0)), 300_000)
+        # 한도 500,000 중 300,000 예약됨 → 200,000만 가능
+        self.assertEqual(budget.reserve("KRW-ETH", 300_000, lambda: (1_000_000, 0.0, 0)), 200_000)
+        self.assertEqual(budget.reserve("KRW-XRP", 300_000, lambda: (1_000_000, 0.0, 0)), 0.0)
+
+        # 같은 마켓 중복 예약 불가
+        self.assertEqual(budget.reserve("KRW-BTC", 100_000, lambda: (1_000_000, 0.0, 0)), 0.0)
+
+        budget.release("KRW-BTC")
+        self.assertEqual(budget.get_reserved(), {"KRW-ETH": 200_000})
+
+    def test_max_open_positions(self):
+        """보유 + 예약 포지션 수 제한"""
+        budget = RiskBudget(max_total_exposure=1.0, max_open_positions=2)
+
+        self.assertEqual(budget.reserve("KRW-XRP", 100_000, lambda: (1_000_000, 0.0, 1)), 100_000)
+        self.assertEqual(budget.reserve("KRW-SOL", 100_000, lambda: (1_000_000, 0.0, 1)), 0.0)
+
+
+class TestMultiMarketPositions(unittest.TestCase):
+    """마켓별 포지션 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_positions_per_market(self):
+        """마켓별 진입 / 청산 / 노출 금액"""
+        manager = PositionManager(data_dir=self.data_dir)
+        self.assertTrue(manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC"))
+        self.assertTrue(manager.open_position("ETH", 0.1, 4_000_000.0, "KRW-ETH"))
+        self.assertFalse(manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC"))
+
+        self.assertEqual(set(manager.get_positions()), {"KRW-BTC", "KRW-ETH"})
+        self.assertAlmostEqual(manager.get_total_exposure(), 1_400_000.0)
+        self.assertAlmostEqual(
+            manager.calculate_profit(4_400_000.0, "KRW-ETH")['profit_pct'], 0.1
+        )
+
+        # 재시작 후 복원
+        restored = PositionManager(data_dir=self.data_dir)
+        self.assertEqual(restored.get_positions(), manager.get_positions())
+
+        closed = restored.close_position("KRW-BTC")
+        self.assertEqual(closed['coin'], "BTC")
+        self.assertFalse(restored.has_position("KRW-BTC"))
+        self.assertEqual(restored.get_current_position()['market'], "KRW-ETH")
+
+    def test_legacy_single_position_file(self):
+        """단일 포지션 형식(current_position) 파일 로드"""
+        legacy = {
+            'current_position': {
+                'coin': "BTC",
+                'quantity': 0.01,
+                'entry_price': 100_000_000.0,
+                'entry_time': "2024-01-01T00:00:00",
+                'market': "KRW-BTC"
+            },
+            'last_updated': "2024-01-01T00:00:00"
+        }
+        (self.data_dir / "positions.json").write_text(json.dumps(legacy), encoding='utf-8')
+
+        manager = PositionManager(data_dir=self.data_dir)
+        self.assertTrue(manager.has_position("KRW-BTC"))
+        self.assertEqual(manager.current_position['coin'], "BTC")
+        self.assertIsNotNone(manager.close_position())
+
+
+class TestMarketBatch(unittest.TestCase):
+    """마켓 일괄 조회 테스트"""
+
+    def test_whale_data_single_query(self):
+        """코인별 최신 고래 데이터를 쿼리 1회로 조회"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_dir = Path(tmp) / "data"
+            db_dir.mkdir()
+            conn = sqlite3.connect(str(db_dir / "project.db"))
+            conn.execute(
+                "CREATE TABLE whale_daily_stats (date TEXT, coin_symbol TEXT, net_flow_usd REAL, "
+                "exchange_inflow_usd REAL, exchange_outflow_usd REAL)"
+            )
+            conn.executemany(
+                "INSERT INTO whale_daily_stats VALUES (?, ?, ?, ?, ?)",
+                [
+                    ("2024-01-01", "BTC", 1.0, 1.0, 0.0),
+                    ("2024-01-02", "BTC", 2.0, 2.0, 0.0),
+                    ("2024-01-02", "XRP", -3.0, 0.0, 3.0),
+                ]
+            )
+            conn.commit()
+            conn.close()
+
+            collector = DataCollector({'strategy': {}})
+            with patch.object(data_collector_module, 'ROOT', Path(tmp)):
+                whales = collector.get_whale_data_batch(["BTC", "XRP", "SOL"])
+
+        self.assertEqual(whales["BTC"]['net_flow_usd'], 2.0)
+        self.assertEqual(whales["XRP"]['exchange_outflow_usd'], 3.0)
+        self.assertEqual(whales["SOL"]['net_flow_usd'], 0.0)
+
+    def test_model_calls_limited_to_supported_coins(self):
+        """리스크 모델 / 일봉 조회는 지원 코인만, 나머지는 환율만 공유"""
+        collector = DataCollector({'strategy': {}})
+        collector.load_exchange_frame = Mock(return_value=pd.DataFrame({
+            'upbit_price': [100_000_000.0],
+            'binance_price': [70_000.0],
+            'krw_usd': [1_450.0],
+        }))
+        collector.get_risk_and_features = Mock(return_value={
+            'risk': {'high_volatility_prob': 0.1},
+            'features': {'volatility_delta': -0.01}
+        })
+        collector.get_whale_data_batch = Mock(side_effect=lambda coins: {
+            coin: {'net_flow_usd': 0.0} for coin in coins
+        })
+
+        batch = collector.get_market_batch(["BTC", "XRP", "SOL"])
+
+        self.assertEqual(set(batch), {"BTC", "XRP", "SOL"})
+        self.assertEqual(collector.load_exchange_frame.call_count, 1)
+        collector.get_risk_and_features.assert_called_once_with("BTC")
+        self.assertEqual(batch["BTC"]['features'], {'volatility_delta': -0.01})
+        collector.get_whale_data_batch.assert_called_once()
+        self.assertEqual(list(batch["XRP"]['exchange_data'].columns), ['krw_usd'])
+        self.assertFalse(batch["SOL"]['risk']['success'])
+
+
+class TestMultiMarketEngine(unittest.TestCase):
+    """여러 마켓 동시 평가 테스트"""
+
+    @patch('trading_bot.execution.order_executor.UpbitRestClient')
+    def test_concurrent_buys_respect_budget(self, mock_upbit):
+        """마켓별 평가는 동시에 실행되고 매수 합계는 전역 한도 이내"""
+        settings = {
+            'trading': {
+                'target_coins': ['BTC', 'ETH', 'XRP'],
+                'max_total_exposure': 0.5
+            },
+            'risk_management': {'check_interval': 3600, 'min_signal_interval': 0.0},
+            'price_feed': {'enabled': False}
+        }
+        engine = TradingBotEngine(settings)
+        self.assertEqual(list(engine.markets.values()), ['KRW-BTC', 'KRW-ETH', 'KRW-XRP'])
+
+        prices = {'BTC': 100_000_000.0, 'ETH': 4_000_000.0, 'XRP': 800.0}
+        engine.data_collector = Mock()
+        engine.data_collector.get_market_batch.return_value = {
+            coin: {
+                'exchange_data': None,
+                'risk': {'high_volatility_prob': 0.1},
+                'features': {},
+                'whale': {'net_flow_usd': 0.0}
+            }
+            for coin in prices
+        }
+        engine.data_collector.get_current_price.side_effect = lambda coin, frame=None: prices[coin]
+        engine.data_collector.get_premium_data.return_value = {
+            'premium': -0.02, 'is_negative_premium': True, 'is_low_premium': True
+        }
+        engine.premium_filter.data_collector = engine.data_collector
+
+        # 세 마켓 모두 평가 중에 만나야 통과 (순차 실행이면 타임아웃)
+        barrier = threading.Barrier(3, timeout=5.0)
+
+        def buy_signal(coin, snapshot=None):
+            barrier.wait()
+            return {'buy_signal': True, 'signal_score': 80.0, 'reason': 'test'}
+
+        engine.strategy = Mock()
+        engine.strategy.calculate_buy_signal_score.side_effect = buy_signal
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        engine.position_manager = PositionManager(data_dir=Path(tmp.name))
+        engine.balance_manager = Mock()
+        # 매수 금액만큼 원화 잔고 차감
+        engine.balance_manager.get_balance.side_effect = (
+            lambda currency: 1_000_000 - engine.position_manager.get_total_exposure()
+        )
+        engine.balance_manager.calculate_position_size.return_value = 300_000
+        engine.balance_manager.calculate_quantity.side_effect = lambda amount, price: amount / price
+        engine.order_executor = Mock()
+        engine.order_executor.is_connected.return_value = True
+        engine.order_executor.place_buy_order.return_value = {'success': True}
+        engine.notifier = None
+
+        self.assertTrue(engine.start())
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and engine.event_stats['signal_evaluations'] < 1:
+            time.sleep(0.02)
+        self.assertTrue(engine.stop())
+
+        # 한도 500,000 → 300,000 + 200,000, 세 번째 마켓은 보류
+        self.assertEqual(engine.order_executor.place_buy_order.call_count, 2)
+        self.assertEqual(len(engine.position_manager.get_positions()), 2)
+        self.assertAlmostEqual(engine.position_manager.get_total_exposure(), 500_000.0)
+        self.assertEqual(engine.risk_budget.get_reserved(), {})
+
+        status = engine.get_status()
+        self.assertEqual(set(status['tick_timings']), {'BTC', 'ETH', 'XRP'})
+        self.assertEqual(len(status['positions']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+텔레그램 알림 큐 테스트
+비동기 전송 / 오래된 알림 버림 (체결 알림 보존) / 에러 요약 순서 / 전송 간격 / 429 재시도 확인 (실제 API 호출 없음)
+"""
+
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.utils.notifier import TelegramNotifier
+
+
+class _FakeTelegram:
+    """session.post 대체 (전송 메시지 / 시각 기록, gate가 열릴 때까지 대기 가능)"""
+
+    def __init__(self, delay=0.0, responses=()):
+        self.delay = delay
+        self.responses = list(responses)
+        self.texts = []
+        self.times = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, url, json=None, timeout=None):
+        self.gate.wait(5)
+        time.sleep(self.delay)
+        self.times.append(time.monotonic())
+        if self.responses:
+            return self.responses.pop(0)
+        self.texts.append(json['text'])
+        return Mock(status_code=200)
+
+
+def _make_notifier(fake, **kwargs):
+    kwargs.setdefault('rate_limit', 0)
+    notifier = TelegramNotifier("token", "chat", **kwargs)
+    notifier.session.post = fake
+    return notifier
+
+
+class TestTelegramNotifier(unittest.TestCase):
+    """텔레그램 알림 큐 테스트"""
+
+    def test_calls_do_not_block(self):
+        """전송이 느려도 알림 호출은 즉시 반환"""
+        fake = _FakeTelegram(delay=0.2)
+        notifier = _make_notifier(fake)
+
+        start = time.monotonic()
+        notifier.notify_status("시작")
+        notifier.notify_sell_executed("BTC", 1.0, 1.0, 1.0, 1.0, 1.0, 0.01)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        self.assertTrue(notifier.flush(timeout=5))
+        stats = notifier.get_stats()
+        self.assertEqual((stats['queued'], stats['sent'], stats['pending']), (2, 2, 0))
+        self.assertEqual(stats['latency']['count'], 2)
+        self.assertGreaterEqual(stats['latency']['max'], 0.2)
+        notifier.close()
+
+    def test_drop_oldest_when_full(self):
+        """큐가 가득 차면 가장 오래된 (체결이 아닌) 알림을 버림"""
+        fake = _FakeTelegram()
+        fake.gate.clear()
+        notifier = _make_notifier(fake, max_queue=3)
+
+        notifier.notify_status("0")
+        time.sleep(0.05)  # 전송 스레드가 첫 알림을 꺼내 대기
+        for i in range(1, 6):
+            notifier.notify_status(str(i))
+
+        fake.gate.set()
+        self.assertTrue(notifier.flush(timeout=5))
+        sent = [text.splitlines()[2] for text in fake.texts]
+        self.assertEqual(sent, ["0", "3", "4", "5"])
+        self.assertEqual(notifier.get_stats()['dropped'], 2)
+        notifier.close()
+
+    def test_trade_notifications_are_never_dropped(self):
+        """큐가 가득 차면 에러 / 상태 알림부터 버리고 체결 알림은 모두 전송"""
+        fake = _FakeTelegram()
+        fake.gate.clear()
+        notifier = _make_notifier(fake, max_queue=3)
+
+        notifier.notify_status("0")
+        time.sleep(0.05)
+        notifier.notify_buy_executed("BTC", 1.0, 1.0, 1.0, 0.01, {}, 0.5)
+        notifier.notify_error("조회 실패")
+        notifier.notify_sell_executed("BTC", 2.0, 1.0, 2.0, 1.0, 1.0, 0.01)
+        notifier.notify_status("1")
+        notifier.notify_buy_executed("ETH", 1.0, 1.0, 1.0, 0.01, {}, 0.5)
+        notifier.notify_error("큐가 체결 알림으로 가득 참")
+        notifier.notify_sell_executed("ETH", 2.0, 1.0, 2.0, 1.0, 1.0, 0.01)
+
+        fake.gate.set()
+        self.assertTrue(notifier.flush(timeout=5))
+        titles = [text.splitlines()[0] for text in fake.texts]
+        self.assertEqual(titles, [
+            "ℹ️ <b>봇 상태</b>",
+            "🟢 <b>매수 체결</b>", "🟢 <b>매도 체결</b>", "🟢 <b>매수 체결</b>", "🟢 <b>매도 체결</b>"
+        ])
+        self.assertIn("코인: ETH", fake.texts[-1])
+        self.assertEqual(notifier.get_stats()['dropped'], 3)
+        notifier.close()
+
+    def test_digest_keeps_order_between_kinds(self):
+        """에러 요약은 연속된 에러만 합치고 앞선 체결 알림보다 뒤의 에러를 먼저 보내지 않음"""
+        fake = _FakeTelegram()
+        fake.gate.clear()
+        notifier = _make_notifier(fake)
+
+        notifier.notify_status("대기")
+        time.sleep(0.05)
+        notifier.notify_error("첫 에러")
+        notifier.notify_error("첫 에러")
+        notifier.notify_sell_executed("BTC", 2.0, 1.0, 2.0, 1.0, 1.0, 0.01)
+        notifier.notify_error("나중 에러")
+
+        fake.gate.set()
+        self.assertTrue(notifier.flush(timeout=5))
+        self.assertEqual(len(fake.texts), 4)
+        self.assertIn("첫 에러 (x2)", fake.texts[1])
+        self.assertNotIn("나중 에러", fake.texts[1])
+        self.assertIn("매도 체결", fake.texts[2])
+        self.assertIn("나중 에러", fake.texts[3])
+        self.assertEqual(notifier.get_stats()['coalesced'], 1)
+        notifier.close()
+
+    def test_errors_coalesced_into_digest(self):
+        """전송 대기 중 쌓인 에러 알림은 요약 1건"""
+        fake = _FakeTelegram()
+        fake.gate.clear()
+        notifier = _make_notifier(fake)
+
+        notifier.notify_status("대기")
+        time.sleep(0.05)
+        for _ in range(3):
+            notifier.notify_error("주문 상태 조회 실패")
+        notifier.notify_error("웹소켓 재연결")
+        notifier.notify_status("다음 상태")
+
+        fake.gate.set()
+        self.assertTrue(notifier.flush(timeout=5))
+        self.assertEqual(len(fake.texts), 3)
+        digest = fake.texts[1]
+        self.assertIn("에러 4건", digest)
+        self.assertIn("주문 상태 조회 실패 (x3)", digest)
+        self.assertIn("웹소켓 재연결", digest)
+        self.assertIn("다음 상태", fake.texts[2])
+        self.assertEqual(notifier.get_stats()['coalesced'], 3)
+        notifier.close()
+
+    def test_rate_limit_and_retry_after(self):
+        """전송 간격 유지 + 429 응답은 retry_after 후 재전송"""
+        too_many = Mock(status_code=429)
+        too_many.json.return_value = {'ok': False, 'parameters': {'retry_after': 0.1}}
+        fake = _FakeTelegram(responses=[too_many])
+        notifier = _make_notifier(fake, rate_limit=10)
+
+        for i in range(3):
+            notifier.notify_status(str(i))
+        self.assertTrue(notifier.flush(timeout=5))
+
+        self.assertEqual(len(fake.texts), 3)
+        gaps = [b - a for a, b in zip(fake.times, fake.times[1:])]
+        self.assertGreaterEqual(gaps[0], 0.1)
+        self.assertTrue(all(gap >= 0.09 for gap in gaps))
+        notifier.close()
+
+    def test_close_rejects_new_messages(self):
+        """종료 후 알림은 큐에 넣지 않음"""
+        notifier = _make_notifier(_FakeTelegram())
+        notifier.close()
+        self.assertFalse(notifier._send_message("late"))
+
+
+if __name__ == '__main__':
+    unittest.main()
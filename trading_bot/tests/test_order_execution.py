@@ -0,0 +1,293 @@
+"""
+주문 실행 테스트
+로컬 가짜 업비트 REST 서버로 재시도 / 클라이언트 주문 ID / 체결 추적 / 지연 시간 기록 확인
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import jwt
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.execution.fill_tracker import FillTracker
+from trading_bot.execution.order_executor import OrderExecutor
+from trading_bot.utils.metrics import LatencyHistogram
+
+SECRET_KEY = "test-secret-key-for-mock-upbit-server"
+
+
+class _MockUpbitServer:
+    """
+    가짜 업비트 REST 서버 (/v1/orders, /v1/order, /v1/accounts)
+
+    - post_failures: 앞쪽 POST 요청에 돌려줄 상태 코드 목록
+    - drop_ack: True면 주문은 저장하고 응답만 500으로 (접수 후 응답 유실)
+    - polls_until_done: 주문별 조회 몇 번째에 체결(done) 처리할지
+    """
+
+    def __init__(self, post_failures=(), drop_ack=False, polls_until_done=1, delay=0.0):
+        self.post_failures = list(post_failures)
+        self.drop_ack = drop_ack
+        self.polls_until_done = polls_until_done
+        self.delay = delay
+        self.orders = {}
+        self.post_identifiers = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _authorized(self):
+                token = self.headers.get('Authorization', '').replace('Bearer ', '')
+                try:
+                    payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+                except jwt.InvalidTokenError:
+                    return False
+                return 'nonce' in payload
+
+            def do_POST(self):
+                if not self._authorized():
+                    return self._reply(401, {'error': {'name': 'invalid_access_key', 'message': 'unauthorized'}})
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                reply = server.place(body)
+                self._reply(*reply)
+
+            def do_GET(self):
+                if not self._authorized():
+                    return self._reply(401, {'error': {'name': 'invalid_access_key', 'message': 'unauthorized'}})
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == '/v1/accounts':
+                    return self._reply(200, [{'currency': 'KRW', 'balance': '500000.0'}])
+                self._reply(*server.lookup(query))
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def place(self, body):
+        with self.lock:
+            self.post_identifiers.append(body.get('identifier'))
+            failure = self.post_failures.pop(0) if self.post_failures else None
+            duplicate = any(o['identifier'] == body.get('identifier') for o in self.orders.values())
+
+            if failure and not self.drop_ack:
+                return failure, {'error': {'name': 'server_error', 'message': f'HTTP {failure}'}}
+            if duplicate:
+                return 400, {'error': {'name': 'duplicate_identifier', 'message': 'duplicate identifier'}}
+
+            order = dict(body, uuid=str(uuid.uuid4()), state='wait', polls=0, executed_volume='0')
+            self.orders[order['uuid']] = order
+
+            if failure:
+                # 주문은 접수했지만 응답 유실
+                return failure, {'error': {'name': 'server_error', 'message': 'gateway timeout'}}
+            return 201, {k: v for k, v in order.items() if k != 'polls'}
+
+    def lookup(self, query):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            with self.lock:
+                if 'identifier' in query:
+                    order = next((o for o in self.orders.values() if o['identifier'] == query['identifier']), None)
+                else:
+                    order = self.orders.get(query.get('uuid'))
+                    if order is not None:
+                        order['polls'] += 1
+                        if order['polls'] >= self.polls_until_done:
+                            order['state'] = 'done'
+                            order['executed_volume'] = order.get('volume') or '1'
+                if order is None:
+                    return 404, {'error': {'name': 'order_not_found', 'message': 'not found'}}
+                return 200, {k: v for k, v in order.items() if k != 'polls'}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _make_executor(server, **kwargs):
+    kwargs.setdefault('retry_base_delay', 0.01)
+    kwargs.setdefault('retry_delay', 0.05)
+    return OrderExecutor("test-access-key", SECRET_KEY, base_url=server.url, **kwargs)
+
+
+class TestOrderExecutor(unittest.TestCase):
+    """주문 전송 / 재시도 테스트"""
+
+    def test_retries_with_same_client_order_id(self):
+        """5xx 응답은 같은 identifier로 재시도"""
+        with _MockUpbitServer(post_failures=[503, 503]) as server:
+            executor = _make_executor(server)
+            result = executor.place_buy_order("KRW-BTC", amount=100_000)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(len(server.post_identifiers), 3)
+        self.assertEqual(set(server.post_identifiers), {result['client_order_id']})
+        self.assertEqual(len(server.orders), 1)
+        order = next(iter(server.orders.values()))
+        self.assertEqual((order['ord_type'], order['price']), ('price', '100000'))
+        self.assertEqual(executor.stats['retries'], 2)
+        self.assertEqual(executor.ack_latency.count, 1)
+
+    def test_lost_ack_does_not_duplicate_order(self):
+        """접수 후 응답이 유실되면 재전송 대신 identifier 조회로 복구"""
+        with _MockUpbitServer(post_failures=[504], drop_ack=True) as server:
+            executor = _make_executor(server)
+            result = executor.place_sell_order("KRW-BTC", quantity=0.003, client_order_id="wa-fixed-id")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['client_order_id'], "wa-fixed-id")
+        self.assertEqual(len(server.orders), 1)
+        self.assertEqual(len(server.post_identifiers), 1)
+        self.assertEqual(result['uuid'], next(iter(server.orders)))
+        self.assertEqual(executor.stats['recovered_by_identifier'], 1)
+
+    def test_client_error_is_not_retried(self):
+        """4xx 응답은 재시도하지 않음"""
+        with _MockUpbitServer(post_failures=[400]) as server:
+            executor = _make_executor(server)
+            result = executor.place_buy_order("KRW-BTC", amount=100_000)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(len(server.post_identifiers), 1)
+        self.assertEqual(executor.stats['retries'], 0)
+
+    def test_backoff_is_capped_and_jittered(self):
+        """재시도 대기는 0 ~ min(최대값, 기본값 * 2^n)"""
+        executor = OrderExecutor("", "", retry_base_delay=0.5, retry_delay=2.0)
+        for attempt in range(6):
+            delays = [executor._backoff_delay(attempt) for _ in range(50)]
+            self.assertTrue(all(0 <= d <= min(2.0, 0.5 * 2 ** attempt) for d in delays))
+            self.assertGreater(len(set(delays)), 1)
+
+
+class TestFillTracker(unittest.TestCase):
+    """체결 추적 테스트"""
+
+    def test_open_orders_polled_concurrently(self):
+        """미체결 주문 전체를 동시 조회하고 체결 지연 시간 기록"""
+        with _MockUpbitServer(polls_until_done=2, delay=0.05) as server:
+            executor = _make_executor(server)
+            results = [executor.place_buy_order("KRW-BTC", amount=10_000 * (i + 1)) for i in range(4)]
+            finals = []
+
+            async def scenario():
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    tracker = FillTracker(
+                        executor, poll_interval=0.01, timeout=5.0, executor=pool,
+                        on_final=lambda order, status: finals.append(order)
+                    )
+                    task = asyncio.create_task(tracker.run())
+                    for result in results:
+                        tracker.track({'uuid': result['uuid'], 'submit_time': result['submit_time']})
+                    while tracker.open_orders:
+                        await asyncio.sleep(0.01)
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    return tracker
+
+            tracker = asyncio.run(scenario())
+
+        self.assertEqual(len(finals), 4)
+        self.assertTrue(all(order['result'] == 'filled' for order in finals))
+        self.assertEqual(tracker.stats['polls'], 8)
+        self.assertGreaterEqual(server.max_active, 2)
+
+        latency = executor.get_latency_stats()
+        self.assertEqual(latency['submit_to_ack']['count'], 4)
+        self.assertEqual(latency['submit_to_fill']['count'], 4)
+        self.assertGreaterEqual(latency['submit_to_fill']['p50'], latency['submit_to_ack']['p50'])
+
+    def test_timed_out_order_is_cancelled_and_polled_to_final_state(self):
+        """시간 초과 주문은 취소 요청 후 최종 상태 조회까지 추적 유지 (재조회한 체결 수량으로 판정)"""
+        for executed_volume, expected in ((0.0, 'timed_out'), (0.001, 'filled')):
+            cancelled = threading.Event()
+            executor = type('Executor', (), {})()
+            executor.fill_latency = LatencyHistogram()
+            executor.cancel_order = lambda uuid: cancelled.set() or True
+            executor.get_order_status = lambda uuid: (
+                {'state': 'cancel', 'executed_volume': executed_volume} if cancelled.is_set()
+                else {'state': 'wait', 'executed_volume': 0.0}
+            )
+            finals = []
+
+            async def scenario():
+                tracker = FillTracker(
+                    executor, poll_interval=0.01, timeout=0.05,
+                    on_final=lambda order, status: finals.append((order, status))
+                )
+                task = asyncio.create_task(tracker.run())
+                tracker.track({'uuid': 'order-1'})
+                while tracker.open_orders:
+                    # 취소 요청 전까지는 추적 유지
+                    self.assertEqual(finals, [])
+                    await asyncio.sleep(0.01)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return tracker
+
+            tracker = asyncio.run(scenario())
+
+            self.assertTrue(cancelled.is_set())
+            self.assertEqual(tracker.stats['cancel_requests'], 1)
+            self.assertEqual(len(finals), 1)
+            order, status = finals[0]
+            self.assertEqual(order['result'], expected)
+            self.assertEqual(status['executed_volume'], executed_volume)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """지연 시간 히스토그램 테스트"""
+
+    def test_percentiles_within_relative_error(self):
+        """분위수 상대 오차는 버킷 폭 이내"""
+        histogram = LatencyHistogram()
+        values = [i / 1000 for i in range(1, 1001)]
+        for value in values:
+            histogram.observe(value)
+
+        summary = histogram.snapshot()
+        self.assertEqual(summary['count'], 1000)
+        self.assertAlmostEqual(summary['mean'], sum(values) / 1000)
+        for q, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            self.assertAlmostEqual(summary[f"p{q}"], expected, delta=expected * 0.05)
+        self.assertEqual(histogram.percentile(100), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+포지션 저널 테스트
+저널 재생 / 손상된 마지막 줄 / 스냅샷 압축 / fsync 묶음 / 거래 내역 확인
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.core.position_journal import PositionJournal
+from trading_bot.core.position_manager import PositionManager
+
+
+class TestPositionJournal(unittest.TestCase):
+    """포지션 저널 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_state_rebuilt_from_journal(self):
+        """재시작 시 저널 재생으로 포지션 / 거래 내역 복원"""
+        manager = PositionManager(data_dir=self.data_dir)
+        manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC")
+        manager.record_fill("KRW-BTC", 0.0098)
+        manager.open_position("ETH", 0.1, 4_000_000.0, "KRW-ETH")
+        manager.close_position("KRW-ETH", exit_price=4_400_000.0)
+
+        # 저널만 있고 스냅샷은 없음
+        self.assertFalse(manager.positions_file.exists())
+
+        restored = PositionManager(data_dir=self.data_dir)
+        self.assertEqual(restored.get_positions(), manager.get_positions())
+        self.assertAlmostEqual(restored.get_current_position("KRW-BTC")['quantity'], 0.0098)
+        self.assertAlmostEqual(restored.get_total_exposure(), 980_000.0)
+
+        history = restored.get_trade_history()
+        self.assertEqual(len(history), 1)
+        self.assertAlmostEqual(history[0]['profit_pct'], 0.1)
+        self.assertAlmostEqual(history[0]['profit_amount'], 40_000.0)
+        self.assertEqual(restored.get_trade_summary()['wins'], 1)
+
+    def test_torn_last_line_is_discarded(self):
+        """기록 중 종료로 잘린 마지막 줄은 무시하고 잘라냄"""
+        manager = PositionManager(data_dir=self.data_dir)
+        manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC")
+        manager.flush()
+
+        journal_file = self.data_dir / "positions.journal.jsonl"
+        with open(journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"type": "close", "market": "KRW-BT')
+
+        restored = PositionManager(data_dir=self.data_dir)
+        self.assertTrue(restored.has_position("KRW-BTC"))
+        self.assertEqual(len(journal_file.read_text(encoding='utf-8').splitlines()), 1)
+
+        # 잘라낸 뒤 이어서 기록 가능
+        restored.close_position("KRW-BTC", exit_price=90_000_000.0)
+        self.assertFalse(PositionManager(data_dir=self.data_dir).has_position())
+
+    def test_compaction_snapshot(self):
+        """compact_every건마다 스냅샷 저장 후 저널 비움"""
+        manager = PositionManager(data_dir=self.data_dir, compact_every=3)
+        for i in range(2):
+            manager.open_position("XRP", 100.0, 800.0 + i, "KRW-XRP")
+            manager.close_position("KRW-XRP", exit_price=820.0)
+        manager.open_position("SOL", 1.0, 200_000.0, "KRW-SOL")
+
+        snapshot = json.loads(manager.positions_file.read_text(encoding='utf-8'))
+        self.assertEqual(snapshot['seq'], 3)
+        self.assertEqual(len(snapshot['trades']), 1)
+
+        journal_lines = (self.data_dir / "positions.journal.jsonl").read_text(encoding='utf-8').splitlines()
+        self.assertEqual([json.loads(line)['seq'] for line in journal_lines], [4, 5])
+
+        restored = PositionManager(data_dir=self.data_dir)
+        self.assertEqual(set(restored.get_positions()), {"KRW-SOL"})
+        self.assertEqual([t['entry_price'] for t in restored.get_trade_history()], [801.0, 800.0])
+
+    def test_snapshot_and_stale_journal(self):
+        """스냅샷 교체 후 저널을 비우기 전에 종료되어도 이벤트를 중복 적용하지 않음"""
+        manager = PositionManager(data_dir=self.data_dir)
+        manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC")
+        journal_file = self.data_dir / "positions.journal.jsonl"
+        stale = journal_file.read_text(encoding='utf-8')
+
+        manager.compact()
+        journal_file.write_text(stale, encoding='utf-8')
+
+        restored = PositionManager(data_dir=self.data_dir)
+        self.assertAlmostEqual(restored.get_total_exposure(), 1_000_000.0)
+        restored.close_position(exit_price=100_000_000.0)
+        self.assertEqual(restored.get_trade_summary()['trades'], 1)
+
+    def test_fsync_batching(self):
+        """fsync는 묶음 단위로 실행"""
+        journal = PositionJournal(self.data_dir, fsync_interval=60.0, fsync_batch=4)
+        with patch('trading_bot.core.position_journal.os.fsync') as mock_fsync:
+            journal.load()
+            for i in range(10):
+                journal.append({'type': 'open', 'market': f"KRW-C{i}"})
+            self.assertEqual(mock_fsync.call_count, 2)
+
+            journal.flush()
+            self.assertEqual(mock_fsync.call_count, 3)
+            journal.close()
+
+        immediate = PositionJournal(self.data_dir, name="immediate", fsync_interval=0)
+        with patch('trading_bot.core.position_journal.os.fsync') as mock_fsync:
+            for i in range(3):
+                immediate.append({'type': 'open', 'market': f"KRW-C{i}"})
+            self.assertEqual(mock_fsync.call_count, 3)
+            immediate.close()
+
+    def test_partial_close(self):
+        """부분 청산은 남은 수량 유지 + 거래 내역 기록"""
+        manager = PositionManager(data_dir=self.data_dir)
+        manager.open_position("BTC", 0.02, 100_000_000.0, "KRW-BTC")
+        manager.close_position("KRW-BTC", exit_price=110_000_000.0, quantity=0.005)
+
+        self.assertAlmostEqual(manager.get_current_position("KRW-BTC")['quantity'], 0.015)
+        self.assertAlmostEqual(manager.get_total_exposure(), 1_500_000.0)
+        self.assertAlmostEqual(manager.get_trade_history(market="KRW-BTC")[0]['profit_amount'], 50_000.0)
+
+
+    def test_cancelled_entry_removed_without_trade(self):
+        """체결 없이 끝난 진입은 거래 내역 없이 제거, 재시작 후에도 유지"""
+        manager = PositionManager(data_dir=self.data_dir)
+        manager.open_position("BTC", 0.01, 100_000_000.0, "KRW-BTC")
+        self.assertTrue(manager.cancel_position("KRW-BTC"))
+        self.assertFalse(manager.cancel_position("KRW-BTC"))
+
+        restored = PositionManager(data_dir=self.data_dir)
+        for state in (manager, restored):
+            self.assertFalse(state.has_position("KRW-BTC"))
+            self.assertEqual(state.get_total_exposure(), 0.0)
+            self.assertEqual(state.get_trade_history(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
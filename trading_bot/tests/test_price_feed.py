@@ -0,0 +1,172 @@
+"""
+실시간 가격 피드 테스트
+로컬 웹소켓 서버가 기록된 업비트 체결 / 호가(fixtures/upbit_ws_ticks.jsonl)를 재생 (외부 네트워크 호출 없음)
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+import websockets
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.collectors.price_feed import (
+    PriceStore,
+    UpbitPriceFeed,
+    parse_binance_message,
+    parse_upbit_message,
+)
+from trading_bot.collectors.market_data import MarketDataCollector
+
+TICKS_PATH = Path(__file__).resolve().parent / "fixtures" / "upbit_ws_ticks.jsonl"
+
+
+class _ReplayServer:
+    """기록된 메시지를 재생하는 로컬 웹소켓 서버 (별도 스레드)"""
+
+    def __init__(self, messages, hold_open=0.0):
+        """
+        Args:
+            messages: 연결마다 전송할 원본 메시지 목록
+            hold_open: 전송 후 연결을 유지할 시간 (초, 0이면 즉시 종료 → 클라이언트 재연결)
+        """
+        self.messages = messages
+        self.hold_open = hold_open
+        self.subscriptions = []
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _handler(self, ws):
+        self.subscriptions.append(json.loads(await ws.recv()))
+        for message in self.messages:
+            await ws.send(message.encode('utf-8'))
+        try:
+            # 클라이언트가 끊을 때까지 무전송 상태 유지
+            await asyncio.wait_for(ws.wait_closed(), self.hold_open)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve())
+        self._loop.close()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestPriceFeed(unittest.TestCase):
+    """실시간 가격 피드 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.messages = TICKS_PATH.read_text(encoding='utf-8').splitlines()
+        trades = [json.loads(m) for m in cls.messages if '"type": "trade"' in m]
+        cls.last_trade_price = trades[-1]['trade_price']
+
+    def test_replay_updates_store_and_reconnects(self):
+        """재생된 체결 / 호가가 저장소에 반영되고 연결 종료 시 재연결"""
+        store = PriceStore(stale_after=5.0)
+        with _ReplayServer(self.messages) as server:
+            feed = UpbitPriceFeed(["KRW-BTC"], store, url=server.url, reconnect_delay=0.05)
+            feed.start()
+            try:
+                # 첫 연결 종료 후 재연결해서 다시 전체 재생을 받을 때까지 대기
+                replayed_twice = lambda: feed.stats['messages'] >= 2 * len(self.messages)
+                self.assertTrue(_wait_until(replayed_twice))
+            finally:
+                feed.stop()
+
+        self.assertFalse(feed.is_running())
+        self.assertGreaterEqual(feed.stats['reconnects'], 1)
+        self.assertEqual(feed.stats['parse_errors'], 0)
+        self.assertEqual(server.subscriptions[0][1], {'type': 'trade', 'codes': ['KRW-BTC']})
+
+        state = store.get("KRW-BTC")
+        self.assertEqual(state['price'], self.last_trade_price)
+        self.assertEqual(state['bid'], self.last_trade_price)
+        self.assertEqual(state['ask'], self.last_trade_price + 1000.0)
+        self.assertEqual(store.get_price("KRW-BTC"), self.last_trade_price)
+
+    def test_stale_connection_is_recycled(self):
+        """무수신 시간이 stale_after를 넘으면 연결을 끊고 재연결, 저장소도 지연 상태"""
+        store = PriceStore(stale_after=0.2)
+        with _ReplayServer(self.messages, hold_open=30.0) as server:
+            feed = UpbitPriceFeed(["KRW-BTC"], store, url=server.url, reconnect_delay=0.05)
+            feed.start()
+            try:
+                self.assertTrue(_wait_until(lambda: feed.stats['stale_disconnects'] >= 1))
+                self.assertTrue(_wait_until(lambda: feed.stats['messages'] >= 2 * len(self.messages)))
+            finally:
+                feed.stop()
+
+        time.sleep(0.25)
+        self.assertTrue(store.is_stale("KRW-BTC"))
+        self.assertEqual(store.get_price("KRW-BTC"), 0.0)
+        self.assertEqual(store.get_price("KRW-BTC", max_age=60), self.last_trade_price)
+
+    def test_market_data_prefers_live_price(self):
+        """실시간 시세가 있으면 REST 조회 없이 반환"""
+        store = PriceStore(stale_after=5.0)
+        store.update_trade("KRW-BTC", 131_000_000.0)
+        collector = MarketDataCollector("", "", price_store=store)
+        self.assertEqual(collector.get_current_price("KRW-BTC"), 131_000_000.0)
+
+    def test_parsers(self):
+        """업비트 상태 메시지 / 바이낸스 combined stream 파싱"""
+        self.assertEqual(parse_upbit_message(b'{"status": "UP"}'), [])
+
+        trade = parse_binance_message(json.dumps({
+            'stream': 'btcusdt@trade',
+            'data': {'e': 'trade', 'E': 1, 's': 'BTCUSDT', 'p': '91234.50', 'q': '0.015', 'T': 2}
+        }))
+        self.assertEqual(trade[0]['market'], 'BTCUSDT')
+        self.assertEqual(trade[0]['price'], 91234.5)
+
+        book = parse_binance_message(json.dumps({
+            'stream': 'btcusdt@bookTicker',
+            'data': {'u': 1, 's': 'BTCUSDT', 'b': '91234.00', 'B': '1.2', 'a': '91234.10', 'A': '0.4'}
+        }))
+        store = PriceStore()
+        store.apply(trade + book)
+        state = store.get('BTCUSDT')
+        self.assertEqual((state['price'], state['bid'], state['ask']), (91234.5, 91234.0, 91234.1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+리플레이 시뮬레이터 테스트
+모의 거래소 원장 / 지정가 대기 주문 / 일괄 계산 데이터로 실제 엔진 구동 확인 (DB / 모델 / 거래소 호출 없음)
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.core.replay import ReplaySimulator
+from trading_bot.execution.simulated_exchange import SimulatedExchange
+from trading_bot.execution.upbit_rest import UpbitAPIError
+
+DATES = pd.date_range("2024-01-01", periods=10, freq="D")
+PRICES = [100_000_000.0 + i * 1_000_000.0 for i in range(10)]
+
+
+class _FakeDataLoader:
+    """거래소 / 리스크 데이터 (역프 상태 일봉, 호출 횟수 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def load_exchange_data(self, start_date, end_date, coin):
+        self.calls.append(('exchange', start_date, end_date, coin))
+        return pd.DataFrame({
+            'date': DATES,
+            'upbit_price': PRICES,
+            'binance_price': [price / 1300.0 * 1.02 for price in PRICES],
+            'krw_usd': [1300.0] * len(DATES)
+        })
+
+    def load_risk_data(self, start_date, end_date, coin):
+        self.calls.append(('risk', start_date, end_date, coin))
+        return pd.DataFrame({'date': DATES, 'volatility_24h': [0.01] * len(DATES)})
+
+
+class _FakeRiskPredictor:
+    """앞 5일은 저변동성, 이후 고변동성 예측"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_batch(self, start_date, end_date, coin):
+        self.calls += 1
+        probs = [0.0] * 5 + [0.9] * 5
+        return pd.DataFrame({
+            'date': DATES.date,
+            'high_volatility_prob': probs,
+            'risk_score': [p * 100 for p in probs],
+            'liquidation_risk': [0.0] * len(DATES)
+        })
+
+
+class TestSimulatedExchange(unittest.TestCase):
+    """모의 거래소 테스트"""
+
+    def test_market_orders_update_ledger(self):
+        """시장가 매수 / 매도는 호가 기준 즉시 체결 + 수수료 차감"""
+        exchange = SimulatedExchange(1_000_000, fee_rate=0.001, spread=0.002)
+        exchange.set_price("KRW-BTC", 100_000.0)
+
+        buy = exchange.place_order("KRW-BTC", 'bid', 'price', price=500_000.0, identifier="wa-1")
+        self.assertEqual(buy['state'], 'done')
+        self.assertAlmostEqual(buy['executed_volume'], 500_000.0 / 100_100.0)
+        self.assertAlmostEqual(exchange.get_balance("KRW"), 500_000.0 - 500.0)
+        self.assertEqual(exchange.get_order(identifier="wa-1")['uuid'], buy['uuid'])
+
+        with self.assertRaises(UpbitAPIError) as ctx:
+            exchange.place_order("KRW-BTC", 'bid', 'price', price=500_000.0, identifier="wa-1")
+        self.assertFalse(ctx.exception.retryable)
+
+        exchange.place_order("KRW-BTC", 'ask', 'market', volume=buy['executed_volume'])
+        self.assertEqual(exchange.get_balance("BTC"), 0.0)
+        self.assertEqual([order['side'] for order in exchange.pop_filled()], ['bid', 'ask'])
+        self.assertEqual(exchange.pop_filled(), [])
+
+    def test_resting_limit_order(self):
+        """지정가 주문은 잔고를 묶고 기준가가 닿으면 체결, 취소 시 잔고 복구"""
+        exchange = SimulatedExchange(1_000_000, fee_rate=0.0)
+        exchange.set_price("KRW-ETH", 4_000_000.0)
+
+        order = exchange.place_order("KRW-ETH", 'bid', 'limit', volume=0.1, price=3_900_000.0)
+        self.assertEqual(order['state'], 'wait')
+        self.assertAlmostEqual(exchange.get_balance("KRW"), 610_000.0)
+        with self.assertRaises(UpbitAPIError):
+            exchange.place_order("KRW-ETH", 'bid', 'price', price=700_000.0)
+
+        exchange.set_price("KRW-ETH", 3_850_000.0)
+        self.assertEqual(exchange.get_order(order['uuid'])['state'], 'done')
+        self.assertAlmostEqual(exchange.get_balance("ETH"), 0.1)
+
+        pending = exchange.place_order("KRW-ETH", 'ask', 'limit', volume=0.1, price=5_000_000.0)
+        self.assertEqual(exchange.get_balance("ETH"), 0.0)
+        exchange.cancel_order(pending['uuid'])
+        self.assertAlmostEqual(exchange.get_balance("ETH"), 0.1)
+
+
+class TestReplaySimulator(unittest.TestCase):
+    """리플레이 시뮬레이터 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = {
+            'api': {},
+            'trading': {
+                'target_coins': ['BTC'],
+                'max_position_size': 0.3,
+                'max_total_exposure': 0.9,
+                'max_open_positions': 1
+            },
+            'strategy': {'negative_premium_threshold': -0.01, 'low_premium_threshold': 0.02},
+            'risk_management': {'max_retries': 1},
+            'price_feed': {'enabled': True}
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _make_simulator(self):
+        simulator = ReplaySimulator(
+            self.settings, "2024-01-01", "2024-01-10",
+            initial_krw=1_000_000, fee_rate=0.0, data_dir=Path(self.tmp.name)
+        )
+        self.loader = _FakeDataLoader()
+        self.predictor = _FakeRiskPredictor()
+        simulator.data_collector._data_loader = self.loader
+        simulator.data_collector._risk_predictor = self.predictor
+        simulator.data_collector._feature_engineer = None
+        simulator.data_collector._init_feature_engineer = lambda: None
+        return simulator
+
+    def test_replay_runs_engine_with_simulated_clock(self):
+        """예측이 바뀌는 시점에 매수 / 매도, 거래 내역은 모의 시각 기준 실시간 형식"""
+        simulator = self._make_simulator()
+        self.assertEqual(simulator.engine.price_feeds, [])
+
+        result = simulator.run()
+        simulator.close()
+
+        self.assertEqual(result['ticks'], 10)
+        self.assertEqual(result['summary']['trades'], 1)
+        self.assertEqual(result['exchange']['fills'], 2)
+
+        trade = result['trades'][0]
+        self.assertEqual(trade['market'], "KRW-BTC")
+        # 당일 종가로 체결하므로 거래 시각은 일봉 마감 (일봉 시작 시각에 종가를 쓰지 않음)
+        self.assertEqual(trade['entry_time'], "2024-01-01T23:59:59")
+        self.assertEqual(trade['exit_time'], "2024-01-06T23:59:59")
+        self.assertEqual(trade['entry_price'], PRICES[0])
+        self.assertEqual(trade['exit_price'], PRICES[5])
+
+        # 역프 → 포지션 배수 2 (자본 50% 한도)
+        self.assertAlmostEqual(trade['quantity'], 500_000.0 / PRICES[0])
+        self.assertAlmostEqual(result['final_equity'], 1_000_000.0 + trade['profit_amount'])
+        self.assertEqual(result['equity_curve'][-1]['date'], "2024-01-10")
+
+    def test_history_loaded_once(self):
+        """리플레이 기간 데이터는 틱마다가 아니라 시작 시 한 번만 조회 / 예측"""
+        simulator = self._make_simulator()
+        simulator.run()
+        simulator.close()
+
+        self.assertEqual([call[0] for call in self.loader.calls], ['exchange', 'risk'])
+        self.assertEqual(self.predictor.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+틱 스냅샷 테스트
+틱당 데이터 조회 횟수 / 필드별 조회 시간 기록 확인 (실제 API / DB 호출 없음)
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.collectors.data_collector import DataCollector
+from trading_bot.collectors.tick_snapshot import TickSnapshot
+from trading_bot.core.bot_engine import TradingBotEngine
+from trading_bot.core.position_manager import PositionManager
+
+
+def _make_collector():
+    """DataLoader / 리스크 / 고래 조회를 가짜로 대체한 DataCollector"""
+    collector = DataCollector({'strategy': {}})
+    collector._data_loader = Mock()
+    collector._data_loader.load_exchange_data.return_value = pd.DataFrame({
+        'upbit_price': [100_000_000.0],
+        'binance_price': [70_000.0],
+        'krw_usd': [1_450.0],
+    })
+    collector._initialized = True
+    collector.get_risk_and_features = Mock(return_value={
+        'risk': {'high_volatility_prob': 0.1},
+        'features': {'volatility_delta': -0.01}
+    })
+    collector.get_whale_data = Mock(return_value={'net_flow_usd': 1_000.0})
+    return collector
+
+
+class TestTickSnapshot(unittest.TestCase):
+    """틱 스냅샷 테스트"""
+
+    def test_fields_are_fetched_once(self):
+        """같은 필드를 여러 번 읽어도 1회만 조회"""
+        collector = _make_collector()
+        snapshot = TickSnapshot(collector, "BTC")
+
+        for _ in range(3):
+            self.assertEqual(snapshot.current_price, 100_000_000.0)
+            self.assertIn('premium', snapshot.premium)
+            self.assertEqual(snapshot.risk['high_volatility_prob'], 0.1)
+            self.assertEqual(snapshot.features['volatility_delta'], -0.01)
+
+        # 현재가 / 프리미엄은 거래소 데이터 1회 로드, 리스크 / 특성은 특성 생성 1회를 공유
+        self.assertEqual(collector._data_loader.load_exchange_data.call_count, 1)
+        self.assertEqual(collector.get_risk_and_features.call_count, 1)
+
+    def test_timings_recorded(self):
+        """필드별 조회 시간 기록"""
+        snapshot = TickSnapshot(_make_collector(), "BTC").prefetch()
+
+        timings = snapshot.get_timings()
+        for field in TickSnapshot.FIELDS:
+            self.assertGreaterEqual(timings[field], 0.0)
+        self.assertAlmostEqual(timings['total'], sum(snapshot.timings.values()))
+
+        with self.assertRaises(ValueError):
+            snapshot.prefetch('orderbook')
+
+    def test_risk_and_features_share_feature_frame(self):
+        """리스크 예측 / 특성 값은 리스크 데이터 로드 / 특성 생성 1회 결과를 함께 사용"""
+        collector = DataCollector({'strategy': {}})
+        frame = pd.DataFrame({'date': pd.to_datetime(['2024-01-01', '2024-01-02']), 'volatility_delta': [0.02, -0.01]})
+        collector._data_loader = Mock()
+        collector._data_loader.load_risk_data.return_value = frame
+        collector._feature_engineer = Mock()
+        collector._feature_engineer.create_features.return_value = (frame, ['volatility_delta'])
+        collector._risk_predictor = Mock()
+        collector._risk_predictor.predict_from_features.return_value = {
+            'success': True, 'data': {'high_volatility_prob': 0.2, 'risk_score': 20.0, 'indicators': {}}
+        }
+
+        values = collector.get_risk_and_features("BTC")
+
+        self.assertEqual(values['risk']['high_volatility_prob'], 0.2)
+        self.assertEqual(values['features'], {'volatility_delta': -0.01})
+        self.assertEqual(collector._data_loader.load_risk_data.call_count, 1)
+        self.assertEqual(collector._feature_engineer.create_features.call_count, 1)
+        collector._risk_predictor.predict_risk.assert_not_called()
+        self.assertIs(collector._risk_predictor.predict_from_features.call_args.args[0], frame)
+
+    @patch('trading_bot.execution.order_executor.UpbitRestClient')
+    def test_engine_tick_loads_each_source_once(self, mock_upbit):
+        """매수 틱 1회 = 거래소 / 리스크·특성 / 고래 데이터 각 1회 조회, 다음 틱은 주기 데이터 재사용"""
+        engine = TradingBotEngine({'trading': {'target_coin': 'BTC'}})
+        collector = _make_collector()
+        engine.data_collector = collector
+        engine.strategy.data_collector = collector
+        engine.premium_filter.data_collector = collector
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        engine.position_manager = PositionManager(data_dir=Path(tmp.name))
+        engine.strategy.calculate_buy_signal_score = Mock(
+            side_effect=lambda coin, snapshot=None: {
+                'buy_signal': snapshot.risk['high_volatility_prob'] < 0.5 and bool(snapshot.features),
+                'signal_score': 80.0,
+                'reason': 'test'
+            }
+        )
+        engine.balance_manager = Mock()
+        engine.balance_manager.get_balance.return_value = 1_000_000
+        engine.balance_manager.calculate_position_size.return_value = 300_000
+        engine.balance_manager.calculate_quantity.return_value = 0.003
+        engine.order_executor = Mock()
+        engine.order_executor.place_buy_order.return_value = {'success': True}
+        engine.notifier = Mock()
+
+        engine._check_and_execute()
+
+        engine.order_executor.place_buy_order.assert_called_once()
+        self.assertEqual(collector._data_loader.load_exchange_data.call_count, 1)
+        self.assertEqual(collector.get_risk_and_features.call_count, 1)
+        self.assertEqual(collector.get_whale_data.call_count, 1)
+        self.assertIn('exchange_data', engine.last_snapshots['BTC'].timings)
+
+        # 주기 갱신 전이라도 다음 틱은 리스크 / 특성 / 고래 / 거래소 일봉을 다시 조회하지 않음
+        engine.position_manager.close_position("KRW-BTC", exit_price=100_000_000.0)
+        engine._check_and_execute()
+        self.assertEqual(engine.order_executor.place_buy_order.call_count, 2)
+        self.assertEqual(collector.get_risk_and_features.call_count, 1)
+        self.assertEqual(collector.get_whale_data.call_count, 1)
+        self.assertEqual(collector._data_loader.load_exchange_data.call_count, 1)
+        self.assertNotIn('risk', engine.last_snapshots['BTC'].timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -277,11 +277,49 @@ def render_monitoring_tab():
                     profit_amount = (current_price - position['entry_price']) * position['quantity']
                     st.metric("수익률", f"{profit_pct:.2f}%", delta=f"{profit_amount:,.0f}원")
         
+        # 보유 포지션 (여러 마켓)
+        positions = status.get('positions', {})
+        if len(positions) > 1:
+            st.markdown("### 보유 포지션")
+            positions_df = pd.DataFrame(list(positions.values()))[['market', 'quantity', 'entry_price', 'entry_time']]
+            positions_df.columns = ['마켓', '수량', '진입 가격', '진입 시간']
+            st.dataframe(positions_df, use_container_width=True, hide_index=True)
+        
+        # 거래 내역 (포지션 저널에서 바로 조회)
+        st.markdown("### 거래 내역")
+        position_manager = st.session_state.bot_engine.position_manager
+        summary = position_manager.get_trade_summary()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("거래 수", f"{summary['trades']}건")
+        with col2:
+            st.metric("승률", f"{summary['win_rate'] * 100:.1f}%")
+        with col3:
+            st.metric("누적 수익", f"{summary['total_profit']:,.0f}원")
+        
+        trades = position_manager.get_trade_history(limit=50)
+        if trades:
+            trades_df = pd.DataFrame(trades)[
+                ['exit_time', 'market', 'quantity', 'entry_price', 'exit_price', 'profit_pct', 'profit_amount']
+            ]
+            trades_df['profit_pct'] = trades_df['profit_pct'] * 100
+            trades_df.columns = ['청산 시간', '마켓', '수량', '진입 가격', '청산 가격', '수익률(%)', '수익금(원)']
+            st.dataframe(trades_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("청산된 거래가 없습니다.")
+        
         # 잔고 정보
         st.markdown("### 잔고 정보")
         if balance:
             balance_df = pd.DataFrame(list(balance.items()), columns=['통화', '잔고'])
             st.dataframe(balance_df, use_container_width=True, hide_index=True)
+            
+            cache = status.get('balance_cache', {})
+            if cache.get('age') is not None:
+                st.caption(
+                    f"잔고 캐시: {cache['age']:.1f}초 전 조회 (TTL {cache['ttl']:g}초) · "
+                    f"API 호출 {cache['api_calls']}회 · 절약 {cache['saved_calls']}회"
+                )
         else:
             st.info("잔고 정보가 없습니다.")
         
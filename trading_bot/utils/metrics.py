@@ -0,0 +1,373 @@
+"""
+지연 시간 / 운영 지표 유틸리티
+로그 간격 버킷 히스토그램 (HDR 방식, 상대 오차 일정), 단계별 타이머 / 카운터 / 게이지 레지스트리,
+Prometheus 텍스트 형식 HTTP 엔드포인트
+"""
+
+import bisect
+import functools
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Prometheus 내보내기용 버킷 경계 (초)
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    지연 시간 히스토그램 (초 단위 기록)
+    
+    - 버킷 경계가 min_value * 2^(k / sub_buckets) 형태라 값 크기와 관계없이 상대 오차가 일정
+    - 기록은 O(1), 메모리는 사용된 버킷 수만큼만 사용
+    - 여러 스레드에서 동시에 기록 가능
+    - 내보내기 경계(bounds) 이하 개수는 로그 버킷과 별도로 정확히 집계 (경계가 버킷 사이에 있어도 누락 없음)
+    """
+    
+    def __init__(self, min_value: float = 1e-6, sub_buckets: int = 16, bounds: Iterable[float] = PROMETHEUS_BUCKETS):
+        """
+        초기화
+        
+        Args:
+            min_value: 최소 구분 값 (초, 이하는 첫 버킷)
+            sub_buckets: 2배 구간당 버킷 수 (16이면 상대 오차 약 2%)
+            bounds: count_le()를 정확히 집계할 경계 값 (초)
+        """
+        self.min_value = min_value
+        self.sub_buckets = sub_buckets
+        self._log_base = math.log(2) / sub_buckets
+        self._counts: Dict[int, int] = {}
+        self.bounds = tuple(sorted(bounds))
+        self._bound_counts = [0] * len(self.bounds)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def _index(self, value: float) -> int:
+        """값 → 버킷 번호"""
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+    
+    def _upper_bound(self, index: int) -> float:
+        """버킷 상한 값"""
+        return self.min_value * math.exp(index * self._log_base)
+    
+    def observe(self, value: float):
+        """값 기록 (초)"""
+        value = max(float(value), 0.0)
+        index = self._index(value)
+        position = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            if position < len(self.bounds):
+                self._bound_counts[position] += 1
+            self.count += 1
+            self.total += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+    
+    def percentile(self, q: float) -> float:
+        """
+        분위수 (버킷 상한 기준, 최대값을 넘지 않음)
+        
+        Args:
+            q: 분위 (0-100)
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, math.ceil(self.count * q / 100.0))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    return min(self._upper_bound(index), self.max)
+            return self.max
+    
+    def count_le(self, bound: float) -> int:
+        """
+        bound 이하로 기록된 값 수
+        
+        bounds에 있는 경계는 정확한 값, 그 밖의 경계는 bound가 속한 버킷까지 포함
+        (빠뜨리지 않고, 초과분은 버킷 폭 이내)
+        """
+        with self._lock:
+            position = bisect.bisect_left(self.bounds, bound)
+            if position < len(self.bounds) and self.bounds[position] == bound:
+                return sum(self._bound_counts[:position + 1])
+            last = self._index(bound)
+            return sum(count for index, count in self._counts.items() if index <= last)
+    
+    def snapshot(self, percentiles: Iterable[float] = (50, 90, 99)) -> Dict[str, float]:
+        """
+        요약 값
+        
+        Returns:
+            {'count', 'mean', 'min', 'max', 'p50', 'p90', 'p99'} (초)
+        """
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max
+        }
+        for q in percentiles:
+            summary[f"p{q:g}"] = self.percentile(q)
+        return summary
+
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _NullTimer:
+    """비활성 상태 타이머 (아무것도 하지 않음)"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    """단계 소요 시간 측정 → 히스토그램 기록"""
+    
+    __slots__ = ('histogram', 'start')
+    
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    운영 지표 레지스트리
+    
+    - stage() / timed(): 단계별 소요 시간 히스토그램 (stage_seconds{stage=...})
+    - inc(): 카운터, set_gauge(): 게이지
+    - enabled가 False면 stage()는 공용 빈 타이머를 돌려주고 inc / set_gauge는 바로 반환 (측정 비용 없음)
+    """
+    
+    STAGE_METRIC = "stage_seconds"
+    
+    def __init__(self, enabled: bool = False, namespace: str = "trading_bot"):
+        """
+        초기화
+        
+        Args:
+            enabled: 측정 여부
+            namespace: Prometheus 지표 이름 접두사
+        """
+        self.enabled = enabled
+        self.namespace = namespace
+        self._histograms: Dict[MetricKey, LatencyHistogram] = {}
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(name: str, labels: Dict) -> MetricKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+    
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        """히스토그램 조회 (없으면 생성)"""
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+    
+    def register_histogram(self, name: str, histogram: LatencyHistogram, **labels):
+        """다른 컴포넌트가 가진 히스토그램을 내보내기 대상으로 등록 (예: 주문 지연 시간)"""
+        with self._lock:
+            self._histograms[self._key(name, labels)] = histogram
+    
+    def stage(self, stage: str):
+        """
+        단계 소요 시간 측정 컨텍스트
+        
+        Example:
+            with METRICS.stage("premium_filter"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.histogram(self.STAGE_METRIC, stage=stage))
+    
+    def timed(self, stage: str) -> Callable:
+        """단계 소요 시간 측정 데코레이터 (호출 시점에 enabled 확인)"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _StageTimer(self.histogram(self.STAGE_METRIC, stage=stage)):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """카운터 증가"""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        """게이지 설정"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[self._key(name, labels)] = float(value)
+    
+    def reset(self):
+        """전체 지표 초기화"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+    
+    @staticmethod
+    def _label_text(labels: Tuple[Tuple[str, str], ...], extra: Optional[Dict] = None) -> str:
+        items = list(labels) + list((extra or {}).items())
+        if not items:
+            return ""
+        escaped = (
+            f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+            for k, v in items
+        )
+        return "{" + ",".join(escaped) + "}"
+    
+    def snapshot(self) -> Dict:
+        """
+        전체 지표 요약 (get_status용)
+        
+        Returns:
+            {'histograms': {이름{라벨}: 요약}, 'counters': {...}, 'gauges': {...}}
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        
+        def label(key: MetricKey) -> str:
+            return key[0] + self._label_text(key[1])
+        
+        return {
+            'histograms': {label(key): histogram.snapshot() for key, histogram in histograms.items()},
+            'counters': {label(key): value for key, value in counters.items()},
+            'gauges': {label(key): value for key, value in gauges.items()}
+        }
+    
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+        
+        lines = []
+        declared = set()
+        
+        def declare(name: str, kind: str):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        
+        for (name, labels), value in counters:
+            full = f"{self.namespace}_{name}_total"
+            declare(full, "counter")
+            lines.append(f"{full}{self._label_text(labels)} {value:g}")
+        
+        for (name, labels), value in gauges:
+            full = f"{self.namespace}_{name}"
+            declare(full, "gauge")
+            lines.append(f"{full}{self._label_text(labels)} {value:g}")
+        
+        for (name, labels), histogram in histograms:
+            full = f"{self.namespace}_{name}"
+            declare(full, "histogram")
+            for bound in PROMETHEUS_BUCKETS:
+                lines.append(f"{full}_bucket{self._label_text(labels, {'le': f'{bound:g}'})} {histogram.count_le(bound)}")
+            lines.append(f"{full}_bucket{self._label_text(labels, {'le': '+Inf'})} {histogram.count}")
+            lines.append(f"{full}_sum{self._label_text(labels)} {histogram.total:.6f}")
+            lines.append(f"{full}_count{self._label_text(labels)} {histogram.count}")
+        
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 공용 레지스트리 (봇 설정 metrics.enabled로 활성화)
+METRICS = MetricsRegistry()
+
+
+class MetricsServer:
+    """지표 HTTP 엔드포인트 (GET /metrics, Prometheus 텍스트 형식, 백그라운드 스레드)"""
+    
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = "127.0.0.1", port: int = 9108):
+        """
+        초기화
+        
+        Args:
+            registry: 내보낼 레지스트리
+            host: 바인드 주소 (기본 로컬 전용)
+            port: 포트 (0이면 임의 포트)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """지표 URL"""
+        return f"http://{self.host}:{self.port}/metrics"
+    
+    def start(self):
+        """서버 시작"""
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="metrics-server")
+        self._thread.start()
+    
+    def stop(self):
+        """서버 중지"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
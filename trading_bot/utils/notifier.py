@@ -1,60 +1,261 @@
 """
 텔레그램 알림 모듈
+알림은 제한 크기 큐에 넣고 백그라운드 스레드가 전송 (호출 스레드를 막지 않음)
 """
 
-import requests
-from typing import Dict, Optional
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
 import logging
 from datetime import datetime
 
+import requests
+
+from trading_bot.utils.metrics import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
+# 큐가 가득 차도 버리지 않는 알림 종류 (매수 / 매도 체결)
+PROTECTED_KINDS = frozenset({'trade'})
+
 
 class TelegramNotifier:
-    """텔레그램 알림 클래스"""
+    """
+    텔레그램 알림 클래스
+    
+    - 알림 메서드는 큐에 넣고 바로 반환, 전송은 백그라운드 스레드가 세션 1개(keep-alive)로 처리
+    - 큐가 가득 차면 에러 / 상태 알림 중 가장 오래된 것부터 버림 (체결 알림은 버리지 않음)
+    - 전송 간격은 rate_limit(초당 메시지 수) 이하로 유지, 429 응답은 retry_after만큼 대기 후 재전송
+    - 큐 앞쪽에 연속으로 쌓인 에러 알림은 요약 메시지 1건으로 합침 (종류 간 전송 순서는 큐 순서 유지)
+    """
     
-    def __init__(self, bot_token: str, chat_id: str):
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        max_queue: int = 100,
+        rate_limit: float = 1.0,
+        max_retries: int = 3,
+        base_url: Optional[str] = None
+    ):
         """
         초기화
         
         Args:
             bot_token: 텔레그램 봇 토큰
             chat_id: 채팅 ID
+            max_queue: 큐 최대 길이 (넘으면 체결 알림이 아닌 오래된 알림 버림)
+            rate_limit: 초당 최대 전송 수 (텔레그램 채팅당 권장 1건/초)
+            max_retries: 메시지당 최대 전송 시도 횟수
+            base_url: API URL (None이면 텔레그램 봇 API, 테스트 시 로컬 서버)
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.base_url = base_url or f"https://api.telegram.org/bot{bot_token}"
+        self.max_queue = max_queue
+        self.min_interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+        self.max_retries = max_retries
+        
+        self.session = requests.Session()
+        self.latency = LatencyHistogram()
+        self.stats = {'queued': 0, 'sent': 0, 'dropped': 0, 'failed': 0, 'coalesced': 0}
+        
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._last_sent = 0.0
+        self._worker: Optional[threading.Thread] = None
     
-    def _send_message(self, message: str) -> bool:
+    def _send_message(self, message: str, kind: str = "info") -> bool:
         """
-        텔레그램 메시지 전송
+        텔레그램 메시지 전송 예약
         
         Args:
             message: 전송할 메시지
+            kind: 알림 종류 ('error'는 전송 대기 중 요약으로 합침)
         
         Returns:
-            전송 성공 여부
+            큐 추가 여부
         """
         if not self.bot_token or not self.chat_id:
             logger.warning("텔레그램 설정이 없습니다. 알림을 보낼 수 없습니다.")
             return False
         
-        try:
-            url = f"{self.base_url}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "HTML"
-            }
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._queue) >= self.max_queue and not self._drop_oldest(kind):
+                self.stats['dropped'] += 1
+                logger.warning("텔레그램 알림 큐가 체결 알림으로 가득 차 새 알림을 버렸습니다.")
+                return False
+            self._queue.append((kind, message, time.monotonic()))
+            self.stats['queued'] += 1
             
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True, name="telegram-notifier")
+                self._worker.start()
+            self._cond.notify()
+        
+        return True
+    
+    def _drop_oldest(self, incoming_kind: str) -> bool:
+        """
+        큐가 가득 찼을 때 자리 확보 (체결 알림이 아닌 가장 오래된 알림 버림)
+        
+        Returns:
+            새 알림을 넣을지 여부 (버릴 알림이 없으면 체결 알림만 한도를 넘겨 추가)
+        """
+        for index, (kind, _, _) in enumerate(self._queue):
+            if kind not in PROTECTED_KINDS:
+                del self._queue[index]
+                self.stats['dropped'] += 1
+                logger.warning("텔레그램 알림 큐가 가득 차 가장 오래된 알림을 버렸습니다.")
+                return True
+        return incoming_kind in PROTECTED_KINDS
+    
+    def _run(self):
+        """전송 스레드"""
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                self._busy = True
             
-            return True
+            try:
+                # 전송 간격 유지 (기다리는 동안 쌓인 에러는 함께 요약)
+                wait = self.min_interval - (time.monotonic() - self._last_sent)
+                if wait > 0:
+                    time.sleep(wait)
+                
+                with self._cond:
+                    message, enqueued_at = self._next_message()
+                
+                if self._post(message):
+                    self.stats['sent'] += 1
+                    self.latency.observe(time.monotonic() - enqueued_at)
+                else:
+                    self.stats['failed'] += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+    
+    def _next_message(self):
+        """
+        다음 전송 메시지 (첫 알림이 에러면 바로 뒤에 이어진 에러 알림까지 요약)
+        
+        뒤쪽 에러를 앞의 체결 / 상태 알림보다 먼저 보내지 않도록 다른 종류의 알림이 나오면 멈춤
+        
+        Returns:
+            (메시지, 가장 오래된 큐 추가 시각)
+        """
+        kind, message, enqueued_at = self._queue.popleft()
+        if kind != 'error':
+            return message, enqueued_at
+        
+        errors = [message]
+        while self._queue and self._queue[0][0] == 'error':
+            errors.append(self._queue.popleft()[1])
+        
+        if len(errors) == 1:
+            return message, enqueued_at
+        
+        self.stats['coalesced'] += len(errors) - 1
+        return self._format_error_digest(errors), enqueued_at
+    
+    @staticmethod
+    def _format_error_digest(messages: List[str]) -> str:
+        """에러 알림 요약 (같은 내용은 횟수로 표시)"""
+        counts: Dict[str, int] = {}
+        for message in messages:
+            # 알림 본문만 비교 (헤더 / 시간 줄 제외)
+            body = "\n".join(
+                line for line in message.splitlines()
+                if line.strip() and not line.startswith("❌") and not line.startswith("시간:")
+            )
+            counts[body] = counts.get(body, 0) + 1
+        
+        lines = [f"❌ <b>에러 {len(messages)}건</b>", ""]
+        for body, count in counts.items():
+            lines.append(f"• {body}" + (f" (x{count})" if count > 1 else ""))
+        lines.append("")
+        lines.append(f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return "\n".join(lines)
+    
+    def _post(self, message: str) -> bool:
+        """sendMessage 호출 (429는 retry_after 대기 후 재시도)"""
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "HTML"
+        }
+        
+        for attempt in range(self.max_retries):
+            try:
+                response = self.session.post(url, json=payload, timeout=10)
+                self._last_sent = time.monotonic()
+                
+                if response.status_code == 429:
+                    retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                    logger.warning(f"텔레그램 전송 제한: {retry_after}초 후 재시도")
+                    time.sleep(retry_after)
+                    continue
+                
+                response.raise_for_status()
+                return True
             
-        except Exception as e:
-            logger.error(f"텔레그램 메시지 전송 실패: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"텔레그램 메시지 전송 실패 (시도 {attempt+1}/{self.max_retries}): {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(min(2 ** attempt, 10))
+        
+        return False
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        큐의 알림 전송 완료까지 대기
+        
+        Returns:
+            시간 안에 모두 전송(또는 실패 처리)되었는지 여부
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+    
+    def close(self, timeout: float = 10.0):
+        """남은 알림 전송 후 전송 스레드 종료 (남으면 버림)"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self.stats['dropped'] += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
+            self._worker = None
+        self.session.close()
+    
+    def get_stats(self) -> Dict:
+        """
+        알림 통계
+        
+        Returns:
+            {'queued', 'sent', 'dropped', 'failed', 'coalesced', 'pending', 'latency': Dict(초)}
+        """
+        with self._cond:
+            stats = dict(self.stats, pending=len(self._queue))
+        stats['latency'] = self.latency.snapshot()
+        return stats
     
     def notify_buy_executed(
         self,
@@ -83,7 +284,7 @@ class TelegramNotifier:
 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """.strip()
         
-        self._send_message(message)
+        self._send_message(message, kind="trade")
     
     def notify_sell_executed(
         self,
@@ -116,7 +317,7 @@ class TelegramNotifier:
 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """.strip()
         
-        self._send_message(message)
+        self._send_message(message, kind="trade")
     
     def notify_error(self, error_message: str):
         """에러 알림"""
@@ -128,7 +329,7 @@ class TelegramNotifier:
 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """.strip()
         
-        self._send_message(message)
+        self._send_message(message, kind="error")
     
     def notify_status(self, status: str, details: Optional[Dict] = None):
         """상태 알림"""
@@ -144,5 +345,4 @@ class TelegramNotifier:
         
         message += f"\n\n시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        self._send_message(message)
-
+        self._send_message(message, kind="status")